@@ -0,0 +1,93 @@
+"""
+Baseline files shared by the benchmarks
+
+A baseline JSON holds one entry per benchmark profile (the parameters that
+change the workload), each with the stage results recorded on one machine:
+    
+    {"profiles": {"<profile_key>": {"recorded_at", "params", "machine", "stages": {stage: {...}}}}}
+
+A stage regresses when its seconds (or peak_mb) grow by more than the
+threshold; stages under the floors below are too noisy to compare.
+"""
+from datetime import datetime
+from pathlib import Path
+import json
+
+DEFAULT_THRESHOLD = 0.25
+
+# Stages faster than this are too noisy for a relative threshold
+MIN_COMPARABLE_SECONDS = 0.05
+MIN_COMPARABLE_MB = 1.0
+
+
+def profile_key(params):
+    """Baseline key for a set of benchmark parameters, e.g. 'roots=3,months=12,...'."""
+    return ','.join(f'{name}={params[name]}' for name in sorted(params))
+
+
+def load_baseline(path):
+    """
+    Read the baseline file.
+    
+    Args:
+        path: Baseline JSON path
+    
+    Returns:
+        Dictionary {'profiles': {profile_key: {...}}} (empty if missing)
+    """
+    path = Path(path)
+    if not path.exists():
+        return {'profiles': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, key, params, results, machine=None):
+    """
+    Store results as the baseline for one profile (other profiles are kept).
+    
+    Args:
+        path: Baseline JSON path
+        key: Profile key (profile_key)
+        params: Profile parameters
+        results: {stage: result entry}
+        machine: Host description stored with the baseline
+    """
+    baseline = load_baseline(path)
+    baseline.setdefault('profiles', {})[key] = {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'params': params,
+        'machine': machine or {},
+        'stages': {stage: entry for stage, entry in results.items() if 'skipped' not in entry},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+
+def compare_to_baseline(results, baseline_stages, threshold=DEFAULT_THRESHOLD):
+    """
+    Find stages that regressed against the baseline.
+    
+    Args:
+        results: {stage: result entry with seconds and optional peak_mb}
+        baseline_stages: {stage: baseline entry}
+        threshold: Allowed relative increase (0.25 = 25% slower/larger)
+    
+    Returns:
+        List of (stage, metric, baseline value, current value, relative change)
+    """
+    regressions = []
+    for stage, entry in results.items():
+        base = baseline_stages.get(stage)
+        if base is None or 'skipped' in entry:
+            continue
+        for metric, floor in (('seconds', MIN_COMPARABLE_SECONDS), ('peak_mb', MIN_COMPARABLE_MB)):
+            if entry.get(metric) is None or base.get(metric) is None:
+                continue
+            if max(entry[metric], base[metric]) < floor:
+                continue
+            change = (entry[metric] - base[metric]) / base[metric] if base[metric] > 0 else float('inf')
+            if change > threshold:
+                regressions.append((stage, metric, base[metric], entry[metric], change))
+    return regressions
@@ -0,0 +1,167 @@
+"""
+Benchmark of AI alignment dispatch against a fake chat-completions server
+
+Times the same set of trades two ways, each with an empty AIAlignCache in a
+temporary directory, against fake_chat_server.py (no API key, no network):
+
+- sequential:  get_or_fetch_ai_alignment per trade, as report rows call it
+- concurrent:  prefetch_ai_alignments with an AIAlignDispatcher
+
+Trades repeat (--duplicates), so cache hits and in-flight coalescing are
+exercised too. Both runs must give the same alignment per trade; the server's
+counters show the requests sent, the peak concurrency and any 429 answers
+(none are expected when --rpm matches the server limit).
+
+Requires the openai package.
+
+Examples:
+    python benchmarks/bench_ai_align.py
+    python benchmarks/bench_ai_align.py --trades 200 --latency-ms 300 --concurrency 16
+    python benchmarks/bench_ai_align.py --rpm 120 --server-rpm 120
+"""
+from datetime import date
+from pathlib import Path
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import fake_chat_server
+
+from signal_generator.ai import AIAlignCache, AIAlignDispatcher, get_or_fetch_ai_alignment, prefetch_ai_alignments
+from signal_generator.ai.ai_align_cache import build_cache_key
+from signal_generator.ai.ai_align_dispatch import OPENAI_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+# Loggers silenced unless --verbose: per-trade AI output and the openai HTTP transport (one line per request)
+AI_LOGGERS = ['signal_generator.ai', 'httpx', 'httpx2']
+
+STRATEGIES = ["Trend", "Enhanced Trend", "Mean Reversion", "MACD+RSI Exhaustion"]
+
+
+def make_trades(n, duplicates):
+    """
+    Synthetic (trade_signature, trade_payload) pairs.
+    
+    Args:
+        n: Number of trades
+        duplicates: Fraction of trades repeating an earlier one
+    
+    Returns:
+        List of (trade_signature, trade_payload)
+    """
+    distinct = max(1, int(round(n * (1 - duplicates))))
+    trades = []
+    for i in range(n):
+        k = i % distinct
+        direction = "Buy" if k % 2 == 0 else "Sell"
+        payload = {
+            "week_date": "2025-12-05",
+            "structure_type": "outright" if k % 3 == 0 else "spread",
+            "strategy_type": STRATEGIES[k % len(STRATEGIES)],
+            "signal_direction": direction,
+            "spread_expression": f"%AFE {'FGHJKMNQUVXZ'[k % 12]}!-IEU #{k}",
+            "legs": [],
+            "entry_price_numeric": 1.0 + k / 100,
+        }
+        signature = {
+            "week_date": payload["week_date"],
+            "structure_type": payload["structure_type"],
+            "symbol": payload["spread_expression"],
+            "signal_direction": direction,
+            "strategy_type": payload["strategy_type"]
+        }
+        trades.append((signature, payload))
+    return trades
+
+
+def run_sequential(trades, base_url, passes):
+    """get_or_fetch_ai_alignment per trade (the OpenAI client picks up OPENAI_BASE_URL)."""
+    os.environ['OPENAI_BASE_URL'] = base_url
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = AIAlignCache(cache_dir)
+        start = time.perf_counter()
+        responses = [
+            get_or_fetch_ai_alignment(signature, payload, cache_date=date.today(), cache=cache,
+                                      num_passes=passes, api_key='fake')
+            for signature, payload in trades
+        ]
+        seconds = time.perf_counter() - start
+        cache.close()
+    return seconds, responses
+
+
+def run_concurrent(trades, base_url, passes, concurrency, rpm, tpm):
+    """prefetch_ai_alignments, then the same per-trade lookups (all cache hits)."""
+    dispatcher = AIAlignDispatcher(api_key='fake', num_passes=passes, max_concurrency=concurrency,
+                                   requests_per_minute=rpm, tokens_per_minute=tpm, base_url=base_url)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = AIAlignCache(cache_dir)
+        start = time.perf_counter()
+        prefetch_ai_alignments(trades, date.today(), cache, dispatcher)
+        responses = [cache.get(date.today(), build_cache_key(signature)) for signature, _ in trades]
+        seconds = time.perf_counter() - start
+        cache.close()
+    return seconds, responses, dispatcher.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AI alignment dispatch against a fake chat-completions server')
+    parser.add_argument('--trades', type=int, default=40, help='Trades (default: 40)')
+    parser.add_argument('--duplicates', type=float, default=0.25, help='Fraction of repeated trades (default: 0.25)')
+    parser.add_argument('--passes', type=int, default=3, help='Analysis passes per trade (default: 3)')
+    parser.add_argument('--latency-ms', type=float, default=100.0, help='Fake model latency per request (default: 100)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Dispatcher max_concurrency (default: 8)')
+    parser.add_argument('--rpm', type=int, default=None, help='Dispatcher requests_per_minute')
+    parser.add_argument('--tpm', type=int, default=None, help='Dispatcher tokens_per_minute')
+    parser.add_argument('--server-rpm', type=int, default=None, help='Fake server answers 429 beyond this rate')
+    parser.add_argument('--skip-sequential', action='store_true', help='Only run the dispatcher')
+    parser.add_argument('--verbose', action='store_true', help='Show AI module log output')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S', force=True)
+    if not args.verbose:
+        for name in AI_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+    if not OPENAI_AVAILABLE:
+        logger.error("The openai package is required (pip install openai)")
+        return 2
+    
+    trades = make_trades(args.trades, args.duplicates)
+    distinct = len({build_cache_key(signature) for signature, _ in trades})
+    logger.info(f"{len(trades)} trades ({distinct} distinct), {args.passes} passes, {args.latency_ms:.0f} ms per request")
+    
+    results = {}
+    if not args.skip_sequential:
+        server = fake_chat_server.start(latency_ms=args.latency_ms, requests_per_minute=args.server_rpm)
+        seconds, responses = run_sequential(trades, server.base_url, args.passes)
+        server.stop()
+        results['sequential'] = responses
+        logger.info(f"  sequential: {seconds:7.2f}s  {server.requests} requests, at most {server.max_active} at once, "
+                    f"{server.rejected} rejected")
+    
+    server = fake_chat_server.start(latency_ms=args.latency_ms, requests_per_minute=args.server_rpm)
+    seconds, responses, stats = run_concurrent(trades, server.base_url, args.passes, args.concurrency, args.rpm, args.tpm)
+    server.stop()
+    results['concurrent'] = responses
+    logger.info(f"  concurrent: {seconds:7.2f}s  {server.requests} requests, at most {server.max_active} at once, "
+                f"{server.rejected} rejected, {stats['coalesced']} coalesced, {stats['rate_limit_wait']:.1f}s rate-limit wait")
+    
+    if 'sequential' in results:
+        labels = [[response.get('alignment_label') for response in responses] for responses in results.values()]
+        if labels[0] != labels[1]:
+            logger.error("✗ Sequential and concurrent alignments differ")
+            return 1
+        logger.info("  alignments identical")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,430 @@
+"""
+Synthetic end-to-end benchmark of the pull pipeline (pull_ohlc_data.py)
+
+Generates a universe shaped like lists_and_matrix/symbol_matrix.csv (see
+synthetic_universe.py) and runs each pull stage on it, in pipeline order,
+against a fake ICE backend (fake_ice.py) - no ICE XL session is needed:
+
+- fetch:        fetch_symbol_ohlc + apply_conversion_factor for every monthly outright
+- quarterlies:  calculate_quarterly_ohlc for every quarterly outright
+- spreads:      calculate_spread_ohlc for every spread (quarterly legs resolved as in the pull)
+- indicators:   indicator engine from the config (panel or per_series) for every series
+- correlation:  calculate_correlation_and_cointegration for every spread
+- snapshot:     combined snapshot CSV + raw OHLC sidecar (save_raw_ohlc), in a temp directory
+
+Each stage reports wall time, peak traced memory (tracemalloc, measured in a
+separate pass so tracing does not inflate the timings), rows and rows/sec.
+Results are compared with benchmarks/baseline.json (one entry per universe
+profile); a stage slower or larger than its baseline by more than --threshold
+is a regression and the script exits with status 1. A stage that cannot run
+here (the per_series engine, or panel fallbacks, without pandas_ta) is
+reported as skipped and the script exits with status 2, so an incomplete run
+does not pass as a clean one.
+
+The indicator engine defaults to panel, the engine of the recorded baselines,
+rather than indicator_engine.mode from the config: the per_series engine
+needs pandas_ta. Pass --indicator-engine per_series to measure it.
+
+Baselines are machine-specific: record them on the machine that runs the pull
+(--save-baseline) before comparing performance changes.
+
+Examples:
+    python benchmarks/bench_pull.py --quick
+    python benchmarks/bench_pull.py --quick --save-baseline
+    python benchmarks/bench_pull.py --stages fetch spreads --repeat 3
+    python benchmarks/bench_pull.py --roots 11 --spreads 13002 --quarterly-spreads 946 --no-memory
+"""
+from datetime import datetime
+from pathlib import Path
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import fake_ice
+from baseline_store import DEFAULT_THRESHOLD, profile_key, load_baseline, save_baseline, compare_to_baseline
+from synthetic_universe import build_symbol_matrix, make_roots, base_prices
+
+# The fake backend must be registered before pull_ohlc_data imports icepython
+BACKEND = fake_ice.install()
+
+import pull_ohlc_data
+from pull_ohlc_data import (
+    fetch_symbol_ohlc, apply_conversion_factor, calculate_quarterly_ohlc, calculate_spread_ohlc,
+    calculate_technical_indicators, calculate_correlation_and_cointegration, find_symbol_in_outright_dict,
+    load_indicator_config, PANDAS_TA_AVAILABLE, STATSMODELS_AVAILABLE
+)
+from indicator_plan import build_indicator_plan
+from panel_indicators import PanelIndicatorEngine, DEFAULT_CHUNK_SIZE
+from snapshot_store import save_raw_ohlc
+
+logger = logging.getLogger(__name__)
+
+STAGES = ['fetch', 'quarterlies', 'spreads', 'indicators', 'correlation', 'snapshot']
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+END_DATE = datetime(2025, 12, 5)
+
+# Production-sized universe and the quick profile used for routine checks
+FULL_PROFILE = {'roots': 11, 'months': 12, 'weeks': 260, 'spreads': 13002, 'quarterly_spreads': 946}
+QUICK_PROFILE = {'roots': 3, 'months': 12, 'weeks': 260, 'spreads': 300, 'quarterly_spreads': 30}
+# Engine of the recorded baselines (runs without pandas_ta), independent of the config default
+DEFAULT_INDICATOR_ENGINE = 'panel'
+
+
+class PullBenchmark:
+    """
+    Runs the pull stages on a synthetic universe, keeping each stage's output for the next.
+    
+    Usage:
+        bench = PullBenchmark(matrix, config, weeks=260)
+        result = bench.run_stage('fetch')   # {'rows': ..., 'series': ...}
+    """
+    
+    def __init__(self, matrix, config, weeks=260, indicator_engine=None, indicator_mode=None):
+        """
+        Initialize benchmark state.
+        
+        Args:
+            matrix: Symbol matrix DataFrame (build_symbol_matrix)
+            config: Indicator configuration dictionary
+            weeks: Weeks of history fetched per outright
+            indicator_engine: 'panel' or 'per_series' (default: indicator_engine.mode from config)
+            indicator_mode: 'full' or 'plan' (default: indicator_plan.mode from config)
+        """
+        self.config = config
+        self.weeks = weeks
+        self.indicator_engine = indicator_engine or config.get('indicator_engine', {}).get('mode', 'per_series')
+        self.plan = build_indicator_plan(config, mode=indicator_mode)
+        self.start_date = END_DATE - pd.Timedelta(weeks=weeks - 1)
+        
+        self.outrights = matrix[(matrix['spread_type'] == 'outright') & (matrix['quarter_numb'] == 'N')]
+        self.quarterlies = matrix[(matrix['spread_type'] == 'outright') & (matrix['quarter_numb'] == 'Y')]
+        self.spread_rows = matrix[matrix['spread_type'] == 'spread'].to_dict('records')
+        
+        self.outright_data = {}
+        self.spread_data = {}
+        self.indicator_frames = {}
+    
+    def run_stage(self, stage):
+        """
+        Run one stage.
+        
+        Args:
+            stage: Stage name (see STAGES)
+        
+        Returns:
+            Dictionary with rows (bars produced/processed) and series counts,
+            or {'skipped': reason} when the stage cannot run here
+        """
+        return getattr(self, f'_run_{stage}')()
+    
+    def _run_fetch(self):
+        self.outright_data = {}
+        rows = 0
+        for symbol, conversion in zip(self.outrights['ice_symbol'], self.outrights['convert_to_$usg']):
+            df = fetch_symbol_ohlc(symbol, self.start_date, END_DATE)
+            if df is None or len(df) == 0:
+                continue
+            self.outright_data[symbol] = apply_conversion_factor(df, conversion)
+            rows += len(df)
+        return {'rows': rows, 'series': len(self.outright_data)}
+    
+    def _run_quarterlies(self):
+        rows = 0
+        series = 0
+        for symbol, components in zip(self.quarterlies['ice_symbol'], self.quarterlies['component_symbols']):
+            component_symbols = [s.strip() for s in components.split(',') if s.strip().startswith('%')]
+            # Monthly data is already converted to $/usg (as in pull_all_ohlc_data)
+            df = calculate_quarterly_ohlc(component_symbols, self.outright_data, conversion_factor=None)
+            if df is None or len(df) == 0:
+                continue
+            self.outright_data[symbol] = df
+            rows += len(df)
+            series += 1
+        return {'rows': rows, 'series': series}
+    
+    def _run_spreads(self):
+        self.spread_data = {}
+        rows = 0
+        for row in self.spread_rows:
+            symbol_1 = find_symbol_in_outright_dict(row['symbol_1'], self.outright_data, row, is_symbol_a=True)
+            symbol_2 = find_symbol_in_outright_dict(row['symbol_2'], self.outright_data, row, is_symbol_a=False)
+            df = calculate_spread_ohlc(symbol_1, symbol_2, self.outright_data)
+            if df is None or len(df) == 0:
+                continue
+            self.spread_data[row['ice_symbol']] = df
+            rows += len(df)
+        return {'rows': rows, 'series': len(self.spread_data)}
+    
+    def _run_indicators(self):
+        frames = {**self.outright_data, **self.spread_data}
+        self.indicator_frames = {}
+        if self.indicator_engine == 'panel':
+            chunk_size = self.config.get('indicator_engine', {}).get('chunk_size', DEFAULT_CHUNK_SIZE)
+            result = PanelIndicatorEngine(self.config, plan=self.plan, chunk_size=chunk_size).compute(frames)
+            if result.skipped and not PANDAS_TA_AVAILABLE:
+                return {'skipped': f'{len(result.skipped)} series need the per-series path (pandas_ta not installed)'}
+            for key in frames:
+                if key in result:
+                    self.indicator_frames[key] = result.series_frame(key)
+                else:
+                    self.indicator_frames[key] = calculate_technical_indicators(frames[key], {}, self.config, plan=self.plan)
+        else:
+            if not PANDAS_TA_AVAILABLE:
+                return {'skipped': 'per_series engine needs pandas_ta'}
+            for key, df in frames.items():
+                self.indicator_frames[key] = calculate_technical_indicators(df, {}, self.config, plan=self.plan)
+        rows = sum(len(df) for df in self.indicator_frames.values() if df is not None)
+        return {'rows': rows, 'series': len(self.indicator_frames)}
+    
+    def _run_correlation(self):
+        rows = 0
+        series = 0
+        for row in self.spread_rows:
+            df = self.spread_data.get(row['ice_symbol'])
+            if df is None:
+                continue
+            stats = calculate_correlation_and_cointegration(
+                df, row['symbol_1'], row['symbol_2'], self.outright_data, self.config, spread_row_meta=row
+            )
+            if stats is not None:
+                series += 1
+            rows += len(df)
+        return {'rows': rows, 'series': series}
+    
+    def _run_snapshot(self):
+        # Indicator output when that stage ran, otherwise the OHLC frames alone
+        frames = self.indicator_frames or {**self.outright_data, **self.spread_data}
+        parts = []
+        for key, df in frames.items():
+            if df is None or len(df) == 0:
+                continue
+            part = df.reset_index()
+            part['ice_connect_symbol'] = key
+            parts.append(part)
+        combined = pd.concat(parts, ignore_index=True)
+        
+        with tempfile.TemporaryDirectory(prefix='bench_pull_') as tmp_dir:
+            csv_path = Path(tmp_dir) / 'snapshot.csv'
+            combined.to_csv(csv_path, index=False)
+            size_mb = csv_path.stat().st_size / 1e6
+            save_raw_ohlc({**self.outright_data, **self.spread_data}, Path(tmp_dir) / 'raw_ohlc.npz')
+        return {'rows': len(combined), 'series': len(parts), 'csv_mb': round(size_mb, 1)}
+
+
+def measure_stage(bench, stage, repeat=1, memory=True):
+    """
+    Time a stage (best of repeat runs) and measure its peak traced memory.
+    
+    Args:
+        bench: PullBenchmark (earlier stages already run)
+        stage: Stage name
+        repeat: Timed runs; the fastest is reported
+        memory: Run one extra pass under tracemalloc for the peak
+    
+    Returns:
+        Dictionary with seconds, peak_mb, rows, rows_per_sec, series (or skipped)
+    """
+    timings = []
+    result = {}
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = bench.run_stage(stage)
+        timings.append(time.perf_counter() - start)
+        if 'skipped' in result:
+            return {'skipped': result['skipped']}
+    
+    entry = {'seconds': round(min(timings), 4)}
+    if memory:
+        tracemalloc.start()
+        try:
+            bench.run_stage(stage)
+            entry['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+        finally:
+            tracemalloc.stop()
+    entry.update(result)
+    entry['rows_per_sec'] = round(entry['rows'] / entry['seconds'], 1) if entry['seconds'] > 0 else None
+    return entry
+
+
+def machine_info():
+    """Host description stored with a baseline (timings only compare on the same machine)."""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'pandas': pd.__version__,
+        'pandas_ta': PANDAS_TA_AVAILABLE,
+        'statsmodels': STATSMODELS_AVAILABLE,
+    }
+
+
+def format_results(results, baseline_stages=None):
+    """
+    Results table (one line per stage) for the log.
+    
+    Args:
+        results: {stage: measure_stage entry}
+        baseline_stages: Optional {stage: baseline entry} for the change column
+    
+    Returns:
+        List of lines
+    """
+    lines = [f"{'stage':<12} {'seconds':>9} {'peak MB':>9} {'rows':>11} {'rows/sec':>12} {'series':>7}  vs baseline"]
+    for stage, entry in results.items():
+        if 'skipped' in entry:
+            lines.append(f"{stage:<12} skipped: {entry['skipped']}")
+            continue
+        peak = f"{entry['peak_mb']:.1f}" if entry.get('peak_mb') is not None else '-'
+        rate = f"{entry['rows_per_sec']:,.0f}" if entry.get('rows_per_sec') is not None else '-'
+        change = ''
+        base = (baseline_stages or {}).get(stage)
+        if base and base.get('seconds'):
+            change = f"{(entry['seconds'] - base['seconds']) / base['seconds']:+.0%} time"
+            if base.get('peak_mb') and entry.get('peak_mb') is not None:
+                change += f", {(entry['peak_mb'] - base['peak_mb']) / base['peak_mb']:+.0%} memory"
+        lines.append(f"{stage:<12} {entry['seconds']:>9.3f} {peak:>9} {entry['rows']:>11,} {rate:>12} "
+                     f"{entry['series']:>7,}  {change}")
+    return lines
+
+
+def run_benchmark(params, stages=None, config_file=None, repeat=1, memory=True, latency_ms=0.0):
+    """
+    Build the universe and run the requested stages (earlier stages run untimed if needed).
+    
+    Args:
+        params: Profile parameters (roots, months, weeks, spreads, quarterly_spreads,
+                indicator_engine, indicator_mode)
+        stages: Stages to measure (default: all, in pipeline order)
+        config_file: Indicator configuration file (default: study_settings/indicator_config.json)
+        repeat: Timed runs per stage (fastest reported)
+        memory: Measure peak traced memory per stage
+        latency_ms: Simulated ICE latency per fetch (milliseconds)
+    
+    Returns:
+        Dictionary {stage: measure_stage entry}
+    """
+    stages = set(stages or STAGES)
+    config = load_indicator_config(config_file or REPO_ROOT / 'study_settings' / 'indicator_config.json')
+    matrix = build_symbol_matrix(
+        roots=params['roots'], months=params['months'],
+        spreads=params['spreads'], quarterly_spreads=params['quarterly_spreads']
+    )
+    BACKEND.latency_ms = latency_ms
+    BACKEND.base_prices = base_prices(make_roots(params['roots']))
+    
+    bench = PullBenchmark(matrix, config, weeks=params['weeks'],
+                          indicator_engine=params['indicator_engine'], indicator_mode=params['indicator_mode'])
+    logger.info(f"Universe: {len(bench.outrights)} monthly + {len(bench.quarterlies)} quarterly outrights, "
+                f"{len(bench.spread_rows):,} spreads, {params['weeks']} weeks "
+                f"(indicators: {bench.indicator_engine}, {'full' if bench.plan is None else 'plan'} mode)")
+    
+    results = {}
+    last_needed = max(STAGES.index(stage) for stage in stages)
+    for stage in STAGES[:last_needed + 1]:
+        if stage not in stages:
+            # Needed as input for a later stage; run once without measuring
+            if stage in ('fetch', 'quarterlies', 'spreads', 'indicators'):
+                bench.run_stage(stage)
+            continue
+        logger.info(f"Running {stage}...")
+        results[stage] = measure_stage(bench, stage, repeat=repeat, memory=memory)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Benchmark the pull stages on a synthetic universe with a fake ICE backend'
+    )
+    parser.add_argument('--quick', action='store_true',
+                        help='Small universe (3 roots, 300 + 30 spreads) for routine checks')
+    parser.add_argument('--roots', type=int, default=None, help='Symbol roots (production: 11)')
+    parser.add_argument('--months', type=int, default=None, help='Contract months per root (production: 12)')
+    parser.add_argument('--weeks', type=int, default=None, help='Weekly bars per outright (production: 260)')
+    parser.add_argument('--spreads', type=int, default=None, help='Monthly spreads (production: 13002)')
+    parser.add_argument('--quarterly-spreads', type=int, default=None, help='Quarterly spreads (production: 946)')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=None,
+                        help='Stages to measure (default: all; earlier stages still run as input)')
+    parser.add_argument('--indicator-engine', type=str, choices=['panel', 'per_series'], default=None,
+                        help=f'Indicator engine (default: {DEFAULT_INDICATOR_ENGINE}, the baseline engine)')
+    parser.add_argument('--indicator-mode', type=str, choices=['full', 'plan'], default=None,
+                        help='Indicator mode (default: indicator_plan.mode from the config)')
+    parser.add_argument('--config', type=str, default=None, help='Indicator configuration file')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed runs per stage, fastest reported (default: 1)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass per stage')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Simulated ICE latency per fetch in milliseconds (default: 0 = parse cost only)')
+    parser.add_argument('--baseline', type=str, default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline for this profile')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Allowed slowdown/growth vs baseline before failing (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--output', type=str, default=None, help='Also write the results to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help='Show pull_ohlc_data log output')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    if not args.verbose:
+        # One INFO line per fetched symbol (and a statsmodels warning per spread) would dominate the output
+        logging.getLogger(pull_ohlc_data.__name__).setLevel(logging.ERROR)
+    
+    params = dict(QUICK_PROFILE if args.quick else FULL_PROFILE)
+    for name in ('roots', 'months', 'weeks', 'spreads', 'quarterly_spreads'):
+        if getattr(args, name) is not None:
+            params[name] = getattr(args, name)
+    config_for_defaults = load_indicator_config(args.config or REPO_ROOT / 'study_settings' / 'indicator_config.json')
+    params['indicator_engine'] = args.indicator_engine or DEFAULT_INDICATOR_ENGINE
+    params['indicator_mode'] = args.indicator_mode or config_for_defaults.get('indicator_plan', {}).get('mode', 'full')
+    key = profile_key(params)
+    
+    if not STATSMODELS_AVAILABLE:
+        logger.warning("statsmodels not installed - correlation stage measures correlation only (no cointegration)")
+    
+    results = run_benchmark(params, stages=args.stages, config_file=args.config, repeat=args.repeat,
+                            memory=not args.no_memory, latency_ms=args.latency_ms)
+    
+    baseline_entry = load_baseline(args.baseline).get('profiles', {}).get(key)
+    baseline_stages = baseline_entry['stages'] if baseline_entry else None
+    for line in format_results(results, baseline_stages):
+        logger.info(line)
+    skipped = {stage: entry['skipped'] for stage, entry in results.items() if 'skipped' in entry}
+    for stage, reason in skipped.items():
+        logger.warning(f"Stage {stage} was not measured: {reason}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'profile': key, 'params': params, 'machine': machine_info(), 'stages': results}, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+    
+    if args.save_baseline:
+        if skipped:
+            logger.error(f"Not saving a baseline without the skipped stages: {', '.join(skipped)}")
+            sys.exit(2)
+        save_baseline(args.baseline, key, params, results, machine_info())
+        logger.info(f"✓ Baseline saved for profile {key} ({args.baseline})")
+        sys.exit(0)
+    
+    if baseline_entry is None:
+        logger.warning(f"No baseline for profile {key} - run with --save-baseline to record one")
+        sys.exit(2 if skipped else 0)
+    if baseline_entry.get('machine', {}).get('platform') != machine_info()['platform']:
+        logger.warning(f"Baseline was recorded on {baseline_entry['machine'].get('platform')} - timings may not be comparable")
+    
+    regressions = compare_to_baseline(results, baseline_stages, threshold=args.threshold)
+    if not regressions:
+        logger.info(f"✓ No stage regressed by more than {args.threshold:.0%} (baseline {baseline_entry['recorded_at']})")
+        if skipped:
+            logger.warning(f"Incomplete run: {len(skipped)} stage(s) skipped ({', '.join(skipped)})")
+        sys.exit(2 if skipped else 0)
+    for stage, metric, base, current, change in regressions:
+        logger.error(f"✗ {stage} {metric}: {base} -> {current} ({change:+.0%}, threshold {args.threshold:.0%})")
+    sys.exit(1)
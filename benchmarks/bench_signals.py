@@ -0,0 +1,344 @@
+"""
+Benchmark of the signal generator stages (run_signal_generator.py) on one snapshot
+
+Runs the weekly signal pipeline headless - no CurveBuilder Excel, no OpenAI
+(ai_align is forced off) - and times each stage with RunMetrics:
+
+- load_data / prepare_data:   unfiltered_<date>.csv read and preparation
+- signals:                    SignalEngine.run, with signals/prepare_view and one
+                              signals/<strategy> entry per strategy
+- prior_week_recompute:       check_prior_week_signals with the prior Friday recomputed
+                              from its CSV (empty ledger, as on a first run)
+- prior_week_ledger:          check_prior_week_signals with the prior Friday read from the ledger
+- formatter_init:             ICEChatFormatter (leg prices and metadata from the prepared frame)
+- html_report:                ReportGenerator.write_report (streamed to a temporary directory)
+- ice_connect_file:           ReportGenerator.generate_ice_connect_text_file
+
+By default the data is synthetic: synthetic_snapshot.py builds the latest two
+Fridays over the real lists_and_matrix/symbol_matrix.csv (14,124 symbols, every
+indicator column) and a synthetic forward curve for delta sizing. --data-dir and
+--date benchmark a recorded pull instead (the prior Friday's file must be there
+too for the recompute stage).
+
+Each stage reports its best wall time over --repeat runs and, unless
+--no-memory, its peak traced memory from a separate tracemalloc pass. Results
+are compared with benchmarks/baseline_signals.json (same format and threshold
+as the pull benchmark, see baseline_store.py); a regression exits with status 1.
+
+The ICE Connect file is written to signal_generator/output as in a real run;
+a file already there for the same date is restored afterwards. The ledger
+used by the prior-week stages lives in a temporary directory.
+
+Examples:
+    python benchmarks/bench_signals.py --quick
+    python benchmarks/bench_signals.py --quick --save-baseline
+    python benchmarks/bench_signals.py --snapshot-dir /tmp/signal_snapshots --repeat 3
+    python benchmarks/bench_signals.py --data-dir full_unfiltered_historicals --date 2025-12-05 --no-memory
+"""
+from datetime import datetime
+from pathlib import Path
+import json
+import logging
+import platform
+import sys
+import tempfile
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / 'signal_generator'))
+
+from baseline_store import DEFAULT_THRESHOLD, profile_key, load_baseline, save_baseline, compare_to_baseline
+from synthetic_snapshot import END_DATE, load_matrix, write_snapshots, build_curve_data
+
+from data_loaders import load_data, prepare_data
+from config import load_config
+from signal_generators import SignalEngine, PointCalculator, ICEChatFormatter
+from reports import ReportGenerator
+from signal_generator.utils.run_metrics import RunMetrics
+from signal_generator.utils.prior_week_checker import check_prior_week_signals
+from signal_generator.utils.signal_ledger import SignalLedger
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline_signals.json'
+OUTPUT_DIR = REPO_ROOT / 'signal_generator' / 'output'
+
+# Full matrix and the quick profile used for routine checks (spreads=None keeps every spread)
+FULL_PROFILE = {'spreads': None, 'weeks': 260}
+QUICK_PROFILE = {'spreads': 2000, 'weeks': 260}
+
+# Loggers of the signal generator packages (one INFO line per step and signal otherwise)
+SIGNAL_LOGGERS = ['data_loaders', 'config', 'signal_generators', 'reports', 'signal_generator']
+
+
+def _signal_count(signals_by_strategy):
+    return sum(len(signals.get('buy_signals', [])) + len(signals.get('sell_signals', []))
+               for signals in signals_by_strategy.values())
+
+
+def run_pipeline(data_dir, data_date, config, curve_data, ledger_path, metrics):
+    """
+    Run the signal pipeline once, recording each stage in metrics.
+    
+    Args:
+        data_dir: Directory with unfiltered_<date>.csv for data_date and the prior Friday
+        data_date: Data date (a Friday)
+        config: Signal configuration (ai_align disabled)
+        curve_data: Curve prices in the load_curve_prices format ({} = fallback prices)
+        ledger_path: Signal ledger file for the prior-week stages (must not exist yet)
+        metrics: RunMetrics collecting the stages
+    
+    Returns:
+        Path of the ICE Connect text file (or None)
+    """
+    with metrics.stage('load_data') as stage:
+        df = load_data(target_date=data_date, data_dir=str(data_dir))
+        if df is None:
+            raise FileNotFoundError(f"No data for {data_date.strftime('%Y-%m-%d')} in {data_dir}")
+        stage['rows'] = len(df)
+    with metrics.stage('prepare_data') as stage:
+        prepared_df = prepare_data(df, target_date=data_date)
+        stage['rows'] = len(prepared_df)
+    
+    signal_engine = SignalEngine(config, PointCalculator(config), metrics=metrics)
+    with metrics.stage('signals') as stage:
+        all_strategy_signals = signal_engine.run(prepared_df, target_date=data_date)
+        stage['signals'] = _signal_count(all_strategy_signals)
+    
+    current_signals = {
+        'trend_following': all_strategy_signals['trend_following'],
+        'mean_reversion': all_strategy_signals['mean_reversion'],
+        'macd_rsi_exhaustion': all_strategy_signals['macd_rsi_exhaustion']
+    }
+    # Empty ledger: the first check recomputes the prior week and records it,
+    # the second reads it back as a later run would
+    ledger = SignalLedger(ledger_path)
+    for name in ('prior_week_recompute', 'prior_week_ledger'):
+        with metrics.stage(name) as stage:
+            stage['checked'] = len(check_prior_week_signals(
+                current_signals=current_signals, data_date=data_date, data_dir=str(data_dir),
+                config=config, ledger=ledger
+            ))
+    
+    with metrics.stage('formatter_init'):
+        ice_chat_formatter = ICEChatFormatter(config, curve_data=curve_data, prepared_df=prepared_df, data_date=data_date)
+    report_generator = ReportGenerator(config)
+    
+    report_signals = dict(
+        trend_signals=all_strategy_signals['trend_following'],
+        enhanced_trend_signals=all_strategy_signals['enhanced_trend_following'],
+        mean_reversion_signals=all_strategy_signals['mean_reversion'],
+        macd_rsi_exhaustion_signals=all_strategy_signals['macd_rsi_exhaustion'],
+        ice_chat_formatter=ice_chat_formatter
+    )
+    with metrics.stage('html_report') as stage:
+        report_path = report_generator.write_report(
+            output_dir=Path(ledger_path).parent, filename='report.html',
+            **report_signals, run_date=datetime.now(), data_date=data_date,
+            total_symbols=prepared_df['ice_connect_symbol'].nunique(), curve_data=curve_data
+        )
+        stage['bytes'] = report_path.stat().st_size
+    with metrics.stage('ice_connect_file') as stage:
+        path = report_generator.generate_ice_connect_text_file(**report_signals, data_date=data_date)
+        cache = ice_chat_formatter.format_cache_stats()
+        stage['format_hits'], stage['format_misses'] = cache['hits'], cache['misses']
+    return path
+
+
+def collect_stages(metrics_runs, memory_run=None):
+    """
+    Combine repeated runs into one entry per stage.
+    
+    Args:
+        metrics_runs: RunMetrics of the timed runs
+        memory_run: Optional RunMetrics of the tracemalloc pass
+    
+    Returns:
+        Dictionary {stage: {'seconds': best time, 'peak_mb', extra fields}}, in completion order
+    """
+    results = {}
+    for metrics in metrics_runs:
+        for entry in metrics.stages:
+            extra = {k: v for k, v in entry.items()
+                     if k not in ('stage', 'seconds', 'thread') and not k.startswith(('rss_', 'traced_'))}
+            current = results.get(entry['stage'])
+            if current is None or entry['seconds'] < current['seconds']:
+                results[entry['stage']] = {'seconds': entry['seconds'], **extra}
+    if memory_run is not None:
+        for entry in memory_run.stages:
+            if entry['stage'] in results and 'traced_peak_mb' in entry:
+                results[entry['stage']]['peak_mb'] = round(entry['traced_peak_mb'], 1)
+    return results
+
+
+def machine_info():
+    """Host description stored with a baseline (timings only compare on the same machine)."""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'pandas': pd.__version__,
+    }
+
+
+def format_results(results, baseline_stages=None):
+    """
+    Results table (one line per stage) for the log.
+    
+    Args:
+        results: {stage: collect_stages entry}
+        baseline_stages: Optional {stage: baseline entry} for the change column
+    
+    Returns:
+        List of lines
+    """
+    lines = [f"{'stage':<40} {'seconds':>9} {'peak MB':>9}  {'details':<28} vs baseline"]
+    for stage, entry in results.items():
+        peak = f"{entry['peak_mb']:.1f}" if entry.get('peak_mb') is not None else '-'
+        details = ', '.join(f"{k}={v:,}" for k, v in entry.items()
+                            if k not in ('seconds', 'peak_mb') and isinstance(v, int))
+        change = ''
+        base = (baseline_stages or {}).get(stage)
+        if base and base.get('seconds'):
+            change = f"{(entry['seconds'] - base['seconds']) / base['seconds']:+.0%} time"
+            if base.get('peak_mb') and entry.get('peak_mb') is not None:
+                change += f", {(entry['peak_mb'] - base['peak_mb']) / base['peak_mb']:+.0%} memory"
+        lines.append(f"{stage:<40} {entry['seconds']:>9.3f} {peak:>9}  {details:<28} {change}")
+    return lines
+
+
+def run_benchmark(data_dir, data_date, curve_data, repeat=1, memory=True):
+    """
+    Run the pipeline repeat times (plus a tracemalloc pass) and collect the stage results.
+    
+    Args:
+        data_dir: Directory with the current and prior-week snapshots
+        data_date: Data date
+        curve_data: Curve prices ({} = fallback prices)
+        repeat: Timed runs; the fastest time per stage is reported
+        memory: Run one extra pass under tracemalloc for the peak per stage
+    
+    Returns:
+        Dictionary {stage: collect_stages entry}
+    """
+    config = load_config()
+    config['ai_align'] = dict(config.get('ai_align', {}), enabled=False)
+    
+    # The ICE Connect file goes to signal_generator/output; keep a file already there for this date
+    ice_connect_path = OUTPUT_DIR / f"ice_connect_signals_{data_date.strftime('%Y-%m-%d')}.txt"
+    previous_file = ice_connect_path.read_bytes() if ice_connect_path.exists() else None
+    
+    runs = []
+    memory_run = None
+    try:
+        with tempfile.TemporaryDirectory(prefix='bench_signals_') as work_dir:
+            for i in range(max(1, repeat)):
+                logger.info(f"Timed run {i + 1}/{max(1, repeat)}...")
+                metrics = RunMetrics()
+                run_pipeline(data_dir, data_date, config, curve_data, Path(work_dir) / f'signal_ledger_{i}.json', metrics)
+                runs.append(metrics)
+            if memory:
+                logger.info("Memory pass (tracemalloc)...")
+                memory_run = RunMetrics(trace_memory=True)
+                try:
+                    run_pipeline(data_dir, data_date, config, curve_data, Path(work_dir) / 'signal_ledger_memory.json', memory_run)
+                finally:
+                    memory_run.stop()
+    finally:
+        if previous_file is not None:
+            ice_connect_path.write_bytes(previous_file)
+        elif ice_connect_path.exists():
+            ice_connect_path.unlink()
+    return collect_stages(runs, memory_run)
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Benchmark the signal generator stages on a synthetic or recorded snapshot (headless)'
+    )
+    parser.add_argument('--quick', action='store_true',
+                        help=f"Synthetic snapshot with {QUICK_PROFILE['spreads']:,} of the matrix spreads")
+    parser.add_argument('--spreads', type=int, default=None, help='Synthetic: spreads kept from the matrix (default: all)')
+    parser.add_argument('--weeks', type=int, default=None, help='Synthetic: weeks of history behind the snapshot')
+    parser.add_argument('--snapshot-dir', type=str, default=None,
+                        help='Synthetic: keep the generated snapshots here and reuse them on later runs')
+    parser.add_argument('--data-dir', type=str, default=None, help='Benchmark recorded snapshots from this directory')
+    parser.add_argument('--date', type=str, default=None, help='Data date YYYY-MM-DD for --data-dir')
+    parser.add_argument('--no-curve', action='store_true', help='No curve data (delta sizing uses fallback prices)')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed runs, fastest per stage reported (default: 1)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--baseline', type=str, default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline for this profile')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Allowed slowdown/growth vs baseline before failing (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--output', type=str, default=None, help='Also write the results to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help='Show signal generator log output')
+    args = parser.parse_args()
+    
+    # force: importing the report modules without openai already configured the root logger
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S', force=True)
+    if not args.verbose:
+        for name in SIGNAL_LOGGERS:
+            logging.getLogger(name).setLevel(logging.ERROR)
+    
+    if args.data_dir:
+        if not args.date:
+            parser.error('--data-dir needs --date')
+        data_date = datetime.strptime(args.date, '%Y-%m-%d')
+        params = {'source': 'recorded', 'date': args.date}
+        curve_data = {} if args.no_curve else build_curve_data(data_date)
+        results = run_benchmark(Path(args.data_dir), data_date, curve_data, repeat=args.repeat, memory=not args.no_memory)
+    else:
+        params = dict(QUICK_PROFILE if args.quick else FULL_PROFILE)
+        for name in ('spreads', 'weeks'):
+            if getattr(args, name) is not None:
+                params[name] = getattr(args, name)
+        params['source'] = 'synthetic'
+        data_date = END_DATE
+        curve_data = {} if args.no_curve else build_curve_data(data_date)
+        
+        with tempfile.TemporaryDirectory(prefix='bench_signals_data_') as temp_dir:
+            snapshot_dir = Path(args.snapshot_dir or temp_dir)
+            if args.snapshot_dir:
+                # Reused snapshots must come from the same profile
+                snapshot_dir = snapshot_dir / profile_key(params).replace(',', '_').replace('=', '-')
+            matrix = load_matrix(spreads=params['spreads'])
+            logger.info(f"Building synthetic snapshots ({len(matrix):,} symbols, {params['weeks']} weeks) in {snapshot_dir}...")
+            write_snapshots(matrix, snapshot_dir, weeks=params['weeks'], snapshots=2, end_date=data_date)
+            results = run_benchmark(snapshot_dir, data_date, curve_data, repeat=args.repeat, memory=not args.no_memory)
+    params['curve'] = 'none' if args.no_curve else 'synthetic'
+    key = profile_key(params)
+    
+    baseline_entry = load_baseline(args.baseline).get('profiles', {}).get(key)
+    baseline_stages = baseline_entry['stages'] if baseline_entry else None
+    for line in format_results(results, baseline_stages):
+        logger.info(line)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'profile': key, 'params': params, 'machine': machine_info(), 'stages': results}, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+    
+    if args.save_baseline:
+        save_baseline(args.baseline, key, params, results, machine_info())
+        logger.info(f"✓ Baseline saved for profile {key} ({args.baseline})")
+        sys.exit(0)
+    
+    if baseline_entry is None:
+        logger.warning(f"No baseline for profile {key} - run with --save-baseline to record one")
+        sys.exit(0)
+    if baseline_entry.get('machine', {}).get('platform') != machine_info()['platform']:
+        logger.warning(f"Baseline was recorded on {baseline_entry['machine'].get('platform')} - timings may not be comparable")
+    
+    regressions = compare_to_baseline(results, baseline_stages, threshold=args.threshold)
+    if not regressions:
+        logger.info(f"✓ No stage regressed by more than {args.threshold:.0%} (baseline {baseline_entry['recorded_at']})")
+        sys.exit(0)
+    for stage, metric, base, current, change in regressions:
+        logger.error(f"✗ {stage} {metric}: {base} -> {current} ({change:+.0%}, threshold {args.threshold:.0%})")
+    sys.exit(1)
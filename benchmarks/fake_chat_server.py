@@ -0,0 +1,192 @@
+"""
+Fake OpenAI chat-completions server for the AI alignment benchmarks
+
+A local HTTP server that answers POST /v1/chat/completions like the OpenAI
+API, so the sync client (get_ai_trade_alignment) and the async dispatcher
+(AIAlignDispatcher) can be exercised without an API key or network access.
+Point them at it with base_url (the openai client also honours the
+OPENAI_BASE_URL environment variable).
+
+Each response is an alignment JSON chosen deterministically from the user
+message, with usage tokens estimated from the message sizes. The server
+counts requests, tracks the highest number handled at once and, with
+requests_per_minute set, answers 429 like the real API when a minute is full.
+
+Usage:
+    import fake_chat_server
+    server = fake_chat_server.start(latency_ms=200, requests_per_minute=500)
+    dispatcher = AIAlignDispatcher(api_key='test', base_url=server.base_url)
+    ...
+    server.stop()
+    
+    python benchmarks/fake_chat_server.py --port 8765 --latency-ms 200
+"""
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import logging
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+LABELS = ["Strongly Agree", "Agree", "Neutral", "Disagree", "Strongly Disagree"]
+
+
+class FakeChatServer(ThreadingHTTPServer):
+    """Threaded HTTP server with the request counters of the fake API."""
+    
+    daemon_threads = True
+    
+    def __init__(self, address, latency_ms=0.0, requests_per_minute=None):
+        """
+        Initialize server.
+        
+        Args:
+            address: (host, port); port 0 picks a free port
+            latency_ms: Simulated model latency per request (milliseconds)
+            requests_per_minute: Answer 429 beyond this many requests per minute (None = no limit)
+        """
+        super().__init__(address, _ChatHandler)
+        self.latency_ms = latency_ms
+        self.requests_per_minute = requests_per_minute
+        self.requests = 0
+        self.rejected = 0
+        self.active = 0
+        self.max_active = 0
+        self.tokens = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    @property
+    def base_url(self):
+        """Base URL for the openai client (http://host:port/v1)."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+    
+    def admit(self):
+        """Count a request; False if it exceeds requests_per_minute."""
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and self._recent[0] <= now - 60.0:
+                self._recent.popleft()
+            if self.requests_per_minute and len(self._recent) >= self.requests_per_minute:
+                self.rejected += 1
+                return False
+            self._recent.append(now)
+            self.requests += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            return True
+    
+    def release(self, tokens):
+        """Finish a request that used this many tokens."""
+        with self._lock:
+            self.active -= 1
+            self.tokens += tokens
+    
+    def stop(self):
+        """Shut the server down and wait for its thread."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    """POST /v1/chat/completions with a deterministic alignment answer."""
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': f'Unknown path {self.path}', 'type': 'invalid_request_error'}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if not self.server.admit():
+            self._send_json(429, {'error': {'message': 'Rate limit reached', 'type': 'requests', 'code': 'rate_limit_exceeded'}},
+                            headers={'retry-after': '1'})
+            return
+        
+        tokens = 0
+        try:
+            if self.server.latency_ms:
+                time.sleep(self.server.latency_ms / 1000.0)
+            messages = request.get('messages', [])
+            user_message = messages[-1].get('content', '') if messages else ''
+            seed = zlib.crc32(user_message.split('\n\n--- ')[0].encode('utf-8'))
+            content = json.dumps({
+                'alignment_label': LABELS[seed % len(LABELS)],
+                'technical_view': 'Fake technical view',
+                'fundamental_view': 'Fake fundamental view',
+                'overall_comment': 'Fake overall comment',
+                'confidence': 50 + seed % 50
+            })
+            prompt_tokens = sum(len(message.get('content', '')) for message in messages) // 4
+            completion_tokens = len(content) // 4
+            tokens = prompt_tokens + completion_tokens
+            self._send_json(200, {
+                'id': f'chatcmpl-fake-{seed:x}',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': request.get('model', 'fake'),
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': content}}],
+                'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                          'total_tokens': tokens}
+            })
+        finally:
+            self.server.release(tokens)
+
+
+def start(latency_ms=0.0, requests_per_minute=None, host='127.0.0.1', port=0):
+    """
+    Start a fake chat-completions server on a background thread.
+    
+    Args:
+        latency_ms: Simulated model latency per request (milliseconds)
+        requests_per_minute: Answer 429 beyond this many requests per minute (None = no limit)
+        host: Bind address
+        port: Port (0 = any free port)
+    
+    Returns:
+        FakeChatServer (base_url for the client, stop() when done)
+    """
+    server = FakeChatServer((host, port), latency_ms=latency_ms, requests_per_minute=requests_per_minute)
+    server._thread = threading.Thread(target=server.serve_forever, name='fake-chat-server', daemon=True)
+    server._thread.start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fake OpenAI chat-completions server')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Simulated latency per request')
+    parser.add_argument('--rpm', type=int, default=None, help='Answer 429 beyond this many requests per minute')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    server = FakeChatServer((args.host, args.port), latency_ms=args.latency_ms, requests_per_minute=args.rpm)
+    logger.info(f"Fake chat completions at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info(f"{server.requests} requests, {server.rejected} rejected, at most {server.max_active} at once")
+        server.server_close()
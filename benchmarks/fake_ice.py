@@ -0,0 +1,150 @@
+"""
+Fake ICE backend for the pull benchmarks
+
+Stands in for icepython (and pythoncom) so pull_ohlc_data.py can be imported
+and its fetch/parse path exercised without ICE XL. get_timeseries returns rows
+shaped like the real API: (date, Open, High, Low, Close, Recent Settlement),
+one per week, with the current week's Close still empty (Recent Settlement
+only), as ICE returns it before the weekly settle.
+
+Prices are deterministic per symbol (seeded from the symbol string), so two
+benchmark runs fetch exactly the same data.
+
+Usage:
+    import fake_ice
+    backend = fake_ice.install(latency_ms=0)   # before importing pull_ohlc_data
+    import pull_ohlc_data
+"""
+import sys
+import time
+import types
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+class FakeIceBackend:
+    """Deterministic weekly OHLC for any symbol (random walk per symbol)."""
+    
+    def __init__(self, latency_ms=0.0, open_week=True, base_prices=None):
+        """
+        Initialize backend.
+        
+        Args:
+            latency_ms: Simulated API latency per get_timeseries call (milliseconds)
+            open_week: Leave Close empty on the last row (incomplete week, Recent Settlement only)
+            base_prices: Optional {symbol_root: typical price}, e.g. {'AFE': 500.0, 'CL': 70.0}
+        """
+        self.latency_ms = latency_ms
+        self.open_week = open_week
+        self.base_prices = base_prices or {}
+        self.calls = 0
+        self.rows_returned = 0
+    
+    def _base_price(self, symbol):
+        root = symbol.lstrip('%').split(' ')[0]
+        return self.base_prices.get(root, 1.0)
+    
+    def ohlc_arrays(self, symbol, n):
+        """
+        Weekly open/high/low/close for a symbol (the values get_timeseries returns).
+        
+        Args:
+            symbol: ICE symbol
+            n: Number of weeks
+        
+        Returns:
+            Tuple of four float ndarrays (open, high, low, close), oldest week first
+        """
+        rng = np.random.default_rng(zlib.crc32(symbol.encode('utf-8')))
+        close = self._base_price(symbol) * (0.8 + 0.4 * rng.random()) * np.exp(np.cumsum(rng.normal(0, 0.03, n)))
+        open_ = close * np.exp(rng.normal(0, 0.01, n))
+        high = np.maximum(open_, close) * (1 + 0.02 * rng.random(n))
+        low = np.minimum(open_, close) * (1 - 0.02 * rng.random(n))
+        return open_, high, low, close
+    
+    def get_timeseries(self, symbols, fields, granularity, start, end):
+        """
+        Weekly rows for the first symbol (same call shape as icepython.get_timeseries).
+        
+        Args:
+            symbols: List with one ICE symbol
+            fields: Requested fields (values are returned in this order after the date)
+            granularity: Ignored (always weekly)
+            start: Start date 'YYYY-MM-DD'
+            end: End date 'YYYY-MM-DD'
+        
+        Returns:
+            Tuple of row tuples (date_str, value per field)
+        """
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        
+        dates = pd.date_range(start, end, freq='W-FRI')
+        n = len(dates)
+        if n == 0:
+            return ()
+        
+        open_, high, low, close = self.ohlc_arrays(symbols[0], n)
+        values = {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Recent Settlement': close}
+        
+        date_strings = dates.strftime('%Y-%m-%d')
+        columns = [values.get(field, close).round(6).tolist() for field in fields]
+        rows = []
+        for i in range(n):
+            rows.append((date_strings[i],) + tuple(column[i] for column in columns))
+        if self.open_week and 'Close' in fields:
+            last = list(rows[-1])
+            last[1 + list(fields).index('Close')] = None
+            rows[-1] = tuple(last)
+        
+        self.rows_returned += n
+        return tuple(rows)
+    
+    def start_publisher(self):
+        pass
+    
+    def get_hibernation(self):
+        return False
+    
+    def set_timeout(self, seconds):
+        pass
+
+
+def install(latency_ms=0.0, open_week=True, base_prices=None):
+    """
+    Register the fake backend as icepython (and a pythoncom shim if pythoncom is missing).
+    
+    Call before importing pull_ohlc_data; if it was already imported, its ice
+    reference is replaced as well, so benchmarks never reach a real ICE session.
+    
+    Args:
+        latency_ms: Simulated API latency per call (milliseconds)
+        open_week: Leave Close empty on the last row
+        base_prices: Optional {symbol_root: typical price}
+    
+    Returns:
+        FakeIceBackend
+    """
+    backend = FakeIceBackend(latency_ms=latency_ms, open_week=open_week, base_prices=base_prices)
+    
+    module = types.ModuleType('icepython')
+    module.get_timeseries = backend.get_timeseries
+    module.start_publisher = backend.start_publisher
+    module.get_hibernation = backend.get_hibernation
+    module.set_timeout = backend.set_timeout
+    sys.modules['icepython'] = module
+    
+    try:
+        import pythoncom  # The real COM module is harmless here
+    except ImportError:
+        shim = types.ModuleType('pythoncom')
+        shim.CoInitialize = lambda: None
+        shim.CoUninitialize = lambda: None
+        sys.modules['pythoncom'] = shim
+    
+    if 'pull_ohlc_data' in sys.modules:
+        sys.modules['pull_ohlc_data'].ice = module
+    return backend
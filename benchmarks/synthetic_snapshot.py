@@ -0,0 +1,272 @@
+"""
+Synthetic unfiltered_<date>.csv snapshots for the signal-side benchmarks
+
+Builds weekly OHLC for every series of a symbol matrix (the real
+lists_and_matrix/symbol_matrix.csv by default, so ICEChatFormatter and the
+report resolve the same metadata they do in production) from the fake ICE
+backend, derives quarterlies and spreads as the pull does, runs the panel
+indicator engine over the history and writes the last weeks as snapshot
+files in the pull's layout (ice_connect_symbol formulas, *_price columns,
+correlation/cointegration columns on spreads).
+
+Cointegration values are random (no statsmodels needed); correlation is the
+52-week correlation of the leg closes.
+
+Usage:
+    matrix = load_matrix(spreads=300)
+    paths = write_snapshots(matrix, 'tmp_snapshots', snapshots=2)
+    curve_data = build_curve_data(datetime(2025, 12, 5))
+"""
+from datetime import datetime
+from pathlib import Path
+import json
+
+import numpy as np
+import pandas as pd
+
+from fake_ice import FakeIceBackend
+from synthetic_universe import ROOTS, base_prices
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MATRIX = REPO_ROOT / 'lists_and_matrix' / 'symbol_matrix.csv'
+DEFAULT_INDICATOR_CONFIG = REPO_ROOT / 'study_settings' / 'indicator_config.json'
+END_DATE = datetime(2025, 12, 5)
+
+CURVE_MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def load_matrix(path=DEFAULT_MATRIX, spreads=None, seed=0):
+    """
+    Read a symbol matrix, optionally keeping a random subset of spreads.
+    
+    Args:
+        path: symbol_matrix.csv path
+        spreads: Spreads to keep (None = all)
+        seed: Random seed for the subset
+    
+    Returns:
+        DataFrame (read with keep_default_na=False, as the pull does)
+    """
+    matrix = pd.read_csv(path, keep_default_na=False)
+    if spreads is None:
+        return matrix
+    spread_rows = matrix[matrix['spread_type'] == 'spread']
+    if spreads < len(spread_rows):
+        spread_rows = spread_rows.sample(n=spreads, random_state=seed).sort_index()
+    return pd.concat([matrix[matrix['spread_type'] != 'spread'], spread_rows])
+
+
+def _divisor(conversion):
+    """Numeric divisor of a convert_to_$usg value ('/521' -> 521.0, 'n/a' -> 1.0)."""
+    if conversion and conversion.startswith('/'):
+        try:
+            return float(conversion[1:])
+        except ValueError:
+            return 1.0
+    return 1.0
+
+
+def build_ohlc_arrays(matrix, weeks=260, backend=None):
+    """
+    OHLC for every series of the matrix (outrights converted to $/usg).
+    
+    Args:
+        matrix: Symbol matrix DataFrame
+        weeks: Weekly bars per series
+        backend: FakeIceBackend (default: one priced like the production roots)
+    
+    Returns:
+        Tuple of (arrays, quarterly_keys): {ice_symbol: (4, weeks) ndarray of
+        open/high/low/close} and {quarterly formula without conversion: ice_symbol}
+        for resolving spread legs
+    """
+    backend = backend or FakeIceBackend(base_prices=base_prices(ROOTS))
+    rows = matrix.to_dict('records')
+    arrays = {}
+    for row in rows:
+        if row['spread_type'] == 'outright' and row['quarter_numb'] == 'N':
+            values = np.vstack(backend.ohlc_arrays(row['ice_symbol'], weeks))
+            arrays[row['ice_symbol']] = values / _divisor(row['convert_to_$usg'])
+    
+    # Quarterlies: mean open/close of the legs, widest high/low (as calculate_quarterly_ohlc)
+    quarterly_keys = {}  # spread symbol_1/symbol_2 form (formula without conversion) -> ice_symbol
+    for row in rows:
+        if row['spread_type'] != 'outright' or row['quarter_numb'] != 'Y':
+            continue
+        legs = [arrays[s.strip()] for s in row['component_symbols'].split(',') if s.strip() in arrays]
+        if not legs:
+            continue
+        stacked = np.stack(legs)
+        arrays[row['ice_symbol']] = np.vstack([
+            stacked[:, 0].mean(axis=0), stacked[:, 1].max(axis=0),
+            stacked[:, 2].min(axis=0), stacked[:, 3].mean(axis=0)
+        ])
+        conversion = row['convert_to_$usg']
+        formula = row['ice_symbol']
+        if conversion.startswith('/') and formula.endswith(conversion):
+            formula = formula[:-len(conversion)]
+        quarterly_keys[formula] = row['ice_symbol']
+    
+    # Spreads: high = high_1 - low_2, low = low_1 - high_2 (as calculate_spread_ohlc)
+    for row in rows:
+        if row['spread_type'] != 'spread':
+            continue
+        leg_1 = arrays.get(quarterly_keys.get(row['symbol_1'], row['symbol_1']))
+        leg_2 = arrays.get(quarterly_keys.get(row['symbol_2'], row['symbol_2']))
+        if leg_1 is None or leg_2 is None:
+            continue
+        arrays[row['ice_symbol']] = np.vstack([
+            leg_1[0] - leg_2[0], leg_1[1] - leg_2[2], leg_1[2] - leg_2[1], leg_1[3] - leg_2[3]
+        ])
+    return arrays, quarterly_keys
+
+
+def _symbol_metadata(rows):
+    """ice_connect_symbol/spread_name/symbol_a/symbol_b/is_outright per ice_symbol (as the pull builds them)."""
+    metadata = {}
+    for row in rows:
+        ice_symbol = row['ice_symbol']
+        is_outright = row['spread_type'] == 'outright'
+        if is_outright and row['quarter_numb'] == 'N':
+            conversion = row['convert_to_$usg']
+            formula = f"=('{ice_symbol}')" + (conversion if conversion not in ('n/a', '') else '')
+        else:
+            formula = ice_symbol
+        metadata[ice_symbol] = (formula, row['symbol_1'], row['symbol_2'], is_outright)
+    return metadata
+
+
+def build_snapshot_frames(matrix, config, weeks=260, snapshots=2, end_date=END_DATE, plan=None, seed=0):
+    """
+    Snapshot rows (pull output layout) for the last weeks of a synthetic history.
+    
+    Args:
+        matrix: Symbol matrix DataFrame
+        config: Indicator configuration dictionary
+        weeks: Weeks of history behind the latest snapshot
+        snapshots: Number of weekly snapshots
+        end_date: Latest snapshot date (a Friday)
+        plan: Optional IndicatorPlan (None = every indicator column)
+        seed: Random seed for the cointegration columns
+    
+    Returns:
+        Dictionary {snapshot date: DataFrame}, latest first
+    """
+    from panel_indicators import PanelIndicatorEngine, DEFAULT_CHUNK_SIZE
+    
+    arrays, quarterly_keys = build_ohlc_arrays(matrix, weeks=weeks)
+    dates = pd.date_range(end=end_date, periods=weeks, freq='W-FRI')
+    frames = {
+        key: pd.DataFrame({'open': values[0], 'high': values[1], 'low': values[2], 'close': values[3]},
+                          index=pd.Index(dates, name='Date'))
+        for key, values in arrays.items()
+    }
+    engine_config = config.get('indicator_engine', {})
+    panel = PanelIndicatorEngine(
+        config, plan=plan, chunk_size=engine_config.get('chunk_size', DEFAULT_CHUNK_SIZE)
+    ).compute(frames)
+    
+    rows = matrix.to_dict('records')
+    metadata = _symbol_metadata(rows)
+    legs = {row['ice_symbol']: (quarterly_keys.get(row['symbol_1'], row['symbol_1']),
+                                quarterly_keys.get(row['symbol_2'], row['symbol_2']))
+            for row in rows if row['spread_type'] == 'spread'}
+    
+    rng = np.random.default_rng(seed)
+    result = {}
+    for offset in range(snapshots):
+        position = weeks - 1 - offset
+        date = dates[position]
+        indicators = panel.snapshot(date)
+        keys = list(indicators.index)
+        ohlc = np.stack([arrays[key][:, position] for key in keys])
+        meta = [metadata[key] for key in keys]
+        
+        df = pd.DataFrame({
+            'Date': date.strftime('%Y-%m-%d'),
+            'ice_connect_symbol': [m[0] for m in meta],
+            'spread_name': [m[0] for m in meta],
+            'symbol_a': [m[1] for m in meta],
+            'symbol_b': [m[2] for m in meta],
+            'is_outright': [m[3] for m in meta],
+            'data_points': position + 1,
+            'open_price': ohlc[:, 0],
+            'high_price': ohlc[:, 1],
+            'low_price': ohlc[:, 2],
+            'close_price': ohlc[:, 3],
+        })
+        df = pd.concat([df, indicators.reset_index(drop=True)], axis=1)
+        
+        # Spread statistics: 52-week correlation of the leg closes, random cointegration
+        correlation = np.full(len(keys), np.nan)
+        window = slice(max(0, position - 51), position + 1)
+        for i, key in enumerate(keys):
+            pair = legs.get(key)
+            if pair is None or pair[0] not in arrays or pair[1] not in arrays:
+                continue
+            correlation[i] = np.corrcoef(arrays[pair[0]][3, window], arrays[pair[1]][3, window])[0, 1]
+        is_spread = ~df['is_outright'].to_numpy(dtype=bool)
+        pvalues = np.where(is_spread, rng.random(len(keys)), np.nan)
+        df['correlation_52w'] = correlation
+        df['cointegration_pvalue'] = pvalues
+        df['cointegration_statistic'] = np.where(is_spread, rng.normal(-2.5, 1.0, len(keys)), np.nan)
+        df['is_cointegrated'] = is_spread & (np.nan_to_num(pvalues, nan=1.0) < 0.05)
+        result[date] = df.sort_values('ice_connect_symbol', ignore_index=True)
+    return result
+
+
+def write_snapshots(matrix, output_dir, config=None, weeks=260, snapshots=2, end_date=END_DATE, plan=None):
+    """
+    Write unfiltered_<date>.csv files for the latest weeks (reuses files that already exist).
+    
+    Args:
+        matrix: Symbol matrix DataFrame
+        output_dir: Directory for the CSV files
+        config: Indicator configuration (default: study_settings/indicator_config.json)
+        weeks: Weeks of history behind the latest snapshot
+        snapshots: Number of weekly snapshots
+        end_date: Latest snapshot date
+        plan: Optional IndicatorPlan (None = every indicator column)
+    
+    Returns:
+        List of snapshot paths, latest first
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dates = pd.date_range(end=end_date, periods=snapshots, freq='W-FRI')[::-1]
+    paths = [output_dir / f"unfiltered_{date.strftime('%Y-%m-%d')}.csv" for date in dates]
+    if all(path.exists() for path in paths):
+        return paths
+    
+    if config is None:
+        with open(DEFAULT_INDICATOR_CONFIG, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    frames = build_snapshot_frames(matrix, config, weeks=weeks, snapshots=snapshots, end_date=end_date, plan=plan)
+    for path, date in zip(paths, dates):
+        frames[date].to_csv(path, index=False)
+    return paths
+
+
+def build_curve_data(data_date, months=24, seed=0):
+    """
+    Forward curve in the load_curve_prices format for the production roots.
+    
+    Args:
+        data_date: Data date; the curve starts with the following month
+        months: Months per root
+        seed: Random seed for the curve shape
+    
+    Returns:
+        Dictionary {root_code: {'Jan_26': price, ...}}
+    """
+    rng = np.random.default_rng(seed)
+    curve = {}
+    for root, price in base_prices(ROOTS).items():
+        level = price * 100 if price < 10 else price  # $/usg roots in cpg
+        points = {}
+        for i in range(months):
+            month_index = data_date.month + i  # 0-based index of the month after data_date, plus i
+            label = f"{CURVE_MONTHS[month_index % 12]}_{str(data_date.year + month_index // 12)[-2:]}"
+            points[label] = round(level * (1 + 0.01 * rng.normal()), 4)
+        curve[root] = points
+    return curve
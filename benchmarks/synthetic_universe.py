@@ -0,0 +1,162 @@
+"""
+Synthetic symbol universe shaped like lists_and_matrix/symbol_matrix.csv
+
+Same columns and formula conventions as the real matrix (monthly outrights,
+quarterly outright formulas with the $/usg conversion appended, monthly and
+quarterly spreads with symbol_1/symbol_2 metadata), so the pull stages see the
+same lookups they do in production. The default size matches the production
+matrix: 11 roots x 12 months = 132 monthly + 44 quarterly outrights, 13,002
+monthly and 946 quarterly spreads.
+
+Usage:
+    matrix = build_symbol_matrix()                     # production-sized
+    matrix = build_symbol_matrix(roots=3, spreads=300)  # quick profile
+"""
+import numpy as np
+import pandas as pd
+
+# (symbol_root, product, location, molecule, native_uom, convert_to_$usg, ICE suffix, typical price)
+ROOTS = [
+    ('PRL', 'PROPANE', 'MT BELVIEU LST', 'C3', '$/usg', 'n/a', '-IEU', 0.75),
+    ('PRN', 'PROPANE', 'MT BELVIEU NON-LST', 'C3', '$/usg', 'n/a', '-IEU', 0.75),
+    ('PRC', 'PROPANE', 'CONWAY', 'C3', '$/usg', 'n/a', '-IEU', 0.70),
+    ('NBI', 'NORMAL BUTANE', 'MT BELVIEU NON-LST', 'NC4', '$/usg', 'n/a', '-IEU', 0.95),
+    ('IBC', 'ISOBUTANE', 'MT BELVIEU NON-LST', 'IC4', '$/usg', 'n/a', '-IEU', 1.00),
+    ('NGE', 'NATURAL GASOLINE', 'MT BELVIEU NON-LST', 'C5', '$/usg', 'n/a', '-IEU', 1.40),
+    ('ISO', 'ISOBUTANE', 'MT BELVIEU LST', 'IC4', '$/usg', 'n/a', '-IEU', 1.05),
+    ('AFE', 'PROPANE', 'FAR EAST', 'C3', '$/mt', '/521', '-IEU', 550.0),
+    ('CL', 'CRUDE OIL', 'CUSHING', 'CL', '$/bbl', '/42', '', 70.0),
+    ('XRB', 'RBOB GASOLINE', 'NEW YORK HARBOR', 'RB', '$/usg', 'n/a', '', 2.00),
+    ('HO', 'HEATING OIL', 'NEW YORK HARBOR', 'HO', '$/usg', 'n/a', '', 2.30),
+]
+
+MONTH_CODES = ['F', 'G', 'H', 'J', 'K', 'M', 'N', 'Q', 'U', 'V', 'X', 'Z']
+MONTH_NAMES = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+COLUMNS = [
+    'ice_symbol', 'symbol_root', 'product', 'location', 'molecule', 'native_uom', 'convert_to_$usg',
+    'quarter_numb', 'quarter_pos', 'component_months', 'component_months_names', 'component_symbols',
+    'symbol_1', 'symbol_2', 'symbol_root_2', 'product_2', 'location_2', 'molecule_2', 'native_uom_2',
+    'convert_to_$usg_2', 'quarter_numb_2', 'quarter_pos_2', 'component_months_2',
+    'component_months_names_2', 'component_symbols_2', 'spread_type'
+]
+
+LEG_COLUMNS = ['symbol_root', 'product', 'location', 'molecule', 'native_uom', 'convert_to_$usg',
+               'quarter_numb', 'quarter_pos', 'component_months', 'component_months_names', 'component_symbols']
+
+
+def make_roots(count):
+    """
+    Root definitions for a universe of count roots.
+    
+    Uses the production roots first, then synthetic $/usg roots (R12, R13, ...).
+    
+    Args:
+        count: Number of roots
+    
+    Returns:
+        List of root tuples (see ROOTS)
+    """
+    roots = list(ROOTS[:count])
+    for i in range(len(roots), count):
+        roots.append((f'R{i + 1}', 'SYNTHETIC', 'SYNTHETIC', 'SYN', '$/usg', 'n/a', '-IEU', 1.0))
+    return roots
+
+
+def base_prices(roots):
+    """Typical price per root, for FakeIceBackend(base_prices=...)."""
+    return {root[0]: root[7] for root in roots}
+
+
+def _conversion_suffix(conversion):
+    return '' if conversion in ('n/a', '') else conversion
+
+
+def _monthly_rows(roots, months):
+    rows = []
+    for root, product, location, molecule, uom, conversion, suffix, _ in roots:
+        for m in range(months):
+            rows.append({
+                'ice_symbol': f'%{root} {MONTH_CODES[m]}!{suffix}',
+                'symbol_root': root, 'product': product, 'location': location, 'molecule': molecule,
+                'native_uom': uom, 'convert_to_$usg': conversion, 'quarter_numb': 'N', 'quarter_pos': 'n/a',
+                'component_months': MONTH_CODES[m], 'component_months_names': MONTH_NAMES[m],
+                'component_symbols': 'n/a', 'spread_type': 'outright'
+            })
+    return rows
+
+
+def _quarterly_rows(roots, months):
+    rows = []
+    for root, product, location, molecule, uom, conversion, suffix, _ in roots:
+        for q in range(months // 3):
+            legs = [f'%{root} {MONTH_CODES[m]}!{suffix}' for m in range(3 * q, 3 * q + 3)]
+            formula = '=(' + '(' + '+'.join(f"('{leg}')" for leg in legs) + ')/3)'
+            rows.append({
+                # Quarterly outrights are stored with the conversion appended (as in the matrix)
+                'ice_symbol': formula + _conversion_suffix(conversion),
+                'formula': formula,
+                'symbol_root': root, 'product': product, 'location': location, 'molecule': molecule,
+                'native_uom': uom, 'convert_to_$usg': conversion, 'quarter_numb': 'Y', 'quarter_pos': f'{q + 1}Q',
+                'component_months': MONTH_CODES[3 * q], 'component_months_names': MONTH_NAMES[3 * q],
+                'component_symbols': ','.join(legs), 'spread_type': 'outright'
+            })
+    return rows
+
+
+def _leg_term(leg):
+    """Spread formula term for one leg, e.g. ('%AFE F!-IEU')/521."""
+    if leg['quarter_numb'] == 'Y':
+        return leg['formula'].lstrip('=') + _conversion_suffix(leg['convert_to_$usg'])
+    return f"('{leg['ice_symbol']}')" + _conversion_suffix(leg['convert_to_$usg'])
+
+
+def _spread_rows(legs, count, rng):
+    """count spreads over ordered pairs of legs (shuffled, without repeats)."""
+    n = len(legs)
+    pair_count = n * (n - 1)
+    if count > pair_count:
+        count = pair_count
+    picks = rng.choice(pair_count, size=count, replace=False) if count else []
+    rows = []
+    for pick in sorted(int(p) for p in picks):
+        i, j = divmod(pick, n - 1)
+        if j >= i:
+            j += 1
+        leg_1, leg_2 = legs[i], legs[j]
+        row = {'ice_symbol': '=' + _leg_term(leg_1) + '-' + _leg_term(leg_2), 'spread_type': 'spread'}
+        for column in LEG_COLUMNS:
+            row[column] = leg_1[column]
+            row[f'{column}_2'] = leg_2[column]
+        # symbol_1/symbol_2 hold the outright symbol, or the quarterly formula without conversion
+        row['symbol_1'] = leg_1.get('formula', leg_1['ice_symbol'])
+        row['symbol_2'] = leg_2.get('formula', leg_2['ice_symbol'])
+        rows.append(row)
+    return rows
+
+
+def build_symbol_matrix(roots=11, months=12, spreads=13002, quarterly_spreads=946, seed=0):
+    """
+    Build a symbol matrix DataFrame with the columns of symbol_matrix.csv.
+    
+    Args:
+        roots: Number of symbol roots (production: 11)
+        months: Contract months per root (production: 12; quarterlies need multiples of 3)
+        spreads: Monthly spreads (capped at the number of ordered outright pairs)
+        quarterly_spreads: Quarterly spreads (capped at the number of ordered quarterly pairs)
+        seed: Random seed for the spread pair selection
+    
+    Returns:
+        DataFrame (all values strings, 'n/a'/'' for missing, as read with keep_default_na=False)
+    """
+    root_defs = make_roots(roots)
+    rng = np.random.default_rng(seed)
+    monthly = _monthly_rows(root_defs, months)
+    quarterly = _quarterly_rows(root_defs, months)
+    
+    rows = monthly + quarterly
+    rows += _spread_rows(monthly, spreads, rng)
+    rows += _spread_rows(quarterly, quarterly_spreads, rng)
+    
+    matrix = pd.DataFrame(rows).reindex(columns=COLUMNS)
+    return matrix.fillna('').astype(str)
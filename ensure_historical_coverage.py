@@ -101,6 +101,7 @@ except Exception as e:
 try:
     logger.info("Importing pull_all_ohlc_data...")
     from pull_ohlc_data import pull_all_ohlc_data
+    from snapshot_store import delete_snapshot_sidecars
     logger.info("Successfully imported pull_all_ohlc_data")
 except Exception as e:
     error_msg = f"Failed to import pull_all_ohlc_data: {e}"
@@ -469,6 +470,7 @@ def ensure_historical_coverage(
             for date, file_path in files_to_delete:
                 try:
                     file_path.unlink()
+                    delete_snapshot_sidecars(output_dir, date.strftime('%Y-%m-%d'))
                     stats['deleted_files'].append(date.strftime('%Y-%m-%d'))
                     logger.info(f"Deleted: {file_path.name}")
                 except Exception as e:
@@ -0,0 +1,248 @@
+"""
+Content-addressed on-disk cache for calculate_technical_indicators results
+
+Each entry is keyed by a SHA-256 of:
+- the series' OHLC input (dates + open/high/low/close values)
+- the indicator_config.json sub-trees of the families being computed
+- the planned columns (None = full mode)
+- the indicator engine (indicator_engine.mode, batch_kernels.enabled)
+- the indicator code version (source hash of the calculation + pandas_ta version)
+
+so a rerun on the same Friday only recomputes series whose inputs changed.
+Entries are stored as compressed .npz files (one array per column, no pickling)
+and evicted least-recently-used once the cache exceeds its size budget.
+"""
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from indicator_plan import INDICATOR_FAMILIES, config_subtree, hash_config_subtree
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = 'cache/indicators'
+DEFAULT_MAX_SIZE_MB = 2048
+
+OHLC_COLUMNS = ['open', 'high', 'low', 'close']
+
+
+def _normalize_ohlc(df):
+    """Return the OHLC frame sorted by a Date index, as calculate_technical_indicators sees it."""
+    frame = df
+    if 'Date' in frame.columns:
+        frame = frame.set_index('Date')
+    return frame.sort_index()
+
+
+def engine_settings(config):
+    """Indicator engine switches that decide which implementation computes a series."""
+    return {
+        'mode': config.get('indicator_engine', {}).get('mode', 'per_series'),
+        'batch_kernels': bool(config.get('batch_kernels', {}).get('enabled', False)),
+    }
+
+
+class IndicatorCache:
+    """
+    Size-bounded, content-addressed cache of indicator DataFrames.
+    
+    Usage:
+        cache = IndicatorCache('cache/indicators', max_size_mb=2048, code_version=...)
+        result = cache.get_or_compute(df, config, plan, lambda: calculate_technical_indicators(...))
+        cache.evict()
+    """
+    
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size_mb=DEFAULT_MAX_SIZE_MB, code_version=''):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory for .npz entries (created if missing)
+            max_size_mb: Size budget enforced by evict()
+            code_version: String identifying the indicator code; changing it invalidates all entries
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.code_version = code_version
+        self.hits = 0
+        self.misses = 0
+        self.write_errors = 0
+        self._config_key_memo = {}
+    
+    def _config_key(self, config, plan):
+        """Hash the config sub-trees, columns and engine the plan depends on (memoized per plan contents)."""
+        engine = engine_settings(config)
+        memo_key = (
+            None if plan is None else (tuple(sorted(plan.families)), tuple(sorted(plan.columns))),
+            engine['mode'],
+            engine['batch_kernels'],
+        )
+        if memo_key in self._config_key_memo:
+            return self._config_key_memo[memo_key]
+        
+        families = [f for f in INDICATOR_FAMILIES if plan is None or plan.wants(f)]
+        payload = {
+            'families': {
+                family: hash_config_subtree(config_subtree(config, INDICATOR_FAMILIES[family]['config_path']))
+                for family in families
+            },
+            'columns': None if plan is None else sorted(plan.columns),
+            'engine': engine,
+            'code_version': self.code_version,
+        }
+        key = hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+        self._config_key_memo[memo_key] = key
+        return key
+    
+    def make_key(self, df, config, plan=None):
+        """
+        Build the content address for one series.
+        
+        Args:
+            df: OHLC DataFrame (Date index or column)
+            config: Indicator configuration dictionary
+            plan: IndicatorPlan or None (full mode)
+        
+        Returns:
+            Hex digest string, or None if the frame cannot be hashed
+        """
+        frame = _normalize_ohlc(df)
+        if not all(col in frame.columns for col in OHLC_COLUMNS):
+            return None
+        
+        hasher = hashlib.sha256()
+        hasher.update(self._config_key(config, plan).encode('ascii'))
+        hasher.update(pd.to_datetime(frame.index).values.astype('datetime64[ns]').view('int64').tobytes())
+        hasher.update(np.ascontiguousarray(frame[OHLC_COLUMNS].to_numpy(dtype='float64')).tobytes())
+        return hasher.hexdigest()
+    
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.npz"
+    
+    def contains(self, key):
+        """Return True if an entry exists for key (does not count as a hit)."""
+        return key is not None and self._entry_path(key).exists()
+    
+    def load(self, key):
+        """
+        Load a cached result.
+        
+        Args:
+            key: Content address from make_key
+        
+        Returns:
+            DataFrame with Date index, or None on miss
+        """
+        path = self._entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                columns = [str(c) for c in data['__columns__']]
+                index = pd.DatetimeIndex(data['__index__'], name=str(data['__index_name__']))
+                frame = pd.DataFrame({col: data[f"c{i}"] for i, col in enumerate(columns)}, index=index)
+            # Touch for LRU ordering
+            os.utime(path, None)
+            return frame
+        except Exception as e:
+            logger.debug(f"Indicator cache entry unreadable ({path.name}): {e}")
+            return None
+    
+    def store(self, key, frame):
+        """
+        Store a result frame. Frames with non-numeric columns are not cached.
+        
+        Args:
+            key: Content address from make_key
+            frame: DataFrame returned by calculate_technical_indicators
+        """
+        if frame is None or len(frame) == 0:
+            return
+        if any(dtype == object for dtype in frame.dtypes):
+            return
+        
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {f"c{i}": frame[col].to_numpy() for i, col in enumerate(frame.columns)}
+        arrays['__columns__'] = np.array([str(c) for c in frame.columns])
+        arrays['__index__'] = pd.to_datetime(frame.index).values
+        arrays['__index_name__'] = np.array(frame.index.name or 'Date')
+        tmp_path = path.with_name(path.stem + '.tmp.npz')
+        try:
+            np.savez_compressed(tmp_path, **arrays)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.write_errors += 1
+            logger.debug(f"Could not write indicator cache entry {path.name}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+    
+    def get_or_compute(self, df, config, plan, compute):
+        """
+        Return cached indicators for df, computing and storing them on a miss.
+        
+        Args:
+            df: OHLC DataFrame
+            config: Indicator configuration dictionary
+            plan: IndicatorPlan or None (full mode)
+            compute: Zero-argument callable returning the indicator DataFrame
+        
+        Returns:
+            Indicator DataFrame
+        """
+        key = self.make_key(df, config, plan) if df is not None and len(df) > 0 else None
+        if key is not None:
+            cached = self.load(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+        
+        self.misses += 1
+        result = compute()
+        if key is not None:
+            self.store(key, result)
+        return result
+    
+    def evict(self):
+        """
+        Delete least-recently-used entries until the cache fits max_size_mb.
+        
+        Returns:
+            Tuple (entries_removed, bytes_after)
+        """
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob('*/*.npz'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        
+        removed = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+                if total <= self.max_bytes:
+                    break
+        return removed, total
+    
+    def summary(self):
+        """Return a one-line hit/miss summary for logging."""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups else 0.0
+        return f"{self.hits} hits / {self.misses} misses ({hit_rate:.1f}% hit rate)"
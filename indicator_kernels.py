@@ -0,0 +1,446 @@
+"""
+Batch kernels for path-dependent indicators over many series at once
+
+pandas_ta evaluates SuperTrend, ADX, Aroon and Parabolic SAR one series at a
+time, looping over bars in Python (and EMA/RMA, and the RSI/MACD built on them,
+one series at a time through pandas' ewm). These kernels run the same
+recurrences on 2D float arrays shaped (bars x series): a single loop over time,
+vectorized across every series.
+
+Series are packed left-aligned (row i = i-th bar of each series, trailing NaN
+padding for shorter series), so every recurrence sees exactly the bars the
+per-series pandas_ta call would see. tests/test_indicator_kernels.py compares
+ewm_mean, rma, ema, atr, adx, rsi and macd with fixed reference values (see
+tests/pandas_ta_reference.py for where they come from). Only the native
+pandas_ta code paths are mirrored (rma smoothing via adjusted EWM); an
+installed TA-Lib switches pandas_ta's ATR/Aroon to TA-Lib instead.
+
+Raw outputs follow pandas_ta's columns (ADX_14/DMP_14/DMN_14,
+SUPERT/SUPERTd, AROONU/AROOND, PSARl/PSARs/PSARaf/PSARr); mapping them to the
+snapshot column names is done by the caller (pull_ohlc_data.py).
+"""
+import sys
+
+import numpy as np
+
+EPSILON = sys.float_info.epsilon
+
+
+def pack_series(frames, columns=('high', 'low', 'close')):
+    """
+    Pack per-series OHLC frames into left-aligned 2D arrays
+    
+    Args:
+        frames: Dictionary {key: DataFrame with Date index or column and the requested columns}
+        columns: Columns to pack
+    
+    Returns:
+        Tuple (keys, lengths, arrays) where arrays is {column: ndarray (max_len x n_series)}
+        and lengths[j] is the number of bars of series keys[j]. Frames are sorted by date
+        first, matching calculate_technical_indicators.
+    """
+    keys = []
+    lengths = []
+    values = {col: [] for col in columns}
+    for key, df in frames.items():
+        if df is None or len(df) == 0:
+            continue
+        frame = df.set_index('Date') if 'Date' in df.columns else df
+        frame = frame.sort_index()
+        if not all(col in frame.columns for col in columns):
+            continue
+        keys.append(key)
+        lengths.append(len(frame))
+        for col in columns:
+            values[col].append(frame[col].to_numpy(dtype='float64'))
+    
+    lengths = np.array(lengths, dtype='int64')
+    max_len = int(lengths.max()) if len(lengths) else 0
+    arrays = {}
+    for col in columns:
+        packed = np.full((max_len, len(keys)), np.nan)
+        for j, series_values in enumerate(values[col]):
+            packed[:len(series_values), j] = series_values
+        arrays[col] = packed
+    return keys, lengths, arrays
+
+
+def unpack_series(array, lengths):
+    """
+    Split a packed (bars x series) array back into one 1D array per series
+    
+    Args:
+        array: ndarray (max_len x n_series)
+        lengths: Bars per series (from pack_series)
+    
+    Returns:
+        List of 1D arrays
+    """
+    return [array[:length, j] for j, length in enumerate(lengths)]
+
+
+def shift_rows(x, periods=1):
+    """Shift a (bars x series) array down by `periods` rows, filling with NaN."""
+    result = np.full_like(x, np.nan)
+    if periods < len(x):
+        result[periods:] = x[:-periods]
+    return result
+
+
+def ewm_mean(x, alpha, adjust=True, min_periods=0):
+    """
+    pandas ewm(alpha=alpha, adjust=adjust, min_periods=min_periods).mean() with ignore_na=False
+    
+    Follows pandas' update order exactly (weights decay on every bar once the average
+    has started, NaN observations are skipped, an observation equal to the running
+    average leaves it untouched), so results match pandas bit for bit and ties in
+    later comparisons (percentiles) resolve the same way.
+    
+    Args:
+        x: ndarray (bars x series)
+        alpha: Smoothing factor
+        adjust: pandas `adjust` flag
+        min_periods: Valid observations required before output
+    
+    Returns:
+        ndarray (bars x series)
+    """
+    factor = 1.0 - alpha
+    new_weight = 1.0 if adjust else alpha
+    bars, n_series = x.shape
+    out = np.full_like(x, np.nan)
+    weighted = np.full(n_series, np.nan)
+    old_weight = np.ones(n_series)
+    observations = np.zeros(n_series, dtype='int64')
+    min_periods = max(min_periods, 1)
+    with np.errstate(invalid='ignore'):
+        for t in range(bars):
+            current = x[t]
+            is_observation = ~np.isnan(current)
+            observations += is_observation
+            started = ~np.isnan(weighted)
+            old_weight = np.where(started, old_weight * factor, old_weight)
+            update = started & is_observation
+            blended = (old_weight * weighted + new_weight * current) / (old_weight + new_weight)
+            weighted = np.where(update & (weighted != current), blended, weighted)
+            if adjust:
+                old_weight = np.where(update, old_weight + new_weight, old_weight)
+            else:
+                old_weight = np.where(update, 1.0, old_weight)
+            weighted = np.where(~started & is_observation, current, weighted)
+            out[t] = np.where(observations >= min_periods, weighted, np.nan)
+    return out
+
+
+def rma(x, length):
+    """
+    Wilder's moving average as pandas_ta computes it: ewm(alpha=1/length, min_periods=length).mean()
+    
+    Args:
+        x: ndarray (bars x series)
+        length: Smoothing length
+    
+    Returns:
+        ndarray (bars x series)
+    """
+    return ewm_mean(x, 1.0 / length, adjust=True, min_periods=length)
+
+
+def ema(x, length):
+    """
+    pandas_ta ema (sma=True seeding): SMA of the first `length` valid values, then ewm(span=length, adjust=False)
+    
+    Each series is seeded at its own first valid row, so a packed series with leading
+    NaN (e.g. the MACD line feeding the signal EMA) behaves like pandas_ta called on
+    macd.loc[macd.first_valid_index():]. Series with fewer than `length` valid values
+    come back all NaN.
+    
+    Args:
+        x: ndarray (bars x series)
+        length: EMA span
+    
+    Returns:
+        ndarray (bars x series)
+    """
+    bars, n_series = x.shape
+    if bars < length:
+        return np.full_like(x, np.nan)
+    
+    valid = ~np.isnan(x)
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), bars)
+    seed_row = first + length - 1
+    seeded = np.flatnonzero(seed_row < bars)
+    
+    seeded_x = np.full_like(x, np.nan)
+    if len(seeded):
+        rows = first[seeded][None, :] + np.arange(length)[:, None]
+        # Sum along a contiguous axis, like pandas' Series.sum (pairwise summation)
+        seed = np.ascontiguousarray(x[rows, seeded[None, :]].T).sum(axis=1) / length
+        keep = np.arange(bars)[:, None] > seed_row[None, :]
+        seeded_x = np.where(keep, x, np.nan)
+        seeded_x[seed_row[seeded], seeded] = seed
+    return ewm_mean(seeded_x, 2.0 / (length + 1), adjust=False)
+
+
+def true_range(high, low, close, lengths=None):
+    """
+    pandas_ta true_range: max(|high-low|, |high-prev_close|, |prev_close-low|), first bar NaN
+    
+    Args:
+        high, low, close: ndarrays (bars x series)
+        lengths: Optional bars per series; restricts the zero-range epsilon check to real bars
+    
+    Returns:
+        ndarray (bars x series)
+    """
+    high_low = high - low
+    # pandas_ta non_zero_range: if any bar has a zero range, add epsilon to the whole series
+    zero_range = (high_low == 0)
+    if lengths is not None:
+        zero_range &= np.arange(len(high))[:, None] < lengths[None, :]
+    high_low = high_low + np.where(zero_range.any(axis=0), EPSILON, 0.0)
+    
+    prev_close = shift_rows(close, 1)
+    tr = np.fmax(np.fmax(np.abs(high_low), np.abs(high - prev_close)), np.abs(prev_close - low))
+    tr[:1] = np.nan
+    return tr
+
+
+def atr(high, low, close, length, lengths=None):
+    """pandas_ta atr (mamode='rma'): rma of true range."""
+    return rma(true_range(high, low, close, lengths), length)
+
+
+def adx(high, low, close, length=14, lensig=None, scalar=100.0, lengths=None):
+    """
+    pandas_ta adx
+    
+    Args:
+        high, low, close: ndarrays (bars x series)
+        length: DI smoothing length
+        lensig: ADX smoothing length (default: length)
+        scalar: Output scale (default 100)
+        lengths: Optional bars per series
+    
+    Returns:
+        Dictionary {'adx', 'dmp', 'dmn'} of ndarrays (bars x series)
+    """
+    lensig = lensig or length
+    atr_ = atr(high, low, close, length, lengths)
+    
+    up = high - shift_rows(high, 1)
+    dn = shift_rows(low, 1) - low
+    with np.errstate(invalid='ignore'):
+        pos = ((up > dn) & (up > 0)) * up
+        neg = ((dn > up) & (dn > 0)) * dn
+    pos = np.where(np.abs(pos) < EPSILON, 0.0, pos)
+    neg = np.where(np.abs(neg) < EPSILON, 0.0, neg)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        k = scalar / atr_
+        dmp = k * rma(pos, length)
+        dmn = k * rma(neg, length)
+        dx = scalar * np.abs(dmp - dmn) / (dmp + dmn)
+    dx = np.where(np.isinf(dx), np.nan, dx)
+    return {'adx': rma(dx, lensig), 'dmp': dmp, 'dmn': dmn}
+
+
+def rsi(close, length=14, scalar=100.0):
+    """
+    pandas_ta rsi (mamode='rma'): scalar * rma(gains) / (rma(gains) + |rma(losses)|)
+    
+    Args:
+        close: ndarray (bars x series)
+        length: RSI period
+        scalar: Output scale (default 100)
+    
+    Returns:
+        ndarray (bars x series)
+    """
+    change = close - shift_rows(close, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        positive_avg = rma(np.where(change < 0, 0.0, change), length)
+        negative_avg = rma(np.where(change > 0, 0.0, change), length)
+        return scalar * positive_avg / (positive_avg + np.abs(negative_avg))
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """
+    pandas_ta macd: ema(fast) - ema(slow), signal EMA seeded at the line's first valid bar
+    
+    Args:
+        close: ndarray (bars x series)
+        fast: Fast EMA span
+        slow: Slow EMA span
+        signal: Signal EMA span
+    
+    Returns:
+        Dictionary {'macd', 'signal', 'histogram'} of ndarrays (bars x series)
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return {'macd': line, 'signal': signal_line, 'histogram': line - signal_line}
+
+
+def supertrend(high, low, close, length=7, multiplier=3.0, lengths=None):
+    """
+    pandas_ta supertrend
+    
+    Args:
+        high, low, close: ndarrays (bars x series)
+        length: ATR length
+        multiplier: ATR multiplier
+        lengths: Optional bars per series
+    
+    Returns:
+        Dictionary {'trend', 'direction', 'long', 'short'} of ndarrays (bars x series)
+    """
+    hl2 = (high + low) / 2
+    matr = multiplier * atr(high, low, close, length, lengths)
+    upperband = hl2 + matr
+    lowerband = hl2 - matr
+    
+    bars, n_series = close.shape
+    direction = np.ones((bars, n_series))
+    trend = np.full((bars, n_series), np.nan)
+    long = np.full((bars, n_series), np.nan)
+    short = np.full((bars, n_series), np.nan)
+    if bars:
+        trend[0] = 0.0
+    
+    with np.errstate(invalid='ignore'):
+        for i in range(1, bars):
+            breaks_up = close[i] > upperband[i - 1]
+            breaks_down = close[i] < lowerband[i - 1]
+            carry = ~breaks_up & ~breaks_down
+            direction[i] = np.where(breaks_up, 1.0, np.where(breaks_down, -1.0, direction[i - 1]))
+            
+            # Ratchet the active band while the trend continues
+            hold_lower = carry & (direction[i] > 0) & (lowerband[i] < lowerband[i - 1])
+            hold_upper = carry & (direction[i] < 0) & (upperband[i] > upperband[i - 1])
+            lowerband[i] = np.where(hold_lower, lowerband[i - 1], lowerband[i])
+            upperband[i] = np.where(hold_upper, upperband[i - 1], upperband[i])
+            
+            is_long = direction[i] > 0
+            trend[i] = np.where(is_long, lowerband[i], upperband[i])
+            long[i] = np.where(is_long, lowerband[i], np.nan)
+            short[i] = np.where(is_long, np.nan, upperband[i])
+    
+    return {'trend': trend, 'direction': direction, 'long': long, 'short': short}
+
+
+def aroon(high, low, length=14, scalar=100.0):
+    """
+    pandas_ta aroon: bars since the most recent high/low within a (length + 1) window
+    
+    Args:
+        high, low: ndarrays (bars x series)
+        length: Aroon period
+        scalar: Output scale (default 100)
+    
+    Returns:
+        Dictionary {'up', 'down', 'osc'} of ndarrays (bars x series)
+    """
+    window = length + 1
+    bars, n_series = high.shape
+    up = np.full((bars, n_series), np.nan)
+    down = np.full((bars, n_series), np.nan)
+    if bars >= window:
+        def periods_since_extreme(x, use_max):
+            # (bars-window+1, series, window) view; reversed so argmax/argmin finds the most recent extreme
+            windows = np.lib.stride_tricks.sliding_window_view(np.nan_to_num(x, nan=0.0), window, axis=0)[..., ::-1]
+            idx = np.argmax(windows, axis=-1) if use_max else np.argmin(windows, axis=-1)
+            # Any NaN in the window -> NaN (pandas rolling min_periods = window)
+            nan_count = np.cumsum(np.vstack([np.zeros((1, n_series)), np.isnan(x)]), axis=0)
+            has_nan = (nan_count[window:] - nan_count[:-window]) > 0
+            return np.where(has_nan, np.nan, idx.astype('float64'))
+        
+        up[window - 1:] = scalar * (1 - periods_since_extreme(high, True) / length)
+        down[window - 1:] = scalar * (1 - periods_since_extreme(low, False) / length)
+    return {'up': up, 'down': down, 'osc': up - down}
+
+
+def psar(high, low, close=None, af0=0.02, af=None, max_af=0.2, lengths=None):
+    """
+    pandas_ta psar (Parabolic SAR)
+    
+    Reproduces pandas_ta's seeding: the initial trend is falling if the second bar's
+    -DM is positive, the SAR starts at the first close (or extreme when no close), and
+    the two-bar lookback on the second bar wraps to the series' last bar.
+    
+    Args:
+        high, low: ndarrays (bars x series)
+        close: Optional ndarray (bars x series)
+        af0: Initial/step acceleration factor
+        af: Starting acceleration factor (default af0)
+        max_af: Maximum acceleration factor
+        lengths: Bars per series (default: all rows)
+    
+    Returns:
+        Dictionary {'long', 'short', 'af', 'reversal'} of ndarrays (bars x series)
+    """
+    af = af if af and af > 0 else af0
+    bars, n_series = high.shape
+    if lengths is None:
+        lengths = np.full(n_series, bars, dtype='int64')
+    columns = np.arange(n_series)
+    
+    long = np.full((bars, n_series), np.nan)
+    short = np.full((bars, n_series), np.nan)
+    af_out = np.full((bars, n_series), np.nan)
+    reversal = np.zeros((bars, n_series))
+    if bars == 0:
+        return {'long': long, 'short': short, 'af': af_out, 'reversal': reversal}
+    
+    # Initial direction from the second bar's -DM
+    if bars >= 2:
+        up = high[1] - high[0]
+        dn = low[0] - low[1]
+        with np.errstate(invalid='ignore'):
+            dmn = ((dn > up) & (dn > 0)) * dn
+            falling = (np.where(np.abs(dmn) < EPSILON, 0.0, dmn) > 0) & (lengths >= 2)
+    else:
+        falling = np.zeros(n_series, dtype=bool)
+    
+    sar = np.where(falling, high[0], low[0]) if close is None else close[0].copy()
+    ep = np.where(falling, low[0], high[0])
+    af_cur = np.full(n_series, float(af))
+    af_out[:2] = af0
+    
+    # pandas_ta reads high.iloc[row - 2] on row 1, i.e. the series' last bar
+    last_row = np.maximum(lengths - 1, 0)
+    last_high = high[last_row, columns]
+    last_low = low[last_row, columns]
+    
+    with np.errstate(invalid='ignore'):
+        for row in range(1, bars):
+            high_, low_ = high[row], low[row]
+            prev2_high = last_high if row == 1 else high[row - 2]
+            prev2_low = last_low if row == 1 else low[row - 2]
+            
+            candidate = sar + af_cur * (ep - sar)
+            reverse = np.where(falling, high_ > candidate, low_ < candidate)
+            
+            new_extreme = np.where(falling, low_ < ep, high_ > ep)
+            ep = np.where(new_extreme, np.where(falling, low_, high_), ep)
+            af_cur = np.where(new_extreme, np.minimum(af_cur + af0, max_af), af_cur)
+            
+            candidate = np.where(
+                falling,
+                np.maximum(np.maximum(high[row - 1], prev2_high), candidate),
+                np.minimum(np.minimum(low[row - 1], prev2_low), candidate)
+            )
+            
+            candidate = np.where(reverse, ep, candidate)
+            af_cur = np.where(reverse, af0, af_cur)
+            falling = np.where(reverse, ~falling, falling)
+            ep = np.where(reverse, np.where(falling, low_, high_), ep)
+            
+            sar = candidate
+            short[row] = np.where(falling, sar, np.nan)
+            long[row] = np.where(falling, np.nan, sar)
+            af_out[row] = af_cur
+            reversal[row] = reverse.astype('float64')
+    
+    return {'long': long, 'short': short, 'af': af_out, 'reversal': reversal}
+
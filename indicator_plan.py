@@ -0,0 +1,529 @@
+"""
+Indicator dependency graph and computation plans for calculate_technical_indicators
+
+Maps every indicator family computed in pull_ohlc_data.py to:
+- the indicator_config.json sub-tree that parameterises it
+- the output columns it produces
+- the other families it reads from (e.g. Markov needs EMAs, ADX, MACD and RSI)
+
+A plan is the closed set of families/columns needed to satisfy a list of
+requested columns. In "plan" mode the pull derives that list from what the
+signal generator actually consumes (signal_settings.json strategies,
+confluence bonuses and exhaustion penalties, plus the columns the data
+loader validates). "full" mode computes every family for research exports.
+"""
+from pathlib import Path
+import fnmatch
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIGNAL_SETTINGS_FILE = 'signal_generator/config/signal_settings.json'
+
+INDICATOR_MODES = ('full', 'plan')
+
+# Family -> config sub-tree path and family dependencies.
+# Order matters: it is the order calculate_technical_indicators computes them.
+INDICATOR_FAMILIES = {
+    'ema': {'config_path': ('moving_averages',), 'depends_on': []},
+    'adx': {'config_path': ('trend_indicators', 'adx'), 'depends_on': []},
+    'supertrend': {'config_path': ('trend_indicators', 'supertrend'), 'depends_on': []},
+    'parabolic_sar': {'config_path': ('trend_indicators', 'parabolic_sar'), 'depends_on': []},
+    'macd': {'config_path': ('momentum_indicators', 'macd'), 'depends_on': []},
+    'rsi': {'config_path': ('momentum_indicators', 'rsi'), 'depends_on': []},
+    'stochastic': {'config_path': ('momentum_indicators', 'stochastic'), 'depends_on': []},
+    'roc': {'config_path': ('momentum_indicators', 'roc'), 'depends_on': []},
+    'cci': {'config_path': ('oscillators', 'cci'), 'depends_on': []},
+    'williams_r': {'config_path': ('oscillators', 'williams_r'), 'depends_on': []},
+    'aroon': {'config_path': ('aroon',), 'depends_on': []},
+    'bollinger': {'config_path': ('volatility', 'bollinger_bands'), 'depends_on': []},
+    'atr': {'config_path': ('volatility', 'atr'), 'depends_on': []},
+    'historical_volatility': {'config_path': ('volatility', 'historical_volatility'), 'depends_on': []},
+    'zscore': {'config_path': ('statistical', 'zscore'), 'depends_on': []},
+    'coefficient_of_variation': {'config_path': ('statistical', 'coefficient_of_variation'), 'depends_on': []},
+    'percentiles': {'config_path': ('statistical', 'percentiles'), 'depends_on': ['rsi', 'macd']},
+    'markov': {'config_path': ('markov_model',), 'depends_on': ['ema', 'adx', 'macd', 'rsi']},
+}
+
+# Source column for each percentile indicator listed in statistical.percentiles.indicators
+PERCENTILE_COLUMNS = {
+    'close': 'percentile_close',
+    'rsi': 'rsi_percentile',
+    'macd_line': 'macd_line_percentile',
+    'macd_signal': 'macd_signal_percentile',
+    'macd_histogram': 'macd_histogram_percentile',
+}
+
+# Columns always consumed by the signal generator regardless of strategy
+# (data_loader.prepare_data validation, stop/target and position sizing)
+SIGNAL_BASE_COLUMNS = [
+    'atr', 'atr_pct_of_price', 'macd_line', 'macd_signal', 'rsi', 'percentile_close'
+]
+
+# Entry conditions per strategy (detect_entry_condition)
+STRATEGY_ENTRY_COLUMNS = {
+    'trend_following': ['macd_line', 'macd_signal'],
+    'mean_reversion': ['percentile_close'],
+    'macd_rsi_exhaustion': ['macd_line', 'macd_signal', 'macd_line_percentile', 'rsi', 'rsi_percentile'],
+    'moving_average': ['ema_20'],
+}
+
+# Enhanced trend following entry triggers (entry_triggers.enabled)
+ENTRY_TRIGGER_COLUMNS = {
+    'ema_crossover': [],  # fast/slow EMA come from the trigger config
+    'supertrend': ['supertrend_direction'],
+    'macd_cross': ['macd_line', 'macd_signal'],
+    'aroon_strong': ['aroon_oscillator', 'aroon_strong_uptrend', 'aroon_strong_downtrend'],
+}
+
+# Enhanced trend following confirmations (confirmations.*)
+CONFIRMATION_COLUMNS = {
+    'adx_strong': ['adx'],
+    'di_alignment': ['di_plus', 'di_minus'],
+    'rsi_aligned': ['rsi'],
+    'macd_histogram_aligned': ['macd_histogram'],
+    'stochastic_aligned': ['stoch_k', 'stoch_d'],
+}
+
+# PointCalculator confluence checks (confluence_bonuses.*). Spread-only checks
+# (correlation/cointegration) read columns added outside the indicator pass.
+CONFLUENCE_COLUMNS = {
+    'rsi_aligned': ['rsi'],
+    'stochastic_aligned': ['stoch_k'],
+    'cci_aligned': ['cci'],
+    'adx_strong': ['adx'],
+    'adx_very_strong': ['adx'],
+    'bollinger_aligned': ['bb_upper', 'bb_lower'],
+    'bollinger_extreme': ['bb_upper', 'bb_lower'],
+    'correlation_high': [],
+    'cointegration': [],
+    'rsi_percentile_aligned': ['rsi_percentile'],
+    'macd_reversal': ['macd_histogram'],
+    'di_alignment': ['di_plus', 'di_minus'],
+    'macd_histogram_aligned': ['macd_histogram'],
+    'ema_50_aligned': ['ema_50'],
+    'ema_100_aligned': ['ema_100'],
+    'ema_200_aligned': ['ema_200'],
+    'both_indicators_exhausted': [],
+}
+
+# PointCalculator trend exhaustion penalties (trend_exhaustion_penalty.penalties.*)
+PENALTY_COLUMNS = {
+    'rsi_extreme': ['rsi'],
+    'price_distance_from_ema': [],  # EMA comes from penalty config ema_column
+    'bollinger_extreme': ['bb_upper', 'bb_lower'],
+}
+
+
+def family_columns(family, config):
+    """
+    List the output columns produced by an indicator family for a given config
+    
+    Args:
+        family: Family name (key of INDICATOR_FAMILIES)
+        config: Indicator configuration dictionary
+    
+    Returns:
+        List of output column names
+    """
+    if family == 'ema':
+        return [f'ema_{period}' for period in config['moving_averages']['ema_periods']]
+    if family == 'adx':
+        return ['adx', 'di_plus', 'di_minus']
+    if family == 'supertrend':
+        return ['supertrend_value', 'supertrend_direction']
+    if family == 'parabolic_sar':
+        return ['parabolic_sar', 'psar_direction', 'psar_af', 'psar_reversal']
+    if family == 'macd':
+        return ['macd_line', 'macd_signal', 'macd_histogram']
+    if family == 'rsi':
+        return ['rsi', 'rsi_overbought', 'rsi_oversold']
+    if family == 'stochastic':
+        return ['stoch_k', 'stoch_d', 'stoch_overbought', 'stoch_oversold']
+    if family == 'roc':
+        return [
+            'roc' if period == 1 else f'roc_{period}w'
+            for period in config['momentum_indicators']['roc']['periods']
+        ]
+    if family == 'cci':
+        return ['cci', 'cci_overbought', 'cci_oversold']
+    if family == 'williams_r':
+        return ['williams_r', 'williams_r_overbought', 'williams_r_oversold']
+    if family == 'aroon':
+        return ['aroon_up', 'aroon_down', 'aroon_oscillator', 'aroon_strong_uptrend', 'aroon_strong_downtrend']
+    if family == 'bollinger':
+        return ['bb_upper', 'bb_middle', 'bb_lower', 'bb_width_pct']
+    if family == 'atr':
+        return ['atr', 'atr_pct_of_price']
+    if family == 'historical_volatility':
+        return ['historical_volatility_20w']
+    if family == 'zscore':
+        return ['zscore']
+    if family == 'coefficient_of_variation':
+        return ['coefficient_of_variation']
+    if family == 'percentiles':
+        return [
+            PERCENTILE_COLUMNS[indicator]
+            for indicator in config['statistical']['percentiles']['indicators']
+            if indicator in PERCENTILE_COLUMNS
+        ]
+    if family == 'markov':
+        return ['markov_state'] + [f'markov_prob_state_{state}' for state in range(1, 5)]
+    raise ValueError(f"Unknown indicator family: {family}")
+
+
+def build_column_index(config):
+    """
+    Map every indicator output column to the family that produces it
+    
+    Args:
+        config: Indicator configuration dictionary
+    
+    Returns:
+        Dictionary {column_name: family}
+    """
+    column_index = {}
+    for family in INDICATOR_FAMILIES:
+        for column in family_columns(family, config):
+            column_index[column] = family
+    return column_index
+
+
+def column_dependencies(column, config):
+    """
+    List the indicator columns a column reads from (one level deep)
+    
+    Args:
+        column: Output column name
+        config: Indicator configuration dictionary
+    
+    Returns:
+        List of column names the column depends on
+    """
+    if column == 'rsi_percentile':
+        return ['rsi']
+    if column in ('macd_line_percentile', 'macd_signal_percentile', 'macd_histogram_percentile'):
+        return [column[:-len('_percentile')]]
+    if column.startswith('markov_'):
+        state_config = config['markov_model']['state_classification']
+        return ['adx', 'macd_line', 'rsi'] + [
+            f"ema_{state_config[key]}" for key in ('ema_short', 'ema_medium', 'ema_long')
+        ]
+    return []
+
+
+class IndicatorPlan:
+    """
+    Resolved set of indicator families and columns to compute for one pull.
+    
+    A plan of None (see build_indicator_plan) means "full": compute everything.
+    """
+    
+    def __init__(self, families, columns, mode='plan'):
+        self.mode = mode
+        self.families = set(families)
+        self.columns = set(columns)
+    
+    def wants(self, family):
+        """Return True if any column of the family is in the plan."""
+        return family in self.families
+    
+    def wants_column(self, column):
+        """Return True if the column itself is in the plan."""
+        return column in self.columns
+    
+    def describe(self, config):
+        """
+        Summarise the plan for logging
+        
+        Args:
+            config: Indicator configuration dictionary
+        
+        Returns:
+            String like "9/17 families, 31/62 columns (skipped: williams_r, zscore, ...)"
+        """
+        all_columns = build_column_index(config)
+        skipped = [family for family in INDICATOR_FAMILIES if family not in self.families]
+        return (
+            f"{len(self.families)}/{len(INDICATOR_FAMILIES)} families, "
+            f"{len(self.columns)}/{len(all_columns)} columns"
+            + (f" (skipped: {', '.join(skipped)})" if skipped else "")
+        )
+
+
+def resolve_indicator_plan(requested_columns, config):
+    """
+    Close a list of requested columns over the dependency graph
+    
+    Requested entries may be exact column names (e.g. 'bb_upper'), glob
+    patterns (e.g. 'bb_*') or family names (e.g. 'bollinger', which selects
+    every column of the family). Names that are both a column and a family
+    ('rsi', 'cci') resolve to the column. Unknown entries are logged and ignored.
+    
+    Args:
+        requested_columns: Iterable of columns, patterns or family names
+        config: Indicator configuration dictionary
+    
+    Returns:
+        IndicatorPlan with every family/column needed to produce the request
+    """
+    column_index = build_column_index(config)
+    pending = []
+    for entry in requested_columns:
+        # Exact columns win over family names ('rsi' and 'cci' are both)
+        if entry in column_index:
+            pending.append(entry)
+        elif entry in INDICATOR_FAMILIES:
+            pending.extend(family_columns(entry, config))
+        else:
+            matches = fnmatch.filter(column_index.keys(), entry)
+            if matches:
+                pending.extend(matches)
+            else:
+                logger.debug(f"Indicator plan: '{entry}' is not an indicator column (ignored)")
+    
+    columns = set()
+    while pending:
+        column = pending.pop()
+        if column in columns or column not in column_index:
+            continue
+        columns.add(column)
+        pending.extend(column_dependencies(column, config))
+    
+    families = {column_index[column] for column in columns}
+    return IndicatorPlan(families, columns)
+
+
+def load_signal_settings(signal_settings_file=DEFAULT_SIGNAL_SETTINGS_FILE):
+    """
+    Load signal_settings.json for plan derivation
+    
+    Args:
+        signal_settings_file: Path to the signal generator configuration JSON
+    
+    Returns:
+        Dictionary with signal settings, or None if the file cannot be read
+    """
+    settings_path = Path(signal_settings_file)
+    if not settings_path.exists():
+        logger.warning(f"Signal settings not found: {signal_settings_file}. Indicator plan falls back to full mode.")
+        return None
+    try:
+        with open(settings_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load signal settings {signal_settings_file}: {e}. Indicator plan falls back to full mode.")
+        return None
+
+
+def columns_required_by_signals(signal_config):
+    """
+    Derive the indicator columns consumed by the signal generator
+    
+    Walks the strategies section of signal_settings.json: entry conditions,
+    enabled entry triggers, confirmations, confluence bonuses and trend
+    exhaustion penalties.
+    
+    Args:
+        signal_config: Signal settings dictionary (signal_settings.json)
+    
+    Returns:
+        Set of indicator column names
+    """
+    required = set(SIGNAL_BASE_COLUMNS)
+    
+    for strategy_name, strategy in signal_config.get('strategies', {}).items():
+        if not isinstance(strategy, dict):
+            continue
+        required.update(STRATEGY_ENTRY_COLUMNS.get(strategy_name, []))
+        
+        # Enhanced trend following triggers and confirmations
+        entry_triggers = strategy.get('entry_triggers', {})
+        for trigger_name, enabled in entry_triggers.get('enabled', {}).items():
+            if enabled is True:
+                required.update(ENTRY_TRIGGER_COLUMNS.get(trigger_name, []))
+                if trigger_name == 'ema_crossover':
+                    ema_config = entry_triggers.get('ema_crossover', {})
+                    required.add(ema_config.get('fast_ema', 'ema_20'))
+                    required.add(ema_config.get('slow_ema', 'ema_50'))
+        
+        confirmations = strategy.get('confirmations', {})
+        if confirmations:
+            for name in confirmations.get('required', {}):
+                required.update(CONFIRMATION_COLUMNS.get(name, []))
+            for name, enabled in confirmations.get('momentum_indicators', {}).items():
+                if enabled is True:
+                    required.update(CONFIRMATION_COLUMNS.get(name, []))
+        
+        for bonus_name, bonus in strategy.get('confluence_bonuses', {}).items():
+            if isinstance(bonus, dict):
+                required.update(CONFLUENCE_COLUMNS.get(bonus_name, []))
+        
+        penalty_config = strategy.get('trend_exhaustion_penalty', {})
+        if penalty_config.get('enabled', False):
+            for penalty_name, penalty in penalty_config.get('penalties', {}).items():
+                required.update(PENALTY_COLUMNS.get(penalty_name, []))
+                if penalty_name == 'price_distance_from_ema':
+                    required.add(penalty.get('ema_column', 'ema_50'))
+    
+    return required
+
+
+def build_indicator_plan(config, mode=None, extra_columns=None, signal_settings_file=None):
+    """
+    Build the indicator plan for a pull
+    
+    Mode and extras come from the arguments or, when not given, from the
+    optional "indicator_plan" section of indicator_config.json:
+        
+        "indicator_plan": {"mode": "plan", "extra_columns": ["zscore"],
+                           "signal_settings_file": "signal_generator/config/signal_settings.json"}
+    
+    Args:
+        config: Indicator configuration dictionary
+        mode: 'full' (compute everything) or 'plan' (signal-driven subset)
+        extra_columns: Additional columns/patterns/families to always compute
+        signal_settings_file: Path to signal_settings.json
+    
+    Returns:
+        IndicatorPlan, or None for full mode
+    """
+    plan_config = config.get('indicator_plan', {})
+    mode = mode or plan_config.get('mode', 'full')
+    if mode not in INDICATOR_MODES:
+        raise ValueError(f"Unknown indicator mode '{mode}'. Expected one of {INDICATOR_MODES}")
+    if mode == 'full':
+        return None
+    
+    signal_settings_file = (
+        signal_settings_file
+        or plan_config.get('signal_settings_file')
+        or DEFAULT_SIGNAL_SETTINGS_FILE
+    )
+    signal_config = load_signal_settings(signal_settings_file)
+    if signal_config is None:
+        return None
+    
+    requested = columns_required_by_signals(signal_config)
+    requested.update(plan_config.get('extra_columns', []))
+    requested.update(extra_columns or [])
+    
+    plan = resolve_indicator_plan(requested, config)
+    logger.info(f"Indicator plan: {plan.describe(config)}")
+    return plan
+
+
+def config_subtree(config, config_path):
+    """
+    Return the config section at config_path
+    
+    Args:
+        config: Indicator configuration dictionary
+        config_path: Tuple of keys (see INDICATOR_FAMILIES)
+    
+    Returns:
+        Config section, or None if any key is missing
+    """
+    node = config
+    for key in config_path:
+        if not isinstance(node, dict) or key not in node:
+            return None
+        node = node[key]
+    return node
+
+
+def hash_config_subtree(subtree):
+    """Hash a config section, ignoring 'comment' keys."""
+    def strip(node):
+        if isinstance(node, dict):
+            return {k: strip(v) for k, v in node.items() if k != 'comment'}
+        if isinstance(node, list):
+            return [strip(v) for v in node]
+        return node
+    payload = json.dumps(strip(subtree), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def build_column_lineage(config, plan=None, code_version=''):
+    """
+    Record which config sub-tree produced which output columns
+    
+    Args:
+        config: Indicator configuration dictionary
+        plan: IndicatorPlan or None (full mode)
+        code_version: Indicator code version string
+    
+    Returns:
+        Dictionary {'mode', 'code_version', 'families': {family: {config_path, config_hash, config, columns}}}
+    """
+    families = {}
+    for family, spec in INDICATOR_FAMILIES.items():
+        if plan is not None and not plan.wants(family):
+            continue
+        columns = family_columns(family, config)
+        if plan is not None and family in ('ema', 'roc', 'percentiles'):
+            # These families are filtered column by column
+            columns = [col for col in columns if plan.wants_column(col)]
+        subtree = config_subtree(config, spec['config_path'])
+        families[family] = {
+            'config_path': list(spec['config_path']),
+            'config_hash': hash_config_subtree(subtree),
+            'config': subtree,
+            'columns': columns,
+        }
+    return {
+        'mode': 'full' if plan is None else plan.mode,
+        'code_version': code_version,
+        'families': families,
+    }
+
+
+def find_stale_columns(lineage, config):
+    """
+    List output columns whose config sub-tree changed since the snapshot was written
+    
+    Args:
+        lineage: Lineage dictionary from build_column_lineage (as stored)
+        config: Current indicator configuration dictionary
+    
+    Returns:
+        Sorted list of stale column names
+    """
+    stale = set()
+    for family, entry in lineage.get('families', {}).items():
+        if family not in INDICATOR_FAMILIES:
+            continue
+        current_hash = hash_config_subtree(config_subtree(config, INDICATOR_FAMILIES[family]['config_path']))
+        if current_hash != entry.get('config_hash'):
+            stale.update(entry.get('columns', []))
+    return sorted(stale)
+
+
+def expand_with_dependents(columns, config):
+    """
+    Add every column that is derived from the given columns
+    
+    Recomputing macd_line invalidates macd_line_percentile and the Markov
+    columns, so those must be rewritten too.
+    
+    Args:
+        columns: Iterable of output column names
+        config: Indicator configuration dictionary
+    
+    Returns:
+        Set of columns including downstream dependents
+    """
+    column_index = build_column_index(config)
+    result = set(columns)
+    changed = True
+    while changed:
+        changed = False
+        for column in column_index:
+            if column in result:
+                continue
+            if any(dep in result for dep in column_dependencies(column, config)):
+                result.add(column)
+                changed = True
+    return result
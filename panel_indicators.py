@@ -0,0 +1,625 @@
+"""
+Panel-wide indicator engine: every series' indicators computed column-wise
+
+calculate_technical_indicators (pull_ohlc_data.py) works one series at a time
+through pandas_ta, and its percentile and Markov steps loop over rows in
+Python. PanelIndicatorEngine produces the same output columns for all
+outrights, quarterlies and spreads at once, on left-aligned (bars x series)
+arrays (packed like indicator_kernels.pack_series):
+
+- EMA, RMA-based indicators (RSI, ATR, ADX), SuperTrend, Parabolic SAR:
+  recursive filters in indicator_kernels, one loop over bars for all series
+- SMA, rolling std/max/min, CCI mean deviation, Aroon: strided window views
+- Percentiles: lagged comparisons over the lookback window
+- Markov transition probabilities: cumulative transition counts
+
+calculate_technical_indicators remains the reference implementation;
+verify_panel_indicators.py compares the two column by column.
+
+Notes:
+- Series with NaN in their OHLC are not computed here (PanelIndicatorResult.skipped);
+  callers fall back to the per-series reference for them.
+- Only pandas_ta's native code paths are mirrored. With TA-Lib installed pandas_ta
+  uses TA-Lib for several indicators and small differences are possible.
+- MACD: a series with fewer than slow + signal - 1 bars gets a NaN signal line and
+  histogram (pandas_ta cannot seed the signal EMA there).
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+import indicator_kernels
+from indicator_plan import PERCENTILE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+OHLC_COLUMNS = ('open', 'high', 'low', 'close')
+DEFAULT_CHUNK_SIZE = 1000
+
+# Columns the reference produces as integers (comparison flags / pandas_ta int outputs)
+INT_COLUMNS = {
+    'supertrend_direction', 'psar_reversal',
+    'rsi_overbought', 'rsi_oversold',
+    'stoch_overbought', 'stoch_oversold',
+    'cci_overbought', 'cci_oversold',
+    'williams_r_overbought', 'williams_r_oversold',
+    'aroon_strong_uptrend', 'aroon_strong_downtrend',
+}
+
+
+def _sliding_windows(x, window):
+    """(bars - window + 1, series, window) view of a (bars x series) array."""
+    return np.lib.stride_tricks.sliding_window_view(x, window, axis=0)
+
+
+def _rolling_mean(x, window):
+    """
+    pandas rolling(window, min_periods=window).mean()
+    
+    Windows holding a single repeated value return that value exactly, as pandas does.
+    """
+    out = np.full_like(x, np.nan)
+    if len(x) < window:
+        return out
+    windows = _sliding_windows(x, window)
+    mean = windows.mean(axis=-1)
+    constant = windows.max(axis=-1) == windows.min(axis=-1)
+    out[window - 1:] = np.where(constant, x[window - 1:], mean)
+    return out
+
+
+def _window_deviation_sum(x, window, window_mean, power):
+    """
+    Sum over each trailing window of |x - window_mean| ** power (power 1 or 2)
+    
+    Accumulates one lagged row slice at a time; much faster than reducing a
+    strided (bars, series, window) view along its last axis.
+    """
+    n_windows = len(x) - window + 1
+    total = np.zeros((n_windows, x.shape[1]))
+    for lag in range(window):
+        deviation = x[lag:lag + n_windows] - window_mean
+        total += deviation * deviation if power == 2 else np.fabs(deviation)
+    return total
+
+
+def _rolling_mean_std(x, window, ddof=1):
+    """
+    pandas rolling(window, min_periods=window) .mean() and .std(ddof) from one window view
+    
+    Constant windows return the value itself and a standard deviation of exactly 0.
+    
+    Returns:
+        Tuple (mean, std) of ndarrays (bars x series)
+    """
+    mean = np.full_like(x, np.nan)
+    std = np.full_like(x, np.nan)
+    if len(x) < window:
+        return mean, std
+    windows = _sliding_windows(x, window)
+    window_mean = windows.mean(axis=-1)
+    constant = windows.max(axis=-1) == windows.min(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = _window_deviation_sum(x, window, window_mean, 2) / (window - ddof)
+    mean[window - 1:] = np.where(constant, x[window - 1:], window_mean)
+    std[window - 1:] = np.sqrt(np.where(constant, 0.0, variance))
+    return mean, std
+
+
+def _rolling_std(x, window, ddof=1):
+    """pandas rolling(window, min_periods=window).std(ddof); constant windows return exactly 0."""
+    return _rolling_mean_std(x, window, ddof)[1]
+
+
+def _rolling_max(x, window):
+    """pandas rolling(window, min_periods=window).max()"""
+    out = np.full_like(x, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = _sliding_windows(x, window).max(axis=-1)
+    return out
+
+
+def _rolling_min(x, window):
+    """pandas rolling(window, min_periods=window).min()"""
+    out = np.full_like(x, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = _sliding_windows(x, window).min(axis=-1)
+    return out
+
+
+def _rolling_mean_deviation(x, window):
+    """pandas_ta mad: rolling(window).apply(lambda w: np.fabs(w - w.mean()).mean())"""
+    out = np.full_like(x, np.nan)
+    if len(x) < window:
+        return out
+    window_mean = _sliding_windows(x, window).mean(axis=-1)
+    out[window - 1:] = _window_deviation_sum(x, window, window_mean, 1) / window
+    return out
+
+
+def _rolling_percentile(x, lookback):
+    """
+    Percent of values in the trailing window (<= lookback bars, current bar included)
+    that are <= the current value; NaN where the current value is NaN.
+    
+    Same arithmetic as the per-row loop in calculate_technical_indicators: the
+    denominator is the window length, NaN values in the window count as "not <=".
+    """
+    bars = len(x)
+    count = (x <= x).astype('int32')
+    with np.errstate(invalid='ignore'):
+        for lag in range(1, min(lookback, bars)):
+            count[lag:] += (x[:-lag] <= x[lag:])
+    window_length = np.minimum(np.arange(bars) + 1, lookback)[:, None]
+    percentile = count / window_length * 100
+    percentile[np.isnan(x)] = np.nan
+    return percentile
+
+
+def _markov_transition_probabilities(states, lookback):
+    """
+    Rolling 4-state transition probabilities out of each bar's current state
+    
+    For bar i the window is states[max(0, i - lookback + 1):i + 1]; every pair
+    (states[j], states[j + 1]) inside it with states[j] == states[i] counts as one
+    transition to states[j + 1].
+    
+    Args:
+        states: ndarray (bars x series) of 1-4 or NaN
+        lookback: Transition window in bars
+    
+    Returns:
+        List of 4 ndarrays (bars x series): probability of moving to state 1..4
+    """
+    bars, n_series = states.shape
+    probabilities = [np.full_like(states, np.nan) for _ in range(4)]
+    if bars < 2:
+        return probabilities
+    
+    rows = np.arange(bars)
+    current = states
+    counts = np.zeros((4, bars, n_series))
+    for from_state in range(1, 5):
+        from_mask = states[:-1] == from_state
+        in_state = current == from_state
+        for to_state in range(1, 5):
+            transitions = from_mask & (states[1:] == to_state)
+            # cumulative[m] = transitions among pairs j < m; window count = cumulative[i] - cumulative[start(i)]
+            cumulative = np.zeros((bars, n_series))
+            np.cumsum(transitions, axis=0, out=cumulative[1:])
+            window_count = cumulative.copy()
+            if bars > lookback:
+                window_count[lookback:] -= cumulative[1:bars - lookback + 1]
+            counts[to_state - 1] += np.where(in_state, window_count, 0.0)
+    
+    total = counts.sum(axis=0)
+    valid = ~np.isnan(current) & (rows[:, None] >= 1) & (total > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for k in range(4):
+            probabilities[k] = np.where(valid, counts[k] / total, np.nan)
+    return probabilities
+
+
+class PanelIndicatorResult:
+    """
+    Columnar indicator output for many series.
+    
+    Columns are (bars x series) arrays with series left-aligned, kept in the
+    series chunks they were computed in (no copy into one panel-sized array);
+    `dates` holds each series' bar dates (NaT padding). Slice per series with
+    series_frame()/series_columns(), per snapshot date with snapshot(), or get a
+    whole column with column().
+    """
+    
+    def __init__(self, keys, lengths, dates, chunks, chunk_size, base_frames, skipped=None):
+        """
+        Initialize the result.
+        
+        Args:
+            keys: Series keys, one per array column
+            lengths: Bars per series
+            dates: datetime64 ndarray (bars x series)
+            chunks: List of ordered dictionaries {column: ndarray (bars x chunk series)}
+            chunk_size: Series per chunk (chunk i holds series i*chunk_size onwards)
+            base_frames: Dictionary {key: input OHLC frame (Date index or column)}
+            skipped: Keys that were not computed (NaN in OHLC)
+        """
+        self.keys = list(keys)
+        self.lengths = np.asarray(lengths, dtype='int64')
+        self.dates = dates
+        self.columns = list(chunks[0]) if chunks else []
+        self.skipped = list(skipped or [])
+        self._chunks = chunks
+        self._chunk_size = chunk_size
+        self._base_frames = base_frames
+        self._positions = {key: j for j, key in enumerate(self.keys)}
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def __contains__(self, key):
+        return key in self._positions
+    
+    def series_columns(self, key):
+        """
+        Indicator arrays for one series.
+        
+        Args:
+            key: Series key
+        
+        Returns:
+            Dictionary {column: 1D ndarray aligned to the date-sorted rows}
+        """
+        j = self._positions[key]
+        length = self.lengths[j]
+        chunk = self._chunks[j // self._chunk_size]
+        result = {}
+        for col, values in chunk.items():
+            series_values = values[:length, j % self._chunk_size]
+            if col in INT_COLUMNS and not np.isnan(series_values).any():
+                result[col] = series_values.astype('int64')
+            else:
+                result[col] = series_values.copy()
+        return result
+    
+    def series_frame(self, key):
+        """
+        One series' output in the same layout as calculate_technical_indicators
+        
+        Args:
+            key: Series key
+        
+        Returns:
+            DataFrame with Date index: input columns followed by indicator columns
+        """
+        base = self._base_frames[key]
+        if 'Date' in base.columns:
+            base = base.set_index('Date')
+        base = base.sort_index()
+        data = {col: base[col].to_numpy() for col in base.columns}
+        data.update(self.series_columns(key))
+        return pd.DataFrame(data, index=base.index)
+    
+    def snapshot(self, date, columns=None):
+        """
+        Cross-section of every series on one date
+        
+        Args:
+            date: Snapshot date (anything pd.Timestamp accepts)
+            columns: Optional subset of indicator columns (default: all)
+        
+        Returns:
+            DataFrame indexed by series key (series without a bar on that date are omitted;
+            bars are matched on the calendar day)
+        """
+        target = np.datetime64(pd.Timestamp(date).date(), 'D')
+        rows, series = np.nonzero(self.dates.astype('datetime64[D]') == target)
+        selected = columns if columns is not None else self.columns
+        chunk_index = series // self._chunk_size
+        data = {}
+        for col in selected:
+            values = np.full(len(series), np.nan)
+            for i, chunk in enumerate(self._chunks):
+                in_chunk = chunk_index == i
+                values[in_chunk] = chunk[col][rows[in_chunk], series[in_chunk] % self._chunk_size]
+            data[col] = values
+        return pd.DataFrame(data, index=pd.Index([self.keys[j] for j in series], name='series'))
+    
+    def column(self, name):
+        """
+        One indicator column for every series
+        
+        Args:
+            name: Column name
+        
+        Returns:
+            ndarray (bars x series), series in `keys` order
+        """
+        if not self._chunks:
+            return np.empty((len(self.dates), 0))
+        return np.hstack([chunk[name] for chunk in self._chunks])
+
+
+class PanelIndicatorEngine:
+    """
+    Computes the calculate_technical_indicators output set for many series at once.
+    
+    Usage:
+        engine = PanelIndicatorEngine(config, plan=indicator_plan)
+        panel = engine.compute(series_frames)
+        df = panel.series_frame(key)
+        latest = panel.snapshot('2025-12-05')
+    """
+    
+    def __init__(self, config, plan=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Initialize the engine.
+        
+        Args:
+            config: Indicator configuration dictionary
+            plan: Optional IndicatorPlan; None computes every family (full mode)
+            chunk_size: Series per computation chunk (bounds temporary memory of window views)
+        """
+        self.config = config
+        self.plan = plan
+        self.chunk_size = max(int(chunk_size or DEFAULT_CHUNK_SIZE), 1)
+    
+    def _wants(self, family, families):
+        if families is not None and family not in families:
+            return False
+        return self.plan is None or self.plan.wants(family)
+    
+    def _wants_column(self, family, column, families):
+        if families is not None and family not in families:
+            return False
+        return self.plan is None or self.plan.wants_column(column)
+    
+    def compute(self, series_frames, families=None):
+        """
+        Calculate indicators for every series
+        
+        Args:
+            series_frames: Dictionary {key: OHLC DataFrame (Date index or column)}
+            families: Optional iterable restricting the families computed (further
+                      limited by the plan)
+        
+        Returns:
+            PanelIndicatorResult
+        """
+        families = set(families) if families is not None else None
+        base_frames = {}
+        ohlc_values = []
+        series_dates = []
+        skipped = []
+        for key, df in series_frames.items():
+            if df is None or len(df) == 0:
+                continue
+            if not all(col in df.columns for col in OHLC_COLUMNS):
+                skipped.append(key)
+                continue
+            # Plain column access here: set_index/sort_index per frame dominates the runtime
+            # for thousands of series, so only unsorted frames take the pandas path
+            frame_dates = df['Date'].to_numpy() if 'Date' in df.columns else df.index.to_numpy()
+            frame_dates = frame_dates.astype('datetime64[ns]')
+            if len(frame_dates) > 1 and not (frame_dates[1:] >= frame_dates[:-1]).all():
+                frame = df.set_index('Date') if 'Date' in df.columns else df
+                frame = frame.sort_index()
+                frame_dates = frame.index.to_numpy().astype('datetime64[ns]')
+                values = np.column_stack([frame[col].to_numpy(dtype='float64') for col in OHLC_COLUMNS])
+            else:
+                values = np.column_stack([df[col].to_numpy(dtype='float64') for col in OHLC_COLUMNS])
+            if np.isnan(values).any():
+                skipped.append(key)
+                continue
+            base_frames[key] = df
+            ohlc_values.append(values)
+            series_dates.append(frame_dates)
+        
+        # Left-align every series in (bars x series) arrays, NaN/NaT padded
+        keys = list(base_frames)
+        lengths = np.array([len(values) for values in ohlc_values], dtype='int64')
+        max_len = int(lengths.max()) if len(lengths) else 0
+        packed = np.full((len(OHLC_COLUMNS), max_len, len(keys)), np.nan)
+        dates = np.full((max_len, len(keys)), np.datetime64('NaT'), dtype='datetime64[ns]')
+        for j, values in enumerate(ohlc_values):
+            packed[:, :lengths[j], j] = values.T
+            dates[:lengths[j], j] = series_dates[j]
+        arrays = {col: packed[i] for i, col in enumerate(OHLC_COLUMNS)}
+        
+        chunks = []
+        for start in range(0, len(keys), self.chunk_size):
+            stop = min(start + self.chunk_size, len(keys))
+            chunk = {col: np.ascontiguousarray(arrays[col][:, start:stop]) for col in OHLC_COLUMNS}
+            chunks.append(self._compute_chunk(chunk, lengths[start:stop], families))
+        
+        if skipped:
+            logger.debug(f"Panel indicators: {len(skipped)} series skipped (NaN or missing OHLC)")
+        return PanelIndicatorResult(keys, lengths, dates, chunks, self.chunk_size, base_frames, skipped=skipped)
+    
+    def _compute_chunk(self, ohlc, lengths, families):
+        """
+        Calculate the planned columns for one chunk of packed series
+        
+        Column order and insufficient-data rules follow calculate_technical_indicators.
+        
+        Args:
+            ohlc: Dictionary {'open'/'high'/'low'/'close': ndarray (bars x series)}
+            lengths: Bars per series in the chunk
+            families: Optional family restriction
+        
+        Returns:
+            Ordered dictionary {column: ndarray (bars x series)}
+        """
+        config = self.config
+        high, low, close = ohlc['high'], ohlc['low'], ohlc['close']
+        out = {}
+        
+        def put(col, values, min_length):
+            # Series shorter than min_length get NaN, as in the per-series fallbacks
+            values = np.array(values, dtype='float64')
+            values[:, lengths < min_length] = np.nan
+            out[col] = values
+        
+        # Phase 2: EMAs, ADX
+        for period in config['moving_averages']['ema_periods']:
+            if self._wants_column('ema', f'ema_{period}', families):
+                put(f'ema_{period}', indicator_kernels.ema(close, period), period)
+        
+        if self._wants('adx', families):
+            adx_period = config['trend_indicators']['adx']['period']
+            adx_result = indicator_kernels.adx(high, low, close, length=adx_period, lengths=lengths)
+            put('adx', adx_result['adx'], adx_period)
+            put('di_plus', adx_result['dmp'], adx_period)
+            put('di_minus', adx_result['dmn'], adx_period)
+        
+        # Phase 3: SuperTrend, Parabolic SAR
+        if self._wants('supertrend', families):
+            supertrend_config = config['trend_indicators']['supertrend']
+            supertrend_result = indicator_kernels.supertrend(
+                high, low, close,
+                length=supertrend_config['atr_period'],
+                multiplier=supertrend_config['multiplier'],
+                lengths=lengths
+            )
+            put('supertrend_value', supertrend_result['trend'], supertrend_config['atr_period'])
+            put('supertrend_direction', supertrend_result['direction'], supertrend_config['atr_period'])
+        
+        if self._wants('parabolic_sar', families):
+            psar_config = config['trend_indicators'].get('parabolic_sar', {'step': 0.02, 'max_step': 0.2})
+            psar_result = indicator_kernels.psar(
+                high, low, close,
+                af0=psar_config['step'],
+                af=psar_config['step'],
+                max_af=psar_config['max_step'],
+                lengths=lengths
+            )
+            psar_long, psar_short = psar_result['long'], psar_result['short']
+            put('parabolic_sar', np.where(np.isnan(psar_long), psar_short, psar_long), 2)
+            put('psar_direction', np.where(~np.isnan(psar_long), 1.0, np.where(~np.isnan(psar_short), -1.0, np.nan)), 2)
+            put('psar_af', psar_result['af'], 2)
+            put('psar_reversal', psar_result['reversal'], 2)
+        
+        # Phase 4: MACD, RSI, Stochastic, ROC
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if self._wants('macd', families):
+                macd_config = config['momentum_indicators']['macd']
+                macd_result = indicator_kernels.macd(close, macd_config['fast'], macd_config['slow'], macd_config['signal'])
+                put('macd_line', macd_result['macd'], macd_config['slow'])
+                put('macd_signal', macd_result['signal'], macd_config['slow'])
+                put('macd_histogram', macd_result['histogram'], macd_config['slow'])
+            
+            if self._wants('rsi', families):
+                rsi_config = config['momentum_indicators']['rsi']
+                rsi = indicator_kernels.rsi(close, rsi_config['period'])
+                put('rsi', rsi, rsi_config['period'])
+                put('rsi_overbought', rsi > rsi_config['overbought'], rsi_config['period'])
+                put('rsi_oversold', rsi < rsi_config['oversold'], rsi_config['period'])
+            
+            if self._wants('stochastic', families):
+                stoch_config = config['momentum_indicators']['stochastic']
+                min_periods_needed = stoch_config['k_period'] + stoch_config['smooth_k'] + stoch_config['d_period'] - 2
+                lowest_low = _rolling_min(low, stoch_config['k_period'])
+                denominator = _rolling_max(high, stoch_config['k_period']) - lowest_low
+                denominator = np.where(denominator == 0, np.nan, denominator)
+                stoch_k_slow = _rolling_mean(100 * (close - lowest_low) / denominator, stoch_config['smooth_k'])
+                put('stoch_k', stoch_k_slow, min_periods_needed)
+                put('stoch_d', _rolling_mean(stoch_k_slow, stoch_config['d_period']), min_periods_needed)
+                put('stoch_overbought', stoch_k_slow > stoch_config['overbought'], min_periods_needed)
+                put('stoch_oversold', stoch_k_slow < stoch_config['oversold'], min_periods_needed)
+            
+            for roc_period in config['momentum_indicators']['roc']['periods']:
+                roc_col = 'roc' if roc_period == 1 else f'roc_{roc_period}w'
+                if self._wants_column('roc', roc_col, families):
+                    previous = indicator_kernels.shift_rows(close, roc_period)
+                    put(roc_col, 100 * (close - previous) / previous, roc_period)
+            
+            # Phase 5: CCI, Williams %R, Aroon
+            if self._wants('cci', families):
+                cci_config = config['oscillators']['cci']
+                typical_price = (high + low + close) / 3.0
+                cci = (typical_price - _rolling_mean(typical_price, cci_config['period'])) / (
+                    0.015 * _rolling_mean_deviation(typical_price, cci_config['period'])
+                )
+                put('cci', cci, cci_config['period'])
+                put('cci_overbought', cci > cci_config['overbought'], cci_config['period'])
+                put('cci_oversold', cci < cci_config['oversold'], cci_config['period'])
+            
+            if self._wants('williams_r', families):
+                williams_r_config = config['oscillators']['williams_r']
+                williams_r_period = williams_r_config['period']
+                lowest_low = _rolling_min(low, williams_r_period)
+                williams_r = 100 * ((close - lowest_low) / (_rolling_max(high, williams_r_period) - lowest_low) - 1)
+                put('williams_r', williams_r, williams_r_period)
+                put('williams_r_overbought', williams_r > williams_r_config['overbought'], williams_r_period)
+                put('williams_r_oversold', williams_r < williams_r_config['oversold'], williams_r_period)
+            
+            if self._wants('aroon', families):
+                aroon_config = config['aroon']
+                aroon_period = aroon_config['period']
+                up_threshold = aroon_config['strong_uptrend_threshold']
+                down_threshold = aroon_config['strong_downtrend_threshold']
+                aroon_result = indicator_kernels.aroon(high, low, length=aroon_period)
+                aroon_up, aroon_down = aroon_result['up'], aroon_result['down']
+                put('aroon_up', aroon_up, aroon_period)
+                put('aroon_down', aroon_down, aroon_period)
+                put('aroon_oscillator', aroon_up - aroon_down, aroon_period)
+                put('aroon_strong_uptrend', (aroon_up > up_threshold) & (aroon_down < (100 - up_threshold)), aroon_period)
+                put('aroon_strong_downtrend', (aroon_down > down_threshold) & (aroon_up < (100 - down_threshold)), aroon_period)
+            
+            # Phase 6: Bollinger Bands, ATR, Historical Volatility
+            if self._wants('bollinger', families):
+                bb_config = config['volatility']['bollinger_bands']
+                bb_period = bb_config['period']
+                bb_middle, bb_std = _rolling_mean_std(close, bb_period, ddof=0)
+                deviations = bb_config['std_dev'] * bb_std
+                bb_upper = bb_middle + deviations
+                bb_lower = bb_middle - deviations
+                put('bb_upper', bb_upper, bb_period)
+                put('bb_middle', bb_middle, bb_period)
+                put('bb_lower', bb_lower, bb_period)
+                put('bb_width_pct', ((bb_upper - bb_lower) / bb_middle) * 100, bb_period)
+            
+            if self._wants('atr', families):
+                atr_period = config['volatility']['atr']['period']
+                atr = indicator_kernels.atr(high, low, close, atr_period, lengths)
+                put('atr', atr, atr_period)
+                put('atr_pct_of_price', (atr / close) * 100, atr_period)
+            
+            if self._wants('historical_volatility', families):
+                hv_period = config['volatility']['historical_volatility']['period']
+                returns = close / indicator_kernels.shift_rows(close, 1) - 1
+                put('historical_volatility_20w', _rolling_std(returns, hv_period) * np.sqrt(52) * 100, hv_period + 1)
+            
+            # Phase 7: Z-score, Coefficient of Variation, Percentiles
+            if self._wants('zscore', families):
+                zscore_period = config['statistical']['zscore']['period']
+                rolling_mean, rolling_std = _rolling_mean_std(close, zscore_period)
+                zscore = (close - rolling_mean) / rolling_std
+                put('zscore', zscore, zscore_period)
+            
+            if self._wants('coefficient_of_variation', families):
+                cv_period = config['statistical']['coefficient_of_variation']['period']
+                rolling_mean, rolling_std = _rolling_mean_std(close, cv_period)
+                put('coefficient_of_variation', np.where(rolling_mean != 0, (rolling_std / rolling_mean) * 100, np.nan), cv_period)
+        
+        percentiles_config = config['statistical']['percentiles']
+        for indicator in percentiles_config['indicators']:
+            col_name = PERCENTILE_COLUMNS.get(indicator)
+            if col_name is None or not self._wants_column('percentiles', col_name, families):
+                continue
+            source = close if indicator == 'close' else out.get(indicator)
+            if source is None:
+                put(col_name, np.full_like(close, np.nan), 0)
+                continue
+            put(col_name, _rolling_percentile(source, percentiles_config['lookback_weeks']), 0)
+        
+        # Phase 8: 4-Factor Markov Model
+        if self._wants('markov', families):
+            markov_config = self.config['markov_model']
+            state_config = markov_config['state_classification']
+            ema_cols = [f"ema_{state_config[name]}" for name in ('ema_short', 'ema_medium', 'ema_long')]
+            required = ['adx', 'macd_line', 'rsi'] + ema_cols
+            if all(col in out for col in required):
+                with np.errstate(invalid='ignore'):
+                    emas_above = sum((close > out[col]).astype('int64') for col in ema_cols)
+                    strong_trend = out['adx'] > state_config['adx_strong_threshold']
+                    bullish_momentum = out['macd_line'] > 0
+                states = np.where(
+                    emas_above >= 2,
+                    np.where(strong_trend & bullish_momentum, 1.0, 2.0),
+                    np.where(~strong_trend | bullish_momentum, 3.0, 4.0)
+                )
+                inputs_missing = np.isnan(close)
+                for col in required:
+                    inputs_missing |= np.isnan(out[col])
+                states[inputs_missing] = np.nan
+                put('markov_state', states, 0)
+                probabilities = _markov_transition_probabilities(states, markov_config['transition_matrix']['lookback_weeks'])
+                for k, values in enumerate(probabilities, start=1):
+                    put(f'markov_prob_state_{k}', values, 0)
+            else:
+                for col in ['markov_state'] + [f'markov_prob_state_{k}' for k in range(1, 5)]:
+                    put(col, np.full_like(close, np.nan), 0)
+        
+        return out
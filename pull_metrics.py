@@ -0,0 +1,370 @@
+"""
+Metrics registry for pull_all_ohlc_data
+
+Counters, gauges and latency histograms for one pull (fetch latency per symbol,
+spread build time, indicator time per series family, write throughput). A
+sampler thread reports progress and exports the registry on a fixed interval:
+
+- Prometheus textfile (ice_pull.prom, for the node_exporter textfile collector)
+- JSON (ice_pull_metrics.json, same values plus p50/p95/p99 per histogram)
+
+Hot-path updates are cheap: Counter.inc takes an uncontended lock and
+Histogram.observe is a list append (both well under a microsecond), so
+instrumenting a call that talks to ICE or builds a DataFrame costs nothing
+measurable. Percentiles are computed from
+the raw samples only when exported.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from threading import Event, Lock, Thread
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_DIR = 'logs/ice_data_pull/metrics'
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 20 * 60
+PERCENTILES = (50, 95, 99)
+
+
+def _label_key(labels):
+    """Hashable, ordered form of a labels dict."""
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(label_key, extra=None):
+    """Prometheus label set, e.g. {family="spread",quantile="0.95"}."""
+    pairs = list(label_key) + list(extra or [])
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    """Prometheus sample value."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return 'NaN'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count (e.g. symbols fetched)."""
+    
+    kind = 'counter'
+    
+    def __init__(self):
+        self._value = 0
+        self._lock = Lock()
+    
+    def inc(self, amount=1):
+        """
+        Add to the counter.
+        
+        Args:
+            amount: Increment (default 1)
+        
+        Returns:
+            New value (consistent with concurrent increments, usable for progress checks)
+        """
+        with self._lock:
+            self._value += amount
+            return self._value
+    
+    @property
+    def value(self):
+        return self._value
+
+
+class Gauge:
+    """Value that can go up and down (e.g. series in the current stage)."""
+    
+    kind = 'gauge'
+    
+    def __init__(self):
+        self._value = 0
+    
+    def set(self, value):
+        self._value = value
+    
+    @property
+    def value(self):
+        return self._value
+
+
+class Histogram:
+    """
+    Latency distribution, exported as a Prometheus summary (p50/p95/p99, sum, count).
+    
+    Keeps every observation (one float per symbol or series, a few hundred KB for
+    a full pull) so percentiles are exact.
+    """
+    
+    kind = 'summary'
+    
+    def __init__(self):
+        self._samples = []
+    
+    def observe(self, value):
+        """Record one observation (seconds). list.append is atomic, so no lock."""
+        self._samples.append(value)
+    
+    @contextmanager
+    def time(self):
+        """Observe the wall time of the with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._samples.append(time.perf_counter() - start)
+    
+    @property
+    def count(self):
+        return len(self._samples)
+    
+    def summary(self):
+        """
+        Distribution statistics.
+        
+        Returns:
+            Dictionary with count, sum, mean, max and p50/p95/p99 (None values when empty)
+        """
+        samples = np.asarray(list(self._samples), dtype='float64')
+        result = {'count': int(len(samples)), 'sum': float(samples.sum()) if len(samples) else 0.0}
+        if len(samples) == 0:
+            result.update({'mean': None, 'max': None})
+            result.update({f'p{p}': None for p in PERCENTILES})
+            return result
+        result['mean'] = float(samples.mean())
+        result['max'] = float(samples.max())
+        for p, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES)):
+            result[f'p{p}'] = float(value)
+        return result
+
+
+class MetricsRegistry:
+    """
+    Named metrics for one run, with periodic sampling and export.
+    
+    Usage:
+        metrics = MetricsRegistry(namespace='ice_pull')
+        fetched = metrics.counter('outright_fetch_success_total', 'Outrights fetched with data')
+        latency = metrics.histogram('outright_fetch_seconds', 'ICE fetch latency per outright')
+        with metrics:  # stops a running sampler on exit, with a final export
+            metrics.start_sampler(1200, on_sample=log_progress, output_dir='logs/ice_data_pull/metrics')
+            with latency.time():
+                df = fetch_symbol_ohlc(...)
+            fetched.inc()
+    """
+    
+    _TYPES = {'counter': Counter, 'gauge': Gauge, 'summary': Histogram}
+    
+    def __init__(self, namespace='ice_pull'):
+        """
+        Initialize an empty registry.
+        
+        Args:
+            namespace: Prefix of every exported metric name
+        """
+        self.namespace = namespace
+        self.started_at = datetime.now()
+        self._metrics = {}  # name -> {'kind', 'help', 'series': {label_key: metric}}
+        self._lock = Lock()
+        self._sampler = None
+        self._stop_event = Event()
+        self._output_dir = None
+        self._on_sample = None
+    
+    def _get(self, kind, name, help_text, labels):
+        key = _label_key(labels)
+        with self._lock:
+            family = self._metrics.setdefault(name, {'kind': kind, 'help': help_text, 'series': {}})
+            if family['kind'] != kind:
+                raise ValueError(f"Metric {name} already registered as a {family['kind']}")
+            if key not in family['series']:
+                family['series'][key] = self._TYPES[kind]()
+            return family['series'][key]
+    
+    def counter(self, name, help_text='', labels=None):
+        """Get or create a Counter (labels: dict of label name -> value)."""
+        return self._get('counter', name, help_text, labels)
+    
+    def gauge(self, name, help_text='', labels=None):
+        """Get or create a Gauge."""
+        return self._get('gauge', name, help_text, labels)
+    
+    def histogram(self, name, help_text='', labels=None):
+        """Get or create a Histogram (exported as a summary with p50/p95/p99)."""
+        return self._get('summary', name, help_text, labels)
+    
+    def _families(self):
+        with self._lock:
+            return [(name, family['kind'], family['help'], list(family['series'].items()))
+                    for name, family in sorted(self._metrics.items())]
+    
+    def to_prometheus(self):
+        """
+        Render the registry in the Prometheus text exposition format.
+        
+        Returns:
+            Text for a .prom file
+        """
+        lines = []
+        for name, kind, help_text, series in self._families():
+            full_name = f"{self.namespace}_{name}"
+            if help_text:
+                lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for label_key, metric in series:
+                if kind == 'summary':
+                    summary = metric.summary()
+                    for p in PERCENTILES:
+                        quantile = _format_labels(label_key, [('quantile', p / 100)])
+                        lines.append(f"{full_name}{quantile} {_format_value(summary[f'p{p}'])}")
+                    lines.append(f"{full_name}_sum{_format_labels(label_key)} {_format_value(summary['sum'])}")
+                    lines.append(f"{full_name}_count{_format_labels(label_key)} {summary['count']}")
+                else:
+                    lines.append(f"{full_name}{_format_labels(label_key)} {_format_value(metric.value)}")
+        return '\n'.join(lines) + '\n'
+    
+    def to_dict(self):
+        """
+        Registry as a JSON-serializable dictionary.
+        
+        Returns:
+            {'namespace', 'started_at', 'sampled_at', 'metrics': {name: {'type', 'help', 'series': [...]}}}
+        """
+        metrics = {}
+        for name, kind, help_text, series in self._families():
+            entries = []
+            for label_key, metric in series:
+                entry = {'labels': dict(label_key)}
+                if kind == 'summary':
+                    entry.update(metric.summary())
+                else:
+                    entry['value'] = metric.value
+                entries.append(entry)
+            metrics[name] = {'type': kind, 'help': help_text, 'series': entries}
+        return {
+            'namespace': self.namespace,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'sampled_at': datetime.now().isoformat(timespec='seconds'),
+            'metrics': metrics,
+        }
+    
+    def percentile_table(self):
+        """
+        One row per histogram series, for the summary email.
+        
+        Returns:
+            List of dicts with name, labels, count, p50, p95, p99, max and sum (seconds)
+        """
+        rows = []
+        for name, kind, help_text, series in self._families():
+            if kind != 'summary':
+                continue
+            for label_key, metric in series:
+                summary = metric.summary()
+                if summary['count'] == 0:
+                    continue
+                rows.append({'name': name, 'help': help_text, 'labels': dict(label_key), **summary})
+        return rows
+    
+    def export(self, output_dir):
+        """
+        Write the Prometheus textfile and the JSON file (atomically).
+        
+        Args:
+            output_dir: Directory for {namespace}.prom and {namespace}_metrics.json
+        
+        Returns:
+            Tuple of (prom_path, json_path)
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        prom_path = output_dir / f"{self.namespace}.prom"
+        json_path = output_dir / f"{self.namespace}_metrics.json"
+        for path, text in ((prom_path, self.to_prometheus()),
+                           (json_path, json.dumps(self.to_dict(), indent=2, default=str))):
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        return prom_path, json_path
+    
+    def sample(self):
+        """Run the progress callback and export (called by the sampler thread)."""
+        if self._on_sample is not None:
+            try:
+                self._on_sample(self)
+            except Exception as e:
+                logger.warning(f"Metrics progress callback failed: {e}")
+        if self._output_dir is not None:
+            try:
+                self.export(self._output_dir)
+            except OSError as e:
+                logger.warning(f"Could not export pull metrics to {self._output_dir}: {e}")
+    
+    def start_sampler(self, interval_seconds=DEFAULT_SAMPLE_INTERVAL_SECONDS, on_sample=None, output_dir=None):
+        """
+        Start the background sampler.
+        
+        Args:
+            interval_seconds: Seconds between samples
+            on_sample: Optional callback(registry), e.g. a progress logger
+            output_dir: Export directory (None = no file export)
+        """
+        self.stop_sampler(export=False)
+        self._on_sample = on_sample
+        self._output_dir = output_dir
+        self._stop_event = Event()
+        
+        def run():
+            while not self._stop_event.wait(interval_seconds):
+                self.sample()
+        
+        self._sampler = Thread(target=run, name='pull-metrics-sampler', daemon=True)
+        self._sampler.start()
+    
+    @property
+    def sampler_running(self):
+        """True between start_sampler() and stop_sampler()."""
+        return self._sampler is not None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # A run that returns early or raises still stops the sampler and exports once
+        if self.sampler_running:
+            self.stop_sampler()
+        return False
+    
+    def stop_sampler(self, export=True):
+        """
+        Stop the sampler thread and write a final export.
+        
+        Args:
+            export: Write the files one last time (if an output directory was given)
+        
+        Returns:
+            Tuple of (prom_path, json_path), or None if nothing was exported
+        """
+        if self._sampler is not None:
+            self._stop_event.set()
+            self._sampler.join(timeout=5)
+            self._sampler = None
+        if export and self._output_dir is not None:
+            try:
+                return self.export(self._output_dir)
+            except OSError as e:
+                logger.warning(f"Could not export pull metrics to {self._output_dir}: {e}")
+        return None
@@ -10,9 +10,11 @@ import logging
 import icepython as ice
 import sys
 import json
+import hashlib
+import inspect
 import traceback
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
-from threading import Lock, Thread, Event
+from threading import Lock
 import pythoncom  # For COM initialization in threads
 import smtplib
 from email.mime.multipart import MIMEMultipart
@@ -21,6 +23,14 @@ from email.mime.base import MIMEBase
 from email import encoders
 import os
 
+from indicator_plan import build_indicator_plan, build_column_lineage, PERCENTILE_COLUMNS
+from indicator_cache import IndicatorCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_SIZE_MB
+from snapshot_store import save_raw_ohlc, save_lineage, raw_ohlc_path, lineage_path
+import indicator_kernels
+import panel_indicators
+from panel_indicators import PanelIndicatorEngine, DEFAULT_CHUNK_SIZE
+from pull_metrics import MetricsRegistry, DEFAULT_METRICS_DIR, DEFAULT_SAMPLE_INTERVAL_SECONDS
+
 # Import pandas_ta for technical indicators
 try:
     import pandas_ta as ta
@@ -286,6 +296,46 @@ def load_email_config(email_config_file='email_settings/Email.env'):
         return None
 
 
+def format_latency(seconds):
+    """Format a latency for the summary email (ms below one second)"""
+    if seconds is None:
+        return 'N/A'
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def generate_latency_table_html(latency_rows):
+    """
+    Generate the latency percentile table for the summary email
+    
+    Args:
+        latency_rows: MetricsRegistry.percentile_table() rows
+    
+    Returns:
+        HTML string (empty if there are no rows)
+    """
+    if not latency_rows:
+        return ''
+    
+    html = """
+            <h2>LATENCY PERCENTILES</h2>
+            <table>
+                <tr><th>Stage</th><th>Count</th><th>p50</th><th>p95</th><th>p99</th><th>Max</th><th>Total</th></tr>
+    """
+    for row in latency_rows:
+        label = row.get('help') or row['name']
+        if row.get('labels'):
+            label += ' (' + ', '.join(str(v) for v in row['labels'].values()) + ')'
+        html += f"""
+                <tr><td class="metric">{label}</td><td>{row['count']:,}</td><td>{format_latency(row['p50'])}</td><td>{format_latency(row['p95'])}</td><td>{format_latency(row['p99'])}</td><td>{format_latency(row['max'])}</td><td>{row['sum']:.1f} s</td></tr>
+        """
+    html += """
+            </table>
+    """
+    return html
+
+
 def generate_email_html(stats):
     """
     Generate HTML email content from statistics
@@ -424,12 +474,15 @@ def generate_email_html(stats):
             <table>
                 <tr><td class="metric">Outright Fetch:</td><td>{stats.get('outright_duration', 0):.1f}s ({stats.get('outright_rate', 0):.1f} symbols/sec)</td></tr>
                 <tr><td class="metric">Spread Calculation:</td><td>{stats.get('spread_duration', 0):.1f}s ({stats.get('spread_rate', 0):.1f} spreads/sec)</td></tr>
-                <tr><td class="metric">Indicator Calc:</td><td>{stats.get('indicator_duration', 0):.1f}s</td></tr>
+                <tr><td class="metric">Indicator Calc:</td><td>{stats.get('indicator_duration', 0):.1f}s (cache: {stats.get('indicator_cache_hits', 0):,} hits / {stats.get('indicator_cache_misses', 0):,} misses)</td></tr>
                 <tr><td class="metric">File Write:</td><td>{stats.get('file_write_duration', 0):.1f}s</td></tr>
                 <tr><td class="metric">Total Processing:</td><td>{stats.get('total_duration', 0):.1f}s</td></tr>
             </table>
     """
     
+    # p50/p95/p99 per instrumented stage (pull metrics registry)
+    html += generate_latency_table_html(stats.get('latency_percentiles', []))
+    
     # Add detailed errors and warnings section (after banner at top)
     if has_errors:
         html += """
@@ -1095,7 +1148,7 @@ def calculate_correlation_and_cointegration(df, symbol_a, symbol_b, outright_dat
         return None
 
 
-def calculate_technical_indicators(df, symbol_info, config):
+def calculate_technical_indicators(df, symbol_info, config, plan=None, precomputed=None):
     """
     Calculate all technical indicators for a symbol's OHLC data
     
@@ -1112,6 +1165,11 @@ def calculate_technical_indicators(df, symbol_info, config):
         df: DataFrame with Date index and columns: open, high, low, close
         symbol_info: Dictionary with symbol metadata (from symbol matrix)
         config: Indicator configuration dictionary
+        plan: Optional IndicatorPlan (see indicator_plan.py). None computes every
+              family (full mode); otherwise only the planned families/columns.
+        precomputed: Optional dict {column: array} of ADX/SuperTrend/Parabolic SAR/Aroon
+                     output columns (aligned to the date-sorted rows) from
+                     calculate_path_dependent_indicators_batch; those families are not recomputed.
     
     Returns:
         DataFrame with all technical indicators added
@@ -1144,6 +1202,8 @@ def calculate_technical_indicators(df, symbol_info, config):
     # Step 2.1: Exponential Moving Averages (EMA)
     ema_periods = config['moving_averages']['ema_periods']
     for period in ema_periods:
+        if plan is not None and not plan.wants_column(f'ema_{period}'):
+            continue
         if len(result_df) >= period:
             ema = ta.ema(result_df['close'], length=period)
             result_df[f'ema_{period}'] = ema
@@ -1153,211 +1213,266 @@ def calculate_technical_indicators(df, symbol_info, config):
             logger.debug(f"Insufficient data for EMA_{period}: {len(result_df)} rows available")
     
     # Step 2.2: ADX and Directional Indicators
-    adx_config = config['trend_indicators']['adx']
-    adx_period = adx_config['period']
-    
-    if len(result_df) >= adx_period:
-        # Calculate ADX, DI+, DI-
-        adx_result = ta.adx(
-            high=result_df['high'],
-            low=result_df['low'],
-            close=result_df['close'],
-            length=adx_period
-        )
-        
-        if adx_result is not None and len(adx_result) > 0:
-            # pandas_ta returns DataFrame with columns: ADX_14, DMP_14, DMN_14
-            # We need to map these to our column names
-            adx_col = f'ADX_{adx_period}'
-            di_plus_col = f'DMP_{adx_period}'  # DI+ (Directional Movement Plus)
-            di_minus_col = f'DMN_{adx_period}'  # DI- (Directional Movement Minus)
-            
-            if adx_col in adx_result.columns:
-                result_df['adx'] = adx_result[adx_col]
-            if di_plus_col in adx_result.columns:
-                result_df['di_plus'] = adx_result[di_plus_col]
-            if di_minus_col in adx_result.columns:
-                result_df['di_minus'] = adx_result[di_minus_col]
+    if precomputed and 'adx' in precomputed:
+        for col in ('adx', 'di_plus', 'di_minus'):
+            result_df[col] = precomputed[col]
+    elif plan is None or plan.wants('adx'):
+        adx_config = config['trend_indicators']['adx']
+        adx_period = adx_config['period']
+        
+        if len(result_df) >= adx_period:
+            # Calculate ADX, DI+, DI-
+            adx_result = ta.adx(
+                high=result_df['high'],
+                low=result_df['low'],
+                close=result_df['close'],
+                length=adx_period
+            )
+            
+            if adx_result is not None and len(adx_result) > 0:
+                # pandas_ta returns DataFrame with columns: ADX_14, DMP_14, DMN_14
+                # We need to map these to our column names
+                adx_col = f'ADX_{adx_period}'
+                di_plus_col = f'DMP_{adx_period}'  # DI+ (Directional Movement Plus)
+                di_minus_col = f'DMN_{adx_period}'  # DI- (Directional Movement Minus)
+                
+                if adx_col in adx_result.columns:
+                    result_df['adx'] = adx_result[adx_col]
+                if di_plus_col in adx_result.columns:
+                    result_df['di_plus'] = adx_result[di_plus_col]
+                if di_minus_col in adx_result.columns:
+                    result_df['di_minus'] = adx_result[di_minus_col]
+            else:
+                result_df['adx'] = np.nan
+                result_df['di_plus'] = np.nan
+                result_df['di_minus'] = np.nan
         else:
             result_df['adx'] = np.nan
             result_df['di_plus'] = np.nan
             result_df['di_minus'] = np.nan
-    else:
-        result_df['adx'] = np.nan
-        result_df['di_plus'] = np.nan
-        result_df['di_minus'] = np.nan
-        logger.debug(f"Insufficient data for ADX: {len(result_df)} rows available, need {adx_period}")
+            logger.debug(f"Insufficient data for ADX: {len(result_df)} rows available, need {adx_period}")
     
     logger.debug(f"Phase 2 indicators calculated: EMAs and ADX")
     
     # PHASE 3: Additional Trend Indicators
     
     # Step 3.1: SuperTrend
-    supertrend_config = config['trend_indicators']['supertrend']
-    atr_period = supertrend_config['atr_period']
-    multiplier = supertrend_config['multiplier']
-    
-    if len(result_df) >= atr_period:
-        # Calculate SuperTrend using pandas_ta
-        supertrend_result = ta.supertrend(
-            high=result_df['high'],
-            low=result_df['low'],
-            close=result_df['close'],
-            length=atr_period,
-            multiplier=multiplier
-        )
-        
-        if supertrend_result is not None and len(supertrend_result) > 0:
-            # pandas_ta returns DataFrame with columns: SUPERT_10_3.0, SUPERTd_10_3.0
-            # SUPERT_10_3.0 = SuperTrend value
-            # SUPERTd_10_3.0 = SuperTrend direction (1 for up, -1 for down)
-            supert_col = f'SUPERT_{atr_period}_{multiplier}'
-            supertd_col = f'SUPERTd_{atr_period}_{multiplier}'
-            
-            if supert_col in supertrend_result.columns:
-                result_df['supertrend_value'] = supertrend_result[supert_col]
-            if supertd_col in supertrend_result.columns:
-                result_df['supertrend_direction'] = supertrend_result[supertd_col]
+    if precomputed and 'supertrend_value' in precomputed:
+        for col in ('supertrend_value', 'supertrend_direction'):
+            result_df[col] = precomputed[col]
+    elif plan is None or plan.wants('supertrend'):
+        supertrend_config = config['trend_indicators']['supertrend']
+        atr_period = supertrend_config['atr_period']
+        multiplier = supertrend_config['multiplier']
+        
+        if len(result_df) >= atr_period:
+            # Calculate SuperTrend using pandas_ta
+            supertrend_result = ta.supertrend(
+                high=result_df['high'],
+                low=result_df['low'],
+                close=result_df['close'],
+                length=atr_period,
+                multiplier=multiplier
+            )
+            
+            if supertrend_result is not None and len(supertrend_result) > 0:
+                # pandas_ta returns DataFrame with columns: SUPERT_10_3.0, SUPERTd_10_3.0
+                # SUPERT_10_3.0 = SuperTrend value
+                # SUPERTd_10_3.0 = SuperTrend direction (1 for up, -1 for down)
+                supert_col = f'SUPERT_{atr_period}_{multiplier}'
+                supertd_col = f'SUPERTd_{atr_period}_{multiplier}'
+                
+                if supert_col in supertrend_result.columns:
+                    result_df['supertrend_value'] = supertrend_result[supert_col]
+                if supertd_col in supertrend_result.columns:
+                    result_df['supertrend_direction'] = supertrend_result[supertd_col]
+            else:
+                result_df['supertrend_value'] = np.nan
+                result_df['supertrend_direction'] = np.nan
         else:
             result_df['supertrend_value'] = np.nan
             result_df['supertrend_direction'] = np.nan
-    else:
-        result_df['supertrend_value'] = np.nan
-        result_df['supertrend_direction'] = np.nan
-        logger.debug(f"Insufficient data for SuperTrend: {len(result_df)} rows available, need {atr_period}")
+            logger.debug(f"Insufficient data for SuperTrend: {len(result_df)} rows available, need {atr_period}")
+    
+    # Step 3.2: Parabolic SAR
+    if precomputed and 'parabolic_sar' in precomputed:
+        for col in ('parabolic_sar', 'psar_direction', 'psar_af', 'psar_reversal'):
+            result_df[col] = precomputed[col]
+    elif plan is None or plan.wants('parabolic_sar'):
+        psar_config = config['trend_indicators'].get('parabolic_sar', {'step': 0.02, 'max_step': 0.2})
+        psar_step = psar_config['step']
+        psar_max_step = psar_config['max_step']
+        
+        if len(result_df) >= 2:
+            # Calculate Parabolic SAR using pandas_ta
+            psar_result = ta.psar(
+                high=result_df['high'],
+                low=result_df['low'],
+                close=result_df['close'],
+                af0=psar_step,
+                af=psar_step,
+                max_af=psar_max_step
+            )
+            
+            if psar_result is not None and len(psar_result) > 0:
+                # pandas_ta returns DataFrame with columns: PSARl_0.02_0.2, PSARs_0.02_0.2, PSARaf_0.02_0.2, PSARr_0.02_0.2
+                # PSARl = SAR while long (below price), PSARs = SAR while short (above price)
+                psar_long = psar_result[f'PSARl_{psar_step}_{psar_max_step}']
+                psar_short = psar_result[f'PSARs_{psar_step}_{psar_max_step}']
+                
+                result_df['parabolic_sar'] = psar_long.combine_first(psar_short)
+                result_df['psar_direction'] = np.where(psar_long.notna(), 1, np.where(psar_short.notna(), -1, np.nan))
+                result_df['psar_af'] = psar_result[f'PSARaf_{psar_step}_{psar_max_step}']
+                result_df['psar_reversal'] = psar_result[f'PSARr_{psar_step}_{psar_max_step}']
+            else:
+                result_df['parabolic_sar'] = np.nan
+                result_df['psar_direction'] = np.nan
+                result_df['psar_af'] = np.nan
+                result_df['psar_reversal'] = np.nan
+        else:
+            result_df['parabolic_sar'] = np.nan
+            result_df['psar_direction'] = np.nan
+            result_df['psar_af'] = np.nan
+            result_df['psar_reversal'] = np.nan
+            logger.debug(f"Insufficient data for Parabolic SAR: {len(result_df)} rows available, need 2")
     
-    logger.debug(f"Phase 3 indicators calculated: SuperTrend")
+    logger.debug(f"Phase 3 indicators calculated: SuperTrend, Parabolic SAR")
     
     # PHASE 4: Momentum Indicators
     
     # Step 4.1: MACD
-    macd_config = config['momentum_indicators']['macd']
-    macd_fast = macd_config['fast']
-    macd_slow = macd_config['slow']
-    macd_signal = macd_config['signal']
-    
-    if len(result_df) >= macd_slow:
-        # Calculate MACD using pandas_ta
-        macd_result = ta.macd(
-            close=result_df['close'],
-            fast=macd_fast,
-            slow=macd_slow,
-            signal=macd_signal
-        )
-        
-        if macd_result is not None and len(macd_result) > 0:
-            # pandas_ta returns DataFrame with columns: MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9
-            # MACD_12_26_9 = MACD line, MACDs_12_26_9 = Signal line, MACDh_12_26_9 = Histogram
-            macd_col = f'MACD_{macd_fast}_{macd_slow}_{macd_signal}'
-            macds_col = f'MACDs_{macd_fast}_{macd_slow}_{macd_signal}'
-            macdh_col = f'MACDh_{macd_fast}_{macd_slow}_{macd_signal}'
-            
-            if macd_col in macd_result.columns:
-                result_df['macd_line'] = macd_result[macd_col]
-            if macds_col in macd_result.columns:
-                result_df['macd_signal'] = macd_result[macds_col]
-            if macdh_col in macd_result.columns:
-                result_df['macd_histogram'] = macd_result[macdh_col]
+    if plan is None or plan.wants('macd'):
+        macd_config = config['momentum_indicators']['macd']
+        macd_fast = macd_config['fast']
+        macd_slow = macd_config['slow']
+        macd_signal = macd_config['signal']
+        
+        if len(result_df) >= macd_slow:
+            # Calculate MACD using pandas_ta
+            macd_result = ta.macd(
+                close=result_df['close'],
+                fast=macd_fast,
+                slow=macd_slow,
+                signal=macd_signal
+            )
+            
+            if macd_result is not None and len(macd_result) > 0:
+                # pandas_ta returns DataFrame with columns: MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9
+                # MACD_12_26_9 = MACD line, MACDs_12_26_9 = Signal line, MACDh_12_26_9 = Histogram
+                macd_col = f'MACD_{macd_fast}_{macd_slow}_{macd_signal}'
+                macds_col = f'MACDs_{macd_fast}_{macd_slow}_{macd_signal}'
+                macdh_col = f'MACDh_{macd_fast}_{macd_slow}_{macd_signal}'
+                
+                if macd_col in macd_result.columns:
+                    result_df['macd_line'] = macd_result[macd_col]
+                if macds_col in macd_result.columns:
+                    result_df['macd_signal'] = macd_result[macds_col]
+                if macdh_col in macd_result.columns:
+                    result_df['macd_histogram'] = macd_result[macdh_col]
+            else:
+                result_df['macd_line'] = np.nan
+                result_df['macd_signal'] = np.nan
+                result_df['macd_histogram'] = np.nan
         else:
             result_df['macd_line'] = np.nan
             result_df['macd_signal'] = np.nan
             result_df['macd_histogram'] = np.nan
-    else:
-        result_df['macd_line'] = np.nan
-        result_df['macd_signal'] = np.nan
-        result_df['macd_histogram'] = np.nan
-        logger.debug(f"Insufficient data for MACD: {len(result_df)} rows available, need {macd_slow}")
+            logger.debug(f"Insufficient data for MACD: {len(result_df)} rows available, need {macd_slow}")
     
     # Step 4.2: RSI
-    rsi_config = config['momentum_indicators']['rsi']
-    rsi_period = rsi_config['period']
-    rsi_overbought_threshold = rsi_config['overbought']
-    rsi_oversold_threshold = rsi_config['oversold']
-    
-    if len(result_df) >= rsi_period:
-        # Calculate RSI using pandas_ta
-        rsi = ta.rsi(close=result_df['close'], length=rsi_period)
-        
-        if rsi is not None and len(rsi) > 0:
-            result_df['rsi'] = rsi
-            
-            # Add overbought/oversold flags
-            result_df['rsi_overbought'] = (rsi > rsi_overbought_threshold).astype(int)
-            result_df['rsi_oversold'] = (rsi < rsi_oversold_threshold).astype(int)
+    if plan is None or plan.wants('rsi'):
+        rsi_config = config['momentum_indicators']['rsi']
+        rsi_period = rsi_config['period']
+        rsi_overbought_threshold = rsi_config['overbought']
+        rsi_oversold_threshold = rsi_config['oversold']
+        
+        if len(result_df) >= rsi_period:
+            # Calculate RSI using pandas_ta
+            rsi = ta.rsi(close=result_df['close'], length=rsi_period)
+            
+            if rsi is not None and len(rsi) > 0:
+                result_df['rsi'] = rsi
+                
+                # Add overbought/oversold flags
+                result_df['rsi_overbought'] = (rsi > rsi_overbought_threshold).astype(int)
+                result_df['rsi_oversold'] = (rsi < rsi_oversold_threshold).astype(int)
+            else:
+                result_df['rsi'] = np.nan
+                result_df['rsi_overbought'] = np.nan
+                result_df['rsi_oversold'] = np.nan
         else:
             result_df['rsi'] = np.nan
             result_df['rsi_overbought'] = np.nan
             result_df['rsi_oversold'] = np.nan
-    else:
-        result_df['rsi'] = np.nan
-        result_df['rsi_overbought'] = np.nan
-        result_df['rsi_oversold'] = np.nan
-        logger.debug(f"Insufficient data for RSI: {len(result_df)} rows available, need {rsi_period}")
+            logger.debug(f"Insufficient data for RSI: {len(result_df)} rows available, need {rsi_period}")
     
     # Step 4.3: Slow Stochastic (14,3,3 smoothed - matching ICE Connect SIMPLE, SIMPLE)
-    stoch_config = config['momentum_indicators']['stochastic']
-    stoch_k_period = stoch_config['k_period']  # 14
-    stoch_d_period = stoch_config['d_period']  # 3
-    stoch_smooth_k = stoch_config['smooth_k']  # 3
-    stoch_overbought_threshold = stoch_config['overbought']  # 80
-    stoch_oversold_threshold = stoch_config['oversold']  # 20
-    
-    # Calculate slow stochastics manually to match ICE Connect (SIMPLE, SIMPLE)
-    # ICE Connect uses: SSTOC(..., 14, 3, 3, SIMPLE, SIMPLE)
-    # This means:
-    # 1. Calculate raw %K (14-period): %K_raw = 100 * (Close - Lowest Low) / (Highest High - Lowest Low)
-    # 2. Smooth %K by 3 periods (SIMPLE moving average): %K_slow = SMA(%K_raw, 3)
-    # 3. Calculate %D as 3-period SMA of slow %K: %D = SMA(%K_slow, 3)
-    min_periods_needed = stoch_k_period + stoch_smooth_k + stoch_d_period - 2  # 14 + 3 + 3 - 2 = 18
-    
-    if len(result_df) >= min_periods_needed:
-        try:
-            # Step 1: Calculate raw %K (14-period)
-            # %K_raw = 100 * (Close - Lowest Low in 14 periods) / (Highest High in 14 periods - Lowest Low in 14 periods)
-            high_rolling = result_df['high'].rolling(window=stoch_k_period, min_periods=stoch_k_period)
-            low_rolling = result_df['low'].rolling(window=stoch_k_period, min_periods=stoch_k_period)
-            
-            highest_high = high_rolling.max()
-            lowest_low = low_rolling.min()
-            
-            # Calculate raw %K
-            denominator = highest_high - lowest_low
-            # Avoid division by zero
-            denominator = denominator.replace(0, np.nan)
-            stoch_k_raw = 100 * (result_df['close'] - lowest_low) / denominator
-            
-            # Step 2: Smooth %K by 3 periods (SIMPLE moving average)
-            stoch_k_slow = stoch_k_raw.rolling(window=stoch_smooth_k, min_periods=stoch_smooth_k).mean()
-            
-            # Step 3: Calculate %D as 3-period SMA of slow %K
-            stoch_d = stoch_k_slow.rolling(window=stoch_d_period, min_periods=stoch_d_period).mean()
-            
-            # Assign to result DataFrame
-            result_df['stoch_k'] = stoch_k_slow
-            result_df['stoch_d'] = stoch_d
-            
-            # Add overbought/oversold flags (1 if condition met, 0 otherwise)
-            result_df['stoch_overbought'] = (stoch_k_slow > stoch_overbought_threshold).astype(int)
-            result_df['stoch_oversold'] = (stoch_k_slow < stoch_oversold_threshold).astype(int)
-            
-        except Exception as e:
-            logger.warning(f"Error calculating slow stochastics: {e}")
+    if plan is None or plan.wants('stochastic'):
+        stoch_config = config['momentum_indicators']['stochastic']
+        stoch_k_period = stoch_config['k_period']  # 14
+        stoch_d_period = stoch_config['d_period']  # 3
+        stoch_smooth_k = stoch_config['smooth_k']  # 3
+        stoch_overbought_threshold = stoch_config['overbought']  # 80
+        stoch_oversold_threshold = stoch_config['oversold']  # 20
+        
+        # Calculate slow stochastics manually to match ICE Connect (SIMPLE, SIMPLE)
+        # ICE Connect uses: SSTOC(..., 14, 3, 3, SIMPLE, SIMPLE)
+        # This means:
+        # 1. Calculate raw %K (14-period): %K_raw = 100 * (Close - Lowest Low) / (Highest High - Lowest Low)
+        # 2. Smooth %K by 3 periods (SIMPLE moving average): %K_slow = SMA(%K_raw, 3)
+        # 3. Calculate %D as 3-period SMA of slow %K: %D = SMA(%K_slow, 3)
+        min_periods_needed = stoch_k_period + stoch_smooth_k + stoch_d_period - 2  # 14 + 3 + 3 - 2 = 18
+        
+        if len(result_df) >= min_periods_needed:
+            try:
+                # Step 1: Calculate raw %K (14-period)
+                # %K_raw = 100 * (Close - Lowest Low in 14 periods) / (Highest High in 14 periods - Lowest Low in 14 periods)
+                high_rolling = result_df['high'].rolling(window=stoch_k_period, min_periods=stoch_k_period)
+                low_rolling = result_df['low'].rolling(window=stoch_k_period, min_periods=stoch_k_period)
+                
+                highest_high = high_rolling.max()
+                lowest_low = low_rolling.min()
+                
+                # Calculate raw %K
+                denominator = highest_high - lowest_low
+                # Avoid division by zero
+                denominator = denominator.replace(0, np.nan)
+                stoch_k_raw = 100 * (result_df['close'] - lowest_low) / denominator
+                
+                # Step 2: Smooth %K by 3 periods (SIMPLE moving average)
+                stoch_k_slow = stoch_k_raw.rolling(window=stoch_smooth_k, min_periods=stoch_smooth_k).mean()
+                
+                # Step 3: Calculate %D as 3-period SMA of slow %K
+                stoch_d = stoch_k_slow.rolling(window=stoch_d_period, min_periods=stoch_d_period).mean()
+                
+                # Assign to result DataFrame
+                result_df['stoch_k'] = stoch_k_slow
+                result_df['stoch_d'] = stoch_d
+                
+                # Add overbought/oversold flags (1 if condition met, 0 otherwise)
+                result_df['stoch_overbought'] = (stoch_k_slow > stoch_overbought_threshold).astype(int)
+                result_df['stoch_oversold'] = (stoch_k_slow < stoch_oversold_threshold).astype(int)
+                
+            except Exception as e:
+                logger.warning(f"Error calculating slow stochastics: {e}")
+                result_df['stoch_k'] = np.nan
+                result_df['stoch_d'] = np.nan
+                result_df['stoch_overbought'] = np.nan
+                result_df['stoch_oversold'] = np.nan
+        else:
             result_df['stoch_k'] = np.nan
             result_df['stoch_d'] = np.nan
             result_df['stoch_overbought'] = np.nan
             result_df['stoch_oversold'] = np.nan
-    else:
-        result_df['stoch_k'] = np.nan
-        result_df['stoch_d'] = np.nan
-        result_df['stoch_overbought'] = np.nan
-        result_df['stoch_oversold'] = np.nan
-        logger.debug(f"Insufficient data for Slow Stochastic: {len(result_df)} rows available, need {min_periods_needed}")
+            logger.debug(f"Insufficient data for Slow Stochastic: {len(result_df)} rows available, need {min_periods_needed}")
     
     # Step 4.4: Rate of Change (ROC)
     roc_config = config['momentum_indicators']['roc']
     roc_periods = roc_config['periods']
     
     for roc_period in roc_periods:
+        if plan is not None and not plan.wants_column('roc' if roc_period == 1 else f'roc_{roc_period}w'):
+            continue
         if len(result_df) >= roc_period:
             # Calculate ROC using pandas_ta
             roc = ta.roc(close=result_df['close'], length=roc_period)
@@ -1384,105 +1499,117 @@ def calculate_technical_indicators(df, symbol_info, config):
     # PHASE 5: Oscillators and Aroon
     
     # Step 5.1: CCI (Commodity Channel Index)
-    cci_config = config['oscillators']['cci']
-    cci_period = cci_config['period']
-    cci_overbought_threshold = cci_config['overbought']
-    cci_oversold_threshold = cci_config['oversold']
-    
-    if len(result_df) >= cci_period:
-        # Calculate CCI using pandas_ta
-        cci = ta.cci(
-            high=result_df['high'],
-            low=result_df['low'],
-            close=result_df['close'],
-            length=cci_period
-        )
-        
-        if cci is not None and len(cci) > 0:
-            result_df['cci'] = cci
+    if plan is None or plan.wants('cci'):
+        cci_config = config['oscillators']['cci']
+        cci_period = cci_config['period']
+        cci_overbought_threshold = cci_config['overbought']
+        cci_oversold_threshold = cci_config['oversold']
+        
+        if len(result_df) >= cci_period:
+            # Calculate CCI using pandas_ta
+            cci = ta.cci(
+                high=result_df['high'],
+                low=result_df['low'],
+                close=result_df['close'],
+                length=cci_period
+            )
             
-            # Add overbought/oversold flags
-            result_df['cci_overbought'] = (cci > cci_overbought_threshold).astype(int)
-            result_df['cci_oversold'] = (cci < cci_oversold_threshold).astype(int)
+            if cci is not None and len(cci) > 0:
+                result_df['cci'] = cci
+                
+                # Add overbought/oversold flags
+                result_df['cci_overbought'] = (cci > cci_overbought_threshold).astype(int)
+                result_df['cci_oversold'] = (cci < cci_oversold_threshold).astype(int)
+            else:
+                result_df['cci'] = np.nan
+                result_df['cci_overbought'] = np.nan
+                result_df['cci_oversold'] = np.nan
         else:
             result_df['cci'] = np.nan
             result_df['cci_overbought'] = np.nan
             result_df['cci_oversold'] = np.nan
-    else:
-        result_df['cci'] = np.nan
-        result_df['cci_overbought'] = np.nan
-        result_df['cci_oversold'] = np.nan
-        logger.debug(f"Insufficient data for CCI: {len(result_df)} rows available, need {cci_period}")
+            logger.debug(f"Insufficient data for CCI: {len(result_df)} rows available, need {cci_period}")
     
     # Step 5.2: Williams %R
-    williams_r_config = config['oscillators']['williams_r']
-    williams_r_period = williams_r_config['period']
-    williams_r_overbought_threshold = williams_r_config['overbought']
-    williams_r_oversold_threshold = williams_r_config['oversold']
-    
-    if len(result_df) >= williams_r_period:
-        # Calculate Williams %R using pandas_ta
-        williams_r = ta.willr(
-            high=result_df['high'],
-            low=result_df['low'],
-            close=result_df['close'],
-            length=williams_r_period
-        )
-        
-        if williams_r is not None and len(williams_r) > 0:
-            result_df['williams_r'] = williams_r
+    if plan is None or plan.wants('williams_r'):
+        williams_r_config = config['oscillators']['williams_r']
+        williams_r_period = williams_r_config['period']
+        williams_r_overbought_threshold = williams_r_config['overbought']
+        williams_r_oversold_threshold = williams_r_config['oversold']
+        
+        if len(result_df) >= williams_r_period:
+            # Calculate Williams %R using pandas_ta
+            williams_r = ta.willr(
+                high=result_df['high'],
+                low=result_df['low'],
+                close=result_df['close'],
+                length=williams_r_period
+            )
             
-            # Add overbought/oversold flags (note: Williams %R is inverted, so thresholds are negative)
-            result_df['williams_r_overbought'] = (williams_r > williams_r_overbought_threshold).astype(int)
-            result_df['williams_r_oversold'] = (williams_r < williams_r_oversold_threshold).astype(int)
+            if williams_r is not None and len(williams_r) > 0:
+                result_df['williams_r'] = williams_r
+                
+                # Add overbought/oversold flags (note: Williams %R is inverted, so thresholds are negative)
+                result_df['williams_r_overbought'] = (williams_r > williams_r_overbought_threshold).astype(int)
+                result_df['williams_r_oversold'] = (williams_r < williams_r_oversold_threshold).astype(int)
+            else:
+                result_df['williams_r'] = np.nan
+                result_df['williams_r_overbought'] = np.nan
+                result_df['williams_r_oversold'] = np.nan
         else:
             result_df['williams_r'] = np.nan
             result_df['williams_r_overbought'] = np.nan
             result_df['williams_r_oversold'] = np.nan
-    else:
-        result_df['williams_r'] = np.nan
-        result_df['williams_r_overbought'] = np.nan
-        result_df['williams_r_oversold'] = np.nan
-        logger.debug(f"Insufficient data for Williams %R: {len(result_df)} rows available, need {williams_r_period}")
+            logger.debug(f"Insufficient data for Williams %R: {len(result_df)} rows available, need {williams_r_period}")
     
     # Step 5.3: Aroon
-    aroon_config = config['aroon']
-    aroon_period = aroon_config['period']
-    aroon_strong_uptrend_threshold = aroon_config['strong_uptrend_threshold']
-    aroon_strong_downtrend_threshold = aroon_config['strong_downtrend_threshold']
-    
-    if len(result_df) >= aroon_period:
-        # Calculate Aroon using pandas_ta
-        aroon_result = ta.aroon(
-            high=result_df['high'],
-            low=result_df['low'],
-            length=aroon_period
-        )
-        
-        if aroon_result is not None and len(aroon_result) > 0:
-            # pandas_ta returns DataFrame with columns: AROONU_14, AROOND_14
-            aroonu_col = f'AROONU_{aroon_period}'
-            aroond_col = f'AROOND_{aroon_period}'
+    if precomputed and 'aroon_up' in precomputed:
+        for col in ('aroon_up', 'aroon_down', 'aroon_oscillator', 'aroon_strong_uptrend', 'aroon_strong_downtrend'):
+            result_df[col] = precomputed[col]
+    elif plan is None or plan.wants('aroon'):
+        aroon_config = config['aroon']
+        aroon_period = aroon_config['period']
+        aroon_strong_uptrend_threshold = aroon_config['strong_uptrend_threshold']
+        aroon_strong_downtrend_threshold = aroon_config['strong_downtrend_threshold']
+        
+        if len(result_df) >= aroon_period:
+            # Calculate Aroon using pandas_ta
+            aroon_result = ta.aroon(
+                high=result_df['high'],
+                low=result_df['low'],
+                length=aroon_period
+            )
             
-            if aroonu_col in aroon_result.columns and aroond_col in aroon_result.columns:
-                result_df['aroon_up'] = aroon_result[aroonu_col]
-                result_df['aroon_down'] = aroon_result[aroond_col]
-                
-                # Calculate Aroon Oscillator (Aroon Up - Aroon Down)
-                result_df['aroon_oscillator'] = aroon_result[aroonu_col] - aroon_result[aroond_col]
-                
-                # Add trend flags
-                # Strong uptrend: Aroon Up > threshold AND Aroon Down < (100 - threshold)
-                # Strong downtrend: Aroon Down > threshold AND Aroon Up < (100 - threshold)
-                result_df['aroon_strong_uptrend'] = (
-                    (aroon_result[aroonu_col] > aroon_strong_uptrend_threshold) & 
-                    (aroon_result[aroond_col] < (100 - aroon_strong_uptrend_threshold))
-                ).astype(int)
+            if aroon_result is not None and len(aroon_result) > 0:
+                # pandas_ta returns DataFrame with columns: AROONU_14, AROOND_14
+                aroonu_col = f'AROONU_{aroon_period}'
+                aroond_col = f'AROOND_{aroon_period}'
                 
-                result_df['aroon_strong_downtrend'] = (
-                    (aroon_result[aroond_col] > aroon_strong_downtrend_threshold) & 
-                    (aroon_result[aroonu_col] < (100 - aroon_strong_downtrend_threshold))
-                ).astype(int)
+                if aroonu_col in aroon_result.columns and aroond_col in aroon_result.columns:
+                    result_df['aroon_up'] = aroon_result[aroonu_col]
+                    result_df['aroon_down'] = aroon_result[aroond_col]
+                    
+                    # Calculate Aroon Oscillator (Aroon Up - Aroon Down)
+                    result_df['aroon_oscillator'] = aroon_result[aroonu_col] - aroon_result[aroond_col]
+                    
+                    # Add trend flags
+                    # Strong uptrend: Aroon Up > threshold AND Aroon Down < (100 - threshold)
+                    # Strong downtrend: Aroon Down > threshold AND Aroon Up < (100 - threshold)
+                    result_df['aroon_strong_uptrend'] = (
+                        (aroon_result[aroonu_col] > aroon_strong_uptrend_threshold) & 
+                        (aroon_result[aroond_col] < (100 - aroon_strong_uptrend_threshold))
+                    ).astype(int)
+                    
+                    result_df['aroon_strong_downtrend'] = (
+                        (aroon_result[aroond_col] > aroon_strong_downtrend_threshold) & 
+                        (aroon_result[aroonu_col] < (100 - aroon_strong_downtrend_threshold))
+                    ).astype(int)
+                else:
+                    result_df['aroon_up'] = np.nan
+                    result_df['aroon_down'] = np.nan
+                    result_df['aroon_oscillator'] = np.nan
+                    result_df['aroon_strong_uptrend'] = np.nan
+                    result_df['aroon_strong_downtrend'] = np.nan
             else:
                 result_df['aroon_up'] = np.nan
                 result_df['aroon_down'] = np.nan
@@ -1495,44 +1622,44 @@ def calculate_technical_indicators(df, symbol_info, config):
             result_df['aroon_oscillator'] = np.nan
             result_df['aroon_strong_uptrend'] = np.nan
             result_df['aroon_strong_downtrend'] = np.nan
-    else:
-        result_df['aroon_up'] = np.nan
-        result_df['aroon_down'] = np.nan
-        result_df['aroon_oscillator'] = np.nan
-        result_df['aroon_strong_uptrend'] = np.nan
-        result_df['aroon_strong_downtrend'] = np.nan
-        logger.debug(f"Insufficient data for Aroon: {len(result_df)} rows available, need {aroon_period}")
+            logger.debug(f"Insufficient data for Aroon: {len(result_df)} rows available, need {aroon_period}")
     
     logger.debug(f"Phase 5 indicators calculated: CCI, Williams %R, Aroon")
     
     # PHASE 6: Volatility Indicators
     
     # Step 6.1: Bollinger Bands
-    bb_config = config['volatility']['bollinger_bands']
-    bb_period = bb_config['period']
-    bb_std_dev = bb_config['std_dev']
-    
-    if len(result_df) >= bb_period:
-        # Calculate Bollinger Bands using pandas_ta
-        bb_result = ta.bbands(
-            close=result_df['close'],
-            length=bb_period,
-            std=bb_std_dev
-        )
-        
-        if bb_result is not None and len(bb_result) > 0:
-            # pandas_ta returns DataFrame with columns: BBU_20_2.0, BBM_20_2.0, BBL_20_2.0
-            bbu_col = f'BBU_{bb_period}_{bb_std_dev}'
-            bbm_col = f'BBM_{bb_period}_{bb_std_dev}'
-            bbl_col = f'BBL_{bb_period}_{bb_std_dev}'
+    if plan is None or plan.wants('bollinger'):
+        bb_config = config['volatility']['bollinger_bands']
+        bb_period = bb_config['period']
+        bb_std_dev = bb_config['std_dev']
+        
+        if len(result_df) >= bb_period:
+            # Calculate Bollinger Bands using pandas_ta
+            bb_result = ta.bbands(
+                close=result_df['close'],
+                length=bb_period,
+                std=bb_std_dev
+            )
             
-            if bbu_col in bb_result.columns and bbm_col in bb_result.columns and bbl_col in bb_result.columns:
-                result_df['bb_upper'] = bb_result[bbu_col]
-                result_df['bb_middle'] = bb_result[bbm_col]
-                result_df['bb_lower'] = bb_result[bbl_col]
+            if bb_result is not None and len(bb_result) > 0:
+                # pandas_ta returns DataFrame with columns: BBU_20_2.0, BBM_20_2.0, BBL_20_2.0
+                bbu_col = f'BBU_{bb_period}_{bb_std_dev}'
+                bbm_col = f'BBM_{bb_period}_{bb_std_dev}'
+                bbl_col = f'BBL_{bb_period}_{bb_std_dev}'
                 
-                # Calculate Bollinger Band Width % = ((Upper - Lower) / Middle) * 100
-                result_df['bb_width_pct'] = ((bb_result[bbu_col] - bb_result[bbl_col]) / bb_result[bbm_col]) * 100
+                if bbu_col in bb_result.columns and bbm_col in bb_result.columns and bbl_col in bb_result.columns:
+                    result_df['bb_upper'] = bb_result[bbu_col]
+                    result_df['bb_middle'] = bb_result[bbm_col]
+                    result_df['bb_lower'] = bb_result[bbl_col]
+                    
+                    # Calculate Bollinger Band Width % = ((Upper - Lower) / Middle) * 100
+                    result_df['bb_width_pct'] = ((bb_result[bbu_col] - bb_result[bbl_col]) / bb_result[bbm_col]) * 100
+                else:
+                    result_df['bb_upper'] = np.nan
+                    result_df['bb_middle'] = np.nan
+                    result_df['bb_lower'] = np.nan
+                    result_df['bb_width_pct'] = np.nan
             else:
                 result_df['bb_upper'] = np.nan
                 result_df['bb_middle'] = np.nan
@@ -1543,96 +1670,95 @@ def calculate_technical_indicators(df, symbol_info, config):
             result_df['bb_middle'] = np.nan
             result_df['bb_lower'] = np.nan
             result_df['bb_width_pct'] = np.nan
-    else:
-        result_df['bb_upper'] = np.nan
-        result_df['bb_middle'] = np.nan
-        result_df['bb_lower'] = np.nan
-        result_df['bb_width_pct'] = np.nan
-        logger.debug(f"Insufficient data for Bollinger Bands: {len(result_df)} rows available, need {bb_period}")
+            logger.debug(f"Insufficient data for Bollinger Bands: {len(result_df)} rows available, need {bb_period}")
     
     # Step 6.2: ATR (Average True Range)
-    atr_config = config['volatility']['atr']
-    atr_period = atr_config['period']
-    
-    if len(result_df) >= atr_period:
-        # Calculate ATR using pandas_ta
-        atr = ta.atr(
-            high=result_df['high'],
-            low=result_df['low'],
-            close=result_df['close'],
-            length=atr_period
-        )
-        
-        if atr is not None and len(atr) > 0:
-            result_df['atr'] = atr
+    if plan is None or plan.wants('atr'):
+        atr_config = config['volatility']['atr']
+        atr_period = atr_config['period']
+        
+        if len(result_df) >= atr_period:
+            # Calculate ATR using pandas_ta
+            atr = ta.atr(
+                high=result_df['high'],
+                low=result_df['low'],
+                close=result_df['close'],
+                length=atr_period
+            )
             
-            # Calculate ATR % of price = (ATR / Close) * 100
-            result_df['atr_pct_of_price'] = (atr / result_df['close']) * 100
+            if atr is not None and len(atr) > 0:
+                result_df['atr'] = atr
+                
+                # Calculate ATR % of price = (ATR / Close) * 100
+                result_df['atr_pct_of_price'] = (atr / result_df['close']) * 100
+            else:
+                result_df['atr'] = np.nan
+                result_df['atr_pct_of_price'] = np.nan
         else:
             result_df['atr'] = np.nan
             result_df['atr_pct_of_price'] = np.nan
-    else:
-        result_df['atr'] = np.nan
-        result_df['atr_pct_of_price'] = np.nan
-        logger.debug(f"Insufficient data for ATR: {len(result_df)} rows available, need {atr_period}")
+            logger.debug(f"Insufficient data for ATR: {len(result_df)} rows available, need {atr_period}")
     
     # Step 6.3: Historical Volatility
-    hv_config = config['volatility']['historical_volatility']
-    hv_period = hv_config['period']
-    
-    if len(result_df) >= hv_period + 1:  # Need at least period+1 for returns calculation
-        # Calculate historical volatility as rolling standard deviation of returns, annualized
-        # First calculate weekly returns
-        returns = result_df['close'].pct_change()
-        
-        # Calculate rolling standard deviation of returns
-        rolling_std = returns.rolling(window=hv_period).std()
+    if plan is None or plan.wants('historical_volatility'):
+        hv_config = config['volatility']['historical_volatility']
+        hv_period = hv_config['period']
         
-        # Annualize: multiply by sqrt(52) for weekly data (52 weeks per year)
-        # Historical volatility = rolling_std * sqrt(52) * 100 (to convert to percentage)
-        result_df['historical_volatility_20w'] = rolling_std * np.sqrt(52) * 100
-    else:
-        result_df['historical_volatility_20w'] = np.nan
-        logger.debug(f"Insufficient data for Historical Volatility: {len(result_df)} rows available, need {hv_period + 1}")
+        if len(result_df) >= hv_period + 1:  # Need at least period+1 for returns calculation
+            # Calculate historical volatility as rolling standard deviation of returns, annualized
+            # First calculate weekly returns
+            returns = result_df['close'].pct_change()
+            
+            # Calculate rolling standard deviation of returns
+            rolling_std = returns.rolling(window=hv_period).std()
+            
+            # Annualize: multiply by sqrt(52) for weekly data (52 weeks per year)
+            # Historical volatility = rolling_std * sqrt(52) * 100 (to convert to percentage)
+            result_df['historical_volatility_20w'] = rolling_std * np.sqrt(52) * 100
+        else:
+            result_df['historical_volatility_20w'] = np.nan
+            logger.debug(f"Insufficient data for Historical Volatility: {len(result_df)} rows available, need {hv_period + 1}")
     
     logger.debug(f"Phase 6 indicators calculated: Bollinger Bands, ATR, Historical Volatility")
     
     # PHASE 7: Statistical Measures
     
     # Step 7.1: Z-score
-    zscore_config = config['statistical']['zscore']
-    zscore_period = zscore_config['period']
-    
-    if len(result_df) >= zscore_period:
-        # Calculate rolling mean and standard deviation
-        rolling_mean = result_df['close'].rolling(window=zscore_period).mean()
-        rolling_std = result_df['close'].rolling(window=zscore_period).std()
+    if plan is None or plan.wants('zscore'):
+        zscore_config = config['statistical']['zscore']
+        zscore_period = zscore_config['period']
         
-        # Calculate Z-score = (value - mean) / std_dev
-        result_df['zscore'] = (result_df['close'] - rolling_mean) / rolling_std
-    else:
-        result_df['zscore'] = np.nan
-        logger.debug(f"Insufficient data for Z-score: {len(result_df)} rows available, need {zscore_period}")
+        if len(result_df) >= zscore_period:
+            # Calculate rolling mean and standard deviation
+            rolling_mean = result_df['close'].rolling(window=zscore_period).mean()
+            rolling_std = result_df['close'].rolling(window=zscore_period).std()
+            
+            # Calculate Z-score = (value - mean) / std_dev
+            result_df['zscore'] = (result_df['close'] - rolling_mean) / rolling_std
+        else:
+            result_df['zscore'] = np.nan
+            logger.debug(f"Insufficient data for Z-score: {len(result_df)} rows available, need {zscore_period}")
     
     # Step 7.2: Coefficient of Variation
-    cv_config = config['statistical']['coefficient_of_variation']
-    cv_period = cv_config['period']
-    
-    if len(result_df) >= cv_period:
-        # Calculate rolling mean and standard deviation
-        rolling_mean = result_df['close'].rolling(window=cv_period).mean()
-        rolling_std = result_df['close'].rolling(window=cv_period).std()
-        
-        # Coefficient of Variation = (std_dev / mean) * 100
-        # Handle division by zero
-        result_df['coefficient_of_variation'] = np.where(
-            rolling_mean != 0,
-            (rolling_std / rolling_mean) * 100,
-            np.nan
-        )
-    else:
-        result_df['coefficient_of_variation'] = np.nan
-        logger.debug(f"Insufficient data for Coefficient of Variation: {len(result_df)} rows available, need {cv_period}")
+    if plan is None or plan.wants('coefficient_of_variation'):
+        cv_config = config['statistical']['coefficient_of_variation']
+        cv_period = cv_config['period']
+        
+        if len(result_df) >= cv_period:
+            # Calculate rolling mean and standard deviation
+            rolling_mean = result_df['close'].rolling(window=cv_period).mean()
+            rolling_std = result_df['close'].rolling(window=cv_period).std()
+            
+            # Coefficient of Variation = (std_dev / mean) * 100
+            # Handle division by zero
+            result_df['coefficient_of_variation'] = np.where(
+                rolling_mean != 0,
+                (rolling_std / rolling_mean) * 100,
+                np.nan
+            )
+        else:
+            result_df['coefficient_of_variation'] = np.nan
+            logger.debug(f"Insufficient data for Coefficient of Variation: {len(result_df)} rows available, need {cv_period}")
     
     # Step 7.3: Percentiles (5-year rolling lookback)
     percentiles_config = config['statistical']['percentiles']
@@ -1641,6 +1767,8 @@ def calculate_technical_indicators(df, symbol_info, config):
     
     # Calculate percentiles for each indicator using rolling window
     for indicator in percentile_indicators:
+        if plan is not None and not plan.wants_column(PERCENTILE_COLUMNS.get(indicator)):
+            continue
         if indicator == 'close':
             # Use close price
             data_series = result_df['close']
@@ -1735,164 +1863,212 @@ def calculate_technical_indicators(df, symbol_info, config):
     # PHASE 8: 4-Factor Markov Model
     
     # Step 8.1: State Classification
-    markov_config = config['markov_model']
-    state_config = markov_config['state_classification']
-    transition_config = markov_config['transition_matrix']
-    
-    adx_strong_threshold = state_config['adx_strong_threshold']
-    rsi_overbought = state_config['rsi_overbought']
-    rsi_oversold = state_config['rsi_oversold']
-    ema_short = state_config['ema_short']
-    ema_medium = state_config['ema_medium']
-    ema_long = state_config['ema_long']
-    lookback_weeks = transition_config['lookback_weeks']
-    
-    # Check if required indicators are available
-    required_cols = ['close', 'adx', 'macd_line', 'rsi']
-    ema_cols = [f'ema_{ema_short}', f'ema_{ema_medium}', f'ema_{ema_long}']
-    
-    if all(col in result_df.columns for col in required_cols) and all(col in result_df.columns for col in ema_cols):
-        # Classify each week into one of 4 states
-        # State 1: Strong Bullish - High momentum, price above MAs, strong trend
-        # State 2: Weak Bullish - Low momentum, price above MAs but weakening
-        # State 3: Weak Bearish - Low momentum, price below MAs but weakening
-        # State 4: Strong Bearish - High momentum, price below MAs, strong downtrend
-        
-        markov_states = []
-        
-        for i in range(len(result_df)):
-            close_val = result_df['close'].iloc[i]
-            adx_val = result_df['adx'].iloc[i]
-            macd_val = result_df['macd_line'].iloc[i]
-            rsi_val = result_df['rsi'].iloc[i]
-            ema_short_val = result_df[f'ema_{ema_short}'].iloc[i]
-            ema_medium_val = result_df[f'ema_{ema_medium}'].iloc[i]
-            ema_long_val = result_df[f'ema_{ema_long}'].iloc[i]
-            
-            # Check if all values are valid
-            if pd.isna(close_val) or pd.isna(adx_val) or pd.isna(macd_val) or pd.isna(rsi_val) or \
-               pd.isna(ema_short_val) or pd.isna(ema_medium_val) or pd.isna(ema_long_val):
-                markov_states.append(np.nan)
-                continue
+    if plan is None or plan.wants('markov'):
+        markov_config = config['markov_model']
+        state_config = markov_config['state_classification']
+        transition_config = markov_config['transition_matrix']
+        
+        adx_strong_threshold = state_config['adx_strong_threshold']
+        rsi_overbought = state_config['rsi_overbought']
+        rsi_oversold = state_config['rsi_oversold']
+        ema_short = state_config['ema_short']
+        ema_medium = state_config['ema_medium']
+        ema_long = state_config['ema_long']
+        lookback_weeks = transition_config['lookback_weeks']
+        
+        # Check if required indicators are available
+        required_cols = ['close', 'adx', 'macd_line', 'rsi']
+        ema_cols = [f'ema_{ema_short}', f'ema_{ema_medium}', f'ema_{ema_long}']
+        
+        if all(col in result_df.columns for col in required_cols) and all(col in result_df.columns for col in ema_cols):
+            # Classify each week into one of 4 states
+            # State 1: Strong Bullish - High momentum, price above MAs, strong trend
+            # State 2: Weak Bullish - Low momentum, price above MAs but weakening
+            # State 3: Weak Bearish - Low momentum, price below MAs but weakening
+            # State 4: Strong Bearish - High momentum, price below MAs, strong downtrend
+            
+            markov_states = []
             
-            # Determine price position relative to EMAs
-            price_above_short = close_val > ema_short_val
-            price_above_medium = close_val > ema_medium_val
-            price_above_long = close_val > ema_long_val
-            
-            # Count how many EMAs price is above
-            emas_above = sum([price_above_short, price_above_medium, price_above_long])
-            
-            # Determine trend strength
-            strong_trend = adx_val > adx_strong_threshold
-            
-            # Determine momentum direction
-            bullish_momentum = macd_val > 0
-            
-            # Determine RSI condition
-            rsi_overbought_cond = rsi_val > rsi_overbought
-            rsi_oversold_cond = rsi_val < rsi_oversold
-            rsi_neutral = not rsi_overbought_cond and not rsi_oversold_cond
-            
-            # Classify state
-            if emas_above >= 2 and strong_trend and bullish_momentum:
-                # Strong Bullish: Price above most MAs, strong trend, bullish momentum
-                state = 1
-            elif emas_above >= 2 and (not strong_trend or not bullish_momentum):
-                # Weak Bullish: Price above MAs but weak trend or momentum
-                state = 2
-            elif emas_above < 2 and (not strong_trend or bullish_momentum):
-                # Weak Bearish: Price below MAs but weak trend or still some bullish momentum
-                state = 3
-            elif emas_above < 2 and strong_trend and not bullish_momentum:
-                # Strong Bearish: Price below MAs, strong trend, bearish momentum
-                state = 4
-            else:
-                # Default classification based on price position
-                if emas_above >= 2:
-                    state = 2  # Weak Bullish
+            for i in range(len(result_df)):
+                close_val = result_df['close'].iloc[i]
+                adx_val = result_df['adx'].iloc[i]
+                macd_val = result_df['macd_line'].iloc[i]
+                rsi_val = result_df['rsi'].iloc[i]
+                ema_short_val = result_df[f'ema_{ema_short}'].iloc[i]
+                ema_medium_val = result_df[f'ema_{ema_medium}'].iloc[i]
+                ema_long_val = result_df[f'ema_{ema_long}'].iloc[i]
+                
+                # Check if all values are valid
+                if pd.isna(close_val) or pd.isna(adx_val) or pd.isna(macd_val) or pd.isna(rsi_val) or \
+                   pd.isna(ema_short_val) or pd.isna(ema_medium_val) or pd.isna(ema_long_val):
+                    markov_states.append(np.nan)
+                    continue
+                
+                # Determine price position relative to EMAs
+                price_above_short = close_val > ema_short_val
+                price_above_medium = close_val > ema_medium_val
+                price_above_long = close_val > ema_long_val
+                
+                # Count how many EMAs price is above
+                emas_above = sum([price_above_short, price_above_medium, price_above_long])
+                
+                # Determine trend strength
+                strong_trend = adx_val > adx_strong_threshold
+                
+                # Determine momentum direction
+                bullish_momentum = macd_val > 0
+                
+                # Determine RSI condition
+                rsi_overbought_cond = rsi_val > rsi_overbought
+                rsi_oversold_cond = rsi_val < rsi_oversold
+                rsi_neutral = not rsi_overbought_cond and not rsi_oversold_cond
+                
+                # Classify state
+                if emas_above >= 2 and strong_trend and bullish_momentum:
+                    # Strong Bullish: Price above most MAs, strong trend, bullish momentum
+                    state = 1
+                elif emas_above >= 2 and (not strong_trend or not bullish_momentum):
+                    # Weak Bullish: Price above MAs but weak trend or momentum
+                    state = 2
+                elif emas_above < 2 and (not strong_trend or bullish_momentum):
+                    # Weak Bearish: Price below MAs but weak trend or still some bullish momentum
+                    state = 3
+                elif emas_above < 2 and strong_trend and not bullish_momentum:
+                    # Strong Bearish: Price below MAs, strong trend, bearish momentum
+                    state = 4
                 else:
-                    state = 3  # Weak Bearish
+                    # Default classification based on price position
+                    if emas_above >= 2:
+                        state = 2  # Weak Bullish
+                    else:
+                        state = 3  # Weak Bearish
+                
+                markov_states.append(state)
             
-            markov_states.append(state)
-        
-        result_df['markov_state'] = markov_states
-        
-        # Step 8.2: Transition Probabilities
-        # Calculate 4x4 transition matrix using rolling window
-        transition_probabilities = {
-            'markov_prob_state_1': [],
-            'markov_prob_state_2': [],
-            'markov_prob_state_3': [],
-            'markov_prob_state_4': []
-        }
-        
-        for i in range(len(result_df)):
-            if i < lookback_weeks:
-                # Not enough data for full window - use available data
-                window_states = result_df['markov_state'].iloc[:i+1]
-            else:
-                # Full window available
-                window_states = result_df['markov_state'].iloc[i - lookback_weeks + 1:i + 1]
-            
-            # Get current state
-            current_state = result_df['markov_state'].iloc[i]
-            
-            if pd.isna(current_state) or len(window_states) < 2:
-                # Not enough data or invalid state
-                transition_probabilities['markov_prob_state_1'].append(np.nan)
-                transition_probabilities['markov_prob_state_2'].append(np.nan)
-                transition_probabilities['markov_prob_state_3'].append(np.nan)
-                transition_probabilities['markov_prob_state_4'].append(np.nan)
-                continue
+            result_df['markov_state'] = markov_states
             
-            # Calculate transition probabilities
-            # Count transitions from current state to each next state
-            transitions = {1: 0, 2: 0, 3: 0, 4: 0}
-            total_transitions = 0
-            
-            # Find all occurrences of current state in window and count next states
-            window_states_list = window_states.tolist()
-            for j in range(len(window_states_list) - 1):
-                if pd.notna(window_states_list[j]) and window_states_list[j] == current_state:
-                    next_state = window_states_list[j + 1]
-                    if pd.notna(next_state) and next_state in [1, 2, 3, 4]:
-                        transitions[int(next_state)] += 1
-                        total_transitions += 1
-            
-            # Calculate probabilities
-            if total_transitions > 0:
-                transition_probabilities['markov_prob_state_1'].append(transitions[1] / total_transitions)
-                transition_probabilities['markov_prob_state_2'].append(transitions[2] / total_transitions)
-                transition_probabilities['markov_prob_state_3'].append(transitions[3] / total_transitions)
-                transition_probabilities['markov_prob_state_4'].append(transitions[4] / total_transitions)
-            else:
-                # No transitions found - use equal probabilities or NaN
-                transition_probabilities['markov_prob_state_1'].append(np.nan)
-                transition_probabilities['markov_prob_state_2'].append(np.nan)
-                transition_probabilities['markov_prob_state_3'].append(np.nan)
-                transition_probabilities['markov_prob_state_4'].append(np.nan)
-        
-        # Add transition probability columns
-        result_df['markov_prob_state_1'] = transition_probabilities['markov_prob_state_1']
-        result_df['markov_prob_state_2'] = transition_probabilities['markov_prob_state_2']
-        result_df['markov_prob_state_3'] = transition_probabilities['markov_prob_state_3']
-        result_df['markov_prob_state_4'] = transition_probabilities['markov_prob_state_4']
-        
-    else:
-        # Missing required indicators
-        result_df['markov_state'] = np.nan
-        result_df['markov_prob_state_1'] = np.nan
-        result_df['markov_prob_state_2'] = np.nan
-        result_df['markov_prob_state_3'] = np.nan
-        result_df['markov_prob_state_4'] = np.nan
-        logger.debug(f"Missing required indicators for Markov model: need {required_cols + ema_cols}")
+            # Step 8.2: Transition Probabilities
+            # Calculate 4x4 transition matrix using rolling window
+            transition_probabilities = {
+                'markov_prob_state_1': [],
+                'markov_prob_state_2': [],
+                'markov_prob_state_3': [],
+                'markov_prob_state_4': []
+            }
+            
+            for i in range(len(result_df)):
+                if i < lookback_weeks:
+                    # Not enough data for full window - use available data
+                    window_states = result_df['markov_state'].iloc[:i+1]
+                else:
+                    # Full window available
+                    window_states = result_df['markov_state'].iloc[i - lookback_weeks + 1:i + 1]
+                
+                # Get current state
+                current_state = result_df['markov_state'].iloc[i]
+                
+                if pd.isna(current_state) or len(window_states) < 2:
+                    # Not enough data or invalid state
+                    transition_probabilities['markov_prob_state_1'].append(np.nan)
+                    transition_probabilities['markov_prob_state_2'].append(np.nan)
+                    transition_probabilities['markov_prob_state_3'].append(np.nan)
+                    transition_probabilities['markov_prob_state_4'].append(np.nan)
+                    continue
+                
+                # Calculate transition probabilities
+                # Count transitions from current state to each next state
+                transitions = {1: 0, 2: 0, 3: 0, 4: 0}
+                total_transitions = 0
+                
+                # Find all occurrences of current state in window and count next states
+                window_states_list = window_states.tolist()
+                for j in range(len(window_states_list) - 1):
+                    if pd.notna(window_states_list[j]) and window_states_list[j] == current_state:
+                        next_state = window_states_list[j + 1]
+                        if pd.notna(next_state) and next_state in [1, 2, 3, 4]:
+                            transitions[int(next_state)] += 1
+                            total_transitions += 1
+                
+                # Calculate probabilities
+                if total_transitions > 0:
+                    transition_probabilities['markov_prob_state_1'].append(transitions[1] / total_transitions)
+                    transition_probabilities['markov_prob_state_2'].append(transitions[2] / total_transitions)
+                    transition_probabilities['markov_prob_state_3'].append(transitions[3] / total_transitions)
+                    transition_probabilities['markov_prob_state_4'].append(transitions[4] / total_transitions)
+                else:
+                    # No transitions found - use equal probabilities or NaN
+                    transition_probabilities['markov_prob_state_1'].append(np.nan)
+                    transition_probabilities['markov_prob_state_2'].append(np.nan)
+                    transition_probabilities['markov_prob_state_3'].append(np.nan)
+                    transition_probabilities['markov_prob_state_4'].append(np.nan)
+            
+            # Add transition probability columns
+            result_df['markov_prob_state_1'] = transition_probabilities['markov_prob_state_1']
+            result_df['markov_prob_state_2'] = transition_probabilities['markov_prob_state_2']
+            result_df['markov_prob_state_3'] = transition_probabilities['markov_prob_state_3']
+            result_df['markov_prob_state_4'] = transition_probabilities['markov_prob_state_4']
+            
+        else:
+            # Missing required indicators
+            result_df['markov_state'] = np.nan
+            result_df['markov_prob_state_1'] = np.nan
+            result_df['markov_prob_state_2'] = np.nan
+            result_df['markov_prob_state_3'] = np.nan
+            result_df['markov_prob_state_4'] = np.nan
+            logger.debug(f"Missing required indicators for Markov model: need {required_cols + ema_cols}")
     
     logger.debug(f"Phase 8 indicators calculated: 4-Factor Markov Model")
     
     return result_df
 
 
+def get_indicator_code_version():
+    """
+    Identify the indicator calculation code for cache invalidation
+    
+    Hashes the source of calculate_technical_indicators, indicator_kernels and
+    panel_indicators together with the pandas_ta version, so any edit to the
+    calculation or library upgrade invalidates previously cached indicator results.
+    
+    Returns:
+        Short hex string
+    """
+    try:
+        source = (
+            inspect.getsource(calculate_technical_indicators)
+            + inspect.getsource(indicator_kernels)
+            + inspect.getsource(panel_indicators)
+        )
+    except (OSError, TypeError):
+        source = calculate_technical_indicators.__code__.co_code.hex()
+    ta_version = getattr(ta, 'version', getattr(ta, '__version__', '')) if PANDAS_TA_AVAILABLE else ''
+    return hashlib.sha256(f"{source}|{ta_version}|{pd.__version__}".encode('utf-8')).hexdigest()[:16]
+
+
+def calculate_path_dependent_indicators_batch(series_frames, config, plan=None):
+    """
+    Calculate ADX, SuperTrend, Parabolic SAR and Aroon for many series at once
+    
+    Runs the indicator_kernels recurrences (via PanelIndicatorEngine) over a
+    (bars x series) array instead of one pandas_ta call per series. Values, column
+    names and the insufficient-data fallbacks match the per-series blocks in
+    calculate_technical_indicators, so the result can be passed to it as
+    `precomputed`. Series with NaN in their OHLC are left out (computed per series).
+    
+    Args:
+        series_frames: Dictionary {key: OHLC DataFrame (Date index or column)}
+        config: Indicator configuration dictionary
+        plan: Optional IndicatorPlan; families outside the plan are skipped
+    
+    Returns:
+        Dictionary {key: {column: ndarray aligned to the date-sorted rows}}
+    """
+    panel = PanelIndicatorEngine(config, plan=plan).compute(
+        series_frames, families=('adx', 'supertrend', 'parabolic_sar', 'aroon')
+    )
+    return {key: panel.series_columns(key) for key in panel.keys}
+
+
 def calculate_spread_ohlc(symbol_1, symbol_2, component_data_dict):
     """
     Calculate spread OHLC from two component symbols' OHLC data
@@ -2084,7 +2260,10 @@ def pull_all_ohlc_data(
     max_workers_outrights=10,
     max_workers_spreads=20,
     config_file='study_settings/indicator_config.json',
-    external_logger=None
+    external_logger=None,
+    indicator_mode=None,
+    extra_indicator_columns=None,
+    use_indicator_cache=None
 ):
     """
     Pull OHLC data for all symbols and export to CSV files with technical indicators
@@ -2103,6 +2282,54 @@ def pull_all_ohlc_data(
         max_workers_spreads: Number of parallel workers for calculating spreads (default: 20)
         config_file: Path to indicator configuration JSON file
         external_logger: Optional logger to use instead of module-level logger (for unified logging)
+        indicator_mode: 'full' (every indicator, for research exports) or 'plan' (only the columns
+                        the signal generator consumes). Default: None = indicator_plan.mode from config
+        extra_indicator_columns: Extra columns/patterns/families to compute in plan mode (e.g. ['zscore', 'markov'])
+        use_indicator_cache: Reuse cached indicator results for series whose OHLC/config are unchanged.
+                             Default: None = indicator_cache.enabled from config
+    
+    Returns:
+        Path to the created CSV file
+    """
+    # Metrics registry: counters, gauges and latency histograms for every stage.
+    # The body starts its sampler thread; leaving the with block (early return or
+    # error included) stops it and writes the last export
+    with MetricsRegistry(namespace='ice_pull') as pull_metrics:
+        return _pull_all_ohlc_data(
+            pull_metrics,
+            symbols_file=symbols_file,
+            weeks_back=weeks_back,
+            output_dir=output_dir,
+            snapshot_date=snapshot_date,
+            max_workers_outrights=max_workers_outrights,
+            max_workers_spreads=max_workers_spreads,
+            config_file=config_file,
+            external_logger=external_logger,
+            indicator_mode=indicator_mode,
+            extra_indicator_columns=extra_indicator_columns,
+            use_indicator_cache=use_indicator_cache
+        )
+
+
+def _pull_all_ohlc_data(
+    pull_metrics,
+    symbols_file='lists_and_matrix/symbol_matrix.csv',
+    weeks_back=None,
+    output_dir='full_unfiltered_historicals',
+    snapshot_date=None,
+    max_workers_outrights=10,
+    max_workers_spreads=20,
+    config_file='study_settings/indicator_config.json',
+    external_logger=None,
+    indicator_mode=None,
+    extra_indicator_columns=None,
+    use_indicator_cache=None
+):
+    """
+    Body of pull_all_ohlc_data (see there for the arguments)
+    
+    Args:
+        pull_metrics: MetricsRegistry for this run; its sampler is stopped by the caller's with block
     
     Returns:
         Path to the created CSV file
@@ -2184,6 +2411,75 @@ def pull_all_ohlc_data(
     config = load_indicator_config(config_file)
     years_back = config['data_settings']['years_back']
     
+    # Counters, gauges and latency histograms for every stage.
+    # A sampler thread logs progress and exports them (Prometheus textfile + JSON)
+    metrics_config = config.get('pull_metrics', {})
+    fetch_latency = pull_metrics.histogram('outright_fetch_seconds', 'ICE fetch latency per outright symbol')
+    quarterly_latency = pull_metrics.histogram('quarterly_build_seconds', 'Quarterly OHLC build time per symbol')
+    spread_latency = pull_metrics.histogram('spread_build_seconds', 'Spread OHLC build time per spread')
+    correlation_latency = pull_metrics.histogram('correlation_seconds', 'Correlation/cointegration time per spread')
+    indicator_latency = {
+        family: pull_metrics.histogram('indicator_seconds', 'Indicator time per series', labels={'family': family})
+        for family in ('outright', 'quarterly', 'spread')
+    }
+    
+    def record_stage_duration(stage, seconds):
+        """Record the wall time of one pull stage"""
+        pull_metrics.gauge('stage_seconds', 'Wall time per pull stage', labels={'stage': stage}).set(round(seconds, 3))
+    
+    # Failed symbols are recorded from worker threads
+    failed_symbols_lock = Lock()
+    def record_failed_symbol(symbol, error=False):
+        """Add a symbol to stats['failed_symbols'] (and count an error)"""
+        with failed_symbols_lock:
+            if symbol not in stats['failed_symbols']:
+                stats['failed_symbols'].append(symbol)
+            if error:
+                stats['error_count'] += 1
+    
+    # Resolve which indicator families to compute (None = full mode)
+    indicator_plan = build_indicator_plan(config, mode=indicator_mode, extra_columns=extra_indicator_columns)
+    if indicator_plan is None:
+        data_logger.info("Indicator mode: full (computing every indicator family)")
+    else:
+        data_logger.info(f"Indicator mode: plan ({indicator_plan.describe(config)})")
+    
+    # Content-addressed indicator cache (skips unchanged series on reruns)
+    cache_config = config.get('indicator_cache', {})
+    if use_indicator_cache is None:
+        use_indicator_cache = cache_config.get('enabled', False)
+    indicator_cache = None
+    if use_indicator_cache and PANDAS_TA_AVAILABLE:
+        try:
+            indicator_cache = IndicatorCache(
+                cache_dir=cache_config.get('directory', DEFAULT_CACHE_DIR),
+                max_size_mb=cache_config.get('max_size_mb', DEFAULT_MAX_SIZE_MB),
+                code_version=get_indicator_code_version()
+            )
+            data_logger.info(f"Indicator cache: enabled ({indicator_cache.cache_dir}, max {cache_config.get('max_size_mb', DEFAULT_MAX_SIZE_MB)} MB)")
+        except Exception as e:
+            data_logger.warning(f"Indicator cache unavailable, computing all series: {e}")
+            indicator_cache = None
+    
+    use_batch_kernels = config.get('batch_kernels', {}).get('enabled', False) and PANDAS_TA_AVAILABLE
+    engine_config = config.get('indicator_engine', {})
+    use_panel_engine = engine_config.get('mode', 'per_series') == 'panel'
+    data_logger.info(f"Indicator engine: {'panel (all series at once)' if use_panel_engine else 'per series'}")
+    panel_result = None
+    batch_results = {}
+    
+    def compute_indicators(df, symbol_info, key):
+        """Calculate indicators for one series, through the cache when enabled."""
+        if panel_result is not None and key in panel_result:
+            compute = lambda: panel_result.series_frame(key)
+        else:
+            compute = lambda: calculate_technical_indicators(
+                df, symbol_info, config, plan=indicator_plan, precomputed=batch_results.get(key)
+            )
+        if indicator_cache is None:
+            return compute()
+        return indicator_cache.get_or_compute(df, config, indicator_plan, compute)
+    
     # For current processing: use 5 years (approximately 260 weeks) for indicator calculations
     # For historical processing: use 2 years (104 weeks) to avoid API hangs
     if weeks_back is None:
@@ -2408,39 +2704,68 @@ def pull_all_ohlc_data(
     data_logger.info(f"Using {max_workers} worker (serial processing) for reliable data fetching")
     
     outright_data_dict = {}  # Store outright data: {symbol: DataFrame}
-    # Thread-safe counters
-    counter_lock = Lock()
-    successful = 0
-    failed = 0
-    total_rows_fetched = 0
-    completed = 0
+    # Thread-safe counters (registry metrics)
+    outrights_completed = pull_metrics.counter('outright_fetch_completed_total', 'Outright fetches finished')
+    outrights_successful = pull_metrics.counter('outright_fetch_success_total', 'Outrights fetched with data')
+    outrights_failed = pull_metrics.counter('outright_fetch_failed_total', 'Outright fetches without data')
+    outright_rows = pull_metrics.counter('outright_rows_fetched_total', 'Weekly bars fetched for outrights')
     
     overall_start_time = datetime.now()
     
-    # Start periodic progress logging thread
-    progress_stop_event = Event()
-    def periodic_progress_logger():
-        """Log progress every 20 minutes to show activity during long operations"""
-        interval_seconds = 20 * 60  # 20 minutes
-        while not progress_stop_event.wait(interval_seconds):
+    # Stage reported by the metrics sampler's periodic progress log
+    progress = {
+        'label': 'Outright Fetch',
+        'unit': 'symbols',
+        'total': len(symbols_to_fetch),
+        'start_time': overall_start_time,
+        'completed': outrights_completed,
+        'successful': outrights_successful,
+        'failed': outrights_failed,
+    }
+    def log_periodic_progress(registry):
+        """Log progress of the running stage on every metrics sample (default every 20 minutes)"""
+        if not progress:
+            return
+        elapsed = (datetime.now() - progress['start_time']).total_seconds()
+        current_completed = progress['completed'].value
+        if current_completed > 0 and progress['total'] > 0:
+            rate = current_completed / elapsed if elapsed > 0 else 0
+            remaining = (progress['total'] - current_completed) / rate if rate > 0 else 0
+            data_logger.info(f"⏱️  PERIODIC PROGRESS UPDATE ({progress['label']}):")
+            data_logger.info(f"   Elapsed: {elapsed/3600:.2f} hours ({elapsed/60:.1f} minutes)")
+            data_logger.info(f"   Progress: {current_completed:,}/{progress['total']:,} ({current_completed/progress['total']*100:.1f}%)")
+            data_logger.info(f"   Success: {progress['successful'].value:,}, Failed: {progress['failed'].value:,}")
+            if rate > 0:
+                data_logger.info(f"   Rate: {rate:.2f} {progress['unit']}/sec, Est. remaining: {remaining/60:.1f} minutes")
+            data_logger.info("")
+    
+    metrics_dir = metrics_config.get('directory', DEFAULT_METRICS_DIR) if metrics_config.get('enabled', True) else None
+    pull_metrics.start_sampler(
+        metrics_config.get('sample_interval_seconds', DEFAULT_SAMPLE_INTERVAL_SECONDS),
+        on_sample=log_periodic_progress,
+        output_dir=metrics_dir
+    )
+    
+    def record_fetch_result(symbol, df, symbol_duration):
+        """Count one finished outright fetch and log progress every 10 completions"""
+        fetch_latency.observe(symbol_duration)
+        if df is not None and len(df) > 0:
+            outrights_successful.inc()
+            outright_rows.inc(len(df))
+            data_logger.debug(f"  ✓ {symbol}: Success in {symbol_duration:.2f}s - {len(df)} rows")
+        else:
+            outrights_failed.inc()
+            record_failed_symbol(symbol)
+            data_logger.warning(f"  ✗ {symbol}: Failed in {symbol_duration:.2f}s - No data returned")
+        
+        completed = outrights_completed.inc()
+        if completed % 10 == 0 or completed == len(symbols_to_fetch):
             elapsed = (datetime.now() - overall_start_time).total_seconds()
-            with counter_lock:
-                current_completed = completed
-                current_successful = successful
-                current_failed = failed
-            if current_completed > 0:
-                rate = current_completed / elapsed if elapsed > 0 else 0
-                remaining = (len(symbols_to_fetch) - current_completed) / rate if rate > 0 else 0
-                data_logger.info(f"⏱️  PERIODIC PROGRESS UPDATE (Outright Fetch):")
-                data_logger.info(f"   Elapsed: {elapsed/3600:.2f} hours ({elapsed/60:.1f} minutes)")
-                data_logger.info(f"   Progress: {current_completed}/{len(symbols_to_fetch)} ({current_completed/len(symbols_to_fetch)*100:.1f}%)")
-                data_logger.info(f"   Success: {current_successful}, Failed: {current_failed}")
-                if rate > 0:
-                    data_logger.info(f"   Rate: {rate:.2f} symbols/min, Est. remaining: {remaining/60:.1f} minutes")
-                data_logger.info("")
-    
-    progress_thread = Thread(target=periodic_progress_logger, daemon=True)
-    progress_thread.start()
+            rate = completed / elapsed if elapsed > 0 else 0
+            remaining = (len(symbols_to_fetch) - completed) / rate if rate > 0 else 0
+            data_logger.info(f"  Progress: {completed}/{len(symbols_to_fetch)} ({completed/len(symbols_to_fetch)*100:.1f}%) - "
+                       f"Success: {outrights_successful.value}, Failed: {outrights_failed.value} - "
+                       f"Elapsed: {elapsed/60:.1f}min, Est. remaining: {remaining/60:.1f}min")
     
     def fetch_symbol_direct(symbol):
         """Direct fetch function for serial processing (no threading)"""
@@ -2468,7 +2793,6 @@ def pull_all_ohlc_data(
     
     def fetch_symbol_wrapper(symbol):
         """Wrapper function for parallel execution - initializes COM for each thread"""
-        nonlocal successful, failed, total_rows_fetched, completed
         # Initialize COM for this thread (required for win32com/ICE API)
         pythoncom.CoInitialize()
         try:
@@ -2491,38 +2815,16 @@ def pull_all_ohlc_data(
                 df = None
             
             symbol_duration = (datetime.now() - symbol_start_time).total_seconds()
-            
-            with counter_lock:
-                completed += 1
-                if df is not None and len(df) > 0:
-                    successful += 1
-                    total_rows_fetched += len(df)
-                    data_logger.debug(f"  ✓ {symbol}: Success in {symbol_duration:.2f}s - {len(df)} rows")
-                else:
-                    failed += 1
-                    if symbol not in stats['failed_symbols']:
-                        stats['failed_symbols'].append(symbol)
-                    data_logger.warning(f"  ✗ {symbol}: Failed in {symbol_duration:.2f}s - No data returned")
-                
-                # Progress update every 10 completions
-                if completed % 10 == 0 or completed == len(symbols_to_fetch):
-                    elapsed = (datetime.now() - overall_start_time).total_seconds()
-                    rate = completed / elapsed if elapsed > 0 else 0
-                    remaining = (len(symbols_to_fetch) - completed) / rate if rate > 0 else 0
-                    data_logger.info(f"  Progress: {completed}/{len(symbols_to_fetch)} ({completed/len(symbols_to_fetch)*100:.1f}%) - "
-                               f"Success: {successful}, Failed: {failed} - "
-                               f"Elapsed: {elapsed/60:.1f}min, Est. remaining: {remaining/60:.1f}min")
+            record_fetch_result(symbol, df, symbol_duration)
             
             return symbol, df
         except Exception as e:
             symbol_duration = (datetime.now() - symbol_start_time).total_seconds() if 'symbol_start_time' in locals() else 0
             data_logger.error(f"✗ Fatal exception in fetch_symbol_wrapper for {symbol} after {symbol_duration:.2f}s: {e}")
             data_logger.error(traceback.format_exc())
-            with counter_lock:
-                completed += 1
-                failed += 1
-                if symbol not in stats['failed_symbols']:
-                    stats['failed_symbols'].append(symbol)
+            outrights_failed.inc()
+            outrights_completed.inc()
+            record_failed_symbol(symbol)
             return symbol, None
         finally:
             # Uninitialize COM for this thread
@@ -2537,26 +2839,7 @@ def pull_all_ohlc_data(
                 result_symbol, df, symbol_duration = fetch_symbol_direct(symbol)
                 
                 # Update counters
-                with counter_lock:
-                    completed += 1
-                    if df is not None and len(df) > 0:
-                        successful += 1
-                        total_rows_fetched += len(df)
-                        data_logger.debug(f"  ✓ {result_symbol}: Success in {symbol_duration:.2f}s - {len(df)} rows")
-                    else:
-                        failed += 1
-                        if result_symbol not in stats['failed_symbols']:
-                            stats['failed_symbols'].append(result_symbol)
-                        data_logger.warning(f"  ✗ {result_symbol}: Failed in {symbol_duration:.2f}s - No data returned")
-                    
-                    # Progress update every 10 completions
-                    if completed % 10 == 0 or completed == len(symbols_to_fetch):
-                        elapsed = (datetime.now() - overall_start_time).total_seconds()
-                        rate = completed / elapsed if elapsed > 0 else 0
-                        remaining = (len(symbols_to_fetch) - completed) / rate if rate > 0 else 0
-                        data_logger.info(f"  Progress: {completed}/{len(symbols_to_fetch)} ({completed/len(symbols_to_fetch)*100:.1f}%) - "
-                                   f"Success: {successful}, Failed: {failed} - "
-                                   f"Elapsed: {elapsed/60:.1f}min, Est. remaining: {remaining/60:.1f}min")
+                record_fetch_result(result_symbol, df, symbol_duration)
                 
                 # Update dictionary
                 if df is not None and len(df) > 0:
@@ -2573,12 +2856,9 @@ def pull_all_ohlc_data(
                         data_logger.warning(f"Symbol {result_symbol} not found in matrix, storing without conversion")
                         outright_data_dict[result_symbol] = df
             except Exception as e:
-                with counter_lock:
-                    completed += 1
-                    failed += 1
-                    if symbol not in stats['failed_symbols']:
-                        stats['failed_symbols'].append(symbol)
-                    stats['error_count'] += 1
+                outrights_completed.inc()
+                outrights_failed.inc()
+                record_failed_symbol(symbol, error=True)
                 data_logger.error(f"Exception processing {symbol}: {e}", exc_info=True)
     else:
         # Parallel processing
@@ -2607,19 +2887,17 @@ def pull_all_ohlc_data(
                             data_logger.warning(f"Symbol {result_symbol} not found in matrix, storing without conversion")
                             outright_data_dict[result_symbol] = df
                 except Exception as e:
-                    with counter_lock:
-                        failed += 1
-                        if symbol not in stats['failed_symbols']:
-                            stats['failed_symbols'].append(symbol)
-                        stats['error_count'] += 1
+                    outrights_failed.inc()
+                    record_failed_symbol(symbol, error=True)
                     data_logger.error(f"Exception fetching {symbol}: {e}", exc_info=True)
     
-    # Stop periodic progress logging
-    progress_stop_event.set()
-    progress_thread.join(timeout=5)  # Wait up to 5 seconds for thread to finish
+    successful = outrights_successful.value
+    failed = outrights_failed.value
+    total_rows_fetched = outright_rows.value
     
     overall_duration = (datetime.now() - overall_start_time).total_seconds()
     stats['outright_duration'] = overall_duration
+    record_stage_duration('outrights', overall_duration)
     data_logger.info(f"\nOutright data fetch complete in {overall_duration/60:.2f} minutes")
     data_logger.info(f"  Successful: {successful}/{len(symbols_to_fetch)}")
     data_logger.info(f"  Failed: {failed}/{len(symbols_to_fetch)}")
@@ -2629,6 +2907,7 @@ def pull_all_ohlc_data(
     if len(outright_data_dict) == 0:
         data_logger.error("No outright data fetched! Cannot calculate spreads.")
         data_logger.error("This usually means all ICE API calls failed - check ICE connection")
+        pull_metrics.stop_sampler()
         # Cleanup COM
         try:
             pythoncom.CoUninitialize()
@@ -2646,7 +2925,9 @@ def pull_all_ohlc_data(
         (df_symbols['spread_type'] == 'outright') & 
         (df_symbols['quarter_numb'] == 'Y')
     ].copy()
+    quarterly_symbols = set(quarterly_outrights['ice_symbol'])
     
+    quarterly_start_time = datetime.now()
     if len(quarterly_outrights) > 0:
         data_logger.info(f"Calculating {len(quarterly_outrights)} quarterly symbols from monthly components...")
         quarterly_count = 0
@@ -2684,11 +2965,12 @@ def pull_all_ohlc_data(
             # Calculate quarterly OHLC
             # NOTE: Monthly data is already converted to $/usg, so pass conversion_factor=None
             # The quarterly formula in the matrix already includes the conversion if needed
-            quarterly_df = calculate_quarterly_ohlc(
-                component_symbols, 
-                outright_data_dict, 
-                conversion_factor=None  # Monthly data already converted
-            )
+            with quarterly_latency.time():
+                quarterly_df = calculate_quarterly_ohlc(
+                    component_symbols, 
+                    outright_data_dict, 
+                    conversion_factor=None  # Monthly data already converted
+                )
             
             if quarterly_df is not None and len(quarterly_df) > 0:
                 # Store quarterly data (already in correct units from monthly conversion)
@@ -2705,6 +2987,7 @@ def pull_all_ohlc_data(
         data_logger.info(f"  Total outright symbols now available: {len(outright_data_dict)}")
     else:
         data_logger.info("No quarterly symbols found in matrix")
+    record_stage_duration('quarterlies', (datetime.now() - quarterly_start_time).total_seconds())
     
     # STEP 2: Calculate OHLC for SPREADS (PARALLEL)
     data_logger.info(f"\n{'='*80}")
@@ -2718,58 +3001,39 @@ def pull_all_ohlc_data(
     data_logger.info(f"Using {spread_max_workers} parallel workers for spread calculations")
     
     spread_data_dict = {}  # Store calculated spread data: {spread_formula: DataFrame}
-    spread_counter_lock = Lock()
-    spread_successful = 0
-    spread_failed = 0
-    spread_completed = 0
+    spreads_completed = pull_metrics.counter('spread_build_completed_total', 'Spread builds finished')
+    spreads_successful = pull_metrics.counter('spread_build_success_total', 'Spreads built with data')
+    spreads_failed = pull_metrics.counter('spread_build_failed_total', 'Spread builds without data')
     
     spread_start_time = datetime.now()
     
-    # Start periodic progress logging for spread calculation
-    spread_progress_stop_event = Event()
-    def periodic_spread_progress_logger():
-        """Log progress every 20 minutes during spread calculation"""
-        interval_seconds = 20 * 60  # 20 minutes
-        while not spread_progress_stop_event.wait(interval_seconds):
-            elapsed = (datetime.now() - spread_start_time).total_seconds()
-            with spread_counter_lock:
-                current_completed = spread_completed
-                current_successful = spread_successful
-                current_failed = spread_failed
-            if current_completed > 0:
-                rate = current_completed / elapsed if elapsed > 0 else 0
-                remaining = (len(spread_symbols) - current_completed) / rate if rate > 0 else 0
-                data_logger.info(f"⏱️  PERIODIC PROGRESS UPDATE (Spread Calculation):")
-                data_logger.info(f"   Elapsed: {elapsed/3600:.2f} hours ({elapsed/60:.1f} minutes)")
-                data_logger.info(f"   Progress: {current_completed:,}/{len(spread_symbols):,} ({current_completed/len(spread_symbols)*100:.1f}%)")
-                data_logger.info(f"   Success: {current_successful:,}, Failed: {current_failed:,}")
-                if rate > 0:
-                    data_logger.info(f"   Rate: {rate:.0f} spreads/min, Est. remaining: {remaining/60:.1f} minutes")
-                data_logger.info("")
-    
-    spread_progress_thread = Thread(target=periodic_spread_progress_logger, daemon=True)
-    spread_progress_thread.start()
+    # Periodic progress log (metrics sampler) now reports the spread stage
+    progress.update(
+        label='Spread Calculation',
+        unit='spreads',
+        total=len(spread_symbols),
+        start_time=spread_start_time,
+        completed=spreads_completed,
+        successful=spreads_successful,
+        failed=spreads_failed
+    )
     
     def calculate_spread_wrapper(spread_formula):
         """Wrapper function for parallel spread calculation"""
-        nonlocal spread_successful, spread_failed, spread_completed
-        
         # Get component symbols from the spreads dataframe
         spread_row = spreads[spreads['ice_symbol'] == spread_formula]
         
         if len(spread_row) == 0:
-            with spread_counter_lock:
-                spread_failed += 1
-                spread_completed += 1
+            spreads_failed.inc()
+            spreads_completed.inc()
             return spread_formula, None
         
         symbol_1 = spread_row.iloc[0]['symbol_1']
         symbol_2 = spread_row.iloc[0]['symbol_2']
         
         if pd.isna(symbol_1) or pd.isna(symbol_2) or symbol_1 == '' or symbol_2 == '':
-            with spread_counter_lock:
-                spread_failed += 1
-                spread_completed += 1
+            spreads_failed.inc()
+            spreads_completed.inc()
             return spread_formula, None
         
         # For quarterly formulas (starting with '='), try to find matching quarterly in outright_data_dict
@@ -2812,28 +3076,29 @@ def pull_all_ohlc_data(
         lookup_symbol_2 = find_quarterly_in_dict(symbol_2, spread_row.iloc[0], is_symbol_1=False)
         
         # Calculate spread OHLC
-        spread_df = calculate_spread_ohlc(lookup_symbol_1, lookup_symbol_2, outright_data_dict)
-        
-        with spread_counter_lock:
-            spread_completed += 1
-            if spread_df is not None and len(spread_df) > 0:
-                spread_successful += 1
-                if spread_completed % 1000 == 0 or spread_completed == len(spread_symbols):
-                    elapsed = (datetime.now() - spread_start_time).total_seconds()
-                    rate = spread_completed / elapsed if elapsed > 0 else 0
-                    remaining = (len(spread_symbols) - spread_completed) / rate if rate > 0 else 0
-                    data_logger.info(f"  Progress: {spread_completed}/{len(spread_symbols):,} ({spread_completed/len(spread_symbols)*100:.1f}%) - "
-                               f"Success: {spread_successful:,}, Failed: {spread_failed:,} - "
-                               f"Elapsed: {elapsed/60:.1f}min, Est. remaining: {remaining/60:.1f}min")
+        with spread_latency.time():
+            spread_df = calculate_spread_ohlc(lookup_symbol_1, lookup_symbol_2, outright_data_dict)
+        
+        if spread_df is not None and len(spread_df) > 0:
+            spreads_successful.inc()
+            spread_completed = spreads_completed.inc()
+            if spread_completed % 1000 == 0 or spread_completed == len(spread_symbols):
+                elapsed = (datetime.now() - spread_start_time).total_seconds()
+                rate = spread_completed / elapsed if elapsed > 0 else 0
+                remaining = (len(spread_symbols) - spread_completed) / rate if rate > 0 else 0
+                data_logger.info(f"  Progress: {spread_completed}/{len(spread_symbols):,} ({spread_completed/len(spread_symbols)*100:.1f}%) - "
+                           f"Success: {spreads_successful.value:,}, Failed: {spreads_failed.value:,} - "
+                           f"Elapsed: {elapsed/60:.1f}min, Est. remaining: {remaining/60:.1f}min")
+        else:
+            spreads_failed.inc()
+            spreads_completed.inc()
+            # Log failure reason for debugging (use lookup_symbols which are the actual keys we tried)
+            if lookup_symbol_1 not in outright_data_dict:
+                data_logger.debug(f"  ✗ {spread_formula}: Missing symbol_1 '{lookup_symbol_1}' (original: '{symbol_1}') in outright_data_dict")
+            elif lookup_symbol_2 not in outright_data_dict:
+                data_logger.debug(f"  ✗ {spread_formula}: Missing symbol_2 '{lookup_symbol_2}' (original: '{symbol_2}') in outright_data_dict")
             else:
-                spread_failed += 1
-                # Log failure reason for debugging (use lookup_symbols which are the actual keys we tried)
-                if lookup_symbol_1 not in outright_data_dict:
-                    data_logger.debug(f"  ✗ {spread_formula}: Missing symbol_1 '{lookup_symbol_1}' (original: '{symbol_1}') in outright_data_dict")
-                elif lookup_symbol_2 not in outright_data_dict:
-                    data_logger.debug(f"  ✗ {spread_formula}: Missing symbol_2 '{lookup_symbol_2}' (original: '{symbol_2}') in outright_data_dict")
-                else:
-                    data_logger.debug(f"  ✗ {spread_formula}: No common dates or insufficient data for {lookup_symbol_1} - {lookup_symbol_2}")
+                data_logger.debug(f"  ✗ {spread_formula}: No common dates or insufficient data for {lookup_symbol_1} - {lookup_symbol_2}")
         
         return spread_formula, spread_df
     
@@ -2851,16 +3116,15 @@ def pull_all_ohlc_data(
                 if spread_df is not None and len(spread_df) > 0:
                     spread_data_dict[formula] = spread_df
             except Exception as e:
-                with spread_counter_lock:
-                    spread_failed += 1
+                spreads_failed.inc()
                 data_logger.error(f"Exception calculating spread {spread_formula}: {e}", exc_info=True)
     
-    # Stop periodic progress logging for spreads
-    spread_progress_stop_event.set()
-    spread_progress_thread.join(timeout=5)  # Wait up to 5 seconds for thread to finish
+    spread_successful = spreads_successful.value
+    spread_failed = spreads_failed.value
     
     spread_duration = (datetime.now() - spread_start_time).total_seconds()
     stats['spread_duration'] = spread_duration
+    record_stage_duration('spreads', spread_duration)
     data_logger.info(f"\nSpread calculation complete in {spread_duration/60:.2f} minutes")
     data_logger.info(f"  Successful: {spread_successful}/{len(spread_symbols):,}")
     data_logger.info(f"  Failed: {spread_failed}/{len(spread_symbols):,}")
@@ -2871,8 +3135,10 @@ def pull_all_ohlc_data(
     data_logger.info("STEP 3: Calculating indicators and combining all data")
     data_logger.info(f"{'='*80}")
     indicator_start_time = datetime.now()
+    progress.clear()  # Indicators are not counted per series; the sampler only exports from here
     
     all_data = []
+    raw_ohlc_frames = {}  # ice_connect_symbol -> OHLC input (saved next to the snapshot for column recomputes)
     
     # Create lookup dictionary for symbol metadata
     symbol_metadata = {}
@@ -2907,6 +3173,43 @@ def pull_all_ohlc_data(
             'is_outright': is_outright
         }
     
+    # Compute every series that is not already cached in one pass: the full indicator set
+    # with the panel engine, or just the path-dependent indicators (ADX, SuperTrend,
+    # PSAR, Aroon) with the batch kernels ahead of the per-series pandas_ta calls
+    pending_frames = {}
+    if use_panel_engine or use_batch_kernels:
+        for key, df in list(outright_data_dict.items()) + list(spread_data_dict.items()):
+            if df is None or len(df) == 0:
+                continue
+            if indicator_cache is not None and indicator_cache.contains(indicator_cache.make_key(df, config, indicator_plan)):
+                continue
+            pending_frames[key] = df
+    if pending_frames and use_panel_engine:
+        panel_start_time = datetime.now()
+        try:
+            panel_result = PanelIndicatorEngine(
+                config, plan=indicator_plan,
+                chunk_size=engine_config.get('chunk_size', DEFAULT_CHUNK_SIZE)
+            ).compute(pending_frames)
+            panel_duration = (datetime.now() - panel_start_time).total_seconds()
+            record_stage_duration('panel_indicators', panel_duration)
+            data_logger.info(f"Panel indicators: {len(panel_result):,} series in {panel_duration:.1f}s"
+                             f" ({len(panel_result.skipped):,} with NaN OHLC computed per series)")
+        except Exception as e:
+            data_logger.warning(f"Panel indicator engine failed, falling back to per-series calculation: {e}")
+            data_logger.debug(traceback.format_exc())
+            panel_result = None
+    elif pending_frames and use_batch_kernels:
+        batch_start_time = datetime.now()
+        try:
+            batch_results = calculate_path_dependent_indicators_batch(pending_frames, config, plan=indicator_plan)
+            batch_duration = (datetime.now() - batch_start_time).total_seconds()
+            record_stage_duration('batch_kernels', batch_duration)
+            data_logger.info(f"Batch path-dependent indicators: {len(batch_results):,} series in {batch_duration:.1f}s")
+        except Exception as e:
+            data_logger.warning(f"Batch indicator kernels failed, falling back to per-series pandas_ta: {e}")
+            batch_results = {}
+    
     # Process outright data with indicators and metadata
     data_logger.info("Processing outrights with indicators and metadata...")
     for symbol, df in outright_data_dict.items():
@@ -2922,11 +3225,13 @@ def pull_all_ohlc_data(
             'is_outright': True
         })
         
-        # Calculate technical indicators (placeholder for now)
-        df_with_indicators = calculate_technical_indicators(df, symbol_info, config)
+        # Calculate technical indicators
+        with indicator_latency['quarterly' if symbol in quarterly_symbols else 'outright'].time():
+            df_with_indicators = compute_indicators(df, symbol_info, symbol)
         
         if df_with_indicators is None or len(df_with_indicators) == 0:
             continue
+        raw_ohlc_frames[symbol_info.get('ice_connect_symbol', symbol)] = df
         
         # Reset index to have Date as column
         df_result = df_with_indicators.reset_index()
@@ -2968,10 +3273,12 @@ def pull_all_ohlc_data(
         })
         
         # Calculate technical indicators
-        df_with_indicators = calculate_technical_indicators(df, symbol_info, config)
+        with indicator_latency['spread'].time():
+            df_with_indicators = compute_indicators(df, symbol_info, spread_formula)
         
         if df_with_indicators is None or len(df_with_indicators) == 0:
             continue
+        raw_ohlc_frames[spread_formula] = df
         
         # Reset index to have Date as column
         df_result = df_with_indicators.reset_index()
@@ -3011,9 +3318,10 @@ def pull_all_ohlc_data(
                     data_logger.debug(f"Could not get spread row metadata for correlation: {e}")
             
             # Calculate correlation and cointegration
-            spread_stats = calculate_correlation_and_cointegration(
-                df, symbol_a, symbol_b, outright_data_dict, config, spread_row_meta=spread_row_meta
-            )
+            with correlation_latency.time():
+                spread_stats = calculate_correlation_and_cointegration(
+                    df, symbol_a, symbol_b, outright_data_dict, config, spread_row_meta=spread_row_meta
+                )
             
             if spread_stats:
                 # Add correlation and cointegration columns (same value for all rows)
@@ -3053,6 +3361,7 @@ def pull_all_ohlc_data(
     
     if len(all_data) == 0:
         data_logger.error("No data to combine!")
+        pull_metrics.stop_sampler()
         return None
     
     # Combine all data
@@ -3065,6 +3374,17 @@ def pull_all_ohlc_data(
     # Track indicator calculation duration
     indicator_duration = (datetime.now() - indicator_start_time).total_seconds()
     stats['indicator_duration'] = indicator_duration
+    record_stage_duration('indicators', indicator_duration)
+    
+    if indicator_cache is not None:
+        stats['indicator_cache_hits'] = indicator_cache.hits
+        stats['indicator_cache_misses'] = indicator_cache.misses
+        data_logger.info(f"Indicator cache: {indicator_cache.summary()}")
+        try:
+            removed, cache_bytes = indicator_cache.evict()
+            data_logger.info(f"Indicator cache size: {cache_bytes / (1024 * 1024):.1f} MB ({removed} entries evicted)")
+        except Exception as e:
+            data_logger.warning(f"Indicator cache eviction failed: {e}")
     
     # Determine actual most recent date in the data (this is what ICE API actually returned)
     # Ensure Date is datetime type for proper comparison
@@ -3179,9 +3499,29 @@ def pull_all_ohlc_data(
     stats['file_write_duration'] = save_duration
     
     file_size_mb = output_file.stat().st_size / (1024 * 1024)
+    record_stage_duration('csv_write', save_duration)
+    pull_metrics.gauge('csv_rows_written', 'Rows in the snapshot CSV').set(len(combined_df))
+    pull_metrics.gauge('csv_size_megabytes', 'Snapshot CSV size').set(round(file_size_mb, 2))
+    if save_duration > 0:
+        pull_metrics.gauge('csv_write_rows_per_second', 'Snapshot CSV write throughput (rows)').set(round(len(combined_df) / save_duration, 1))
+        pull_metrics.gauge('csv_write_megabytes_per_second', 'Snapshot CSV write throughput (MB)').set(round(file_size_mb / save_duration, 2))
     data_logger.info(f"✓ Saved to {output_file} ({file_size_mb:.2f} MB) in {save_duration:.2f}s")
     data_logger.debug(f"  File path: {output_file.absolute()}")
     
+    # Save column lineage and raw OHLC inputs next to the snapshot (used by recompute_indicators.py)
+    lineage_config = config.get('column_lineage', {})
+    if lineage_config.get('enabled', True):
+        try:
+            lineage = build_column_lineage(config, indicator_plan, code_version=get_indicator_code_version())
+            lineage['snapshot_date'] = actual_date_str
+            lineage['weeks_back'] = weeks_back
+            save_lineage(lineage, lineage_path(output_path, actual_date_str))
+            if lineage_config.get('save_raw_ohlc', True):
+                series_saved = save_raw_ohlc(raw_ohlc_frames, raw_ohlc_path(output_path, actual_date_str))
+                data_logger.info(f"  Saved raw OHLC for {series_saved:,} series and column lineage for {actual_date_str}")
+        except Exception as e:
+            data_logger.warning(f"  Could not save column lineage/raw OHLC for {actual_date_str}: {e}")
+    
     # Calculate final statistics for email
     execution_end_time = datetime.now()
     total_duration = (execution_end_time - execution_start_time).total_seconds()
@@ -3236,6 +3576,14 @@ def pull_all_ohlc_data(
         'symbols_file': symbols_file
     })
     
+    # Final metrics export (Prometheus textfile + JSON); latency percentiles go into the email
+    record_stage_duration('total', total_duration)
+    metrics_files = pull_metrics.stop_sampler()
+    stats['latency_percentiles'] = pull_metrics.percentile_table()
+    if metrics_files is not None:
+        stats['metrics_file'] = str(metrics_files[1])
+        data_logger.info(f"Pull metrics exported: {metrics_files[0]} and {metrics_files[1]}")
+    
     data_logger.info("=" * 80)
     data_logger.info("OHLC DATA PULL COMPLETE")
     data_logger.info("=" * 80)
@@ -3336,6 +3684,25 @@ if __name__ == "__main__":
         default=20,
         help='Number of parallel workers for calculating spreads (default: 20)'
     )
+    parser.add_argument(
+        '--indicator-mode',
+        type=str,
+        choices=['full', 'plan'],
+        default=None,
+        help="'full' computes every indicator (research exports), 'plan' only what the signal generator uses (default: config indicator_plan.mode)"
+    )
+    parser.add_argument(
+        '--no-indicator-cache',
+        action='store_true',
+        help='Recompute indicators for every series instead of reusing cached results'
+    )
+    parser.add_argument(
+        '--extra-columns',
+        type=str,
+        nargs='*',
+        default=None,
+        help='Extra indicator columns, glob patterns or families to compute in plan mode (e.g. zscore markov bb_*)'
+    )
     
     args = parser.parse_args()
     
@@ -3345,6 +3712,9 @@ if __name__ == "__main__":
         output_dir=args.output_dir,
         snapshot_date=args.date,
         max_workers_outrights=args.workers_outrights,
-        max_workers_spreads=args.workers_spreads
+        max_workers_spreads=args.workers_spreads,
+        indicator_mode=args.indicator_mode,
+        extra_indicator_columns=args.extra_columns,
+        use_indicator_cache=False if args.no_indicator_cache else None
     )
 
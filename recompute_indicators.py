@@ -0,0 +1,311 @@
+"""
+Recompute selected indicator columns across existing weekly snapshots
+- Reads the raw OHLC stored next to each snapshot (raw_ohlc/raw_ohlc_YYYY-MM-DD.npz)
+- Recalculates only the requested columns (plus columns derived from them)
+- Rewrites those columns in unfiltered_YYYY-MM-DD.csv, leaving everything else untouched
+- Updates the column lineage (lineage/lineage_YYYY-MM-DD.json)
+
+Examples:
+    python recompute_indicators.py --columns "bb_*"
+    python recompute_indicators.py --stale
+    python recompute_indicators.py --columns macd_line --dates 2025-11-28 2025-12-05
+"""
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+import fnmatch
+import logging
+import os
+import sys
+import traceback
+
+from pull_ohlc_data import calculate_technical_indicators, load_indicator_config, get_indicator_code_version
+from indicator_plan import (
+    INDICATOR_FAMILIES, build_column_index, config_subtree, hash_config_subtree,
+    expand_with_dependents, find_stale_columns, resolve_indicator_plan
+)
+from snapshot_store import load_raw_ohlc, load_lineage, save_lineage, raw_ohlc_path, lineage_path
+from panel_indicators import PanelIndicatorEngine, DEFAULT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def setup_logging(log_dir='logs/recompute_indicators'):
+    """Setup logging for the column recompute script"""
+    log_path = Path(log_dir)
+    log_path.mkdir(parents=True, exist_ok=True)
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    log_file = log_path / f"recompute_indicators_{timestamp}.log"
+    
+    root_logger = logging.getLogger()
+    root_logger.handlers.clear()
+    root_logger.setLevel(logging.DEBUG)
+    
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+    root_logger.addHandler(console_handler)
+    
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(formatter)
+    root_logger.addHandler(file_handler)
+    
+    logger.info(f"Logging initialized - Log file: {log_file}")
+    return log_file
+
+
+def match_indicator_columns(patterns, config):
+    """
+    Expand column names/glob patterns to indicator output columns
+    
+    Args:
+        patterns: List of names or globs (e.g. ['bb_*', 'rsi'])
+        config: Indicator configuration dictionary
+    
+    Returns:
+        Set of matching indicator columns
+    """
+    column_index = build_column_index(config)
+    matched = set()
+    for pattern in patterns:
+        hits = fnmatch.filter(column_index.keys(), pattern)
+        if not hits:
+            logger.warning(f"Pattern '{pattern}' does not match any indicator column")
+        matched.update(hits)
+    return matched
+
+
+def recompute_snapshot(snapshot_file, target_columns, config, code_version, dry_run=False):
+    """
+    Recompute target columns for one snapshot file
+    
+    Args:
+        snapshot_file: Path to unfiltered_YYYY-MM-DD.csv
+        target_columns: Set of indicator columns to rewrite (dependents already included)
+        config: Indicator configuration dictionary
+        code_version: Indicator code version (recorded in lineage)
+        dry_run: Log what would change without writing files
+    
+    Returns:
+        Dictionary with 'status', 'rows_updated', 'columns'
+    """
+    output_dir = snapshot_file.parent
+    date_str = snapshot_file.stem.replace('unfiltered_', '')
+    raw_path = raw_ohlc_path(output_dir, date_str)
+    
+    if not raw_path.exists():
+        logger.warning(f"{date_str}: no raw OHLC stored ({raw_path.name}) - re-pull this week to recompute")
+        return {'status': 'NO_RAW_OHLC', 'rows_updated': 0, 'columns': []}
+    
+    snapshot_df = pd.read_csv(snapshot_file, low_memory=False)
+    if 'ice_connect_symbol' not in snapshot_df.columns:
+        logger.warning(f"{date_str}: snapshot has no ice_connect_symbol column - skipped")
+        return {'status': 'INVALID_SNAPSHOT', 'rows_updated': 0, 'columns': []}
+    
+    snapshot_date = pd.Timestamp(date_str)
+    plan = resolve_indicator_plan(target_columns, config)
+    columns = sorted(target_columns)
+    
+    raw_frames = load_raw_ohlc(raw_path, symbols=snapshot_df['ice_connect_symbol'].unique())
+    logger.info(f"{date_str}: recomputing {len(columns)} columns for {len(raw_frames):,} series ({plan.describe(config)})")
+    
+    new_values = {}
+    if config.get('indicator_engine', {}).get('mode', 'per_series') == 'panel':
+        panel = PanelIndicatorEngine(
+            config, plan=plan, chunk_size=config['indicator_engine'].get('chunk_size', DEFAULT_CHUNK_SIZE)
+        ).compute(raw_frames)
+        panel_snapshot = panel.snapshot(snapshot_date, columns=[col for col in columns if col in panel.columns])
+        for symbol, row in panel_snapshot.iterrows():
+            new_values[symbol] = [row.get(col) for col in columns]
+        # Series with NaN in their OHLC go through the per-series reference
+        raw_frames = {symbol: raw_frames[symbol] for symbol in panel.skipped}
+    
+    for symbol, df in raw_frames.items():
+        result = calculate_technical_indicators(df, {}, config, plan=plan)
+        if result is None or len(result) == 0:
+            continue
+        result.index = pd.to_datetime(result.index).normalize()
+        if snapshot_date not in result.index:
+            continue
+        row = result.loc[snapshot_date]
+        if isinstance(row, pd.DataFrame):
+            row = row.iloc[-1]
+        new_values[symbol] = [row.get(col) for col in columns]
+    
+    if not new_values:
+        logger.warning(f"{date_str}: no series produced values for the snapshot date - nothing written")
+        return {'status': 'NO_VALUES', 'rows_updated': 0, 'columns': columns}
+    
+    values_df = pd.DataFrame.from_dict(new_values, orient='index', columns=columns)
+    matched = snapshot_df['ice_connect_symbol'].isin(values_df.index)
+    for col in columns:
+        mapped = snapshot_df['ice_connect_symbol'].map(values_df[col])
+        if col in snapshot_df.columns:
+            snapshot_df[col] = mapped.where(matched, snapshot_df[col])
+        else:
+            snapshot_df[col] = mapped
+    
+    rows_updated = int(matched.sum())
+    if dry_run:
+        logger.info(f"{date_str}: [dry run] would update {rows_updated:,} rows")
+        return {'status': 'DRY_RUN', 'rows_updated': rows_updated, 'columns': columns}
+    
+    tmp_file = snapshot_file.with_name(snapshot_file.name + '.tmp')
+    snapshot_df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, snapshot_file)
+    
+    # Update lineage for families whose recorded columns were all rewritten
+    lineage = load_lineage(lineage_path(output_dir, date_str)) or {'mode': 'unknown', 'families': {}}
+    column_index = build_column_index(config)
+    for family in sorted({column_index[col] for col in columns}):
+        entry = lineage['families'].get(family, {'columns': []})
+        recorded = set(entry.get('columns', []))
+        if recorded and not recorded.issubset(target_columns):
+            # Other columns of this family still come from the old config
+            logger.info(f"{date_str}: {family} partially recomputed - lineage keeps the previous config hash")
+        else:
+            subtree = config_subtree(config, INDICATOR_FAMILIES[family]['config_path'])
+            entry = {
+                'config_path': list(INDICATOR_FAMILIES[family]['config_path']),
+                'config_hash': hash_config_subtree(subtree),
+                'config': subtree,
+                'columns': sorted(recorded | {col for col in columns if column_index[col] == family}),
+            }
+        entry['recomputed_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        entry['code_version'] = code_version
+        lineage['families'][family] = entry
+    save_lineage(lineage, lineage_path(output_dir, date_str))
+    
+    logger.info(f"{date_str}: ✓ updated {rows_updated:,} rows")
+    return {'status': 'UPDATED', 'rows_updated': rows_updated, 'columns': columns}
+
+
+def recompute_indicator_columns(
+    columns=None,
+    stale=False,
+    output_dir='full_unfiltered_historicals',
+    config_file='study_settings/indicator_config.json',
+    dates=None,
+    dry_run=False
+):
+    """
+    Rewrite indicator columns across existing snapshots from stored raw OHLC
+    
+    Args:
+        columns: Column names/glob patterns to recompute (e.g. ['bb_*'])
+        stale: Also recompute columns whose config sub-tree changed since each snapshot was written
+        output_dir: Snapshot directory
+        config_file: Path to indicator configuration JSON file
+        dates: Optional list of snapshot dates (YYYY-MM-DD) to limit the run
+        dry_run: Log what would change without writing files
+    
+    Returns:
+        Dictionary {date_str: result dict from recompute_snapshot}
+    """
+    config = load_indicator_config(config_file)
+    code_version = get_indicator_code_version()
+    requested = match_indicator_columns(columns or [], config)
+    
+    snapshot_files = sorted(Path(output_dir).glob('unfiltered_*.csv'))
+    if dates:
+        wanted_dates = set(dates)
+        snapshot_files = [f for f in snapshot_files if f.stem.replace('unfiltered_', '') in wanted_dates]
+    
+    logger.info(f"Recomputing indicator columns across {len(snapshot_files)} snapshots in {output_dir}")
+    if requested:
+        logger.info(f"  Requested columns: {', '.join(sorted(requested))}")
+    
+    results = {}
+    for snapshot_file in snapshot_files:
+        date_str = snapshot_file.stem.replace('unfiltered_', '')
+        target = set(requested)
+        if stale:
+            lineage = load_lineage(lineage_path(output_dir, date_str))
+            if lineage is None:
+                logger.warning(f"{date_str}: no lineage recorded - cannot detect stale columns")
+            else:
+                target.update(find_stale_columns(lineage, config))
+        if not target:
+            logger.info(f"{date_str}: nothing to recompute")
+            results[date_str] = {'status': 'UP_TO_DATE', 'rows_updated': 0, 'columns': []}
+            continue
+        
+        target = expand_with_dependents(target, config)
+        try:
+            results[date_str] = recompute_snapshot(snapshot_file, target, config, code_version, dry_run=dry_run)
+        except Exception as e:
+            logger.error(f"{date_str}: recompute failed: {e}")
+            logger.debug(traceback.format_exc())
+            results[date_str] = {'status': 'ERROR', 'rows_updated': 0, 'columns': sorted(target), 'error': str(e)}
+    
+    updated = sum(1 for r in results.values() if r['status'] == 'UPDATED')
+    missing_raw = sum(1 for r in results.values() if r['status'] == 'NO_RAW_OHLC')
+    failed = sum(1 for r in results.values() if r['status'] == 'ERROR')
+    logger.info(f"Done: {updated} snapshots updated, {missing_raw} without raw OHLC, {failed} failed")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Recompute selected indicator columns across existing snapshots from stored raw OHLC'
+    )
+    parser.add_argument(
+        '--columns',
+        type=str,
+        nargs='*',
+        default=None,
+        help='Indicator columns or glob patterns to recompute (e.g. "bb_*" rsi)'
+    )
+    parser.add_argument(
+        '--stale',
+        action='store_true',
+        help='Recompute columns whose indicator_config.json sub-tree changed since each snapshot was written'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default='full_unfiltered_historicals',
+        help='Snapshot directory (default: full_unfiltered_historicals)'
+    )
+    parser.add_argument(
+        '--config',
+        type=str,
+        default='study_settings/indicator_config.json',
+        help='Indicator configuration file (default: study_settings/indicator_config.json)'
+    )
+    parser.add_argument(
+        '--dates',
+        type=str,
+        nargs='*',
+        default=None,
+        help='Limit to these snapshot dates (YYYY-MM-DD)'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Show what would be rewritten without writing files'
+    )
+    
+    args = parser.parse_args()
+    if not args.columns and not args.stale:
+        parser.error('Specify --columns and/or --stale')
+    
+    setup_logging()
+    results = recompute_indicator_columns(
+        columns=args.columns,
+        stale=args.stale,
+        output_dir=args.output_dir,
+        config_file=args.config,
+        dates=args.dates,
+        dry_run=args.dry_run
+    )
+    sys.exit(1 if any(r['status'] == 'ERROR' for r in results.values()) else 0)
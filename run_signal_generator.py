@@ -7,6 +7,7 @@ from pathlib import Path
 from datetime import datetime
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 # Add signal_generator to path
@@ -14,8 +15,9 @@ sys.path.insert(0, str(Path(__file__).parent / 'signal_generator'))
 
 from data_loaders import load_data, prepare_data, load_curve_prices
 from config import load_config
-from signal_generators import TrendFollowingSignals, EnhancedTrendFollowingSignals, MeanReversionSignals, MacdRsiExhaustionSignals, PointCalculator, ICEChatFormatter
+from signal_generators import SignalEngine, PointCalculator, ICEChatFormatter
 from reports import ReportGenerator
+from signal_generator.utils.run_metrics import RunMetrics
 
 # Setup logging - ensure logs directory exists
 logs_dir = Path(__file__).parent / 'signal_generator' / 'logs'
@@ -33,22 +35,39 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main(target_date=None, data_dir=None):
+def _in_stage(metrics, name, fn, *args, **kwargs):
+    """Run fn inside a metrics stage (used for tasks on background threads)."""
+    with metrics.stage(name):
+        return fn(*args, **kwargs)
+
+
+def main(target_date=None, data_dir=None, workers=1, trace_memory=False):
     """
     Main execution function.
     
     Args:
         target_date: Target date for analysis (None = most recent)
         data_dir: Data directory path (None = default)
+        workers: Parallel workers (1 = sequential). With more than one, strategies
+                 run in a process pool, the prior-week lookup loads while they run,
+                 and the HTML report (its sections in threads) and ICE Connect file
+                 render concurrently.
+                 Outputs and log order are the same as a sequential run.
+        trace_memory: Record Python allocations per stage with tracemalloc (slower).
+                      Timings and RSS are always recorded in the run-metrics JSON.
     """
     logger.info("=" * 80)
     logger.info("SIGNAL GENERATOR - STARTING")
     logger.info("=" * 80)
     
+    metrics = RunMetrics(trace_memory=trace_memory)
+    metrics.info['workers'] = workers
+    
     try:
         # Step 1: Load configuration
         logger.info("\n[Step 1] Loading configuration...")
-        config = load_config()
+        with metrics.stage('step_1_config'):
+            config = load_config()
         logger.info("✓ Configuration loaded")
         
         # Step 2: Load data
@@ -56,24 +75,27 @@ def main(target_date=None, data_dir=None):
         if data_dir is None:
             data_dir = str(Path(__file__).parent / 'full_unfiltered_historicals')
         
-        df = load_data(target_date=target_date, data_dir=data_dir)
-        if df is None:
-            logger.error("Failed to load data")
-            return 1
-        
-        # If target_date is None, determine it from the most recent date in the data
-        if target_date is None and 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-            most_recent_date_in_data = df['Date'].max()
-            if pd.notna(most_recent_date_in_data):
-                if isinstance(most_recent_date_in_data, pd.Timestamp):
-                    target_date = most_recent_date_in_data.to_pydatetime()
-                else:
-                    target_date = pd.to_datetime(most_recent_date_in_data).to_pydatetime()
-                logger.info(f"No target_date specified, using most recent date in data: {target_date.strftime('%Y-%m-%d')}")
-        
-        prepared_df = prepare_data(df, target_date=target_date)
-        logger.info(f"✓ Data loaded: {len(prepared_df)} rows, {prepared_df['ice_connect_symbol'].nunique()} unique symbols")
+        with metrics.stage('step_2_load_data'):
+            df = load_data(target_date=target_date, data_dir=data_dir)
+            if df is None:
+                logger.error("Failed to load data")
+                return 1
+            
+            # If target_date is None, determine it from the most recent date in the data
+            if target_date is None and 'Date' in df.columns:
+                df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+                most_recent_date_in_data = df['Date'].max()
+                if pd.notna(most_recent_date_in_data):
+                    if isinstance(most_recent_date_in_data, pd.Timestamp):
+                        target_date = most_recent_date_in_data.to_pydatetime()
+                    else:
+                        target_date = pd.to_datetime(most_recent_date_in_data).to_pydatetime()
+                    logger.info(f"No target_date specified, using most recent date in data: {target_date.strftime('%Y-%m-%d')}")
+            
+            with metrics.stage('prepare_data', rows=len(df)) as stage:
+                prepared_df = prepare_data(df, target_date=target_date)
+                stage['prepared_rows'] = len(prepared_df)
+            logger.info(f"✓ Data loaded: {len(prepared_df)} rows, {prepared_df['ice_connect_symbol'].nunique()} unique symbols")
         
         # Extract actual data date from DataFrame (from Date column) - use the target_date or most recent
         data_date = None
@@ -96,56 +118,82 @@ def main(target_date=None, data_dir=None):
             data_date = datetime.now()
             logger.warning(f"Could not extract data date, using {data_date.strftime('%Y-%m-%d')}")
         
+        metrics.info.update(
+            data_date=data_date.strftime('%Y-%m-%d'),
+            rows=len(prepared_df),
+            symbols=int(prepared_df['ice_connect_symbol'].nunique())
+        )
+        
         # Step 3: Initialize components
         logger.info("\n[Step 3] Loading curve data for delta sizing...")
-        try:
-            curve_data = load_curve_prices()
-            logger.info(f"✓ Curve data loaded: {len(curve_data)} commodities")
-        except Exception as e:
-            logger.warning(f"Could not load curve data: {e}. Delta sizing will use fallback prices.")
-            curve_data = {}
+        with metrics.stage('step_3_curve_data') as stage:
+            try:
+                curve_data = load_curve_prices()
+                logger.info(f"✓ Curve data loaded: {len(curve_data)} commodities")
+            except Exception as e:
+                logger.warning(f"Could not load curve data: {e}. Delta sizing will use fallback prices.")
+                curve_data = {}
+            stage['commodities'] = len(curve_data)
         
         logger.info("\n[Step 4] Initializing signal generators...")
-        point_calculator = PointCalculator(config)
+        with metrics.stage('step_4_init'):
+            point_calculator = PointCalculator(config)
+            
+            signal_engine = SignalEngine(config, point_calculator, metrics=metrics)
+            
+            ice_chat_formatter = ICEChatFormatter(config, curve_data=curve_data, prepared_df=prepared_df, data_date=data_date)
+            report_generator = ReportGenerator(config)
+            report_generator.metrics = metrics
+            
+            from signal_generator.utils.prior_week_checker import check_prior_week_signals, prepare_prior_week_lookup
+            from signal_generator.utils.signal_ledger import SignalLedger
+            from signal_generator.utils.deferred_logs import submit_deferred
+            
+            signal_ledger = SignalLedger.from_config(config)
         
-        trend_signal_gen = TrendFollowingSignals(config, point_calculator)
-        enhanced_trend_gen = EnhancedTrendFollowingSignals(config, point_calculator)
-        mean_reversion_gen = MeanReversionSignals(config, point_calculator)
-        macd_rsi_exhaustion_gen = MacdRsiExhaustionSignals(config, point_calculator)
+        logger.info("✓ All components initialized")
         
-        ice_chat_formatter = ICEChatFormatter(config, curve_data=curve_data, prepared_df=prepared_df, data_date=data_date)
-        report_generator = ReportGenerator(config)
+        # Background thread pool for overlapping steps (--workers); logs are replayed in step order
+        background = ThreadPoolExecutor(max_workers=2) if workers > 1 else None
+        prior_week_task = None
+        if background is not None:
+            # The prior-week lookup (Step 7.5) does not depend on this week's signals
+            prior_week_task = submit_deferred(
+                background, _in_stage, metrics, 'prior_week_lookup',
+                prepare_prior_week_lookup, data_date, data_dir, config, ledger=signal_ledger
+            )
         
-        logger.info("✓ All components initialized")
+        # Step 5: Generate signals (all strategies over one prepared view)
+        logger.info("\n[Step 5] Generating signals (trend, enhanced trend, mean reversion, MACD/RSI exhaustion)...")
+        with metrics.stage('step_5_signals') as stage:
+            all_strategy_signals = signal_engine.run(prepared_df, target_date=target_date, workers=workers)
+            stage['final_signals'] = sum(
+                len(signals.get('buy_signals', [])) + len(signals.get('sell_signals', []))
+                for signals in all_strategy_signals.values()
+            )
         
-        # Step 5: Generate signals
-        logger.info("\n[Step 5] Generating standard trend following signals (MACD cross)...")
-        trend_signals = trend_signal_gen.generate_signals(prepared_df, target_date=target_date)
+        trend_signals = all_strategy_signals['trend_following']
         trend_buy_count = len(trend_signals.get('buy_signals', []))
         trend_sell_count = len(trend_signals.get('sell_signals', []))
         logger.info(f"✓ Standard trend following: {trend_buy_count} buy, {trend_sell_count} sell signals")
         
-        logger.info("\n[Step 5.5] Generating enhanced trend following signals (multi-trigger)...")
-        enhanced_trend_signals = enhanced_trend_gen.generate_signals(prepared_df, target_date=target_date)
+        enhanced_trend_signals = all_strategy_signals['enhanced_trend_following']
         enhanced_buy_count = len(enhanced_trend_signals.get('buy_signals', []))
         enhanced_sell_count = len(enhanced_trend_signals.get('sell_signals', []))
         logger.info(f"✓ Enhanced trend following: {enhanced_buy_count} buy, {enhanced_sell_count} sell signals")
         
-        logger.info("\n[Step 6] Generating mean reversion signals...")
-        mean_reversion_signals = mean_reversion_gen.generate_signals(prepared_df, target_date=target_date)
+        mean_reversion_signals = all_strategy_signals['mean_reversion']
         mr_buy_count = len(mean_reversion_signals.get('buy_signals', []))
         mr_sell_count = len(mean_reversion_signals.get('sell_signals', []))
         logger.info(f"✓ Mean reversion: {mr_buy_count} buy, {mr_sell_count} sell signals")
         
-        logger.info("\n[Step 6.5] Generating MACD/RSI exhaustion signals...")
-        macd_rsi_exhaustion_signals = macd_rsi_exhaustion_gen.generate_signals(prepared_df, target_date=target_date)
+        macd_rsi_exhaustion_signals = all_strategy_signals['macd_rsi_exhaustion']
         exhaustion_buy_count = len(macd_rsi_exhaustion_signals.get('buy_signals', []))
         exhaustion_sell_count = len(macd_rsi_exhaustion_signals.get('sell_signals', []))
         logger.info(f"✓ MACD/RSI exhaustion: {exhaustion_buy_count} buy, {exhaustion_sell_count} sell signals")
         
         # Step 7.5: Check prior week signals
         logger.info("\n[Step 7.5] Checking prior week signals...")
-        from signal_generator.utils.prior_week_checker import check_prior_week_signals
         
         all_current_signals = {
             'trend_following': trend_signals,
@@ -153,50 +201,95 @@ def main(target_date=None, data_dir=None):
             'macd_rsi_exhaustion': macd_rsi_exhaustion_signals
         }
         
-        prior_week_results = check_prior_week_signals(
-            current_signals=all_current_signals,
-            data_date=data_date,
-            data_dir=data_dir,
-            config=config
-        )
-        logger.info(f"✓ Prior week check complete: {len(prior_week_results)} signals checked")
+        with metrics.stage('step_7_5_prior_week') as stage:
+            prior_lookup = None
+            if prior_week_task is not None:
+                future, prior_week_logs = prior_week_task
+                prior_lookup = prior_week_logs.result(future)
+            
+            if prior_week_task is not None and prior_lookup is None:
+                prior_week_results = {}  # Prior week unavailable (already logged)
+            else:
+                prior_week_results = check_prior_week_signals(
+                    current_signals=all_current_signals,
+                    data_date=data_date,
+                    data_dir=data_dir,
+                    config=config,
+                    ledger=signal_ledger,
+                    prior_lookup=prior_lookup
+                )
+            logger.info(f"✓ Prior week check complete: {len(prior_week_results)} signals checked")
+            
+            # Record this week's final signals so next week's PRWK check is a lookup
+            if signal_ledger is not None:
+                signal_ledger.record(data_date, all_strategy_signals)
+            
+            stage['checked'] = len(prior_week_results)
         
-        # Step 8: Generate report
-        logger.info("\n[Step 8] Generating HTML report...")
-        total_symbols = prepared_df['ice_connect_symbol'].nunique()
-        html_report = report_generator.generate_html_report(
+        report_signals = dict(
             trend_signals=trend_signals,
             enhanced_trend_signals=enhanced_trend_signals,
             mean_reversion_signals=mean_reversion_signals,
             macd_rsi_exhaustion_signals=macd_rsi_exhaustion_signals,
-            ice_chat_formatter=ice_chat_formatter,
+            ice_chat_formatter=ice_chat_formatter
+        )
+        html_report_args = dict(
+            report_signals,
             run_date=datetime.now(),
             data_date=data_date,
-            total_symbols=total_symbols,
+            total_symbols=prepared_df['ice_connect_symbol'].nunique(),
             curve_data=curve_data
         )
-        logger.info("✓ HTML report generated")
+        if report_generator.report_settings.get('include_run_metrics', False):
+            html_report_args['run_metrics'] = metrics.to_dict()
         
-        # Step 9: Save report
-        logger.info("\n[Step 9] Saving report...")
-        output_path = report_generator.save_report(html_report)
+        # With --workers, the HTML report and the ICE Connect file render concurrently
+        html_task = text_task = None
+        if background is not None:
+            html_task = submit_deferred(
+                background, _in_stage, metrics, 'step_8_html_report',
+                report_generator.write_report, workers=workers, **html_report_args
+            )
+            text_task = submit_deferred(
+                background, _in_stage, metrics, 'step_10_ice_connect_file',
+                report_generator.generate_ice_connect_text_file, **report_signals, data_date=data_date
+            )
+        
+        # Step 8-9: Generate report (streamed section by section into the report file)
+        logger.info("\n[Step 8] Generating HTML report...")
+        if html_task is not None:
+            future, html_logs = html_task
+            output_path = html_logs.result(future)
+        else:
+            output_path = _in_stage(metrics, 'step_8_html_report', report_generator.write_report, **html_report_args)
         logger.info(f"✓ Report saved to: {output_path}")
         
         # Step 10: Generate ICE Connect text file
         logger.info("\n[Step 10] Generating ICE Connect text file...")
-        ice_connect_file = report_generator.generate_ice_connect_text_file(
-            trend_signals=trend_signals,
-            enhanced_trend_signals=enhanced_trend_signals,
-            mean_reversion_signals=mean_reversion_signals,
-            macd_rsi_exhaustion_signals=macd_rsi_exhaustion_signals,
-            ice_chat_formatter=ice_chat_formatter,
-            data_date=data_date
-        )
+        if text_task is not None:
+            future, text_logs = text_task
+            ice_connect_file = text_logs.result(future)
+            background.shutdown(wait=True)
+        else:
+            ice_connect_file = _in_stage(
+                metrics, 'step_10_ice_connect_file',
+                report_generator.generate_ice_connect_text_file, **report_signals, data_date=data_date
+            )
         if ice_connect_file:
             logger.info(f"✓ ICE Connect text file saved to: {ice_connect_file}")
         else:
             logger.warning("⚠️  Could not generate ICE Connect text file")
         
+        # Formatted-signal cache shared by the HTML report, ICE Connect file and AI payloads
+        metrics.info['ice_chat_format_cache'] = ice_chat_formatter.format_cache_stats()
+        
+        # Run metrics (stage timings and memory) next to the HTML report
+        metrics_path = None
+        try:
+            metrics_path = metrics.save(Path(output_path).with_suffix('.metrics.json'))
+        except OSError as e:
+            logger.warning(f"Could not save run metrics: {e}")
+        
         # Summary
         logger.info("\n" + "=" * 80)
         logger.info("SIGNAL GENERATION COMPLETE")
@@ -210,6 +303,8 @@ def main(target_date=None, data_dir=None):
         logger.info(f"\nReport saved to: {output_path}")
         if ice_connect_file:
             logger.info(f"ICE Connect text file: {ice_connect_file}")
+        if metrics_path:
+            logger.info(f"Run metrics: {metrics_path}")
         logger.info("=" * 80)
         
         # Flush output to ensure summary is visible
@@ -225,6 +320,9 @@ def main(target_date=None, data_dir=None):
         logger.error("SIGNAL GENERATION FAILED - See error above")
         logger.error("=" * 80)
         return 1
+    
+    finally:
+        metrics.stop()
 
 
 if __name__ == '__main__':
@@ -239,6 +337,17 @@ if __name__ == '__main__':
         type=str,
         help='Data directory path (default: full_unfiltered_historicals)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Parallel workers for strategies and report rendering (default: 1 = sequential)'
+    )
+    parser.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='Record per-stage Python allocations (tracemalloc) in the run-metrics JSON (slower)'
+    )
     
     args = parser.parse_args()
     
@@ -251,5 +360,5 @@ if __name__ == '__main__':
             logger.error(f"Invalid date format: {args.date}. Use YYYY-MM-DD")
             sys.exit(1)
     
-    exit_code = main(target_date=target_date, data_dir=args.data_dir)
+    exit_code = main(target_date=target_date, data_dir=args.data_dir, workers=args.workers, trace_memory=args.trace_memory)
     sys.exit(exit_code)
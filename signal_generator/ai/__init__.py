@@ -4,15 +4,21 @@ Provides AI-based alignment assessment using OpenAI API.
 """
 
 from .ai_align_client import get_ai_trade_alignment, load_openai_config
-from .ai_align_cache import get_or_fetch_ai_alignment, load_today_cache, save_today_cache
+from .ai_align_cache import AIAlignCache, get_default_cache, get_or_fetch_ai_alignment, load_today_cache, save_today_cache
+from .ai_align_dispatch import AIAlignDispatcher, RateLimiter, prefetch_ai_alignments
 from .trade_payload_builder import build_trade_payload, extract_legs, determine_structure_type
 
 __all__ = [
     'get_ai_trade_alignment',
     'load_openai_config',
+    'AIAlignCache',
+    'get_default_cache',
     'get_or_fetch_ai_alignment',
     'load_today_cache',
     'save_today_cache',
+    'AIAlignDispatcher',
+    'RateLimiter',
+    'prefetch_ai_alignments',
     'build_trade_payload',
     'extract_legs',
     'determine_structure_type',
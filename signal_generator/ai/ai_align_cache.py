@@ -1,11 +1,23 @@
 """
 Daily cache implementation for AI alignment responses.
 Prevents redundant API calls for the same trade on the same day.
+
+AIAlignCache keeps the cache in memory for the whole run: each day is read
+once, hits are served from memory and new responses are written in batches
+(atomically, every flush_every entries and at exit). Day files are the same
+ai_align_YYYYMMDD.json files load_today_cache/save_today_cache use. An
+optional SQLite backend (one ai_align.sqlite3 file, WAL mode) lets several
+processes share the cache.
 """
+import atexit
 import json
 import logging
+import os
+import sqlite3
+import threading
+import time
 from pathlib import Path
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
@@ -13,6 +25,27 @@ logger = logging.getLogger(__name__)
 # Default cache directory (relative to project root)
 DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / 'outputs' / 'ai_cache'
 
+CACHE_BACKENDS = ('json', 'sqlite')
+DEFAULT_FLUSH_EVERY = 20
+SQLITE_FILENAME = 'ai_align.sqlite3'
+
+
+def _cache_file(cache_dir: Path, cache_date: date) -> Path:
+    """Day file of the JSON cache (ai_align_YYYYMMDD.json)."""
+    return cache_dir / f"ai_align_{cache_date.strftime('%Y%m%d')}.json"
+
+
+def _write_day_file(cache_file: Path, cache: Dict, cache_date: date) -> None:
+    """Write one day of entries atomically (temp file + replace)."""
+    cache_data = {
+        "cache_date": cache_date.strftime("%Y-%m-%d"),
+        "entries": cache
+    }
+    tmp_path = cache_file.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache_data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, cache_file)
+
 
 def load_today_cache(cache_date: date, cache_dir: Optional[Path] = None) -> Dict:
     """
@@ -33,9 +66,7 @@ def load_today_cache(cache_date: date, cache_dir: Optional[Path] = None) -> Dict
     # Ensure cache directory exists
     cache_dir.mkdir(parents=True, exist_ok=True)
     
-    # Build cache file path
-    cache_filename = f"ai_align_{cache_date.strftime('%Y%m%d')}.json"
-    cache_file = cache_dir / cache_filename
+    cache_file = _cache_file(cache_dir, cache_date)
     
     if not cache_file.exists():
         logger.debug(f"Cache file does not exist: {cache_file}")
@@ -75,19 +106,10 @@ def save_today_cache(cache: Dict, cache_date: date, cache_dir: Optional[Path] =
     # Ensure cache directory exists
     cache_dir.mkdir(parents=True, exist_ok=True)
     
-    # Build cache file path
-    cache_filename = f"ai_align_{cache_date.strftime('%Y%m%d')}.json"
-    cache_file = cache_dir / cache_filename
-    
-    # Build cache structure
-    cache_data = {
-        "cache_date": cache_date.strftime("%Y-%m-%d"),
-        "entries": cache
-    }
+    cache_file = _cache_file(cache_dir, cache_date)
     
     try:
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, indent=2, ensure_ascii=False)
+        _write_day_file(cache_file, cache, cache_date)
         
         logger.info(f"Saved cache for {cache_date}: {len(cache)} entries to {cache_file}")
         
@@ -124,6 +146,357 @@ def build_cache_key(trade_signature: Dict) -> str:
     return cache_key
 
 
+class AIAlignCache:
+    """
+    In-memory AI alignment cache with batched, atomic persistence.
+    
+    Each cache date is loaded once (on first use) and served from memory.
+    New responses are buffered and written every flush_every entries, on
+    flush()/close() and at interpreter exit. The JSON backend rewrites the
+    touched day files atomically; the SQLite backend inserts the buffered
+    rows in one transaction and re-checks the database on a memory miss, so
+    several processes can share it.
+    
+    ttl_days and max_entries are applied across days when the cache is first
+    used (and after each SQLite flush): days older than ttl_days are dropped,
+    then the oldest entries beyond max_entries.
+    
+    Usage:
+        cache = AIAlignCache.from_config(config.get('ai_align', {}))
+        response = cache.get(cache_date, cache_key)
+        if response is None:
+            response = get_ai_trade_alignment(payload)
+            cache.put(cache_date, cache_key, response)
+        cache.flush()
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        backend: str = 'json',
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        ttl_days: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Initialize the cache (nothing is read until the first lookup).
+        
+        Args:
+            cache_dir: Cache directory (default: outputs/ai_cache)
+            backend: 'json' (day files) or 'sqlite' (ai_align.sqlite3, multi-process)
+            flush_every: Buffered new entries that trigger a write (1 = write every entry)
+            ttl_days: Drop cache days older than this many days (None = keep all)
+            max_entries: Keep at most this many entries across days (None = no cap)
+        """
+        if backend not in CACHE_BACKENDS:
+            raise ValueError(f"Unknown AI cache backend '{backend}' (expected one of {CACHE_BACKENDS})")
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.backend = backend
+        self.flush_every = max(1, int(flush_every))
+        self.ttl_days = ttl_days
+        self.max_entries = max_entries
+        
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._days: Dict[date, Dict] = {}     # cache_date -> {cache_key: response}
+        self._pending: Dict[date, Dict] = {}  # cache_date -> entries not written yet
+        self._pending_count = 0
+        self._evicted = False
+        self._connection = None
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+    
+    @classmethod
+    def from_config(cls, ai_align_config: dict) -> 'AIAlignCache':
+        """
+        Create a cache from the ai_align config section.
+        
+        Args:
+            ai_align_config: config['ai_align'] (cache_dir, cache_backend, cache_flush_every,
+                             cache_ttl_days, cache_max_entries; all optional)
+        
+        Returns:
+            AIAlignCache
+        """
+        cache_dir = ai_align_config.get('cache_dir')
+        if cache_dir:
+            cache_dir = Path(cache_dir)
+            if not cache_dir.is_absolute():
+                cache_dir = Path(__file__).parent.parent.parent / cache_dir
+        return cls(
+            cache_dir=cache_dir,
+            backend=ai_align_config.get('cache_backend', 'json'),
+            flush_every=ai_align_config.get('cache_flush_every', DEFAULT_FLUSH_EVERY),
+            ttl_days=ai_align_config.get('cache_ttl_days'),
+            max_entries=ai_align_config.get('cache_max_entries')
+        )
+    
+    def _db(self) -> sqlite3.Connection:
+        """SQLite connection (opened and migrated on first use)."""
+        if self._connection is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.cache_dir / SQLITE_FILENAME, timeout=30, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS ai_align ('
+                'cache_date TEXT NOT NULL, cache_key TEXT NOT NULL, response TEXT NOT NULL, '
+                'created_at REAL NOT NULL, PRIMARY KEY (cache_date, cache_key))'
+            )
+            self._connection.execute('CREATE INDEX IF NOT EXISTS ai_align_created ON ai_align (created_at)')
+            self._connection.commit()
+        return self._connection
+    
+    def _day(self, cache_date: date) -> Dict:
+        """Entries of one day (read from the backend the first time the day is used)."""
+        entries = self._days.get(cache_date)
+        if entries is None:
+            if not self._evicted:
+                self._evicted = True
+                self.evict()
+            if self.backend == 'sqlite':
+                rows = self._db().execute(
+                    'SELECT cache_key, response FROM ai_align WHERE cache_date = ? ORDER BY created_at',
+                    (cache_date.isoformat(),)
+                )
+                entries = {key: json.loads(response) for key, response in rows}
+                logger.info(f"Loaded AI cache for {cache_date}: {len(entries)} entries")
+            else:
+                entries = load_today_cache(cache_date, self.cache_dir)
+            self._days[cache_date] = entries
+        return entries
+    
+    def get(self, cache_date: date, cache_key: str) -> Optional[Dict]:
+        """
+        Cached response for a trade.
+        
+        Args:
+            cache_date: Cache date
+            cache_key: build_cache_key() of the trade
+        
+        Returns:
+            AI response dictionary, or None on a miss
+        """
+        with self._lock:
+            response = self._lookup(cache_date, cache_key)
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return response
+    
+    def contains(self, cache_date: date, cache_key: str) -> bool:
+        """
+        Check for a cached response without counting a hit or miss.
+        
+        Args:
+            cache_date: Cache date
+            cache_key: build_cache_key() of the trade
+        
+        Returns:
+            True if the response is cached
+        """
+        with self._lock:
+            return self._lookup(cache_date, cache_key) is not None
+    
+    def _lookup(self, cache_date: date, cache_key: str) -> Optional[Dict]:
+        """Memory lookup, then the database for entries other processes added (SQLite)."""
+        entries = self._day(cache_date)
+        response = entries.get(cache_key)
+        if response is None and self.backend == 'sqlite':
+            # Another process may have stored it since the day was loaded
+            row = self._db().execute(
+                'SELECT response FROM ai_align WHERE cache_date = ? AND cache_key = ?',
+                (cache_date.isoformat(), cache_key)
+            ).fetchone()
+            if row is not None:
+                response = entries[cache_key] = json.loads(row[0])
+        return response
+    
+    def put(self, cache_date: date, cache_key: str, response: Dict) -> None:
+        """
+        Store a response (written with the next batch).
+        
+        Args:
+            cache_date: Cache date
+            cache_key: build_cache_key() of the trade
+            response: AI response dictionary
+        """
+        with self._lock:
+            self._day(cache_date)[cache_key] = response
+            self._pending.setdefault(cache_date, {})[cache_key] = response
+            self._pending_count += 1
+            if self._pending_count >= self.flush_every:
+                self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write buffered entries (atomic per day file / one SQLite transaction).
+        
+        Returns:
+            Number of entries written
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            written = self._pending_count
+            try:
+                if self.backend == 'sqlite':
+                    now = time.time()
+                    with self._db() as connection:
+                        connection.executemany(
+                            'INSERT OR REPLACE INTO ai_align (cache_date, cache_key, response, created_at) VALUES (?, ?, ?, ?)',
+                            [(cache_date.isoformat(), key, json.dumps(response, ensure_ascii=False), now)
+                             for cache_date, entries in self._pending.items() for key, response in entries.items()]
+                        )
+                    self._evict_sqlite()
+                else:
+                    self.cache_dir.mkdir(parents=True, exist_ok=True)
+                    for cache_date in self._pending:
+                        _write_day_file(_cache_file(self.cache_dir, cache_date), self._days[cache_date], cache_date)
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Error writing AI cache to {self.cache_dir}: {e}")
+                return 0
+            self._pending.clear()
+            self._pending_count = 0
+            self.writes += written
+            logger.info(f"Saved {written} AI cache entries ({self.backend}) to {self.cache_dir}")
+            return written
+    
+    def evict(self) -> int:
+        """
+        Apply ttl_days and max_entries across days.
+        
+        Returns:
+            Number of entries dropped
+        """
+        if self.ttl_days is None and self.max_entries is None:
+            return 0
+        with self._lock:
+            if self.backend == 'sqlite':
+                return self._evict_sqlite()
+            return self._evict_json()
+    
+    def _cutoff(self) -> Optional[date]:
+        """Oldest cache date kept by ttl_days (None = no TTL)."""
+        return date.today() - timedelta(days=self.ttl_days) if self.ttl_days is not None else None
+    
+    def _evict_sqlite(self) -> int:
+        """TTL and size cap on the SQLite table (oldest rows first)."""
+        if self.ttl_days is None and self.max_entries is None:
+            return 0
+        dropped = 0
+        with self._db() as connection:
+            cutoff = self._cutoff()
+            if cutoff is not None:
+                dropped += connection.execute('DELETE FROM ai_align WHERE cache_date < ?', (cutoff.isoformat(),)).rowcount
+            if self.max_entries is not None:
+                dropped += connection.execute(
+                    'DELETE FROM ai_align WHERE rowid NOT IN '
+                    '(SELECT rowid FROM ai_align ORDER BY created_at DESC, rowid DESC LIMIT ?)',
+                    (int(self.max_entries),)
+                ).rowcount
+        if dropped:
+            self._days.clear()
+            logger.info(f"Evicted {dropped} AI cache entries")
+        return dropped
+    
+    def _evict_json(self) -> int:
+        """TTL and size cap on the day files (older days first, then a day's oldest entries)."""
+        if not self.cache_dir.exists():
+            return 0
+        days = []
+        for path in self.cache_dir.glob('ai_align_*.json'):
+            try:
+                days.append((datetime.strptime(path.stem[len('ai_align_'):], '%Y%m%d').date(), path))
+            except ValueError:
+                continue
+        days.sort(reverse=True)  # Newest first
+        
+        dropped = 0
+        kept = 0
+        cutoff = self._cutoff()
+        for cache_date, path in days:
+            if self._pending.get(cache_date):
+                kept += len(self._days.get(cache_date, {}))
+                continue  # Never drop unwritten entries
+            if cutoff is not None and cache_date < cutoff:
+                dropped += len(self._days.pop(cache_date, None) or load_today_cache(cache_date, self.cache_dir))
+                path.unlink(missing_ok=True)
+                continue
+            if self.max_entries is None:
+                continue
+            entries = self._days.get(cache_date)
+            if entries is None:
+                entries = load_today_cache(cache_date, self.cache_dir)
+            room = max(0, int(self.max_entries) - kept)
+            if len(entries) <= room:
+                kept += len(entries)
+                continue
+            dropped += len(entries) - room
+            if room == 0:
+                self._days.pop(cache_date, None)
+                path.unlink(missing_ok=True)
+            else:
+                # Dicts keep insertion order: the newest entries are last
+                entries = dict(list(entries.items())[-room:])
+                if cache_date in self._days:
+                    self._days[cache_date] = entries
+                _write_day_file(path, entries, cache_date)
+                kept += room
+        if dropped:
+            logger.info(f"Evicted {dropped} AI cache entries")
+        return dropped
+    
+    def stats(self) -> Dict:
+        """
+        Cache counters for run metrics.
+        
+        Returns:
+            Dictionary with 'hits', 'misses', 'writes', 'pending' and 'days' (loaded)
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'writes': self.writes,
+                    'pending': self._pending_count, 'days': len(self._days)}
+    
+    def close(self) -> None:
+        """Flush and release the backend (the cache can be reopened by using it again)."""
+        with self._lock:
+            self.flush()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# Process-wide caches used by get_or_fetch_ai_alignment when no cache is passed
+_default_caches: Dict[Path, AIAlignCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def get_default_cache(cache_dir: Optional[Path] = None) -> AIAlignCache:
+    """
+    Shared JSON-backed AIAlignCache for a cache directory (one per process).
+    
+    Args:
+        cache_dir: Cache directory (default: outputs/ai_cache)
+    
+    Returns:
+        AIAlignCache
+    """
+    cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    with _default_caches_lock:
+        cache = _default_caches.get(cache_dir)
+        if cache is None:
+            cache = _default_caches[cache_dir] = AIAlignCache(cache_dir)
+        return cache
+
+
 def get_or_fetch_ai_alignment(
     trade_signature: Dict,
     trade_payload: Dict,
@@ -131,6 +504,7 @@ def get_or_fetch_ai_alignment(
     cache_dir: Optional[Path] = None,
     multi_pass: bool = True,
     num_passes: int = 3,
+    cache: Optional[AIAlignCache] = None,
     **api_kwargs
 ) -> Dict:
     """
@@ -141,6 +515,8 @@ def get_or_fetch_ai_alignment(
         trade_payload: Full trade payload for API call (if needed)
         cache_date: Date for cache lookup (default: today)
         cache_dir: Cache directory path (default: outputs/ai_cache)
+        cache: AIAlignCache to use (default: the process-wide cache of cache_dir;
+               new entries are written in batches and at exit)
         **api_kwargs: Additional arguments to pass to get_ai_trade_alignment()
     
     Returns:
@@ -155,12 +531,13 @@ def get_or_fetch_ai_alignment(
     # Build cache key
     cache_key = build_cache_key(trade_signature)
     
-    # Try to load from cache
-    cache = load_today_cache(cache_date, cache_dir)
+    # Try the in-memory cache (each day is loaded once per run)
+    if cache is None:
+        cache = get_default_cache(cache_dir)
+    cached_response = cache.get(cache_date, cache_key)
     
-    if cache_key in cache:
+    if cached_response is not None:
         logger.info(f"Cache HIT for key: {cache_key[:100]}...")
-        cached_response = cache[cache_key]
         
         # Add timestamp if not present (for backward compatibility)
         if "timestamp" not in cached_response:
@@ -178,8 +555,7 @@ def get_or_fetch_ai_alignment(
     )
     
     # Store in cache (even if error, to avoid repeated failed calls)
-    cache[cache_key] = ai_response
-    save_today_cache(cache, cache_date, cache_dir)
+    cache.put(cache_date, cache_key, ai_response)
     
     return ai_response
 
@@ -143,164 +143,24 @@ def get_ai_trade_alignment(
             "confidence": 0
         }
     
-    # Build system message
-    system_message = """You are a senior energy commodity analyst with deep expertise in:
-- Energy commodity markets (crude oil, refined products, NGLs, natural gas)
-- Technical analysis and trading signals
-- Spread trading (inter-commodity, inter-tenor, calendar spreads)
-- Fundamental analysis of supply/demand, seasonality, and market structure
-- Historical market conditions and price dynamics
-
-Your task is to RESEARCH and BALANCED evaluate trade signals as a true analyst would.
-
-BALANCED ANALYST APPROACH:
-1. RESEARCH THE MARKET: Use your knowledge of energy markets to understand what was happening at the trade date/timeframe
-   - Consider: seasonal patterns, supply/demand fundamentals, geopolitical events, inventory levels, refinery runs
-   - Think about: What were typical spreads at that time? What were seasonal expectations?
-   - Analyze: Are the commodities in the trade fundamentally aligned or misaligned for that timeframe?
-   - Use forward curve data to assess market structure (contango/backwardation)
-
-2. BE BALANCED AND HONEST:
-   - Use the FULL RANGE of alignment labels appropriately: Strongly Agree, Agree, Neutral, Disagree, Strongly Disagree
-   - AGREE when: Technical indicators are strong (high score, multiple confirmations) AND fundamentals/market structure support the trade
-   - DISAGREE when: There are clear fundamental mismatches, poor risk/reward, or market structure contradicts the trade
-   - Don't be overly negative - recognize when a trade has merit despite some concerns
-   - A trade with strong technicals (score 95+) and reasonable fundamentals should often be "Agree" or "Neutral", not automatically "Disagree"
-
-3. EVALUATION CRITERIA:
-   - Strong technicals (score 95-110) + supportive fundamentals = Agree/Strongly Agree
-   - Strong technicals + neutral/mixed fundamentals = Neutral/Agree
-   - Strong technicals + clearly negative fundamentals = Disagree
-   - Weak technicals OR poor risk/reward = Disagree/Strongly Disagree
-   - Give credit where due - if technicals are excellent and fundamentals are reasonable, don't default to Disagree
-
-CRITICAL UNDERSTANDING OF SPREADS:
-- Spreads have two legs: Leg 1 and Leg 2
-- A "Buy" spread means: Buy Leg 1 / Sell Leg 2
-- A "Sell" spread means: Sell Leg 1 / Buy Leg 2
-- Legs can involve different commodities and different tenors (including quarterlies like Q1, Q2, Q3, Q4)
-- Outrights have only one leg (Leg 1), and the signal direction applies directly to it
-
-You must evaluate each trade from both:
-1. Technical perspective: Based on the score details, indicators, and risk metrics provided
-2. Fundamental perspective: Based on your RESEARCH of market conditions, commodities, tenors, and seasonality
-3. Market structure perspective: Analyze the forward curves provided
-   - CONTANGO (prices rising over time): BEARISH structure - indicates oversupply/storage costs, bearish for longs
-   - BACKWARDATION (prices falling over time): BULLISH structure - indicates tight supply/demand, bullish for longs
-   - For BUY signals: Backwardation is supportive, Contango is bearish/negative
-   - For SELL signals: Contango is supportive, Backwardation is bullish/negative
-   - Consider if the trade direction aligns with the forward curve structure
-
-Provide your assessment as JSON only, with no additional text."""
-
-    # Build user message from trade_payload
-    user_message = _build_user_message(trade_payload)
-    
     # Multi-pass system for accuracy
     if multi_pass and num_passes > 1:
         return _get_ai_alignment_multipass(
             trade_payload, api_key, model, temperature, max_tokens, timeout, num_passes
         )
     
-    # Single-pass (original behavior)
+    # Single-pass: the Pass 1 request, built and parsed as in the multi-pass and async clients
+    api_params = _build_pass_request(trade_payload, None, model, temperature, max_tokens, pass_number=1)
+    
     # Make API call
     start_time = time.time()
     try:
-        # Note: response_format={"type": "json_object"} only works with certain models (gpt-4-turbo, gpt-4o)
-        # For gpt-4, we'll request JSON in the prompt and parse it manually
-        use_json_format = model in ["gpt-4-turbo", "gpt-4-turbo-preview", "gpt-4o", "gpt-4o-mini"]
-        
-        # Enhance user message to strongly request JSON if not using response_format
-        if not use_json_format:
-            user_message += "\n\nIMPORTANT: Respond ONLY with valid JSON. Do not include any text before or after the JSON object."
-        
-        api_params = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ],
-            "temperature": temperature,
-            "max_tokens": max_tokens
-        }
-        
-        if use_json_format:
-            api_params["response_format"] = {"type": "json_object"}
-        
         response = client.chat.completions.create(**api_params)
         
         duration = time.time() - start_time
         logger.info(f"OpenAI API call completed in {duration:.2f}s")
         
-        # Extract response content
-        response_content = response.choices[0].message.content
-        
-        # Parse JSON response - handle cases where response might have extra text
-        try:
-            # Try to extract JSON from response (in case model adds extra text)
-            response_content_clean = response_content.strip()
-            
-            # If response starts with ```json or ```, extract JSON part
-            if response_content_clean.startswith("```json"):
-                # Extract content between ```json and ```
-                start_idx = response_content_clean.find("```json") + 7
-                end_idx = response_content_clean.find("```", start_idx)
-                if end_idx != -1:
-                    response_content_clean = response_content_clean[start_idx:end_idx].strip()
-            elif response_content_clean.startswith("```"):
-                # Extract content between ``` and ```
-                start_idx = response_content_clean.find("```") + 3
-                end_idx = response_content_clean.find("```", start_idx)
-                if end_idx != -1:
-                    response_content_clean = response_content_clean[start_idx:end_idx].strip()
-            
-            # Try to find JSON object boundaries if response has extra text
-            if not response_content_clean.startswith("{"):
-                # Look for first { and last }
-                start_brace = response_content_clean.find("{")
-                end_brace = response_content_clean.rfind("}")
-                if start_brace != -1 and end_brace != -1 and end_brace > start_brace:
-                    response_content_clean = response_content_clean[start_brace:end_brace+1]
-            
-            ai_response = json.loads(response_content_clean)
-            
-            # Validate response structure
-            required_fields = ["alignment_label", "technical_view", "fundamental_view", "overall_comment", "confidence"]
-            missing_fields = [field for field in required_fields if field not in ai_response]
-            
-            if missing_fields:
-                logger.warning(f"AI response missing fields: {missing_fields}. Using defaults.")
-                for field in missing_fields:
-                    if field == "confidence":
-                        ai_response[field] = 0
-                    else:
-                        ai_response[field] = ""
-            
-            # Validate alignment_label
-            valid_labels = ["Strongly Agree", "Agree", "Neutral", "Disagree", "Strongly Disagree"]
-            if ai_response.get("alignment_label") not in valid_labels:
-                logger.warning(f"Invalid alignment_label: {ai_response.get('alignment_label')}. Using 'Neutral'.")
-                ai_response["alignment_label"] = "Neutral"
-            
-            # Validate confidence
-            confidence = ai_response.get("confidence", 0)
-            if not isinstance(confidence, (int, float)) or confidence < 0 or confidence > 100:
-                logger.warning(f"Invalid confidence: {confidence}. Using 0.")
-                ai_response["confidence"] = 0
-            
-            return ai_response
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing AI JSON response: {e}")
-            logger.error(f"Response content: {response_content[:500]}")
-            return {
-                "error": f"JSON parse error: {e}",
-                "alignment_label": "AI Parse Error",
-                "technical_view": "",
-                "fundamental_view": "",
-                "overall_comment": "",
-                "confidence": 0
-            }
+        return _parse_pass_response(response.choices[0].message.content, pass_number=1)
             
     except openai.APITimeoutError:
         logger.error(f"OpenAI API timeout after {timeout}s")
@@ -446,6 +306,72 @@ def _get_ai_alignment_single_pass(
             "confidence": 0
         }
     
+    api_params = _build_pass_request(trade_payload, previous_response, model, temperature, max_tokens, pass_number)
+    
+    # Make API call
+    start_time = time.time()
+    try:
+        response = client.chat.completions.create(**api_params)
+        
+        duration = time.time() - start_time
+        logger.info(f"  Pass {pass_number} completed in {duration:.2f}s")
+        
+        return _parse_pass_response(response.choices[0].message.content, pass_number)
+            
+    except openai.APITimeoutError:
+        logger.error(f"  Pass {pass_number} timeout after {timeout}s")
+        return {
+            "error": "API timeout",
+            "alignment_label": "AI Timeout",
+            "technical_view": "",
+            "fundamental_view": "",
+            "overall_comment": "",
+            "confidence": 0
+        }
+    except openai.APIError as e:
+        logger.error(f"  Pass {pass_number} API error: {e}")
+        return {
+            "error": f"API error: {e}",
+            "alignment_label": "AI Error",
+            "technical_view": "",
+            "fundamental_view": "",
+            "overall_comment": "",
+            "confidence": 0
+        }
+    except Exception as e:
+        logger.error(f"  Pass {pass_number} unexpected error: {e}", exc_info=True)
+        return {
+            "error": f"Unexpected error: {e}",
+            "alignment_label": "AI Error",
+            "technical_view": "",
+            "fundamental_view": "",
+            "overall_comment": "",
+            "confidence": 0
+        }
+
+
+def _build_pass_request(
+    trade_payload: Dict,
+    previous_response: Optional[Dict],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    pass_number: int = 1
+) -> Dict:
+    """
+    Chat completion parameters for one analysis pass (shared by the sync and async clients).
+    
+    Args:
+        trade_payload: Trade payload dictionary
+        previous_response: Previous pass response (None for Pass 1)
+        model: Model name
+        temperature: Temperature setting
+        max_tokens: Max tokens
+        pass_number: Pass number (1, 2, or 3)
+    
+    Returns:
+        Keyword arguments for chat.completions.create
+    """
     # Build system message
     system_message = """You are a senior energy commodity analyst with deep expertise in:
 - Energy commodity markets (crude oil, refined products, NGLs, natural gas)
@@ -541,130 +467,102 @@ Provide your assessment as JSON only, with no additional text."""
         # Fallback: use Pass 1 format
         user_message = _build_user_message(trade_payload)
     
-    # Make API call
-    start_time = time.time()
+    # Note: response_format={"type": "json_object"} only works with certain models (gpt-4-turbo, gpt-4o)
+    # For gpt-4, we'll request JSON in the prompt and parse it manually
+    use_json_format = model in ["gpt-4-turbo", "gpt-4-turbo-preview", "gpt-4o", "gpt-4o-mini"]
+    
+    # Enhance user message to strongly request JSON if not using response_format
+    if not use_json_format:
+        user_message += "\n\nIMPORTANT: Respond ONLY with valid JSON. Do not include any text before or after the JSON object."
+    
+    api_params = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message}
+        ],
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    
+    if use_json_format:
+        api_params["response_format"] = {"type": "json_object"}
+    
+    return api_params
+
+
+def _parse_pass_response(response_content: str, pass_number: int = 1) -> Dict:
+    """
+    Parse and validate the JSON content of one pass (shared by the sync and async clients).
+    
+    Args:
+        response_content: Message content returned by the model
+        pass_number: Pass number (for log messages)
+    
+    Returns:
+        AI response dictionary (or a parse error response)
+    """
+    # Parse JSON response - handle cases where response might have extra text
     try:
-        # Note: response_format={"type": "json_object"} only works with certain models (gpt-4-turbo, gpt-4o)
-        # For gpt-4, we'll request JSON in the prompt and parse it manually
-        use_json_format = model in ["gpt-4-turbo", "gpt-4-turbo-preview", "gpt-4o", "gpt-4o-mini"]
+        # Try to extract JSON from response (in case model adds extra text)
+        response_content_clean = response_content.strip()
         
-        # Enhance user message to strongly request JSON if not using response_format
-        if not use_json_format:
-            user_message += "\n\nIMPORTANT: Respond ONLY with valid JSON. Do not include any text before or after the JSON object."
+        # If response starts with ```json or ```, extract JSON part
+        if response_content_clean.startswith("```json"):
+            # Extract content between ```json and ```
+            start_idx = response_content_clean.find("```json") + 7
+            end_idx = response_content_clean.find("```", start_idx)
+            if end_idx != -1:
+                response_content_clean = response_content_clean[start_idx:end_idx].strip()
+        elif response_content_clean.startswith("```"):
+            # Extract content between ``` and ```
+            start_idx = response_content_clean.find("```") + 3
+            end_idx = response_content_clean.find("```", start_idx)
+            if end_idx != -1:
+                response_content_clean = response_content_clean[start_idx:end_idx].strip()
         
-        api_params = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ],
-            "temperature": temperature,
-            "max_tokens": max_tokens
-        }
+        # Try to find JSON object boundaries if response has extra text
+        if not response_content_clean.startswith("{"):
+            # Look for first { and last }
+            start_brace = response_content_clean.find("{")
+            end_brace = response_content_clean.rfind("}")
+            if start_brace != -1 and end_brace != -1 and end_brace > start_brace:
+                response_content_clean = response_content_clean[start_brace:end_brace+1]
         
-        if use_json_format:
-            api_params["response_format"] = {"type": "json_object"}
+        ai_response = json.loads(response_content_clean)
         
-        response = client.chat.completions.create(**api_params)
+        # Validate response structure
+        required_fields = ["alignment_label", "technical_view", "fundamental_view", "overall_comment", "confidence"]
+        missing_fields = [field for field in required_fields if field not in ai_response]
         
-        duration = time.time() - start_time
-        logger.info(f"  Pass {pass_number} completed in {duration:.2f}s")
+        if missing_fields:
+            logger.warning(f"  Pass {pass_number} response missing fields: {missing_fields}. Using defaults.")
+            for field in missing_fields:
+                if field == "confidence":
+                    ai_response[field] = 0
+                else:
+                    ai_response[field] = ""
         
-        # Extract response content
-        response_content = response.choices[0].message.content
+        # Validate alignment_label
+        valid_labels = ["Strongly Agree", "Agree", "Neutral", "Disagree", "Strongly Disagree"]
+        if ai_response.get("alignment_label") not in valid_labels:
+            logger.warning(f"  Pass {pass_number} invalid alignment_label: {ai_response.get('alignment_label')}. Using 'Neutral'.")
+            ai_response["alignment_label"] = "Neutral"
         
-        # Parse JSON response - handle cases where response might have extra text
-        try:
-            # Try to extract JSON from response (in case model adds extra text)
-            response_content_clean = response_content.strip()
-            
-            # If response starts with ```json or ```, extract JSON part
-            if response_content_clean.startswith("```json"):
-                # Extract content between ```json and ```
-                start_idx = response_content_clean.find("```json") + 7
-                end_idx = response_content_clean.find("```", start_idx)
-                if end_idx != -1:
-                    response_content_clean = response_content_clean[start_idx:end_idx].strip()
-            elif response_content_clean.startswith("```"):
-                # Extract content between ``` and ```
-                start_idx = response_content_clean.find("```") + 3
-                end_idx = response_content_clean.find("```", start_idx)
-                if end_idx != -1:
-                    response_content_clean = response_content_clean[start_idx:end_idx].strip()
-            
-            # Try to find JSON object boundaries if response has extra text
-            if not response_content_clean.startswith("{"):
-                # Look for first { and last }
-                start_brace = response_content_clean.find("{")
-                end_brace = response_content_clean.rfind("}")
-                if start_brace != -1 and end_brace != -1 and end_brace > start_brace:
-                    response_content_clean = response_content_clean[start_brace:end_brace+1]
-            
-            ai_response = json.loads(response_content_clean)
-            
-            # Validate response structure
-            required_fields = ["alignment_label", "technical_view", "fundamental_view", "overall_comment", "confidence"]
-            missing_fields = [field for field in required_fields if field not in ai_response]
-            
-            if missing_fields:
-                logger.warning(f"  Pass {pass_number} response missing fields: {missing_fields}. Using defaults.")
-                for field in missing_fields:
-                    if field == "confidence":
-                        ai_response[field] = 0
-                    else:
-                        ai_response[field] = ""
-            
-            # Validate alignment_label
-            valid_labels = ["Strongly Agree", "Agree", "Neutral", "Disagree", "Strongly Disagree"]
-            if ai_response.get("alignment_label") not in valid_labels:
-                logger.warning(f"  Pass {pass_number} invalid alignment_label: {ai_response.get('alignment_label')}. Using 'Neutral'.")
-                ai_response["alignment_label"] = "Neutral"
-            
-            # Validate confidence
-            confidence = ai_response.get("confidence", 0)
-            if not isinstance(confidence, (int, float)) or confidence < 0 or confidence > 100:
-                logger.warning(f"  Pass {pass_number} invalid confidence: {confidence}. Using 0.")
-                ai_response["confidence"] = 0
-            
-            return ai_response
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"  Pass {pass_number} JSON parse error: {e}")
-            logger.error(f"  Response content: {response_content[:500]}")
-            return {
-                "error": f"JSON parse error: {e}",
-                "alignment_label": "AI Parse Error",
-                "technical_view": "",
-                "fundamental_view": "",
-                "overall_comment": "",
-                "confidence": 0
-            }
-            
-    except openai.APITimeoutError:
-        logger.error(f"  Pass {pass_number} timeout after {timeout}s")
-        return {
-            "error": "API timeout",
-            "alignment_label": "AI Timeout",
-            "technical_view": "",
-            "fundamental_view": "",
-            "overall_comment": "",
-            "confidence": 0
-        }
-    except openai.APIError as e:
-        logger.error(f"  Pass {pass_number} API error: {e}")
-        return {
-            "error": f"API error: {e}",
-            "alignment_label": "AI Error",
-            "technical_view": "",
-            "fundamental_view": "",
-            "overall_comment": "",
-            "confidence": 0
-        }
-    except Exception as e:
-        logger.error(f"  Pass {pass_number} unexpected error: {e}", exc_info=True)
+        # Validate confidence
+        confidence = ai_response.get("confidence", 0)
+        if not isinstance(confidence, (int, float)) or confidence < 0 or confidence > 100:
+            logger.warning(f"  Pass {pass_number} invalid confidence: {confidence}. Using 0.")
+            ai_response["confidence"] = 0
+        
+        return ai_response
+    
+    except json.JSONDecodeError as e:
+        logger.error(f"  Pass {pass_number} JSON parse error: {e}")
+        logger.error(f"  Response content: {response_content[:500]}")
         return {
-            "error": f"Unexpected error: {e}",
-            "alignment_label": "AI Error",
+            "error": f"JSON parse error: {e}",
+            "alignment_label": "AI Parse Error",
             "technical_view": "",
             "fundamental_view": "",
             "overall_comment": "",
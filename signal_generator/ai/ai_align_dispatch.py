@@ -0,0 +1,395 @@
+"""
+Concurrent dispatch of AI alignment requests (asyncio + AsyncOpenAI).
+
+get_or_fetch_ai_alignment handles one trade at a time, and each trade is a
+chain of up to three chat calls, so a report waits for every call in turn.
+AIAlignDispatcher sends the cache misses of a report together: the passes of
+a trade stay sequential (each pass reviews the previous one), trades run
+concurrently up to max_concurrency, and a one-minute sliding window keeps
+requests and tokens under requests_per_minute / tokens_per_minute. Requests
+for the same cache key share one in-flight task.
+
+prefetch_ai_alignments stores the results in the AIAlignCache, where the
+report rows pick them up as cache hits.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Try to import openai library
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+from .ai_align_cache import AIAlignCache, build_cache_key
+from .ai_align_client import load_openai_config, _build_pass_request, _parse_pass_response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+WINDOW_SECONDS = 60.0
+CHARS_PER_TOKEN = 4  # Rough prompt size estimate before the response reports usage
+
+
+def _error_response(error: str, label: str = "AI Error") -> Dict:
+    """Error response in the shape get_ai_trade_alignment returns."""
+    return {
+        "error": error,
+        "alignment_label": label,
+        "technical_view": "",
+        "fundamental_view": "",
+        "overall_comment": "",
+        "confidence": 0
+    }
+
+
+def estimate_tokens(api_params: Dict) -> int:
+    """
+    Tokens a chat request may use (prompt estimate plus max_tokens).
+    
+    Args:
+        api_params: Keyword arguments for chat.completions.create
+    
+    Returns:
+        Estimated total tokens
+    """
+    prompt_chars = sum(len(message.get('content', '')) for message in api_params.get('messages', []))
+    return prompt_chars // CHARS_PER_TOKEN + int(api_params.get('max_tokens', 0))
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits over a sliding window.
+    
+    acquire() waits (in arrival order) until the request fits the last minute;
+    settle() replaces the estimate with the tokens the response reported.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        clock=time.monotonic
+    ):
+        """
+        Initialize the limiter.
+        
+        Args:
+            requests_per_minute: Request limit (None = unlimited)
+            tokens_per_minute: Token limit (None = unlimited)
+            clock: Monotonic clock in seconds
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.clock = clock
+        self.waited = 0.0
+        self._events = deque()  # [timestamp, tokens], oldest first
+        self._tokens = 0
+        self._lock = asyncio.Lock()
+    
+    def _expire(self, now: float) -> None:
+        """Drop requests older than the window."""
+        while self._events and self._events[0][0] <= now - WINDOW_SECONDS:
+            self._tokens -= self._events.popleft()[1]
+    
+    def _wait_time(self, now: float, tokens: int) -> float:
+        """Seconds until a request of this size fits (0 = now)."""
+        if not self._events:
+            return 0.0
+        if self.requests_per_minute and len(self._events) >= self.requests_per_minute:
+            return self._events[0][0] + WINDOW_SECONDS - now
+        if self.tokens_per_minute and self._tokens + tokens > self.tokens_per_minute:
+            return self._events[0][0] + WINDOW_SECONDS - now
+        return 0.0
+    
+    async def acquire(self, tokens: int) -> List:
+        """
+        Wait until a request fits the limits and record it.
+        
+        Args:
+            tokens: Estimated tokens of the request
+        
+        Returns:
+            Window entry to pass to settle()
+        """
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)  # A single oversized request still goes out
+        async with self._lock:
+            while True:
+                now = self.clock()
+                self._expire(now)
+                wait = self._wait_time(now, tokens)
+                if wait <= 0:
+                    break
+                self.waited += wait
+                await asyncio.sleep(wait)
+            event = [now, tokens]
+            self._events.append(event)
+            self._tokens += tokens
+            return event
+    
+    def settle(self, event: List, tokens: int) -> None:
+        """
+        Record the tokens a request actually used.
+        
+        Args:
+            event: Entry returned by acquire()
+            tokens: Total tokens reported by the response
+        """
+        self._expire(self.clock())
+        if self._events and event[0] >= self._events[0][0]:
+            self._tokens += tokens - event[1]
+            event[1] = tokens
+
+
+class AIAlignDispatcher:
+    """
+    Runs the AI alignment passes of many trades concurrently.
+    
+    Usage:
+        dispatcher = AIAlignDispatcher.from_config(config.get('ai_align', {}))
+        responses = dispatcher.fetch_many([(cache_key, trade_payload), ...])
+    """
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4",
+        temperature: float = 0.3,
+        max_tokens: int = 1000,
+        timeout: int = 30,
+        multi_pass: bool = True,
+        num_passes: int = 3,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        base_url: Optional[str] = None,
+        max_retries: int = 2
+    ):
+        """
+        Initialize the dispatcher.
+        
+        Args:
+            api_key: OpenAI API key (if None, loaded with load_openai_config)
+            model ... num_passes: As get_ai_trade_alignment
+            max_concurrency: Trades in flight at once (each has at most one pending call)
+            requests_per_minute: Request limit (None = unlimited)
+            tokens_per_minute: Token limit (None = unlimited)
+            base_url: Chat completions endpoint (None = OpenAI; e.g. a local test server)
+            max_retries: Client retries on rate-limit/connection errors (with backoff)
+        """
+        self.api_key = api_key
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.num_passes = min(max(num_passes, 1), 3) if multi_pass else 1
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.base_url = base_url
+        self.max_retries = max_retries
+        
+        self.trades = 0
+        self.requests = 0
+        self.tokens = 0
+        self.coalesced = 0
+        self.waited = 0.0
+        self._inflight: Dict[str, asyncio.Task] = {}
+    
+    @classmethod
+    def from_config(cls, ai_align_config: dict) -> 'AIAlignDispatcher':
+        """
+        Create a dispatcher from the ai_align config section.
+        
+        Args:
+            ai_align_config: config['ai_align'] (openai_* settings, multi_pass, passes,
+                             max_concurrency, requests_per_minute, tokens_per_minute,
+                             openai_base_url; all optional)
+        
+        Returns:
+            AIAlignDispatcher
+        """
+        return cls(
+            model=ai_align_config.get('openai_model', 'gpt-4'),
+            temperature=ai_align_config.get('openai_temperature', 0.3),
+            max_tokens=ai_align_config.get('openai_max_tokens', 1000),
+            timeout=ai_align_config.get('openai_timeout', 30),
+            multi_pass=ai_align_config.get('multi_pass', True),
+            num_passes=ai_align_config.get('passes', 3),
+            max_concurrency=ai_align_config.get('max_concurrency', DEFAULT_MAX_CONCURRENCY),
+            requests_per_minute=ai_align_config.get('requests_per_minute'),
+            tokens_per_minute=ai_align_config.get('tokens_per_minute'),
+            base_url=ai_align_config.get('openai_base_url')
+        )
+    
+    async def _complete(self, client, limiter: RateLimiter, api_params: Dict, pass_number: int) -> Dict:
+        """One chat call under the rate limits, parsed like the sync client."""
+        event = await limiter.acquire(estimate_tokens(api_params))
+        self.requests += 1
+        try:
+            response = await client.chat.completions.create(**api_params)
+            usage = getattr(response, 'usage', None)
+            if usage is not None and getattr(usage, 'total_tokens', None):
+                limiter.settle(event, usage.total_tokens)
+                self.tokens += usage.total_tokens
+            return _parse_pass_response(response.choices[0].message.content, pass_number)
+        except openai.APITimeoutError:
+            logger.error(f"  Pass {pass_number} timeout after {self.timeout}s")
+            return _error_response("API timeout", "AI Timeout")
+        except openai.APIError as e:
+            logger.error(f"  Pass {pass_number} API error: {e}")
+            return _error_response(f"API error: {e}")
+        except Exception as e:
+            logger.error(f"  Pass {pass_number} unexpected error: {e}", exc_info=True)
+            return _error_response(f"Unexpected error: {e}")
+    
+    async def _align(self, client, limiter: RateLimiter, semaphore: asyncio.Semaphore, trade_payload: Dict) -> Dict:
+        """Multi-pass chain of one trade (a later failed pass falls back to the previous one)."""
+        async with semaphore:
+            self.trades += 1
+            previous = None
+            for pass_number in range(1, self.num_passes + 1):
+                api_params = _build_pass_request(
+                    trade_payload, previous, self.model, self.temperature, self.max_tokens, pass_number
+                )
+                response = await self._complete(client, limiter, api_params, pass_number)
+                if "error" in response:
+                    if previous is not None:
+                        logger.warning(f"  Pass {pass_number} failed, using Pass {pass_number - 1} response")
+                    return previous if previous is not None else response
+                previous = response
+            return previous
+    
+    async def fetch(self, client, limiter: RateLimiter, semaphore: asyncio.Semaphore, cache_key: str, trade_payload: Dict) -> Dict:
+        """
+        AI response of one trade; a request for a key already in flight waits for that one.
+        
+        Args:
+            client: openai.AsyncOpenAI
+            limiter: RateLimiter shared by the run
+            semaphore: Concurrency limit shared by the run
+            cache_key: build_cache_key() of the trade
+            trade_payload: Trade payload dictionary
+        
+        Returns:
+            AI response dictionary
+        """
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._align(client, limiter, semaphore, trade_payload))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        else:
+            self.coalesced += 1
+        return await task
+    
+    async def fetch_all(self, requests: List[Tuple[str, Dict]]) -> Dict[str, Dict]:
+        """
+        Fetch all requests concurrently (async version of fetch_many).
+        
+        Args:
+            requests: (cache_key, trade_payload) pairs; repeated keys are fetched once
+        
+        Returns:
+            Dictionary cache_key -> AI response
+        """
+        limiter = RateLimiter(self.requests_per_minute, self.tokens_per_minute)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with openai.AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=self.timeout,
+            max_retries=self.max_retries
+        ) as client:
+            responses = await asyncio.gather(*(
+                self.fetch(client, limiter, semaphore, cache_key, trade_payload)
+                for cache_key, trade_payload in requests
+            ), return_exceptions=True)
+        self.waited += limiter.waited
+        
+        results = {}
+        for (cache_key, _), response in zip(requests, responses):
+            if isinstance(response, Exception):
+                # One failed trade must not lose the responses of the others
+                logger.error(f"AI alignment failed for {cache_key}: {response}")
+                response = _error_response(f"Unexpected error: {response}")
+            results[cache_key] = response
+        return results
+    
+    def fetch_many(self, requests: List[Tuple[str, Dict]]) -> Dict[str, Dict]:
+        """
+        Fetch all requests concurrently (runs its own event loop).
+        
+        Args:
+            requests: (cache_key, trade_payload) pairs; repeated keys are fetched once
+        
+        Returns:
+            Dictionary cache_key -> AI response (empty if the client cannot be set up)
+        """
+        if not requests:
+            return {}
+        if not OPENAI_AVAILABLE:
+            logger.error("OpenAI library not available. Install with: pip install openai")
+            return {}
+        if self.api_key is None:
+            self.api_key = load_openai_config()
+            if self.api_key is None:
+                return {}
+        
+        start = time.perf_counter()
+        responses = asyncio.run(self.fetch_all(requests))
+        logger.info(
+            f"AI alignment dispatch: {len(responses)} trades, {self.requests} requests in "
+            f"{time.perf_counter() - start:.1f}s (concurrency {self.max_concurrency}, {self.coalesced} coalesced)"
+        )
+        return responses
+    
+    def stats(self) -> Dict:
+        """
+        Dispatch counters for run metrics.
+        
+        Returns:
+            Dictionary with 'trades', 'requests', 'tokens', 'coalesced' and 'rate_limit_wait'
+        """
+        return {'trades': self.trades, 'requests': self.requests, 'tokens': self.tokens,
+                'coalesced': self.coalesced, 'rate_limit_wait': round(self.waited, 3)}
+
+
+def prefetch_ai_alignments(
+    requests: Iterable[Tuple[Dict, Dict]],
+    cache_date: date,
+    cache: AIAlignCache,
+    dispatcher: AIAlignDispatcher
+) -> int:
+    """
+    Fetch the uncached trades of a run concurrently and store them in the cache.
+    
+    Args:
+        requests: (trade_signature, trade_payload) pairs, as get_or_fetch_ai_alignment takes them
+        cache_date: Cache date
+        cache: AIAlignCache the report reads from
+        dispatcher: AIAlignDispatcher
+    
+    Returns:
+        Number of responses stored
+    """
+    misses = []
+    for trade_signature, trade_payload in requests:
+        cache_key = build_cache_key(trade_signature)
+        if not cache.contains(cache_date, cache_key):
+            misses.append((cache_key, trade_payload))
+    if not misses:
+        return 0
+    
+    responses = dispatcher.fetch_many(misses)
+    # Stored even if error, to avoid repeated failed calls (as get_or_fetch_ai_alignment)
+    for cache_key, response in responses.items():
+        cache.put(cache_date, cache_key, response)
+    cache.flush()
+    return len(responses)
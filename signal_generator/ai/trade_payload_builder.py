@@ -3,6 +3,7 @@ Trade payload builder for AI alignment analysis.
 Converts signal dictionaries into structured trade payloads for OpenAI API.
 """
 import logging
+import re
 from typing import Dict, List, Optional
 from datetime import datetime
 try:
@@ -11,6 +12,10 @@ try:
 except ImportError:
     CURVE_LOADER_AVAILABLE = False
     logging.warning("curve_loader not available. Forward curve data will not be included.")
+try:
+    from ..data_loaders.ice_symbol import IceSymbol
+except ImportError:
+    from data_loaders.ice_symbol import IceSymbol
 
 logger = logging.getLogger(__name__)
 
@@ -321,10 +326,8 @@ def _format_tenor(
         return f"{quarter_name} {inferred_year}"
     
     # Monthly - extract month code from symbol
-    import re
-    month_match = re.search(r'%[A-Z]+ ([FGHJKMNQUVXZ])!', symbol)
-    if month_match:
-        month_code = month_match.group(1)
+    month_code = IceSymbol.parse(symbol).month
+    if month_code:
         month_name = MONTH_MAP.get(month_code, month_code)
         return f"{month_name} {inferred_year}"
     
@@ -483,19 +486,20 @@ def build_trade_payload(
         except Exception as e:
             logger.warning(f"Error formatting risk details: {e}")
     
-    # Format ICE Chat message
+    # Format ICE Chat message (the formatter's cached record, shared with the report)
     ice_chat_raw = ""
-    if hasattr(ice_chat_formatter, 'format_ice_chat_message'):
+    quantities = ()
+    if hasattr(ice_chat_formatter, 'format_signal'):
         try:
-            ice_chat_raw = ice_chat_formatter.format_ice_chat_message(signal)
+            formatted = ice_chat_formatter.format_signal(signal)
+            ice_chat_raw = formatted['message']
+            quantities = formatted['quantities']
         except Exception as e:
             logger.warning(f"Error formatting ICE Chat message: {e}")
     
-    # Extract volumes from ICE Chat message if available
-    # Parse "buy 15kb ... and sell 10kb ..." pattern
+    # Extract volumes from the leg quantities ("15kb", "10kb per mo")
     if ice_chat_raw and legs:
-        import re
-        volume_matches = re.findall(r'(\d+)kb', ice_chat_raw)
+        volume_matches = [volume for quantity in quantities for volume in re.findall(r'(\d+)kb', quantity)]
         if len(volume_matches) >= len(legs):
             for i, leg in enumerate(legs):
                 if i < len(volume_matches):
@@ -545,20 +549,20 @@ def build_trade_payload(
     prwk_flag = "✓" if was_active_prior_week else "✗"
     
     # Get forward curve data for market structure analysis
+    # (the formatter's CurveStore; load_curve_prices is the shared store's dict otherwise)
     forward_curves = {}
-    if CURVE_LOADER_AVAILABLE:
+    curve_store = getattr(ice_chat_formatter, 'curve_store', None)
+    if curve_store is not None or CURVE_LOADER_AVAILABLE:
         try:
-            curve_data = load_curve_prices()
+            curve_data = curve_store.as_dict() if curve_store is not None else load_curve_prices()
             if curve_data:
                 # Extract relevant forward curve data for the legs in this trade
                 for leg in legs:
                     leg_symbol = leg.get("symbol", "")
                     commodity_root = leg.get("commodity", "").split()[0] if leg.get("commodity") else ""
                     # Try to extract root code from symbol
-                    import re
-                    root_match = re.search(r'%([A-Z]+)', leg_symbol)
-                    if root_match:
-                        root_code = root_match.group(1)
+                    root_code = IceSymbol.parse(leg_symbol).root
+                    if root_code:
                         if root_code in curve_data:
                             # Get all available months for this commodity
                             commodity_curve = curve_data[root_code]
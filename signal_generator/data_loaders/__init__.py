@@ -16,6 +16,13 @@ from .curve_loader import (
     get_leg_price_from_curve
 )
 
+from .curve_store import (
+    CurveStore,
+    get_curve_store
+)
+
+from .ice_symbol import IceSymbol
+
 __all__ = [
     'find_most_recent_csv',
     'find_csv_by_date',
@@ -23,7 +30,10 @@ __all__ = [
     'prepare_data',
     'load_curve_prices',
     'map_month_code_to_excel_column',
-    'get_leg_price_from_curve'
+    'get_leg_price_from_curve',
+    'CurveStore',
+    'get_curve_store',
+    'IceSymbol'
 ]
 
 
@@ -0,0 +1,432 @@
+"""
+Indexed forward-curve store for delta sizing and the forward-curve report.
+
+Loads CurveBuilder prices (latest forward_curves_*.xlsx, else the JSON cache),
+reloads only when the source file changes (mtime/size, confirmed by content
+hash), and keeps them as a (root x month) price array so single legs, many
+legs and quarterly averages are index lookups instead of per-call parsing.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .ice_symbol import IceSymbol, MONTH_CODE_NUMBER
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / 'cache' / 'curvebuilder_prices_latest.json'
+DEFAULT_EXCEL_DIR = Path(r"C:\ICEPython\TradeBookM2M_PROD\Outputs")
+EXCEL_SHEET = 'Closing Curves (Prior Day)'
+
+# CurveBuilder commodity names to root codes (matching UETTechOnlySignals format)
+COMMODITY_TO_ROOT = {
+    'Propane (MB LST)': 'PRL',
+    'Propane (MB Non-TET)': 'PRN',
+    'Propane (Conway)': 'PRC',
+    'AFE Propane (FEI)': 'AFE',
+    'Normal Butane (MB Non-TET)': 'NBI',
+    'LST Normal Butane (MB LST)': 'NBR',
+    'Normal Butane (Conway)': 'IBC',
+    'Far East Butane': 'ABF',
+    'Isobutane (MB Non-TET)': 'ISO',
+    'Isobutane (Conway)': 'ISC',
+    'Natural Gasoline (MB Non-TET)': 'NGE',
+    'Natural Gasoline (Conway)': 'NGC',
+    'WTI Crude Oil': 'CL',
+    'Natural Gas (HH)': 'NG',
+    'RBOB Gasoline': 'XRB',
+    'Heating Oil': 'HO',
+}
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def month_ordinal(year: int, month: int) -> int:
+    """Months since year 0 (year * 12 + month - 1), the store's column key."""
+    return year * 12 + month - 1
+
+
+def parse_month_label(label: str) -> Optional[int]:
+    """
+    Month ordinal of a curve column label.
+    
+    Args:
+        label: CurveBuilder column, e.g. 'Jan_26'
+    
+    Returns:
+        month_ordinal, or None if the label is not a month column
+    """
+    name, _, year = str(label).partition('_')
+    if name not in MONTH_NAMES or len(year) != 2 or not year.isdigit():
+        return None
+    return month_ordinal(2000 + int(year), MONTH_NAMES.index(name) + 1)
+
+
+def parse_leg_symbol(symbol: str) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+    """
+    Root, month code and explicit year of an ICE leg symbol (via IceSymbol.parse).
+    
+    Args:
+        symbol: ICE symbol, e.g. '%AFE F!-IEU' or '%CL V!'
+    
+    Returns:
+        Tuple (root_code, month_code, year); month_code is None for formulas
+        (quarterlies), year is None unless the symbol carries one ('26)
+    """
+    parsed = IceSymbol.parse(symbol)
+    if parsed.root is None:
+        return None, None, None
+    if parsed.is_formula:
+        return parsed.root, None, None
+    return parsed.root, parsed.month, parsed.year
+
+
+def _file_signature(path: Path) -> Optional[Tuple[str, int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CurveStore:
+    """
+    Forward curve prices indexed by (root, year-month).
+    
+    `prices` is a (roots x months) float array (NaN where CurveBuilder has no
+    price); rows follow `roots`, column j is month ordinal `first_month + j`.
+    `as_dict()` gives the load_curve_prices format ({root: {'Jan_26': price}}).
+    
+    Usage:
+        store = get_curve_store()                     # shared, reloads when the file changes
+        store.price('AFE', 2026, 1)                   # native units ($/mt for AFE)
+        store.lookup(['PRL', 'CL'], [ordinal_1, ordinal_2])
+        store.leg_price('%AFE F!-IEU', year=2026)     # same result as get_leg_price_from_curve
+    """
+    
+    def __init__(self, cache_path: Optional[Path] = None, excel_dir: Optional[Path] = None):
+        """
+        Initialize an empty store (call load() or use from_dict()).
+        
+        Args:
+            cache_path: JSON cache (default: cache/curvebuilder_prices_latest.json)
+            excel_dir: CurveBuilder output directory with forward_curves_*.xlsx
+                       (default: the production M2M output directory; missing = JSON cache only)
+        """
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        self.excel_dir = Path(excel_dir) if excel_dir else DEFAULT_EXCEL_DIR
+        self.source = None
+        self.loaded_at = None
+        self._signature = None
+        self._hash = None
+        self._failed_signature = None
+        self._warned_missing = False
+        self._set_prices({})
+    
+    @classmethod
+    def from_dict(cls, curve_data: Dict) -> 'CurveStore':
+        """
+        Build a store from load_curve_prices-format data (no file source).
+        
+        Args:
+            curve_data: {root_code: {month_col: price}}
+        
+        Returns:
+            CurveStore
+        """
+        store = cls()
+        store._set_prices(curve_data or {})
+        store.source = 'dict'
+        return store
+    
+    @classmethod
+    def coerce(cls, curve_data) -> 'CurveStore':
+        """
+        CurveStore for curve_data.
+        
+        A dict returned by load_curve_prices maps back to its shared store; other
+        dicts are indexed once and reused while the same dict object is passed
+        (copy before mutating a curve dict that was already looked up).
+        
+        Args:
+            curve_data: CurveStore, load_curve_prices-format dict, or None
+        
+        Returns:
+            CurveStore
+        """
+        global _LAST_COERCED
+        if hasattr(curve_data, 'leg_price'):
+            return curve_data  # A CurveStore (possibly imported under the signal_generator. package path)
+        for shared in _SHARED_STORES.values():
+            if curve_data is shared._curve_dict:
+                return shared
+        if _LAST_COERCED is not None and _LAST_COERCED[0] is curve_data:
+            return _LAST_COERCED[1]
+        store = cls.from_dict(curve_data)
+        if curve_data:
+            _LAST_COERCED = (curve_data, store)
+        return store
+    
+    def __len__(self) -> int:
+        return len(self.roots)
+    
+    def __bool__(self) -> bool:
+        return bool(self.roots)
+    
+    def __contains__(self, root: str) -> bool:
+        return root in self._root_index
+    
+    def _set_prices(self, curve_data: Dict):
+        """Build the index from {root: {month_col: price}}."""
+        self._curve_dict = curve_data
+        self.roots: List[str] = list(curve_data)
+        self._root_index = {root: i for i, root in enumerate(self.roots)}
+        
+        ordinals = {}
+        for months in curve_data.values():
+            for label in months:
+                ordinal = parse_month_label(label)
+                if ordinal is not None:
+                    ordinals[label] = ordinal
+        self.first_month = min(ordinals.values()) if ordinals else 0
+        width = (max(ordinals.values()) - self.first_month + 1) if ordinals else 0
+        self.prices = np.full((len(self.roots), width), np.nan)
+        
+        # get_leg_price_from_curve fallbacks: same month name in another year, else the first column
+        self._fallbacks = {}
+        for i, (root, months) in enumerate(curve_data.items()):
+            for label, price in months.items():
+                if label in ordinals and price is not None:
+                    self.prices[i, ordinals[label] - self.first_month] = float(price)
+            labels = sorted(months)
+            by_name = {}
+            for label in labels:
+                by_name.setdefault(label[:3], label)
+            self._fallbacks[root] = (by_name, labels[0] if labels else None)
+    
+    def _latest_excel(self) -> Optional[Path]:
+        if not self.excel_dir.exists():
+            return None
+        excel_files = sorted(self.excel_dir.glob("forward_curves_*.xlsx"), reverse=True)
+        return excel_files[0] if excel_files else None
+    
+    def load(self, force: bool = False) -> 'CurveStore':
+        """
+        Load (or refresh) prices from the latest CurveBuilder workbook, else the JSON cache.
+        
+        Unchanged sources (same mtime and size, or same content hash) are not re-parsed.
+        
+        Args:
+            force: Re-parse even if the source is unchanged
+        
+        Returns:
+            self
+        """
+        excel_path = self._latest_excel()
+        for path, reader in ((excel_path, self._read_excel), (self.cache_path, self._read_json)):
+            if path is None:
+                continue
+            signature = _file_signature(path)
+            if signature is None:
+                continue
+            if not force and signature == self._signature:
+                return self
+            if not force and signature == self._failed_signature:
+                continue  # Same file failed to parse before
+            content_hash = _file_hash(path)
+            if not force and content_hash == self._hash and self.source == str(path):
+                self._signature = signature  # Touched but unchanged
+                return self
+            try:
+                curve_data = reader(path)
+            except Exception as e:
+                logger.warning(f"Error loading curve prices from {path}: {e}")
+                self._failed_signature = signature
+                continue
+            self._set_prices(curve_data)
+            self.source = str(path)
+            self.loaded_at = datetime.now()
+            self._signature = signature
+            self._hash = content_hash
+            return self
+        if self.source is None and not self._warned_missing:
+            logger.warning(f"No curve price source available (CurveBuilder Excel or {self.cache_path})")
+            self._warned_missing = True
+        return self
+    
+    def _read_excel(self, path: Path) -> Dict:
+        """Parse the CurveBuilder sheet and refresh the JSON cache."""
+        logger.info(f"Loading curve prices from: {path}")
+        df = pd.read_excel(path, sheet_name=EXCEL_SHEET)
+        month_cols = [c for c in df.columns if c != 'Commodity' and '_' in str(c)]
+        
+        # Skip spread rows and commodities without a root code
+        commodities = df['Commodity'].astype(str)
+        df = df[~commodities.str.contains('M/M Spreads', regex=False) & commodities.isin(COMMODITY_TO_ROOT)]
+        values = df[month_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        
+        curve_data = {}
+        for commodity, row in zip(df['Commodity'].astype(str), values):
+            valid = ~np.isnan(row) & (row > 0)
+            curve_data[COMMODITY_TO_ROOT[commodity]] = {
+                str(col): float(price) for col, price, ok in zip(month_cols, row, valid) if ok
+            }
+        
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_path.write_text(json.dumps(curve_data, indent=2), encoding='utf-8')
+        logger.info(f"Loaded {len(curve_data)} commodities from CurveBuilder Excel, cached to {self.cache_path}")
+        return curve_data
+    
+    def _read_json(self, path: Path) -> Dict:
+        curve_data = json.loads(path.read_text(encoding='utf-8'))
+        logger.info(f"Loaded {len(curve_data)} commodities from cached JSON")
+        return curve_data
+    
+    def as_dict(self) -> Dict:
+        """Prices in the load_curve_prices format ({root: {'Jan_26': price}})."""
+        return self._curve_dict
+    
+    def curve(self, root: str) -> Dict:
+        """One root's {month_col: price} (empty if unknown)."""
+        return self._curve_dict.get(root, {})
+    
+    def lookup(self, roots: Iterable[str], ordinals: Iterable[int]) -> np.ndarray:
+        """
+        Vectorized exact lookup for many legs.
+        
+        Args:
+            roots: Root code per leg
+            ordinals: month_ordinal per leg
+        
+        Returns:
+            float ndarray (NaN where the root or month is not on the curve)
+        """
+        rows = np.array([self._root_index.get(root, -1) for root in roots], dtype='int64')
+        cols = np.asarray(list(ordinals), dtype='int64') - self.first_month
+        result = np.full(len(rows), np.nan)
+        valid = (rows >= 0) & (cols >= 0) & (cols < self.prices.shape[1])
+        result[valid] = self.prices[rows[valid], cols[valid]]
+        return result
+    
+    def price(self, root: str, year: int, month: int) -> Optional[float]:
+        """Exact price for one root and calendar month (None if missing)."""
+        row = self._root_index.get(root)
+        col = month_ordinal(year, month) - self.first_month
+        if row is None or not 0 <= col < self.prices.shape[1]:
+            return None
+        value = self.prices[row, col]
+        return None if value != value else float(value)  # NaN check without numpy call overhead
+    
+    def row(self, root: str, labels: List[str]) -> np.ndarray:
+        """Prices of one root for curve column labels (NaN where missing)."""
+        ordinals = [parse_month_label(label) for label in labels]
+        return self.lookup([root] * len(labels), [-1 if o is None else o for o in ordinals])
+    
+    def quarterly_average(self, root: str, year: int, first_month: int, months: int = 3) -> Optional[float]:
+        """
+        Average price over consecutive months (e.g. a quarterly strip).
+        
+        Args:
+            root: Root code
+            year: Year of the first month
+            first_month: First calendar month (1-12)
+            months: Months in the strip
+        
+        Returns:
+            Mean of the available months, or None if none are on the curve
+        """
+        start = month_ordinal(year, first_month)
+        values = self.lookup([root] * months, range(start, start + months))
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else None
+    
+    def leg_price(self, symbol: str, year: Optional[int] = None) -> Optional[float]:
+        """
+        Curve price for one monthly leg, with get_leg_price_from_curve's fallbacks.
+        
+        Args:
+            symbol: ICE symbol (e.g., '%AFE F!-IEU'); formulas return None
+            year: Contract year (None = year in the symbol, else next calendar year)
+        
+        Returns:
+            Price in native curve units, or None if unavailable
+        """
+        root, month_code, symbol_year = parse_leg_symbol(symbol)
+        if root is None or root not in self._root_index or month_code is None:
+            return None
+        if year is None:
+            year = symbol_year if symbol_year is not None else datetime.now().year + 1
+        
+        price = self.price(root, year, MONTH_CODE_NUMBER[month_code])
+        if price is not None:
+            return price
+        
+        # Fallbacks: same month name in another year, else the first available column
+        by_name, first_label = self._fallbacks[root]
+        label = by_name.get(MONTH_NAMES[MONTH_CODE_NUMBER[month_code] - 1], first_label)
+        return self._curve_dict[root][label] if label is not None else None
+    
+    def leg_prices(self, symbols: Iterable[str], year: Optional[int] = None) -> np.ndarray:
+        """
+        leg_price for many legs (exact matches in one vectorized lookup).
+        
+        Args:
+            symbols: ICE leg symbols
+            year: Contract year for every leg (None = per-symbol default)
+        
+        Returns:
+            float ndarray (NaN where unavailable)
+        """
+        symbols = list(symbols)
+        default_year = datetime.now().year + 1
+        roots, ordinals = [], []
+        for symbol in symbols:
+            root, month_code, symbol_year = parse_leg_symbol(symbol)
+            leg_year = year if year is not None else (symbol_year if symbol_year is not None else default_year)
+            roots.append(root)
+            ordinals.append(month_ordinal(leg_year, MONTH_CODE_NUMBER[month_code]) if month_code else -1)
+        result = self.lookup(roots, ordinals)
+        for i in np.nonzero(np.isnan(result))[0]:
+            price = self.leg_price(symbols[i], year=year)
+            if price is not None:
+                result[i] = price
+        return result
+
+
+# One shared store per cache path (load_curve_prices, ICEChatFormatter, report, AI payloads)
+_SHARED_STORES: Dict[Path, CurveStore] = {}
+
+# Last non-shared dict indexed by CurveStore.coerce (get_leg_price_from_curve callers pass the same dict)
+_LAST_COERCED = None
+
+
+def get_curve_store(cache_path: Optional[Path] = None, force_reload: bool = False) -> CurveStore:
+    """
+    Shared CurveStore, refreshed if its source file changed since the last call.
+    
+    Args:
+        cache_path: JSON cache path (default: cache/curvebuilder_prices_latest.json)
+        force_reload: Re-parse the source even if unchanged
+    
+    Returns:
+        CurveStore
+    """
+    key = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+    store = _SHARED_STORES.get(key)
+    if store is None:
+        store = _SHARED_STORES[key] = CurveStore(cache_path=key)
+    return store.load(force=force_reload)
@@ -0,0 +1,173 @@
+"""
+Shared parser for ICE symbols and symbol-matrix formulas.
+
+Root, month code, exchange suffix, quarterly components and the $/usg
+conversion divisor are read once per distinct symbol string (precompiled
+patterns, memoized) and returned as an immutable IceSymbol record, so the
+point calculator, ICE Chat formatter, curve store and AI payloads stop
+re-running the same regexes for every signal.
+
+Symbol forms (from symbol_matrix.csv):
+    %AFE F!-IEU                                             outright contract
+    =('%AFE F!-IEU')/521                                    converted outright
+    =((('%AFE F!-IEU')+('%AFE G!-IEU')+('%AFE H!-IEU'))/3)/521   quarterly average
+    =('%AFE F!-IEU')/521-('%AFE G!-IEU')/521                spread (two sides)
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+MONTH_CODES = 'FGHJKMNQUVXZ'
+MONTH_CODE_NUMBER = {code: i + 1 for i, code in enumerate(MONTH_CODES)}
+
+_ROOT_PATTERN = re.compile(r'%([A-Z]+)')
+_CONTRACT_PATTERN = re.compile(r'%([A-Z]+)\s+([FGHJKMNQUVXZ])!(?:-([A-Z]+))?')
+_YEAR_PATTERN = re.compile(r"'(\d{2})")
+_QUARTERLY_PATTERN = re.compile(r"^=?\(\(\(.*\)\)/\d+\)")  # (((leg)+(leg)+(leg))/3), optionally converted
+_DIVISOR_PATTERN = re.compile(r'\)/(\d+(?:\.\d+)?)$')
+
+
+def _split_sides(formula: str) -> List[str]:
+    """Split a spread formula at its top-level '-' (outside parentheses and quotes)."""
+    sides, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(formula):
+        if char == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '-' and depth == 0:
+            sides.append(formula[start:i])
+            start = i + 1
+    sides.append(formula[start:])
+    return sides
+
+
+class IceSymbol:
+    """
+    Parsed ICE symbol (immutable; build with IceSymbol.parse).
+    
+    Attributes:
+        symbol: Original symbol string
+        root: First root code ('AFE'), None if the string has none
+        month: Month code of the first contract ('F'), also for formulas
+        exchange: Exchange suffix of the first contract ('IEU'), None if absent
+        year: Year hint from an explicit 'YY in the symbol, else None
+        legs: Contract symbols in the string, in order ('%AFE F!-IEU', ...)
+        quarter_months: Month numbers averaged by the first side if it is a
+                        quarterly formula ((1, 2, 3)), else ()
+        divisor: $/usg conversion divisor applied to the first side (1.0 if none)
+        is_spread: True for two-sided (spread) formulas
+    
+    Usage:
+        parsed = IceSymbol.parse("=((('%AFE F!-IEU')+('%AFE G!-IEU')+('%AFE H!-IEU'))/3)/521")
+        parsed.root, parsed.quarter_months, parsed.divisor    # 'AFE', (1, 2, 3), 521.0
+        roots = [p.root for p in IceSymbol.parse_many(frame['ice_connect_symbol'])]
+    """
+    
+    __slots__ = ('symbol', 'root', 'month', 'exchange', 'year', 'legs', 'quarter_months', 'divisor', 'is_spread')
+    
+    def __init__(self, symbol, root=None, month=None, exchange=None, year=None,
+                 legs=(), quarter_months=(), divisor=1.0, is_spread=False):
+        for name, value in zip(self.__slots__, (symbol, root, month, exchange, year,
+                                                legs, quarter_months, divisor, is_spread)):
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"IceSymbol is immutable (cannot set '{name}')")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"IceSymbol is immutable (cannot delete '{name}')")
+    
+    def _key(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __eq__(self, other):
+        return isinstance(other, IceSymbol) and self._key() == other._key()
+    
+    def __hash__(self):
+        return hash(self._key())
+    
+    def __repr__(self):
+        return f"IceSymbol({self.symbol!r}, root={self.root!r}, month={self.month!r}, legs={len(self.legs)})"
+    
+    @property
+    def is_formula(self) -> bool:
+        """True for symbol-matrix formulas ('=...')."""
+        return isinstance(self.symbol, str) and self.symbol.startswith('=')
+    
+    @property
+    def is_quarterly(self) -> bool:
+        """True if the first side is a quarterly average formula."""
+        return bool(self.quarter_months)
+    
+    @property
+    def month_number(self) -> Optional[int]:
+        """Month (1-12) of the first contract, None if there is no month code."""
+        return MONTH_CODE_NUMBER.get(self.month)
+    
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def parse(symbol) -> 'IceSymbol':
+        """
+        Parse an ICE symbol or symbol-matrix formula (memoized per string).
+        
+        Args:
+            symbol: ICE symbol, e.g. '%AFE F!-IEU', '%CL V!' or a formula;
+                    non-strings and '' give an empty record (root None)
+        
+        Returns:
+            IceSymbol
+        """
+        if not isinstance(symbol, str) or not symbol:
+            return IceSymbol(symbol)
+        
+        root_match = _ROOT_PATTERN.search(symbol)
+        contracts = list(_CONTRACT_PATTERN.finditer(symbol))
+        first = contracts[0] if contracts else None
+        year = None
+        year_match = _YEAR_PATTERN.search(symbol)
+        if year_match:
+            year_short = int(year_match.group(1))
+            # Assume 2000s for years 00-50, 1900s for 51-99
+            year = 2000 + year_short if year_short <= 50 else 1900 + year_short
+        
+        quarter_months, divisor, is_spread = (), 1.0, False
+        if symbol.startswith('='):
+            sides = _split_sides(symbol)
+            is_spread = len(sides) > 1
+            first_side = sides[0]
+            if _QUARTERLY_PATTERN.search(first_side):
+                quarter_months = tuple(MONTH_CODE_NUMBER[m.group(2)] for m in _CONTRACT_PATTERN.finditer(first_side))
+            divisor_match = _DIVISOR_PATTERN.search(first_side)
+            if divisor_match:
+                divisor = float(divisor_match.group(1))
+        
+        return IceSymbol(
+            symbol,
+            root=root_match.group(1) if root_match else None,
+            month=first.group(2) if first else None,
+            exchange=first.group(3) if first else None,
+            year=year,
+            legs=tuple(m.group(0) for m in contracts),
+            quarter_months=quarter_months,
+            divisor=divisor,
+            is_spread=is_spread
+        )
+    
+    @staticmethod
+    def parse_many(symbols: Iterable) -> List['IceSymbol']:
+        """
+        IceSymbol.parse for a column of symbols (each distinct string parsed once).
+        
+        Args:
+            symbols: Iterable of symbols (list, Series, ndarray)
+        
+        Returns:
+            List of IceSymbol, in input order
+        """
+        parse = IceSymbol.parse
+        return [parse(symbol) for symbol in symbols]
@@ -3,7 +3,8 @@ Report generation module for signal generator system.
 """
 
 from .report_generator import ReportGenerator
+from .signal_summary import SignalSummary
 
-__all__ = ['ReportGenerator']
+__all__ = ['ReportGenerator', 'SignalSummary']
 
 
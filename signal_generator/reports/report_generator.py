@@ -4,9 +4,16 @@ Matches UET light theme design from reference template.
 """
 from datetime import datetime, date
 from pathlib import Path
-from typing import Dict, List, Optional
-from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+import base64
+import gzip
+import io
+import json
 import logging
+import math
+import time
 import pandas as pd
 import html as _html
 import re
@@ -18,14 +25,14 @@ try:
     # Try multiple import strategies to handle different execution contexts
     try:
         # Strategy 1: Relative import (when run as part of signal_generator package)
-        from ..ai import get_or_fetch_ai_alignment, build_trade_payload, determine_structure_type
+        from ..ai import AIAlignCache, AIAlignDispatcher, prefetch_ai_alignments, get_or_fetch_ai_alignment, build_trade_payload, determine_structure_type
     except ImportError:
         try:
             # Strategy 2: Absolute import with signal_generator prefix
-            from signal_generator.ai import get_or_fetch_ai_alignment, build_trade_payload, determine_structure_type
+            from signal_generator.ai import AIAlignCache, AIAlignDispatcher, prefetch_ai_alignments, get_or_fetch_ai_alignment, build_trade_payload, determine_structure_type
         except ImportError:
             # Strategy 3: Direct import (when signal_generator is in path)
-            from ai import get_or_fetch_ai_alignment, build_trade_payload, determine_structure_type
+            from ai import AIAlignCache, AIAlignDispatcher, prefetch_ai_alignments, get_or_fetch_ai_alignment, build_trade_payload, determine_structure_type
     AI_ALIGN_AVAILABLE = True
 except ImportError as e:
     AI_ALIGN_AVAILABLE = False
@@ -34,6 +41,16 @@ except Exception as e:
     AI_ALIGN_AVAILABLE = False
     logger.warning(f"AI alignment modules not available. AI alignment will be disabled. Unexpected error: {e}")
 
+from .signal_summary import SignalSummary
+
+# Indexed curve prices (shared with ICEChatFormatter)
+try:
+    from ..data_loaders.curve_store import CurveStore
+    from ..data_loaders.ice_symbol import IceSymbol
+except ImportError:
+    from data_loaders.curve_store import CurveStore
+    from data_loaders.ice_symbol import IceSymbol
+
 # Molecule code to display code mapping
 MOLECULE_CODE_MAP = {
     'C3': 'C3',      # Propane
@@ -46,6 +63,127 @@ MOLECULE_CODE_MAP = {
     'RBOB': 'RBOB'   # Gasoline (RBOB)
 }
 
+# Signal table templates (built once; rows are formatted into them and streamed one signal at a time)
+_SIGNAL_TABLE_HEAD_TEMPLATE = (
+    '<table class="uet-table">'
+    '<thead><tr style="background-color: {header_bg}; color: #ffffff;">'
+    '<th>ICE Symbol</th><th>Strategy_Type</th><th>Signal</th>'
+    '<th>Price</th><th>Stop</th><th>Target</th><th>Pos %</th><th>Score</th>'
+    '{ai_headers}<th>PRWK</th><th>Entry Date</th>'
+    '</tr></thead><tbody>'
+)
+_SIGNAL_ROW_TEMPLATE = (
+    '<tr{row_class}><td><strong>{symbol}</strong></td><td>{strategy_type}</td><td>{direction}</td>'
+    '<td>{price}</td><td>{stop}</td><td>{target}</td>'
+    '<td class="uet-num">{pos_pct:.1f}%</td><td class="uet-num">{score}</td>{ai_cells}'
+    '<td class="uet-center">{prior_week}</td><td>{entry_date}</td></tr>'
+)
+_AI_CELLS_TEMPLATE = '<td class="uet-center">{icon}{label}</td><td class="uet-num">{confidence}</td>'
+_SCORE_ROW_TEMPLATE = ('<tr class="uet-scoredetails"><td colspan="{colspan}">'
+                       '<div class="icechat-line">Score details: {breakdown} | {risk}</div></td></tr>')
+_ICECHAT_ROW_TEMPLATE = '<tr class="uet-icechat"><td colspan="{colspan}"><div class="icechat-line">{message}</div></td></tr>'
+_AI_ROW_TEMPLATE = '<tr class="uet-ai-analysis"><td colspan="{colspan}">{content}</td></tr>'
+_STRATEGY_TYPE_LABELS = {
+    'trend_following': "Trend",
+    'enhanced_trend_following': "Enhanced Trend",
+    'mean_reversion': "Mean Reversion",
+    'macd_rsi_exhaustion': "MACD+RSI Exhaustion",
+}
+
+# Candidate explorer (report_settings.include_all_candidates): every candidate is embedded as one
+# JSON data block and this script renders, sorts, filters and paginates the table in the browser
+CANDIDATE_COLUMNS = ['strategy', 'side', 'symbol', 'points', 'price', 'stop', 'target',
+                     'pos_pct', 'alignment', 'spread', 'prwk', 'shown']
+_CANDIDATE_EXPLORER_SCRIPT = '''
+(function () {
+  var block = document.getElementById('uet-candidate-data');
+  var root = document.getElementById('uet-candidates');
+  if (!block || !root) { return; }
+  var PAGE = 50;
+  var state = {key: 'points', desc: true, page: 0, query: '', strategy: '', side: ''};
+  var data, col = {};
+
+  function load() {
+    var text = block.textContent.trim();
+    if (block.getAttribute('data-encoding') !== 'gzip+base64') { return Promise.resolve(JSON.parse(text)); }
+    var bytes = Uint8Array.from(atob(text), function (c) { return c.charCodeAt(0); });
+    var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).text().then(JSON.parse);
+  }
+  function esc(value) {
+    return String(value).replace(/[&<>"']/g, function (c) {
+      return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+    });
+  }
+  function num(value, digits, prefix) {
+    return value === null ? 'N/A' : (prefix || '') + value.toFixed(digits);
+  }
+  function rows() {
+    var query = state.query.toLowerCase(), key = col[state.key], sign = state.desc ? -1 : 1;
+    var out = data.rows.filter(function (row) {
+      return (state.strategy === '' || row[col.strategy] === +state.strategy) &&
+             (state.side === '' || row[col.side] === +state.side) &&
+             (query === '' || row[col.symbol].toLowerCase().indexOf(query) !== -1);
+    });
+    return out.sort(function (a, b) {
+      var x = a[key], y = b[key];
+      if (x === y) { return 0; }
+      if (x === null) { return 1; }
+      if (y === null) { return -1; }
+      return (x < y ? -1 : 1) * sign;
+    });
+  }
+  function render() {
+    var matched = rows(), pages = Math.max(1, Math.ceil(matched.length / PAGE));
+    state.page = Math.min(state.page, pages - 1);
+    var html = matched.slice(state.page * PAGE, (state.page + 1) * PAGE).map(function (row) {
+      return '<tr' + (row[col.shown] ? '' : ' class="uet-fallback-row"') + '>' +
+        '<td><strong>' + esc(row[col.symbol]) + '</strong></td>' +
+        '<td>' + esc(data.strategies[row[col.strategy]]) + '</td>' +
+        '<td>' + (row[col.side] ? 'Sell' : 'Buy') + '</td>' +
+        '<td class="uet-num">' + num(row[col.price], 4, '$') + '</td>' +
+        '<td class="uet-num">' + num(row[col.stop], 4, '$') + '</td>' +
+        '<td class="uet-num">' + num(row[col.target], 4, '$') + '</td>' +
+        '<td class="uet-num">' + num(row[col.pos_pct], 1) + '%</td>' +
+        '<td class="uet-num">' + num(row[col.points], 1) + '</td>' +
+        '<td class="uet-num">' + num(row[col.alignment], 0) + '</td>' +
+        '<td>' + (row[col.spread] ? 'Spread' : 'Outright') + '</td>' +
+        '<td class="uet-center">' + (row[col.prwk] ? '✓' : '✗') + '</td>' +
+        '<td class="uet-center">' + (row[col.shown] ? '✓' : '') + '</td></tr>';
+    }).join('');
+    root.querySelector('tbody').innerHTML = html || '<tr><td colspan="12">No matching candidates</td></tr>';
+    root.querySelector('.uet-candidate-count').textContent =
+      matched.length + ' of ' + data.rows.length + ' candidates · page ' + (state.page + 1) + ' of ' + pages;
+  }
+
+  load().then(function (payload) {
+    data = payload;
+    data.columns.forEach(function (name, i) { col[name] = i; });
+    var select = root.querySelector('[data-filter="strategy"]');
+    data.strategies.forEach(function (name, i) {
+      select.insertAdjacentHTML('beforeend', '<option value="' + i + '">' + esc(name) + '</option>');
+    });
+    root.querySelectorAll('[data-filter]').forEach(function (input) {
+      input.addEventListener('input', function () { state[input.getAttribute('data-filter')] = input.value; state.page = 0; render(); });
+    });
+    root.querySelectorAll('th[data-key]').forEach(function (th) {
+      th.style.cursor = 'pointer';
+      th.addEventListener('click', function () {
+        var key = th.getAttribute('data-key');
+        state.desc = state.key === key ? !state.desc : key !== 'symbol';
+        state.key = key;
+        render();
+      });
+    });
+    root.querySelector('[data-page="prev"]').addEventListener('click', function () { state.page = Math.max(0, state.page - 1); render(); });
+    root.querySelector('[data-page="next"]').addEventListener('click', function () { state.page += 1; render(); });
+    render();
+  }).catch(function (error) {
+    root.querySelector('.uet-candidate-count').textContent = 'Could not load candidate data: ' + error;
+  });
+})();
+'''
+
 
 class ReportGenerator:
     """
@@ -63,6 +201,9 @@ class ReportGenerator:
         self.config = config
         self.report_settings = config.get('report_settings', {})
         
+        # Optional run-metrics collector (utils.run_metrics.RunMetrics); set by the runner
+        self.metrics = None
+        
         # Check if AI alignment is enabled
         ai_align_config = config.get('ai_align', {})
         self.ai_align_enabled = (
@@ -71,9 +212,18 @@ class ReportGenerator:
         )
         if self.ai_align_enabled:
             self.ai_align_config = ai_align_config
+            # Day cache held in memory for the run (written in batches)
+            self.ai_cache = AIAlignCache.from_config(ai_align_config)
+            # Cache misses are fetched concurrently before rendering (max_concurrency 1 = row by row)
+            self.ai_dispatcher = (
+                AIAlignDispatcher.from_config(ai_align_config)
+                if ai_align_config.get('max_concurrency', 8) > 1 else None
+            )
             logger.info("AI alignment is ENABLED")
         else:
             self.ai_align_config = {}
+            self.ai_cache = None
+            self.ai_dispatcher = None
             if not AI_ALIGN_AVAILABLE:
                 logger.info("AI alignment is DISABLED (modules not available)")
             else:
@@ -81,6 +231,8 @@ class ReportGenerator:
         
         # Load symbol matrix for metadata lookup (optional, will try to load if available)
         self.symbol_matrix = None
+        self._matrix_rows = {}  # ice_symbol -> first matrix row (product/location/molecule/symbol_root)
+        self._first_monthly_symbol = {}  # symbol_root -> first monthly ice_symbol
         self._load_symbol_matrix()
     
     def _load_symbol_matrix(self):
@@ -89,6 +241,12 @@ class ReportGenerator:
             symbol_matrix_path = Path(__file__).parent.parent.parent / 'lists_and_matrix' / 'symbol_matrix.csv'
             if symbol_matrix_path.exists():
                 self.symbol_matrix = pd.read_csv(symbol_matrix_path, low_memory=False)
+                columns = [c for c in ('ice_symbol', 'product', 'location', 'molecule', 'symbol_root', 'quarter_numb')
+                           if c in self.symbol_matrix.columns]
+                for row in self.symbol_matrix[columns].to_dict('records'):
+                    self._matrix_rows.setdefault(row.get('ice_symbol'), row)
+                    if row.get('quarter_numb') == 'N':
+                        self._first_monthly_symbol.setdefault(row.get('symbol_root'), row.get('ice_symbol'))
                 logger.debug(f"Loaded symbol matrix: {len(self.symbol_matrix)} rows for formal name lookup")
             else:
                 logger.debug(f"Symbol matrix not found: {symbol_matrix_path}")
@@ -182,16 +340,11 @@ class ReportGenerator:
             symbol_root = row_data.get('symbol_root', '')
         
         # If not in row_data, try to lookup from symbol matrix
-        if (not location or location in ['n/a', '']) and self.symbol_matrix is not None:
-            try:
-                match = self.symbol_matrix[self.symbol_matrix['ice_symbol'] == symbol]
-                if len(match) > 0:
-                    row = match.iloc[0]
-                    location = row.get('location', '')
-                    molecule = row.get('molecule', '')
-                    symbol_root = row.get('symbol_root', '')
-            except Exception as e:
-                logger.debug(f"Could not lookup symbol {symbol} in matrix: {e}")
+        if (not location or location in ['n/a', '']) and symbol in self._matrix_rows:
+            row = self._matrix_rows[symbol]
+            location = row.get('location', '')
+            molecule = row.get('molecule', '')
+            symbol_root = row.get('symbol_root', '')
         
         # Extract symbol root from symbol if not available
         if not symbol_root:
@@ -247,22 +400,12 @@ class ReportGenerator:
                 if symbol_2.startswith('='):
                     # Quarterly formula - try to extract first component symbol
                     # Pattern: =((('%ROOT MONTH!-EXCHANGE')+...
-                    component_match = re.search(r"%([A-Z]+)\s+[FGHJKMNQUVXZ]!", symbol_2)
-                    if component_match:
+                    parsed = IceSymbol.parse(symbol_2)
+                    if parsed.legs:
                         # Extract first component for lookup (approximation)
-                        root = component_match.group(1)
-                        # Try to find a monthly symbol with this root to get metadata
-                        if self.symbol_matrix is not None:
-                            try:
-                                # Find first monthly symbol with this root
-                                root_matches = self.symbol_matrix[
-                                    (self.symbol_matrix['symbol_root'] == root) &
-                                    (self.symbol_matrix['quarter_numb'] == 'N')
-                                ]
-                                if len(root_matches) > 0:
-                                    lookup_symbol = root_matches.iloc[0]['ice_symbol']
-                            except Exception:
-                                pass
+                        root = parsed.root
+                        # Use the first monthly symbol with this root for metadata
+                        lookup_symbol = self._first_monthly_symbol.get(root, lookup_symbol)
                 
                 # First, try to get metadata from row_data (spread metadata fields)
                 location_2 = row_data.get('location_2', '')
@@ -275,18 +418,13 @@ class ReportGenerator:
                         'symbol_root': symbol_root_2
                     }
                 # If not in row_data, lookup from symbol matrix
-                elif self.symbol_matrix is not None:
-                    try:
-                        match = self.symbol_matrix[self.symbol_matrix['ice_symbol'] == lookup_symbol]
-                        if len(match) > 0:
-                            row = match.iloc[0]
-                            meta_2 = {
-                                'location': row.get('location', ''),
-                                'molecule': row.get('molecule', ''),
-                                'symbol_root': row.get('symbol_root', '')
-                            }
-                    except Exception:
-                        pass
+                elif lookup_symbol in self._matrix_rows:
+                    row = self._matrix_rows[lookup_symbol]
+                    meta_2 = {
+                        'location': row.get('location', ''),
+                        'molecule': row.get('molecule', ''),
+                        'symbol_root': row.get('symbol_root', '')
+                    }
                 
                 return self._get_formal_symbol_name(symbol_2, meta_2)
         
@@ -307,7 +445,8 @@ class ReportGenerator:
         run_date: datetime = None,
         data_date: datetime = None,
         total_symbols: int = 0,
-        curve_data: Dict = None
+        curve_data: Dict = None,
+        run_metrics: Dict = None
     ) -> str:
         """
         Generate complete HTML report.
@@ -321,9 +460,54 @@ class ReportGenerator:
             run_date: Date of report generation
             data_date: Actual date from the data (from Date column in CSV)
             total_symbols: Total number of symbols analyzed
+            curve_data: Forward curve data by signal key
+            run_metrics: Optional RunMetrics.to_dict() of this run (adds a stage timing row
+                         to the command center)
         
         Returns:
-            HTML string
+            HTML string (write_report streams the same HTML straight to the file)
+        """
+        buffer = io.StringIO()
+        self.write_html_report(
+            buffer, trend_signals, enhanced_trend_signals, mean_reversion_signals, macd_rsi_exhaustion_signals,
+            ice_chat_formatter, run_date, data_date, total_symbols, curve_data, run_metrics
+        )
+        return buffer.getvalue()
+    
+    def write_html_report(
+        self,
+        handle,
+        trend_signals: Dict,
+        enhanced_trend_signals: Dict = None,
+        mean_reversion_signals: Dict = None,
+        macd_rsi_exhaustion_signals: Dict = None,
+        ice_chat_formatter = None,
+        run_date: datetime = None,
+        data_date: datetime = None,
+        total_symbols: int = 0,
+        curve_data: Dict = None,
+        run_metrics: Dict = None,
+        workers: int = 1
+    ) -> int:
+        """
+        Write the HTML report to an open text handle, section by section.
+        
+        Sequentially, strategy tables are written one signal row at a time, so
+        memory does not grow with the number of signals. With workers > 1 the
+        strategy, candidate explorer, forward curve and ICE Connect sections
+        render in a thread pool and are written in report order as they finish
+        (output is identical).
+        With AI alignment, uncached trades are first fetched concurrently
+        (AIAlignDispatcher) and rendering stays sequential; the cache is
+        flushed once the report is written.
+        
+        Args:
+            handle: Writable text handle (open file, io.StringIO)
+            trend_signals ... run_metrics: As generate_html_report
+            workers: Threads for independent sections (1 = sequential)
+        
+        Returns:
+            Number of characters written
         """
         if run_date is None:
             run_date = datetime.now()
@@ -336,34 +520,34 @@ class ReportGenerator:
         if macd_rsi_exhaustion_signals is None:
             macd_rsi_exhaustion_signals = {'buy_signals': [], 'sell_signals': []}
         
-        # Build HTML
-        html = self._generate_html_header()
-        html += self._generate_command_center(run_date, data_date, total_symbols, trend_signals, enhanced_trend_signals, mean_reversion_signals, macd_rsi_exhaustion_signals)
-        html += self._generate_strategy_section(
-            "📈 MACD Trend Following System",
-            "trend_following",
-            trend_signals,
-            ice_chat_formatter
-        )
-        html += self._generate_strategy_section(
-            "🚀 Enhanced Trend Following Signals",
-            "enhanced_trend_following",
-            enhanced_trend_signals,
-            ice_chat_formatter
-        )
-        html += self._generate_strategy_section(
-            "🔄 Standard Mean Reversion Signals",
-            "mean_reversion",
-            mean_reversion_signals,
-            ice_chat_formatter
-        )
-        html += self._generate_strategy_section(
-            "⚡ MACD/RSI Exhaustion Signals",
-            "macd_rsi_exhaustion",
-            macd_rsi_exhaustion_signals,
-            ice_chat_formatter
-        )
-        html += self._generate_forward_curve_section(
+        # (stage name, stage fields, chunk producer) in report order
+        sections = []
+        for title, strategy_key, signals in (
+            ("📈 MACD Trend Following System", "trend_following", trend_signals),
+            ("🚀 Enhanced Trend Following Signals", "enhanced_trend_following", enhanced_trend_signals),
+            ("🔄 Standard Mean Reversion Signals", "mean_reversion", mean_reversion_signals),
+            ("⚡ MACD/RSI Exhaustion Signals", "macd_rsi_exhaustion", macd_rsi_exhaustion_signals),
+        ):
+            sections.append((
+                f'section_{strategy_key}',
+                {'signals': len(signals.get('buy_signals', [])) + len(signals.get('sell_signals', []))},
+                lambda title=title, strategy_key=strategy_key, signals=signals: self._iter_strategy_section(
+                    title, strategy_key, signals, ice_chat_formatter, summary
+                )
+            ))
+        if self.report_settings.get('include_all_candidates', False):
+            candidates = sum(
+                len(signals.get(f'all_{key}_signals', signals.get(f'{key}_signals', [])))
+                for signals in (trend_signals, enhanced_trend_signals, mean_reversion_signals, macd_rsi_exhaustion_signals)
+                for key in ('buy', 'sell')
+            )
+            sections.append(('all_candidates', {'signals': candidates}, lambda: (self._generate_candidate_explorer_section(
+                trend_signals,
+                enhanced_trend_signals,
+                mean_reversion_signals,
+                macd_rsi_exhaustion_signals
+            ),)))
+        sections.append(('forward_curve', {}, lambda: (self._generate_forward_curve_section(
             trend_signals,
             enhanced_trend_signals,
             mean_reversion_signals,
@@ -372,17 +556,64 @@ class ReportGenerator:
             ice_chat_formatter,
             data_date,
             run_date
-        )
-        html += self._generate_ice_connect_section(
+        ),)))
+        sections.append(('ice_connect', {}, lambda: (self._generate_ice_connect_section(
             trend_signals,
             enhanced_trend_signals,
             mean_reversion_signals,
             macd_rsi_exhaustion_signals,
             ice_chat_formatter
-        )
-        html += self._generate_html_footer()
-        
-        return html
+        ),)))
+        
+        written = 0
+        with self._stage('header'):
+            written += handle.write(self._generate_html_header())
+        with self._stage('summary') as stage:
+            summary = self._build_summary(trend_signals, enhanced_trend_signals, mean_reversion_signals, macd_rsi_exhaustion_signals)
+            stage['candidates'] = len(summary.candidates.points)
+        if self.ai_dispatcher is not None:
+            with self._stage('ai_prefetch') as stage:
+                try:
+                    stage['fetched'] = self._prefetch_ai_alignments(
+                        (trend_signals, enhanced_trend_signals, mean_reversion_signals, macd_rsi_exhaustion_signals),
+                        ice_chat_formatter
+                    )
+                except Exception as e:
+                    # Rows not in the cache fetch their alignment one by one while rendering
+                    logger.warning(f"AI alignment prefetch failed, falling back to per-row requests: {e}")
+                    stage['fetched'] = 0
+        with self._stage('command_center'):
+            written += handle.write(self._generate_command_center(run_date, data_date, total_symbols, trend_signals, enhanced_trend_signals, mean_reversion_signals, macd_rsi_exhaustion_signals, run_metrics, summary))
+        
+        if workers > 1 and not self.ai_align_enabled:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report') as pool:
+                futures = [pool.submit(self._render_section, produce) for _, _, produce in sections]
+                for (name, fields, _), future in zip(sections, futures):
+                    text, seconds = future.result()
+                    written += handle.write(text)
+                    if self.metrics is not None:
+                        self.metrics.record(name, seconds, **fields)
+        else:
+            for name, fields, produce in sections:
+                with self._stage(name, **fields):
+                    for chunk in produce():
+                        written += handle.write(chunk)
+        
+        written += handle.write(self._generate_html_footer())
+        if self.ai_cache is not None:
+            self.ai_cache.flush()
+            if self.metrics is not None:
+                self.metrics.info['ai_align_cache'] = self.ai_cache.stats()
+                if self.ai_dispatcher is not None:
+                    self.metrics.info['ai_align_dispatch'] = self.ai_dispatcher.stats()
+        return written
+    
+    @staticmethod
+    def _render_section(produce):
+        """Render one section to a string on a pool thread (returns text and seconds)."""
+        start = time.perf_counter()
+        text = ''.join(produce())
+        return text, time.perf_counter() - start
     
     def _generate_html_header(self) -> str:
         """Generate HTML header with UET light theme CSS."""
@@ -591,46 +822,50 @@ tr.uet-fallback-row td{
   <h1>Technical Signals Report</h1>
 """
     
+    def _stage(self, name: str, **fields):
+        """Metrics stage context (no-op unless self.metrics is set)."""
+        return self.metrics.stage(name, **fields) if self.metrics is not None else nullcontext({})
+    
+    def _generate_run_metrics_row(self, run_metrics: Dict) -> str:
+        """Generate compact stage timing row for the command center."""
+        stages = [entry for entry in run_metrics.get('stages', []) if '/' not in entry['stage']]
+        if not stages:
+            return ''
+        totals = run_metrics.get('totals', {})
+        items = []
+        for entry in stages:
+            label = _html.escape(re.sub(r'^step_[\d_]+?_(?=[a-z])', '', entry['stage']).replace('_', ' '))
+            items.append(f"<span style='white-space:nowrap;'>{label} <strong>{entry['seconds']:.1f}s</strong></span>")
+        peak = f" · peak RSS {totals['peak_rss_mb']:.0f} MB" if totals.get('peak_rss_mb') is not None else ''
+        return f"""
+    <div style='padding:6px 10px; margin-top:8px; background:#f8fafc; border-radius:6px; border:1px solid #e2e8f0; font-size:11px; color:#475569;'>
+      <div style='display:flex; flex-wrap:wrap; gap:4px 12px;'>
+        <span style='font-weight:600;'>⏱ Run {totals.get('seconds', 0):.1f}s{peak}</span>
+        {' '.join(items)}
+      </div>
+    </div>"""
+    
     def _generate_command_center(self, run_date: datetime, data_date: datetime, total_symbols: int,
-                                 trend_signals: Dict, enhanced_trend_signals: Dict = None, mean_reversion_signals: Dict = None, macd_rsi_exhaustion_signals: Dict = None) -> str:
+                                 trend_signals: Dict, enhanced_trend_signals: Dict = None, mean_reversion_signals: Dict = None, macd_rsi_exhaustion_signals: Dict = None,
+                                 run_metrics: Dict = None, summary: SignalSummary = None) -> str:
         """Generate compact command center with all KPIs, strategies, and alignment in one card."""
-        if enhanced_trend_signals is None:
-            enhanced_trend_signals = {'buy_signals': [], 'sell_signals': []}
-        if mean_reversion_signals is None:
-            mean_reversion_signals = {'buy_signals': [], 'sell_signals': []}
-        if macd_rsi_exhaustion_signals is None:
-            macd_rsi_exhaustion_signals = {'buy_signals': [], 'sell_signals': []}
+        if summary is None:
+            summary = self._build_summary(trend_signals, enhanced_trend_signals, mean_reversion_signals, macd_rsi_exhaustion_signals)
         
-        # Collect all signals for KPI calculations
-        all_signals = []
-        all_signals.extend(trend_signals.get('buy_signals', []))
-        all_signals.extend(trend_signals.get('sell_signals', []))
-        all_signals.extend(enhanced_trend_signals.get('buy_signals', []))
-        all_signals.extend(enhanced_trend_signals.get('sell_signals', []))
-        all_signals.extend(mean_reversion_signals.get('buy_signals', []))
-        all_signals.extend(mean_reversion_signals.get('sell_signals', []))
-        all_signals.extend(macd_rsi_exhaustion_signals.get('buy_signals', []))
-        all_signals.extend(macd_rsi_exhaustion_signals.get('sell_signals', []))
-        
-        high_conviction = [s for s in all_signals if s.get('points', 0) >= 75]
-        total_available = len(all_signals)
+        kpis = summary.kpis()
+        total_available = kpis['total']
         
         # Count alignment categories
-        strong_agree = len([s for s in all_signals if s.get('alignment_score', 0) >= 90])
-        agree = len([s for s in all_signals if 80 <= s.get('alignment_score', 0) < 90])
-        neutral = len([s for s in all_signals if 70 <= s.get('alignment_score', 0) < 80])
-        disagree = len([s for s in all_signals if 60 <= s.get('alignment_score', 0) < 70])
-        strong_disagree = len([s for s in all_signals if s.get('alignment_score', 0) < 60])
-        
-        # Strategy counts
-        trend_buy = len([s for s in trend_signals.get('buy_signals', []) if s.get('points', 0) >= 75])
-        trend_sell = len([s for s in trend_signals.get('sell_signals', []) if s.get('points', 0) >= 75])
-        enhanced_buy = len([s for s in enhanced_trend_signals.get('buy_signals', []) if s.get('points', 0) >= 75])
-        enhanced_sell = len([s for s in enhanced_trend_signals.get('sell_signals', []) if s.get('points', 0) >= 75])
-        mr_buy = len([s for s in mean_reversion_signals.get('buy_signals', []) if s.get('points', 0) >= 75])
-        mr_sell = len([s for s in mean_reversion_signals.get('sell_signals', []) if s.get('points', 0) >= 75])
-        exhaustion_buy = len([s for s in macd_rsi_exhaustion_signals.get('buy_signals', []) if s.get('points', 0) >= 75])
-        exhaustion_sell = len([s for s in macd_rsi_exhaustion_signals.get('sell_signals', []) if s.get('points', 0) >= 75])
+        strong_agree = kpis['alignment']['strong_agree']
+        agree = kpis['alignment']['agree']
+        disagree = kpis['alignment']['disagree']
+        strong_disagree = kpis['alignment']['strong_disagree']
+        
+        # Strategy counts (>= 75 points)
+        trend_buy, trend_sell = summary.strategy_counts('trend_following')
+        enhanced_buy, enhanced_sell = summary.strategy_counts('enhanced_trend_following')
+        mr_buy, mr_sell = summary.strategy_counts('mean_reversion')
+        exhaustion_buy, exhaustion_sell = summary.strategy_counts('macd_rsi_exhaustion')
         
         # Use actual data_date from the DataFrame (not run_date)
         data_date_str = data_date.strftime('%Y-%m-%d')
@@ -651,7 +886,7 @@ tr.uet-fallback-row td{
       </div>
       <div class='uet-kpi-card'>
         <div class='uet-kpi-label'>High-Conviction (≥75)</div>
-        <div class='uet-kpi-value'>{len(high_conviction)}</div>
+        <div class='uet-kpi-value'>{kpis['high_conviction']}</div>
         <div class='uet-kpi-subvalue'>of {total_available} total</div>
       </div>
       <div class='uet-kpi-card'>
@@ -707,29 +942,23 @@ tr.uet-fallback-row td{
         <div class='uet-alignment-badge'><span>⚠️</span> <span>Disagree (60-69)</span></div>
         <div class='uet-alignment-badge'><span>💥</span> <span>Strong Disagree (<60)</span></div>
       </div>
-    </div>
+    </div>{self._generate_run_metrics_row(run_metrics) if run_metrics else ''}
   </div>
 """
     
     def _generate_run_kpis_card(self, run_date: datetime, data_date: datetime, total_symbols: int, 
-                                trend_signals: Dict, mean_reversion_signals: Dict) -> str:
+                                trend_signals: Dict, mean_reversion_signals: Dict, summary: SignalSummary = None) -> str:
         """Generate Run KPIs card."""
-        # Count high-conviction signals (>= 75 points)
-        all_signals = []
-        all_signals.extend(trend_signals.get('buy_signals', []))
-        all_signals.extend(trend_signals.get('sell_signals', []))
-        all_signals.extend(mean_reversion_signals.get('buy_signals', []))
-        all_signals.extend(mean_reversion_signals.get('sell_signals', []))
-        
-        high_conviction = [s for s in all_signals if s.get('points', 0) >= 75]
-        total_available = len(all_signals)
+        if summary is None:
+            summary = self._build_summary(trend_signals, mean_reversion_signals=mean_reversion_signals)
         
-        # Count alignment categories
-        strong_agree = len([s for s in all_signals if s.get('alignment_score', 0) >= 90])
-        agree = len([s for s in all_signals if 80 <= s.get('alignment_score', 0) < 90])
-        neutral = len([s for s in all_signals if 70 <= s.get('alignment_score', 0) < 80])
-        disagree = len([s for s in all_signals if 60 <= s.get('alignment_score', 0) < 70])
-        strong_disagree = len([s for s in all_signals if s.get('alignment_score', 0) < 60])
+        # High-conviction (>= 75 points) and alignment counts of the two strategies
+        kpis = summary.kpis(['trend_following', 'mean_reversion'])
+        total_available = kpis['total']
+        strong_agree = kpis['alignment']['strong_agree']
+        agree = kpis['alignment']['agree']
+        disagree = kpis['alignment']['disagree']
+        strong_disagree = kpis['alignment']['strong_disagree']
         
         # Use actual data_date from the DataFrame (not run_date)
         data_date_str = data_date.strftime('%Y-%m-%d')
@@ -750,7 +979,7 @@ tr.uet-fallback-row td{
       </div>
       <div class='uet-kpi-card'>
         <div class='uet-kpi-label'>High-Conviction (≥75)</div>
-        <div class='uet-kpi-value'>{len(high_conviction)}</div>
+        <div class='uet-kpi-value'>{kpis['high_conviction']}</div>
         <div class='uet-kpi-subvalue'>of {total_available} total</div>
       </div>
       <div class='uet-kpi-card'>
@@ -766,12 +995,12 @@ tr.uet-fallback-row td{
     </div>
 """
     
-    def _generate_at_a_glance_card(self, trend_signals: Dict, mean_reversion_signals: Dict) -> str:
+    def _generate_at_a_glance_card(self, trend_signals: Dict, mean_reversion_signals: Dict, summary: SignalSummary = None) -> str:
         """Generate At a Glance card."""
-        trend_buy = len([s for s in trend_signals.get('buy_signals', []) if s.get('points', 0) >= 75])
-        trend_sell = len([s for s in trend_signals.get('sell_signals', []) if s.get('points', 0) >= 75])
-        mr_buy = len([s for s in mean_reversion_signals.get('buy_signals', []) if s.get('points', 0) >= 75])
-        mr_sell = len([s for s in mean_reversion_signals.get('sell_signals', []) if s.get('points', 0) >= 75])
+        if summary is None:
+            summary = self._build_summary(trend_signals, mean_reversion_signals=mean_reversion_signals)
+        trend_buy, trend_sell = summary.strategy_counts('trend_following')
+        mr_buy, mr_sell = summary.strategy_counts('mean_reversion')
         
         return f"""
     <div style='display:flex; flex-direction:column; gap:6px;'>
@@ -809,6 +1038,70 @@ tr.uet-fallback-row td{
   </div>
 """
     
+    def _build_summary(self, trend_signals: Dict = None, enhanced_trend_signals: Dict = None,
+                       mean_reversion_signals: Dict = None, macd_rsi_exhaustion_signals: Dict = None) -> SignalSummary:
+        """
+        Build the run's SignalSummary (shared by the command center and the strategy stats tiles).
+        
+        Args:
+            trend_signals ... macd_rsi_exhaustion_signals: generate_signals results (None = no signals)
+        
+        Returns:
+            SignalSummary keyed by strategy key
+        """
+        empty = {'buy_signals': [], 'sell_signals': []}
+        return SignalSummary(
+            {
+                'trend_following': trend_signals or empty,
+                'enhanced_trend_following': enhanced_trend_signals or empty,
+                'mean_reversion': mean_reversion_signals or empty,
+                'macd_rsi_exhaustion': macd_rsi_exhaustion_signals or empty
+            },
+            product_of=self._extract_product_code,
+            display_symbol_of=self._extract_display_symbol_for_stats
+        )
+    
+    def _extract_product_code(self, signal: Dict) -> Optional[str]:
+        """Extract product code from signal metadata, row_data, symbol_matrix, or symbol string."""
+        # First try row_data metadata
+        row_data = signal.get('row_data', {})
+        if row_data:
+            # Try product field first
+            product = row_data.get('product', '')
+            if product and product not in ['n/a', '']:
+                return str(product).upper().strip()
+            # Try symbol_root (e.g., 'PRL', 'CL', 'AFE')
+            symbol_root = row_data.get('symbol_root', '')
+            if symbol_root and symbol_root not in ['n/a', '']:
+                # Remove % if present
+                symbol_root = str(symbol_root).lstrip('%').upper().strip()
+                if symbol_root:
+                    return symbol_root
+        
+        # Try symbol_matrix lookup
+        symbol = signal.get('symbol', '') or signal.get('ice_connect_symbol', '')
+        match = self._matrix_rows.get(symbol) if symbol else None
+        if match is not None:
+            # Try product first
+            product = match.get('product', '')
+            if product and product not in ['n/a', '']:
+                return str(product).upper().strip()
+            # Try symbol_root
+            symbol_root = match.get('symbol_root', '')
+            if symbol_root and symbol_root not in ['n/a', '']:
+                symbol_root = str(symbol_root).lstrip('%').upper().strip()
+                if symbol_root:
+                    return symbol_root
+        
+        # Fall back to extracting from symbol string
+        if symbol:
+            # Pattern: %PRODUCT_CODE ... (e.g., %PRL, %CL, %AFE)
+            match = re.match(r'%([A-Z]+)', str(symbol))
+            if match:
+                return match.group(1)
+        
+        return None
+    
     def _calculate_strategy_stats(self, signals: Dict) -> Dict:
         """
         Calculate statistics for a strategy's signals.
@@ -825,176 +1118,14 @@ tr.uet-fallback-row td{
             - high_conviction_count: Number of signals >= 75 points
             - product_type_counts: Dict of product code -> count
             - spread_vs_outright: Dict with 'spreads' and 'outrights' counts
+            (see SignalSummary.strategy_stats; the report reads these from the run's summary)
         """
-        buy_signals = signals.get('buy_signals', [])
-        sell_signals = signals.get('sell_signals', [])
-        all_signals = buy_signals + sell_signals
-        
-        if not all_signals:
-            return {
-                'top_products_buy': [],
-                'top_products_sell': [],
-                'avg_points': 0,
-                'point_distribution': {},
-                'high_conviction_count': 0,
-                'product_type_counts': {},
-                'spread_vs_outright': {'spreads': 0, 'outrights': 0}
-            }
-        
-        # Extract product codes from symbols or metadata
-        def extract_product_code(signal):
-            """Extract product code from signal metadata, row_data, symbol_matrix, or symbol string."""
-            # First try row_data metadata
-            row_data = signal.get('row_data', {})
-            if row_data:
-                # Try product field first
-                product = row_data.get('product', '')
-                if product and product not in ['n/a', '']:
-                    return str(product).upper().strip()
-                # Try symbol_root (e.g., 'PRL', 'CL', 'AFE')
-                symbol_root = row_data.get('symbol_root', '')
-                if symbol_root and symbol_root not in ['n/a', '']:
-                    # Remove % if present
-                    symbol_root = str(symbol_root).lstrip('%').upper().strip()
-                    if symbol_root:
-                        return symbol_root
-            
-            # Try symbol_matrix lookup
-            symbol = signal.get('symbol', '') or signal.get('ice_connect_symbol', '')
-            if symbol and self.symbol_matrix is not None and len(self.symbol_matrix) > 0:
-                try:
-                    # Look up symbol in symbol_matrix
-                    matches = self.symbol_matrix[self.symbol_matrix['ice_symbol'] == symbol]
-                    if len(matches) > 0:
-                        # Get first match
-                        match = matches.iloc[0]
-                        # Try product first
-                        product = match.get('product', '')
-                        if product and product not in ['n/a', '']:
-                            return str(product).upper().strip()
-                        # Try symbol_root
-                        symbol_root = match.get('symbol_root', '')
-                        if symbol_root and symbol_root not in ['n/a', '']:
-                            symbol_root = str(symbol_root).lstrip('%').upper().strip()
-                            if symbol_root:
-                                return symbol_root
-                except Exception as e:
-                    logger.debug(f"Error looking up symbol {symbol} in symbol_matrix: {e}")
-            
-            # Fall back to extracting from symbol string
-            if symbol:
-                # Pattern: %PRODUCT_CODE ... (e.g., %PRL, %CL, %AFE)
-                match = re.match(r'%([A-Z]+)', str(symbol))
-                if match:
-                    return match.group(1)
-            
-            return None
-        
-        # Count products for buy and sell
-        buy_products = []
-        sell_products = []
-        all_products = []
-        points_list = []
-        spread_count = 0
-        outright_count = 0
-        
-        # Track symbols for buy/sell distribution
-        buy_symbols = []
-        sell_symbols = []
-        
-        for signal in buy_signals:
-            product = extract_product_code(signal)
-            if product:
-                buy_products.append(product)
-                all_products.append(product)
-            
-            # Track symbol for buy/sell distribution (use formal name)
-            display_symbol = self._extract_display_symbol_for_stats(signal)
-            if display_symbol:
-                buy_symbols.append(display_symbol)
-            
-            points = signal.get('points', 0)
-            if points:
-                points_list.append(points)
-            
-            # Check if spread (has symbol_1 and symbol_2 in row_data)
-            row_data = signal.get('row_data', {})
-            if row_data.get('symbol_1') and row_data.get('symbol_2'):
-                spread_count += 1
-            else:
-                outright_count += 1
-        
-        for signal in sell_signals:
-            product = extract_product_code(signal)
-            if product:
-                sell_products.append(product)
-                all_products.append(product)
-            
-            # Track symbol for buy/sell distribution (use formal name)
-            display_symbol = self._extract_display_symbol_for_stats(signal)
-            if display_symbol:
-                sell_symbols.append(display_symbol)
-            
-            points = signal.get('points', 0)
-            if points:
-                points_list.append(points)
-            
-            # Check if spread (has symbol_1 and symbol_2 in row_data)
-            row_data = signal.get('row_data', {})
-            if row_data.get('symbol_1') and row_data.get('symbol_2'):
-                spread_count += 1
-            else:
-                outright_count += 1
-        
-        # Calculate top products (top 5)
-        buy_product_counts = Counter(buy_products)
-        sell_product_counts = Counter(sell_products)
-        all_product_counts = Counter(all_products)
-        
-        top_products_buy = buy_product_counts.most_common(5)
-        top_products_sell = sell_product_counts.most_common(5)
-        
-        # Calculate point statistics
-        avg_points = sum(points_list) / len(points_list) if points_list else 0
-        high_conviction_count = len([p for p in points_list if p >= 75])
-        
-        # Point distribution
-        point_distribution = {
-            '75-84': len([p for p in points_list if 75 <= p < 85]),
-            '85-94': len([p for p in points_list if 85 <= p < 95]),
-            '95+': len([p for p in points_list if p >= 95])
-        }
-        
-        # Calculate symbol-level buy/sell distribution (top 5 symbols by total signal count)
-        buy_symbol_counts = Counter(buy_symbols)
-        sell_symbol_counts = Counter(sell_symbols)
-        all_symbol_counts = buy_symbol_counts + sell_symbol_counts
-        top_symbols = all_symbol_counts.most_common(5)
-        
-        # For each top symbol, get buy and sell counts
-        symbol_buy_sell = []
-        for symbol, total_count in top_symbols:
-            buy_count = buy_symbol_counts.get(symbol, 0)
-            sell_count = sell_symbol_counts.get(symbol, 0)
-            symbol_buy_sell.append({
-                'symbol': symbol,
-                'buy': buy_count,
-                'sell': sell_count,
-                'total': total_count
-            })
-        
-        return {
-            'top_products_buy': top_products_buy,
-            'top_products_sell': top_products_sell,
-            'avg_points': avg_points,
-            'point_distribution': point_distribution,
-            'high_conviction_count': high_conviction_count,
-            'product_type_counts': dict(all_product_counts),
-            'spread_vs_outright': {'spreads': spread_count, 'outrights': outright_count},
-            'buy_count': len(buy_signals),
-            'sell_count': len(sell_signals),
-            'symbol_buy_sell': symbol_buy_sell
-        }
+        summary = SignalSummary(
+            {'strategy': {'buy_signals': signals.get('buy_signals', []), 'sell_signals': signals.get('sell_signals', [])}},
+            product_of=self._extract_product_code,
+            display_symbol_of=self._extract_display_symbol_for_stats
+        )
+        return summary.strategy_stats('strategy')
     
     def _generate_strategy_stats_html(self, stats: Dict, strategy_key: str = None) -> str:
         """Generate HTML for strategy statistics dashboard."""
@@ -1349,9 +1480,21 @@ tr.uet-fallback-row td{
         title: str,
         strategy_key: str,
         signals: Dict,
-        ice_chat_formatter
+        ice_chat_formatter,
+        summary: SignalSummary = None
     ) -> str:
         """Generate strategy section with signals."""
+        return ''.join(self._iter_strategy_section(title, strategy_key, signals, ice_chat_formatter, summary))
+    
+    def _iter_strategy_section(
+        self,
+        title: str,
+        strategy_key: str,
+        signals: Dict,
+        ice_chat_formatter,
+        summary: SignalSummary = None
+    ) -> Iterator[str]:
+        """Yield a strategy section chunk by chunk (card header, then table rows)."""
         buy_signals = signals.get('buy_signals', [])
         sell_signals = signals.get('sell_signals', [])
         total_signals = len(buy_signals) + len(sell_signals)
@@ -1364,14 +1507,16 @@ tr.uet-fallback-row td{
         strategy_name = strategy_config.get('name', title)
         strategy_desc = strategy_config.get('description', '')
         
-        # Calculate stats from ALL signals (before filtering)
-        all_signals_for_stats = {
-            'buy_signals': all_buy_signals,
-            'sell_signals': all_sell_signals
-        }
-        stats = self._calculate_strategy_stats(all_signals_for_stats)
+        # Calculate stats from ALL signals (before filtering); the run's summary already has them
+        if summary is not None and strategy_key in summary.strategies:
+            stats = summary.strategy_stats(strategy_key)
+        else:
+            stats = self._calculate_strategy_stats({
+                'buy_signals': all_buy_signals,
+                'sell_signals': all_sell_signals
+            })
         
-        html = f"""
+        yield f"""
   <div class='uet-card'>
     <h2>{title} ({total_signals} signals)</h2>
     
@@ -1396,27 +1541,26 @@ tr.uet-fallback-row td{
 """
         
         if len(buy_signals) == 0:
-            html += '        <div class=\'uet-note\'>No qualifying signals</div>'
+            yield '        <div class=\'uet-note\'>No qualifying signals</div>'
         else:
-            html += self._generate_signals_table(buy_signals, ice_chat_formatter, 'buy')
+            yield from self._iter_signals_table(buy_signals, ice_chat_formatter, 'buy')
         
-        html += """
+        yield """
       </div>
       <div>
         <h3><span class='uet-banner sell'>SELL</span></h3>
 """
         
         if len(sell_signals) == 0:
-            html += '        <div class=\'uet-note\'>No qualifying signals</div>'
+            yield '        <div class=\'uet-note\'>No qualifying signals</div>'
         else:
-            html += self._generate_signals_table(sell_signals, ice_chat_formatter, 'sell')
+            yield from self._iter_signals_table(sell_signals, ice_chat_formatter, 'sell')
         
-        html += """
+        yield """
       </div>
     </div>
   </div>
 """
-        return html
     
     def _get_entry_description(self, strategy_key: str) -> str:
         """Get entry point description for strategy."""
@@ -1461,18 +1605,20 @@ tr.uet-fallback-row td{
         signal_type: str
     ) -> str:
         """Generate signals table with embedded ICE Chat rows."""
+        return ''.join(self._iter_signals_table(signals, ice_chat_formatter, signal_type))
+    
+    def _iter_signals_table(
+        self,
+        signals: List[Dict],
+        ice_chat_formatter,
+        signal_type: str
+    ) -> Iterator[str]:
+        """Yield the signals table chunk by chunk (one chunk per signal)."""
         # Color header based on signal type (green for buy, red for sell)
-        header_bg = '#10b981' if signal_type.lower() == 'buy' else '#ef4444'  # Green for buy, red for sell
-        header_text_color = '#ffffff'  # White text for contrast
-        
-        html = '<table class="uet-table">'
-        html += f'<thead><tr style="background-color: {header_bg}; color: {header_text_color};">'
-        html += '<th>ICE Symbol</th><th>Strategy_Type</th><th>Signal</th>'
-        html += '<th>Price</th><th>Stop</th><th>Target</th><th>Pos %</th><th>Score</th>'
-        if self.ai_align_enabled:
-            html += '<th>AI Align</th><th>AI Conf</th>'
-        html += '<th>PRWK</th><th>Entry Date</th>'
-        html += '</tr></thead><tbody>'
+        yield _SIGNAL_TABLE_HEAD_TEMPLATE.format(
+            header_bg='#10b981' if signal_type.lower() == 'buy' else '#ef4444',
+            ai_headers='<th>AI Align</th><th>AI Conf</th>' if self.ai_align_enabled else ''
+        )
         
         # Get data_date from ice_chat_formatter if available (for AI alignment)
         data_date = None
@@ -1480,10 +1626,9 @@ tr.uet-fallback-row td{
             data_date = ice_chat_formatter.data_date
         
         for signal in signals:
-            html += self._generate_signal_row_with_ice_chat(signal, ice_chat_formatter, signal_type, data_date)
+            yield self._generate_signal_row_with_ice_chat(signal, ice_chat_formatter, signal_type, data_date)
         
-        html += '</tbody></table>'
-        return html
+        yield '</tbody></table>'
     
     def _format_price_value(self, value: float, signal_type: str, field_type: str, is_spread: bool = False) -> str:
         """
@@ -1559,16 +1704,59 @@ tr.uet-fallback-row td{
         
         return f"{prefix} {formatted_value}"
     
-    def _generate_signal_row_with_ice_chat(self, signal: Dict, ice_chat_formatter, signal_type: str, data_date: Optional[datetime] = None) -> str:
-        """Generate table row for a signal with embedded ICE Chat rows."""
+    @staticmethod
+    def _entry_date_str(signal: Dict) -> str:
+        """Entry date of a signal as YYYY-MM-DD ('N/A' if missing)."""
         entry_date = signal.get('entry_date', '')
         if pd.notna(entry_date) and entry_date:
             if isinstance(entry_date, str):
-                date_str = entry_date[:10] if len(entry_date) >= 10 else entry_date
-            else:
-                date_str = entry_date.strftime('%Y-%m-%d')
-        else:
-            date_str = 'N/A'
+                return entry_date[:10] if len(entry_date) >= 10 else entry_date
+            return entry_date.strftime('%Y-%m-%d')
+        return 'N/A'
+    
+    @staticmethod
+    def _strategy_type_label(signal: Dict) -> str:
+        """Strategy type shown to the AI (from row_data strategy_name)."""
+        return _STRATEGY_TYPE_LABELS.get(signal.get('row_data', {}).get('strategy_name', ''), "Unknown")
+    
+    @staticmethod
+    def _ai_cache_date(data_date) -> date:
+        """AI cache date for a data date (today if none)."""
+        if isinstance(data_date, datetime):
+            return data_date.date()
+        if isinstance(data_date, date):
+            return data_date
+        return date.today()
+    
+    def _ai_request(self, signal: Dict, ice_chat_formatter, signal_type: str, data_date=None) -> Tuple[Dict, Dict]:
+        """Trade signature (cache key fields) and trade payload of a signal."""
+        trade_payload = build_trade_payload(signal, ice_chat_formatter, data_date)
+        trade_signature = {
+            "week_date": trade_payload.get("week_date", self._entry_date_str(signal)),
+            "structure_type": trade_payload.get("structure_type", "outright"),
+            "symbol": signal.get("symbol", ""),
+            "signal_direction": trade_payload.get("signal_direction", signal_type.title()),
+            "strategy_type": self._strategy_type_label(signal)
+        }
+        return trade_signature, trade_payload
+    
+    def _prefetch_ai_alignments(self, strategy_signals, ice_chat_formatter) -> int:
+        """Fetch AI alignment for the uncached report rows concurrently (into self.ai_cache)."""
+        data_date = getattr(ice_chat_formatter, 'data_date', None)
+        requests = []
+        for signals in strategy_signals:
+            for signal_type in ('buy', 'sell'):
+                for signal in signals.get(f'{signal_type}_signals', []):
+                    try:
+                        requests.append(self._ai_request(signal, ice_chat_formatter, signal_type, data_date))
+                    except Exception as e:
+                        # The row retries (and reports) it while rendering
+                        logger.debug(f"AI prefetch skipped {signal.get('symbol', '')}: {e}")
+        return prefetch_ai_alignments(requests, self._ai_cache_date(data_date), self.ai_cache, self.ai_dispatcher)
+    
+    def _generate_signal_row_with_ice_chat(self, signal: Dict, ice_chat_formatter, signal_type: str, data_date: Optional[datetime] = None) -> str:
+        """Generate table row for a signal with embedded ICE Chat rows."""
+        date_str = self._entry_date_str(signal)
         
         price = signal.get('entry_price', 0)
         stop = signal.get('stop', 0)
@@ -1588,50 +1776,21 @@ tr.uet-fallback-row td{
         stop_str = self._format_price_value(stop, signal_type, 'stop', is_spread)
         target_str = self._format_price_value(target, signal_type, 'target', is_spread)
         
-        # Get strategy type name from row_data or infer from signal context
-        strategy_name = row_data.get('strategy_name', '')
-        if strategy_name == 'trend_following':
-            strategy_type = "Trend"
-        elif strategy_name == 'enhanced_trend_following':
-            strategy_type = "Enhanced Trend"
-        elif strategy_name == 'mean_reversion':
-            strategy_type = "Mean Reversion"
-        elif strategy_name == 'macd_rsi_exhaustion':
-            strategy_type = "MACD+RSI Exhaustion"
-        else:
-            # Fallback: try to infer from signal characteristics
-            strategy_type = "Unknown"
-        
         # Get AI alignment if enabled
         ai_align_label = ""
         ai_align_confidence = ""
         ai_response = None  # Store full response for summary row
         if self.ai_align_enabled:
             try:
-                # Build trade payload
-                trade_payload = build_trade_payload(signal, ice_chat_formatter, data_date)
-                
-                # Build trade signature for cache
-                trade_signature = {
-                    "week_date": trade_payload.get("week_date", date_str),
-                    "structure_type": trade_payload.get("structure_type", "outright"),
-                    "symbol": signal.get("symbol", ""),
-                    "signal_direction": trade_payload.get("signal_direction", signal_type.title()),
-                    "strategy_type": strategy_type
-                }
-                
-                # Get AI alignment (with caching)
-                cache_date = date.today()
-                if data_date:
-                    if isinstance(data_date, datetime):
-                        cache_date = data_date.date()
-                    elif isinstance(data_date, date):
-                        cache_date = data_date
+                # Build trade payload and trade signature for cache
+                trade_signature, trade_payload = self._ai_request(signal, ice_chat_formatter, signal_type, data_date)
                 
+                # Get AI alignment (with caching; prefetched rows are cache hits)
                 ai_response = get_or_fetch_ai_alignment(
                     trade_signature,
                     trade_payload,
-                    cache_date=cache_date,
+                    cache_date=self._ai_cache_date(data_date),
+                    cache=self.ai_cache,
                     multi_pass=self.ai_align_config.get('multi_pass', True),
                     num_passes=self.ai_align_config.get('passes', 3),
                     model=self.ai_align_config.get('openai_model', 'gpt-4'),
@@ -1668,21 +1827,10 @@ tr.uet-fallback-row td{
         else:
             prior_week_display = '<span style="color: #ef4444; font-weight: bold; font-size: 14px;">✗</span>'  # Red X
         
-        # Initialize HTML string
-        html = ''
-        
         # Calculate colspan for detail rows (base 10, add 2 if AI enabled)
         colspan = 12 if self.ai_align_enabled else 10
         
-        html += f'<tr{row_class}>'
-        html += f'<td><strong>{_html.escape(str(signal.get("symbol", "")))}</strong></td>'  # ICE Symbol (bold)
-        html += f'<td>{strategy_type}</td>'
-        html += f'<td>{signal_type.title()}</td>'
-        html += f'<td>{price_str}</td>'
-        html += f'<td>{stop_str}</td>'
-        html += f'<td>{target_str}</td>'
-        html += f'<td class="uet-num">{pos_pct:.1f}%</td>'
-        html += f'<td class="uet-num">{score_display}</td>'
+        ai_cells = ''
         if self.ai_align_enabled:
             # Add visual status indicator based on alignment (not just API success)
             if ai_align_label and ai_align_label != "AI Error" and ai_response and "error" not in ai_response:
@@ -1697,20 +1845,34 @@ tr.uet-fallback-row td{
                     status_icon = '<span style="color: #6b7280; font-weight: bold;">?</span> '  # Gray question for unknown
             else:
                 status_icon = '<span style="color: #dc2626; font-weight: bold;">✗</span> '  # Red X for error
-            html += f'<td class="uet-center">{status_icon}{_html.escape(str(ai_align_label))}</td>'
-            html += f'<td class="uet-num">{ai_align_confidence}</td>'
-        html += f'<td class="uet-center">{prior_week_display}</td>'
-        html += f'<td>{date_str}</td>'
-        html += '</tr>'
+            ai_cells = _AI_CELLS_TEMPLATE.format(icon=status_icon, label=_html.escape(str(ai_align_label)),
+                                                 confidence=ai_align_confidence)
+        
+        parts = [_SIGNAL_ROW_TEMPLATE.format(
+            row_class=row_class,
+            symbol=_html.escape(str(signal.get("symbol", ""))),
+            strategy_type=self._strategy_type_label(signal),
+            direction=signal_type.title(),
+            price=price_str,
+            stop=stop_str,
+            target=target_str,
+            pos_pct=pos_pct,
+            score=score_display,
+            ai_cells=ai_cells,
+            prior_week=prior_week_display,
+            entry_date=date_str
+        )]
         
         # Add score details row - light blue background
-        score_breakdown = ice_chat_formatter.format_score_breakdown(signal)
-        risk_details = ice_chat_formatter.format_risk_details(signal)
-        html += f'<tr class="uet-scoredetails"><td colspan="{colspan}"><div class="icechat-line">Score details: {score_breakdown} | {risk_details}</div></td></tr>'
+        parts.append(_SCORE_ROW_TEMPLATE.format(
+            colspan=colspan,
+            breakdown=ice_chat_formatter.format_score_breakdown(signal),
+            risk=ice_chat_formatter.format_risk_details(signal)
+        ))
         
         # Add ICE Chat row - light yellow background
         ice_chat_msg = ice_chat_formatter.format_ice_chat_message(signal)
-        html += f'<tr class="uet-icechat"><td colspan="{colspan}"><div class="icechat-line">{_html.escape(ice_chat_msg)}</div></td></tr>'
+        parts.append(_ICECHAT_ROW_TEMPLATE.format(colspan=colspan, message=_html.escape(ice_chat_msg)))
         
         # Add AI Analysis summary row - light green background (only if AI succeeded)
         if self.ai_align_enabled and ai_response and ai_align_label != "AI Error" and "error" not in ai_response:
@@ -1719,7 +1881,6 @@ tr.uet-fallback-row td{
             overall_comment = ai_response.get("overall_comment", "")
             
             # Build compact one-line bullet points
-            ai_summary_html = '<div class="icechat-line" style="font-size: 12px; line-height: 1.4;">'
             bullet_points = []
             if technical_view:
                 bullet_points.append(f'<strong>• Technical:</strong> {_html.escape(technical_view.strip())}')
@@ -1729,18 +1890,20 @@ tr.uet-fallback-row td{
                 bullet_points.append(f'<strong>• Overall:</strong> {_html.escape(overall_comment.strip())}')
             
             # Join with separator (pipe) for compact display
-            ai_summary_html += ' | '.join(bullet_points)
-            ai_summary_html += '</div>'
-            
-            html += f'<tr class="uet-ai-analysis"><td colspan="{colspan}">{ai_summary_html}</td></tr>'
+            ai_summary_html = ('<div class="icechat-line" style="font-size: 12px; line-height: 1.4;">'
+                               + ' | '.join(bullet_points) + '</div>')
+            parts.append(_AI_ROW_TEMPLATE.format(colspan=colspan, content=ai_summary_html))
         elif self.ai_align_enabled and (ai_align_label == "AI Error" or not ai_response or "error" in (ai_response or {})):
             # Show error message if AI failed
             error_msg = "AI Analysis unavailable"
             if ai_response and "error" in ai_response:
                 error_msg += f": {ai_response.get('error', 'Unknown error')}"
-            html += f'<tr class="uet-ai-analysis"><td colspan="{colspan}"><div class="icechat-line" style="color: #dc2626;"><em>{error_msg}</em></div></td></tr>'
+            parts.append(_AI_ROW_TEMPLATE.format(
+                colspan=colspan,
+                content=f'<div class="icechat-line" style="color: #dc2626;"><em>{error_msg}</em></div>'
+            ))
         
-        return html
+        return ''.join(parts)
     
     def _get_alignment_icon(self, alignment_score: float) -> str:
         """Get alignment icon based on score."""
@@ -1799,8 +1962,11 @@ tr.uet-fallback-row td{
                     metadata = ice_chat_formatter._get_symbol_metadata(symbol)
                     if metadata:
                         # Check if it's a spread by looking for symbol_1 and symbol_2
+                        # Outrights have empty symbol_1/symbol_2 (NaN as read from the matrix)
                         symbol_1 = metadata.get('symbol_1', '')
                         symbol_2 = metadata.get('symbol_2', '')
+                        symbol_1 = symbol_1 if isinstance(symbol_1, str) else ''
+                        symbol_2 = symbol_2 if isinstance(symbol_2, str) else ''
                         if symbol_1 or symbol_2:  # Has symbol_1 or symbol_2 means it's a spread
                             if symbol_1:
                                 referenced.add(symbol_1)
@@ -1809,6 +1975,110 @@ tr.uet-fallback-row td{
         
         return referenced
     
+    def _candidate_payload(self, strategy_signals: Dict) -> Dict:
+        """
+        Compact candidate table for the explorer (one row array per candidate).
+        
+        Args:
+            strategy_signals: Dictionary {strategy title: generate_signals result}
+        
+        Returns:
+            Dictionary with 'columns' (CANDIDATE_COLUMNS), 'strategies' (titles,
+            referenced by index) and 'rows'
+        """
+        def number(value, digits):
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                return None
+            return round(value, digits) if math.isfinite(value) else None
+        
+        rows = []
+        for index, signals in enumerate(strategy_signals.values()):
+            for side, key in ((0, 'buy'), (1, 'sell')):
+                shown = {id(signal) for signal in signals.get(f'{key}_signals', [])}
+                candidates = signals.get(f'all_{key}_signals', signals.get(f'{key}_signals', []))
+                for signal in candidates:
+                    row_data = signal.get('row_data', {})
+                    is_outright = row_data.get('is_outright', True)
+                    rows.append([
+                        index,
+                        side,
+                        str(signal.get('symbol', '')),
+                        number(signal.get('points'), 1),
+                        number(signal.get('entry_price'), 4),
+                        number(signal.get('stop'), 4),
+                        number(signal.get('target'), 4),
+                        number(signal.get('pos_pct'), 1),
+                        number(signal.get('alignment_score'), 0),
+                        int(isinstance(is_outright, bool) and not is_outright),
+                        int(bool(signal.get('was_active_prior_week', False))),
+                        int(id(signal) in shown)
+                    ])
+        return {'columns': CANDIDATE_COLUMNS, 'strategies': list(strategy_signals), 'rows': rows}
+    
+    def _generate_candidate_explorer_section(
+        self,
+        trend_signals: Dict,
+        enhanced_trend_signals: Dict,
+        mean_reversion_signals: Dict,
+        macd_rsi_exhaustion_signals: Dict
+    ) -> str:
+        """
+        Generate the All Candidates section: every candidate (all_buy_signals /
+        all_sell_signals) as an embedded data block, rendered client-side.
+        
+        The section markup and script are fixed; only the data block grows with
+        the candidate count (gzip+base64 unless report_settings.compress_candidate_data
+        is false).
+        
+        Args:
+            trend_signals: Trend following signals
+            enhanced_trend_signals: Enhanced trend following signals
+            mean_reversion_signals: Mean reversion signals
+            macd_rsi_exhaustion_signals: MACD/RSI exhaustion signals
+        
+        Returns:
+            HTML string for the candidate explorer section
+        """
+        payload = self._candidate_payload({
+            'MACD Trend Following': trend_signals,
+            'Enhanced Trend Following': enhanced_trend_signals,
+            'Mean Reversion': mean_reversion_signals,
+            'MACD/RSI Exhaustion': macd_rsi_exhaustion_signals
+        })
+        data = json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+        if self.report_settings.get('compress_candidate_data', True):
+            encoding = 'gzip+base64'
+            data = base64.b64encode(gzip.compress(data.encode('utf-8'), compresslevel=6, mtime=0)).decode('ascii')
+        else:
+            encoding = 'json'
+            data = data.replace('<', '\\u003c')  # Keep '</script>' out of the data block
+        
+        headers = ''.join(
+            f'<th data-key="{key}">{label}</th>' for key, label in (
+                ('symbol', 'ICE Symbol'), ('strategy', 'Strategy'), ('side', 'Signal'), ('price', 'Price'),
+                ('stop', 'Stop'), ('target', 'Target'), ('pos_pct', 'Pos %'), ('points', 'Score'),
+                ('alignment', 'Align'), ('spread', 'Type'), ('prwk', 'PRWK'), ('shown', 'In Report')
+            )
+        )
+        return f"""
+  <div class='uet-card' id='uet-candidates'>
+    <h2>🔎 All Candidates ({len(payload['rows'])} signals before ranking)</h2>
+    <div style='display:flex; flex-wrap:wrap; gap:8px; align-items:center; margin-bottom:8px; font-size:12px;'>
+      <input type='search' data-filter='query' placeholder='Filter symbol…' style='padding:4px 8px;'>
+      <select data-filter='strategy'><option value=''>All strategies</option></select>
+      <select data-filter='side'><option value=''>Buy &amp; Sell</option><option value='0'>Buy</option><option value='1'>Sell</option></select>
+      <button type='button' data-page='prev'>‹ Prev</button>
+      <button type='button' data-page='next'>Next ›</button>
+      <span class='uet-candidate-count' style='color:var(--muted);'>Loading candidates…</span>
+    </div>
+    <table class="uet-table"><thead><tr>{headers}</tr></thead><tbody></tbody></table>
+    <script type="application/json" id="uet-candidate-data" data-encoding="{encoding}">{data}</script>
+    <script>{_CANDIDATE_EXPLORER_SCRIPT}</script>
+  </div>
+"""
+    
     def _generate_forward_curve_section(
         self,
         trend_signals: Dict,
@@ -1920,9 +2190,11 @@ tr.uet-fallback-row td{
         conversion_factors = {}
         if ice_chat_formatter and hasattr(ice_chat_formatter, 'symbol_matrix') and ice_chat_formatter.symbol_matrix is not None:
             # Get conversion factors from symbol matrix
-            for _, row in ice_chat_formatter.symbol_matrix.iterrows():
-                root = row.get('symbol_root', '').upper()
-                convert_to_usg = row.get('convert_to_$usg', 'n/a')
+            matrix = ice_chat_formatter.symbol_matrix
+            roots = matrix['symbol_root'] if 'symbol_root' in matrix.columns else [''] * len(matrix)
+            conversions = matrix['convert_to_$usg'] if 'convert_to_$usg' in matrix.columns else ['n/a'] * len(matrix)
+            for root, convert_to_usg in zip(roots, conversions):
+                root = root.upper()
                 if root and convert_to_usg and convert_to_usg != 'n/a' and convert_to_usg != '':
                     # Parse conversion factor (e.g., "/521" or "/42" or already a float like 521.0)
                     try:
@@ -1949,20 +2221,25 @@ tr.uet-fallback-row td{
             if root not in conversion_factors:
                 conversion_factors[root] = divisor
         
+        # Indexed curve (the formatter's store when it holds the same prices)
+        curve_store = getattr(ice_chat_formatter, 'curve_store', None)
+        if curve_store is None or curve_store.as_dict() is not curve_data:
+            curve_store = CurveStore.coerce(curve_data)
+        
         # Sort commodities for display
-        sorted_roots = sorted(curve_data.keys())
+        sorted_roots = sorted(curve_store.roots)
         
         for root in sorted_roots:
             commodity_name = commodity_names.get(root, root)
-            prices = curve_data.get(root, {})
+            prices = curve_store.row(root, months_to_show)
             
             # Get conversion factor for this root
             conversion_divisor = conversion_factors.get(root, 1.0)
             
             html += f'<tr><td style="font-weight: bold; font-size:9px; padding:3px 6px;">{commodity_name}</td>'
             
-            for month_col in months_to_show:
-                price = prices.get(month_col)
+            for month_col, price in zip(months_to_show, prices):
+                price = None if pd.isna(price) else float(price)
                 
                 # Check if this symbol is referenced
                 # Build symbol string to check (e.g., '%AFE F!-IEU' for Jan_26)
@@ -2207,6 +2484,20 @@ tr.uet-fallback-row td{
 </html>
 """
     
+    def _report_path(self, output_dir: Path = None, filename: str = None) -> Path:
+        """Report file path (default: signal_generator/output/<prefix>_YYYY-MM-DD.html); creates the directory."""
+        if output_dir is None:
+            output_dir = Path(__file__).parent.parent / 'output'
+        
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        if filename is None:
+            date_str = datetime.now().strftime('%Y-%m-%d')
+            prefix = self.report_settings.get('filename_prefix', 'technical_signals_report')
+            filename = f"{prefix}_{date_str}.html"
+        
+        return output_dir / filename
+    
     def save_report(self, html: str, output_dir: Path = None, filename: str = None) -> Path:
         """
         Save HTML report to file.
@@ -2219,20 +2510,41 @@ tr.uet-fallback-row td{
         Returns:
             Path to saved file
         """
-        if output_dir is None:
-            output_dir = Path(__file__).parent.parent / 'output'
-        
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        if filename is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
-            prefix = self.report_settings.get('filename_prefix', 'technical_signals_report')
-            filename = f"{prefix}_{date_str}.html"
-        
-        output_path = output_dir / filename
+        output_path = self._report_path(output_dir, filename)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html)
         
         logger.info(f"Saved report to {output_path}")
         return output_path
+    
+    def write_report(self, output_dir: Path = None, filename: str = None, workers: int = 1, **report_args) -> Path:
+        """
+        Render the HTML report straight to its file (generate_html_report + save_report
+        without holding the whole report in memory).
+        
+        The report is written to a temporary file next to the target and renamed
+        when complete, so a failed render never leaves a truncated report behind.
+        
+        Args:
+            output_dir: Output directory (default: signal_generator/output)
+            filename: Filename (default: technical_signals_report_YYYY-MM-DD.html)
+            workers: Threads for independent sections (see write_html_report)
+            **report_args: generate_html_report arguments (trend_signals, ...)
+        
+        Returns:
+            Path to saved file
+        """
+        output_path = self._report_path(output_dir, filename)
+        partial_path = output_path.with_name(output_path.name + '.partial')
+        
+        try:
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                written = self.write_html_report(f, workers=workers, **report_args)
+            partial_path.replace(output_path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
+        
+        logger.info(f"Saved report to {output_path} ({written:,} characters)")
+        return output_path
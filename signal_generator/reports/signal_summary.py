@@ -0,0 +1,321 @@
+"""
+Report statistics for one run, computed once.
+
+The command center, the KPI cards and every strategy stats tile read their
+counts from a SignalSummary instead of re-walking the signal lists. Signals
+are flattened once into score arrays (points, alignment, side, strategy);
+per-symbol attributes (product code, display name, spread flag) are resolved
+once per distinct symbol; KPIs, alignment buckets, point histograms and
+top-N product/symbol counts are then NumPy reductions over those arrays.
+
+Usage:
+    summary = SignalSummary(
+        {'trend_following': trend_signals, 'mean_reversion': mean_reversion_signals},
+        product_of=report_generator._extract_product_code,
+        display_symbol_of=report_generator._extract_display_symbol_for_stats
+    )
+    summary.kpis()                           # high-conviction, total, alignment buckets
+    summary.strategy_counts('trend_following')   # (3, 1): buys, sells >= 75 points
+    summary.strategy_stats('trend_following')    # stats tile of all candidates
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+HIGH_CONVICTION_POINTS = 75
+
+# (name, lower bound inclusive, upper bound exclusive) of alignment_score
+ALIGNMENT_BUCKETS = (
+    ('strong_agree', 90, np.inf),
+    ('agree', 80, 90),
+    ('neutral', 70, 80),
+    ('disagree', 60, 70),
+    ('strong_disagree', -np.inf, 60),
+)
+
+# Point histogram of the stats tiles
+POINT_BUCKETS = (
+    ('75-84', 75, 85),
+    ('85-94', 85, 95),
+    ('95+', 95, np.inf),
+)
+
+BUY, SELL = 0, 1
+
+
+def _top_counts(codes: np.ndarray, labels: List, n: Optional[int] = None, by_count: bool = True) -> List[Tuple]:
+    """
+    Count category codes, most common first (ties in order of first appearance,
+    as Counter.most_common).
+    
+    Args:
+        codes: Category index per item (-1 = no category)
+        labels: Category labels by index
+        n: Number of categories to return (None = all)
+        by_count: False = order of first appearance only (as iterating a Counter)
+    
+    Returns:
+        List of (label, count)
+    """
+    codes = codes[codes >= 0]
+    if codes.size == 0:
+        return []
+    present, first_seen = np.unique(codes, return_index=True)
+    counts = np.bincount(codes)[present]
+    order = np.lexsort((first_seen, -counts)) if by_count else np.argsort(first_seen)
+    if n is not None:
+        order = order[:n]
+    return [(labels[present[i]], int(counts[i])) for i in order]
+
+
+class _SignalArrays:
+    """Flat arrays of one set of signal lists (ranked or all candidates)."""
+    
+    __slots__ = ('strategy', 'side', 'points', 'alignment', 'symbol')
+    
+    def __init__(self, strategy, side, points, alignment, symbol):
+        self.strategy = np.asarray(strategy, dtype=np.int16)
+        self.side = np.asarray(side, dtype=np.int8)
+        self.points = np.asarray(points, dtype=float)
+        self.alignment = np.asarray(alignment, dtype=float)
+        self.symbol = np.asarray(symbol, dtype=np.int64)
+
+
+class SignalSummary:
+    """
+    KPI, bucket, histogram and top-N aggregates of a run's signals.
+    
+    Ranked signals ('buy_signals'/'sell_signals') feed the command center
+    KPIs; all candidates ('all_buy_signals'/'all_sell_signals', falling back
+    to the ranked lists) feed the per-strategy stats tiles.
+    """
+    
+    def __init__(
+        self,
+        strategy_signals: Dict[str, Dict],
+        product_of: Optional[Callable[[Dict], Optional[str]]] = None,
+        display_symbol_of: Optional[Callable[[Dict], str]] = None,
+        high_conviction: float = HIGH_CONVICTION_POINTS
+    ):
+        """
+        Flatten the signals and resolve per-symbol attributes.
+        
+        Args:
+            strategy_signals: Dictionary {strategy_key: generate_signals result}
+            product_of: Product code of a signal (None = no product counts)
+            display_symbol_of: Display name of a signal for the symbol counts
+                               (None = no symbol counts)
+            high_conviction: Points threshold of the high-conviction counts
+        """
+        self.strategies = list(strategy_signals)
+        self.high_conviction = high_conviction
+        self._product_of = product_of
+        self._display_symbol_of = display_symbol_of
+        
+        # Distinct symbols and their attributes, resolved from the first signal seen
+        self._symbol_index: Dict[str, int] = {}
+        self._products: List[Optional[str]] = []
+        self._display_symbols: List[Optional[str]] = []
+        self._is_spread: List[bool] = []
+        
+        self.ranked = self._flatten(strategy_signals, '{side}_signals', resolve=False)
+        self.candidates = self._flatten(strategy_signals, 'all_{side}_signals', resolve=True)
+        
+        # Per-symbol attribute codes (-1 = none) for bincount/lexsort
+        self._product_labels, self._product_codes = self._encode(self._products)
+        self._display_labels, self._display_codes = self._encode(self._display_symbols)
+        self._spread_flags = np.asarray(self._is_spread, dtype=bool)
+    
+    def _flatten(self, strategy_signals: Dict[str, Dict], key: str, resolve: bool) -> _SignalArrays:
+        """Flatten one set of signal lists into arrays (one Python pass over the signals)."""
+        strategy, side, points, alignment, symbol = [], [], [], [], []
+        for index, signals in enumerate(strategy_signals.values()):
+            for side_code, side_name in ((BUY, 'buy'), (SELL, 'sell')):
+                signal_list = signals.get(key.format(side=side_name))
+                if signal_list is None:
+                    signal_list = signals.get(f'{side_name}_signals', [])
+                for signal in signal_list:
+                    strategy.append(index)
+                    side.append(side_code)
+                    points.append(signal.get('points', 0) or 0)
+                    alignment.append(signal.get('alignment_score', 0))
+                    symbol.append(self._symbol_code(signal) if resolve else -1)
+        return _SignalArrays(strategy, side, points, alignment, symbol)
+    
+    def _symbol_code(self, signal: Dict) -> int:
+        """Index of the signal's symbol, resolving its attributes the first time it is seen."""
+        symbol = signal.get('symbol', '') or signal.get('ice_connect_symbol', '')
+        code = self._symbol_index.get(symbol)
+        if code is None:
+            code = self._symbol_index[symbol] = len(self._products)
+            self._products.append(self._product_of(signal) if self._product_of else None)
+            self._display_symbols.append(self._display_symbol_of(signal) if self._display_symbol_of else None)
+            # Spread = row_data has both symbol_1 and symbol_2
+            row_data = signal.get('row_data', {})
+            self._is_spread.append(bool(row_data.get('symbol_1') and row_data.get('symbol_2')))
+        return code
+    
+    @staticmethod
+    def _encode(values: List[Optional[str]]) -> Tuple[List[str], np.ndarray]:
+        """Category labels and per-symbol codes (-1 for empty values)."""
+        labels, index, codes = [], {}, np.full(len(values), -1, dtype=np.int64)
+        for i, value in enumerate(values):
+            if not value:
+                continue
+            if value not in index:
+                index[value] = len(labels)
+                labels.append(value)
+            codes[i] = index[value]
+        return labels, codes
+    
+    def _mask(self, arrays: _SignalArrays, strategies: Optional[Iterable[str]] = None,
+              side: Optional[int] = None) -> np.ndarray:
+        """Boolean mask of the signals of some strategies and/or one side."""
+        mask = np.ones(len(arrays.points), dtype=bool)
+        if strategies is not None:
+            indices = [self.strategies.index(key) for key in strategies if key in self.strategies]
+            mask &= np.isin(arrays.strategy, indices)
+        if side is not None:
+            mask &= arrays.side == side
+        return mask
+    
+    def kpis(self, strategies: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Command center KPIs of the ranked signals.
+        
+        Args:
+            strategies: Strategy keys to include (None = all)
+        
+        Returns:
+            Dictionary with 'total', 'high_conviction' and 'alignment'
+            ({bucket name: count}, see ALIGNMENT_BUCKETS)
+        """
+        mask = self._mask(self.ranked, strategies)
+        points = self.ranked.points[mask]
+        alignment = self.ranked.alignment[mask]
+        return {
+            'total': int(mask.sum()),
+            'high_conviction': int((points >= self.high_conviction).sum()),
+            'alignment': {name: int(((alignment >= low) & (alignment < high)).sum())
+                          for name, low, high in ALIGNMENT_BUCKETS}
+        }
+    
+    def strategy_counts(self, strategy: str, min_points: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Ranked buy/sell counts of one strategy at or above a points threshold.
+        
+        Args:
+            strategy: Strategy key
+            min_points: Points threshold (default: the high-conviction threshold)
+        
+        Returns:
+            Tuple of (buy count, sell count)
+        """
+        if min_points is None:
+            min_points = self.high_conviction
+        mask = self._mask(self.ranked, [strategy]) & (self.ranked.points >= min_points)
+        sides = np.bincount(self.ranked.side[mask], minlength=2)
+        return int(sides[BUY]), int(sides[SELL])
+    
+    def point_histogram(self, strategy: Optional[str] = None) -> Dict[str, int]:
+        """
+        Candidate counts per POINT_BUCKETS range (signals with points).
+        
+        Args:
+            strategy: Strategy key (None = all strategies)
+        
+        Returns:
+            Dictionary {bucket label: count}
+        """
+        mask = self._mask(self.candidates, None if strategy is None else [strategy])
+        points = self.candidates.points[mask]
+        points = points[points != 0]
+        return {label: int(((points >= low) & (points < high)).sum()) for label, low, high in POINT_BUCKETS}
+    
+    def top_products(self, strategy: Optional[str] = None, side: Optional[int] = None,
+                     n: Optional[int] = 5) -> List[Tuple[str, int]]:
+        """
+        Most common product codes among the candidates.
+        
+        Args:
+            strategy: Strategy key (None = all strategies)
+            side: BUY, SELL or None for both
+            n: Number of products (None = all)
+        
+        Returns:
+            List of (product, count), most common first
+        """
+        mask = self._mask(self.candidates, None if strategy is None else [strategy], side)
+        return _top_counts(self._product_codes[self.candidates.symbol[mask]], self._product_labels, n)
+    
+    def top_symbols(self, strategy: Optional[str] = None, n: Optional[int] = 5) -> List[Dict]:
+        """
+        Most common display symbols among the candidates, with their buy/sell split.
+        
+        Args:
+            strategy: Strategy key (None = all strategies)
+            n: Number of symbols (None = all)
+        
+        Returns:
+            List of {'symbol', 'buy', 'sell', 'total'}, most common first
+            (buys are counted ahead of sells for first-appearance ties)
+        """
+        mask = self._mask(self.candidates, None if strategy is None else [strategy])
+        sides = self.candidates.side[mask]
+        codes = self._display_codes[self.candidates.symbol[mask]]
+        # Buys first so ties keep the order of the buy list, then sell-only symbols
+        ordered = np.concatenate([codes[sides == BUY], codes[sides == SELL]])
+        top = _top_counts(ordered, self._display_labels, n)
+        if not top:
+            return []
+        buy_counts = np.bincount(codes[(sides == BUY) & (codes >= 0)], minlength=len(self._display_labels))
+        sell_counts = np.bincount(codes[(sides == SELL) & (codes >= 0)], minlength=len(self._display_labels))
+        position = {label: i for i, label in enumerate(self._display_labels)}
+        return [{'symbol': label, 'buy': int(buy_counts[position[label]]),
+                 'sell': int(sell_counts[position[label]]), 'total': total} for label, total in top]
+    
+    def strategy_stats(self, strategy: str) -> Dict:
+        """
+        Stats tile of one strategy's candidates.
+        
+        Args:
+            strategy: Strategy key
+        
+        Returns:
+            Dictionary with top_products_buy, top_products_sell, avg_points,
+            point_distribution, high_conviction_count, product_type_counts,
+            spread_vs_outright, buy_count, sell_count and symbol_buy_sell
+        """
+        mask = self._mask(self.candidates, [strategy])
+        if not mask.any():
+            return {
+                'top_products_buy': [],
+                'top_products_sell': [],
+                'avg_points': 0,
+                'point_distribution': {},
+                'high_conviction_count': 0,
+                'product_type_counts': {},
+                'spread_vs_outright': {'spreads': 0, 'outrights': 0}
+            }
+        
+        sides = self.candidates.side[mask]
+        points = self.candidates.points[mask]
+        points = points[points != 0]
+        spreads = int(self._spread_flags[self.candidates.symbol[mask]].sum())
+        # Buy products ahead of sell products (first-appearance order of the counts)
+        product_codes = self._product_codes[self.candidates.symbol[mask]]
+        all_products = _top_counts(np.concatenate([product_codes[sides == BUY], product_codes[sides == SELL]]),
+                                   self._product_labels, by_count=False)
+        
+        return {
+            'top_products_buy': self.top_products(strategy, BUY),
+            'top_products_sell': self.top_products(strategy, SELL),
+            'avg_points': float(points.mean()) if points.size else 0,
+            'point_distribution': self.point_histogram(strategy),
+            'high_conviction_count': int((points >= self.high_conviction).sum()),
+            'product_type_counts': dict(all_products),
+            'spread_vs_outright': {'spreads': spreads, 'outrights': int(mask.sum()) - spreads},
+            'buy_count': int((sides == BUY).sum()),
+            'sell_count': int((sides == SELL).sum()),
+            'symbol_buy_sell': self.top_symbols(strategy)
+        }
@@ -2,22 +2,30 @@
 Signal generators for trade signal system.
 """
 
-from .base_signal import BaseSignal
+from .base_signal import BaseSignal, SignalView, SignalRangeView
+from .signal_row import SignalRow
 from .point_calculator import PointCalculator
 from .trend_signals import TrendFollowingSignals
 from .enhanced_trend_signals import EnhancedTrendFollowingSignals
 from .mean_reversion_signals import MeanReversionSignals
 from .macd_rsi_exhaustion_signals import MacdRsiExhaustionSignals
 from .ice_chat_formatter import ICEChatFormatter
+from .signal_engine import SignalEngine, SignalRule, RuleSignals
 
 __all__ = [
     'BaseSignal',
+    'SignalView',
+    'SignalRangeView',
+    'SignalRow',
     'PointCalculator',
     'TrendFollowingSignals',
     'EnhancedTrendFollowingSignals',
     'MeanReversionSignals',
     'MacdRsiExhaustionSignals',
-    'ICEChatFormatter'
+    'ICEChatFormatter',
+    'SignalEngine',
+    'SignalRule',
+    'RuleSignals'
 ]
 
 
@@ -6,14 +6,248 @@ from abc import ABC, abstractmethod
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 
 from .point_calculator import PointCalculator
+from .signal_row import SignalRow
 
 logger = logging.getLogger(__name__)
 
 
+def _date_order(data: pd.DataFrame) -> np.ndarray:
+    """
+    Row positions of data sorted by Date, most recent first.
+    
+    Same order as data.sort_values('Date', ascending=False) (default sort kind),
+    without reordering the other columns.
+    
+    Args:
+        data: DataFrame with indicator data
+    
+    Returns:
+        Array of row positions (identity order if there is no Date column)
+    """
+    if 'Date' not in data.columns:
+        return np.arange(len(data))
+    dates = data['Date'].reset_index(drop=True).to_frame()
+    return dates.sort_values('Date', ascending=False).index.to_numpy()
+
+
+def _entry_frame(data: pd.DataFrame, current_pos: np.ndarray, previous_pos: np.ndarray) -> pd.DataFrame:
+    """
+    Current rows plus 'prev_' columns and '_has_previous' (see SignalView.frame).
+    
+    Args:
+        data: Indicator data
+        current_pos: Positions of the current bars
+        previous_pos: Positions of the previous bars (-1 = none)
+    
+    Returns:
+        Entry frame, one row per current position
+    """
+    has_previous = previous_pos >= 0
+    current = data.iloc[current_pos].reset_index(drop=True)
+    # Rows without a previous bar borrow their own values; _entry_column masks them
+    previous = data.iloc[np.where(has_previous, previous_pos, current_pos)].reset_index(drop=True)
+    frame = pd.concat([current, previous.add_prefix('prev_')], axis=1)
+    frame['_has_previous'] = has_previous
+    return frame
+
+
+class SignalView:
+    """
+    Current and previous bar per symbol, prepared once and shared by strategies.
+    
+    One sort by Date (most recent first) plus a per-symbol cumcount replaces the
+    per-symbol boolean scans; symbols keep the order of their first row.
+    current_pos/previous_pos are row positions in data, which is kept as is
+    (signal row_data records refer to it).
+    """
+    
+    def __init__(self, data: pd.DataFrame, target_date: Optional[datetime] = None):
+        """
+        Locate the most recent bar and the one before it for every symbol.
+        
+        Args:
+            data: DataFrame with indicator data
+            target_date: Target date (None = no filter); symbols whose most recent
+                         bar is not on this date are dropped
+        """
+        self.target_date = target_date
+        self.row_count = len(data)
+        self.symbol_count = data['ice_connect_symbol'].nunique()
+        
+        # Work on positions (data itself is neither sorted nor copied)
+        order = _date_order(data)
+        symbols = data['ice_connect_symbol'].iloc[order].reset_index(drop=True)
+        
+        bar = symbols.groupby(symbols, sort=False).cumcount().to_numpy()
+        current = np.flatnonzero(bar == 0)
+        previous = np.full(len(current), -1, dtype=np.int64)
+        second = np.flatnonzero(bar == 1)
+        if len(second):
+            lookup = pd.Series(second, index=symbols.iloc[second].to_numpy())
+            found = lookup.reindex(symbols.iloc[current].to_numpy())
+            previous = found.fillna(-1).to_numpy(dtype=np.int64)
+        
+        current_pos = order[current]
+        previous_pos = np.where(previous >= 0, order[previous], -1)
+        
+        # If target_date specified, only keep symbols whose most recent row matches target_date
+        if target_date and 'Date' in data.columns:
+            dates = pd.to_datetime(data['Date'].iloc[current_pos], errors='coerce')
+            keep = (dates.isna() | (dates.dt.date == target_date.date())).to_numpy()
+            current_pos = current_pos[keep]
+            previous_pos = previous_pos[keep]
+        
+        self.data = data
+        self.current_pos = current_pos
+        self.previous_pos = previous_pos
+        self._frame = None
+        self._entry_masks = {}
+    
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        Frame passed to detect_entry_mask (one row per symbol, built on first use).
+        
+        Returns:
+            DataFrame of current values plus 'prev_' columns and '_has_previous'
+        """
+        if self._frame is None:
+            self._frame = _entry_frame(self.data, self.current_pos, self.previous_pos)
+        return self._frame
+    
+    def rows(self, i: int) -> Tuple[pd.Series, Optional[pd.Series]]:
+        """
+        Copies of the current and previous rows for the i-th symbol.
+        
+        Args:
+            i: Symbol position in the view
+        
+        Returns:
+            Tuple of (current_row, prev_row or None)
+        """
+        current_row = self.data.iloc[self.current_pos[i]].copy()
+        prev_row = self.data.iloc[self.previous_pos[i]].copy() if self.previous_pos[i] >= 0 else None
+        return current_row, prev_row
+    
+    def entry_mask(self, strategy: 'BaseSignal') -> Optional[pd.Series]:
+        """
+        Entry screen of a strategy over this view (precomputed by SignalRangeView if available).
+        
+        Args:
+            strategy: BaseSignal instance
+        
+        Returns:
+            Boolean Series aligned with frame, or None to check every row
+        """
+        name = strategy.get_strategy_name()
+        if name in self._entry_masks:
+            return self._entry_masks[name]
+        return strategy.detect_entry_mask(self.frame)
+
+
+class SignalRangeView:
+    """
+    Current and previous bar per symbol for many target dates, stacked in one frame.
+    
+    The view for date d matches SignalView(data[Date <= d], target_date=d): each
+    symbol with a bar on d uses that bar as current and its preceding bar as
+    previous. Rows with a missing Date belong to no date. Entry masks are
+    evaluated once over the stacked frame (screen) and sliced per date.
+    """
+    
+    def __init__(self, data: pd.DataFrame, dates: List):
+        """
+        Locate current/previous bars for every (date, symbol).
+        
+        Args:
+            data: DataFrame with indicator data (must have a Date column)
+            dates: Target dates (datetime, Timestamp or 'YYYY-MM-DD')
+        """
+        self.dates = list(dict.fromkeys(pd.Timestamp(d).normalize() for d in dates))
+        self.row_count = len(data)
+        self.symbol_count = data['ice_connect_symbol'].nunique()
+        
+        order = _date_order(data)
+        symbols = data['ice_connect_symbol'].iloc[order].reset_index(drop=True)
+        bar_dates = pd.to_datetime(data['Date'].iloc[order], errors='coerce').dt.normalize().reset_index(drop=True)
+        
+        # Previous bar = next row of the same symbol in the descending order
+        positions = pd.Series(np.arange(len(data)), dtype='float64')
+        previous = positions.groupby(symbols.to_numpy(), sort=False).shift(-1)
+        previous_all = previous.fillna(-1).to_numpy(dtype=np.int64)
+        
+        # A symbol's first row on a date is its current bar as of that date
+        first_on_date = ~pd.DataFrame({'symbol': symbols, 'date': bar_dates}).duplicated()
+        
+        current_parts = []
+        self._slices = {}
+        start = 0
+        for date in self.dates:
+            current = np.flatnonzero(((bar_dates == date) & first_on_date).to_numpy())
+            current_parts.append(current)
+            self._slices[date] = (start, start + len(current))
+            start += len(current)
+        
+        current = np.concatenate(current_parts) if current_parts else np.array([], dtype=np.int64)
+        previous = previous_all[current]
+        
+        self.data = data
+        self.current_pos = order[current]
+        self.previous_pos = np.where(previous >= 0, order[previous], -1)
+        self._frame = None
+        self._entry_masks = {}
+    
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Stacked entry frame for all dates (same layout as SignalView.frame)."""
+        if self._frame is None:
+            self._frame = _entry_frame(self.data, self.current_pos, self.previous_pos)
+        return self._frame
+    
+    def screen(self, strategy: 'BaseSignal'):
+        """
+        Evaluate a strategy's entry mask once over the stacked frame.
+        
+        Args:
+            strategy: BaseSignal instance
+        """
+        name = strategy.get_strategy_name()
+        if name not in self._entry_masks:
+            mask = strategy.detect_entry_mask(self.frame) if len(self.current_pos) else None
+            self._entry_masks[name] = None if mask is None else np.asarray(mask, dtype=bool)
+    
+    def view(self, date) -> SignalView:
+        """
+        SignalView for one target date, sharing data and screened masks.
+        
+        Args:
+            date: One of self.dates
+        
+        Returns:
+            SignalView equivalent to SignalView(data[Date <= date], target_date=date)
+        """
+        date = pd.Timestamp(date).normalize()
+        start, stop = self._slices[date]
+        
+        view = SignalView.__new__(SignalView)
+        view.target_date = date.to_pydatetime()
+        view.row_count = self.row_count
+        view.symbol_count = self.symbol_count
+        view.data = self.data
+        view.current_pos = self.current_pos[start:stop]
+        view.previous_pos = self.previous_pos[start:stop]
+        view._frame = self.frame.iloc[start:stop].reset_index(drop=True) if self._frame is not None else None
+        view._entry_masks = {
+            name: None if mask is None else pd.Series(mask[start:stop])
+            for name, mask in self._entry_masks.items()
+        }
+        return view
+
+
 class BaseSignal(ABC):
     """
     Abstract base class for signal generation strategies.
@@ -145,6 +379,45 @@ class BaseSignal(ABC):
         # Default: return base size
         return float(base_size)
     
+    def detect_entry_mask(self, frame: pd.DataFrame) -> Optional[pd.Series]:
+        """
+        Column-wise version of detect_entry_condition over one row per symbol.
+        
+        Rows flagged here are still passed through detect_entry_condition (which
+        attaches trigger metadata), so the mask must flag every row the row-wise
+        check would fire on.
+        
+        Args:
+            frame: Current bar per symbol; previous bar columns carry a 'prev_' prefix
+                   and '_has_previous' is False for symbols with a single bar
+        
+        Returns:
+            Boolean Series aligned with frame, or None to check every row with
+            detect_entry_condition
+        """
+        return None
+    
+    @staticmethod
+    def _entry_column(frame: pd.DataFrame, column: str, previous: bool = False) -> pd.Series:
+        """
+        Numeric column of an entry frame, NaN where missing (mirrors row.get(column, np.nan)).
+        
+        Args:
+            frame: Entry frame (SignalView.frame)
+            column: Column name
+            previous: Read the previous bar's value
+        
+        Returns:
+            Float Series aligned with frame
+        """
+        name = f'prev_{column}' if previous else column
+        if name not in frame.columns:
+            return pd.Series(np.nan, index=frame.index)
+        values = pd.to_numeric(frame[name], errors='coerce').astype('float64')
+        if previous:
+            values = values.where(frame['_has_previous'])
+        return values
+    
     def generate_signals(
         self,
         data: pd.DataFrame,
@@ -153,6 +426,9 @@ class BaseSignal(ABC):
         """
         Generate signals for all symbols in data.
         
+        Entry conditions are screened column-wise (detect_entry_mask); only the
+        symbols that fire are confirmed row-wise and turned into signal dicts.
+        
         Args:
             data: DataFrame with indicator data
             target_date: Target date for analysis (None = use most recent date)
@@ -160,20 +436,61 @@ class BaseSignal(ABC):
         Returns:
             Dictionary with 'buy_signals' and 'sell_signals' lists
         """
-        # Filter to target date if specified (but keep previous weeks for cross detection)
-        # The prepare_data function already handles this, so we just need to ensure
-        # we're only generating signals for the target date
-        if target_date and 'Date' in data.columns:
-            # Keep all data for cross detection, but only generate signals for target_date
-            target_date_only = target_date.date()
-            # We'll filter later when creating signals
-            pass
-        
         if len(data) == 0:
             logger.warning("No data available for signal generation")
             return {'buy_signals': [], 'sell_signals': []}
         
-        logger.info(f"Generating signals for {self.get_strategy_name()}: {len(data)} rows, {data['ice_connect_symbol'].nunique()} unique symbols")
+        return self.generate_signals_from_view(SignalView(data, target_date))
+    
+    def generate_signals_range(self, data: pd.DataFrame, dates: List) -> Dict[pd.Timestamp, Dict[str, List[Dict]]]:
+        """
+        Generate signals as of each of several dates in one pass.
+        
+        The result for date d is the same as generate_signals(data[data['Date'] <= d],
+        target_date=d), but the data is sorted once and the entry screen runs
+        once over all dates (see SignalRangeView).
+        
+        Args:
+            data: DataFrame with indicator data spanning the dates
+            dates: Target dates (datetime, Timestamp or 'YYYY-MM-DD')
+        
+        Returns:
+            Dictionary {date (normalized Timestamp): generate_signals result}
+        """
+        if len(data) == 0:
+            logger.warning("No data available for signal generation")
+            return {pd.Timestamp(d).normalize(): {'buy_signals': [], 'sell_signals': []} for d in dates}
+        
+        return self.generate_signals_from_range(SignalRangeView(data, dates))
+    
+    def generate_signals_from_range(self, range_view: 'SignalRangeView') -> Dict[pd.Timestamp, Dict[str, List[Dict]]]:
+        """
+        Generate signals for every date of a prepared SignalRangeView.
+        
+        Args:
+            range_view: SignalRangeView built from the indicator data
+        
+        Returns:
+            Dictionary {date: generate_signals result}
+        """
+        range_view.screen(self)
+        return {date: self.generate_signals_from_view(range_view.view(date)) for date in range_view.dates}
+    
+    def generate_signals_from_view(self, view: 'SignalView') -> Dict[str, List[Dict]]:
+        """
+        Generate signals from a prepared current/previous-bar view.
+        
+        Lets several strategies share one SignalView (see SignalEngine).
+        
+        Args:
+            view: SignalView built from the indicator data
+        
+        Returns:
+            Dictionary with 'buy_signals', 'sell_signals', 'all_buy_signals' and 'all_sell_signals'
+        """
+        target_date = view.target_date
+        
+        logger.info(f"Generating signals for {self.get_strategy_name()}: {view.row_count} rows, {view.symbol_count} unique symbols")
         
         # Diagnostic counters (will be set in loop)
         symbols_checked = 0
@@ -181,34 +498,20 @@ class BaseSignal(ABC):
         symbols_with_prev_week = 0
         symbols_with_cross = 0
         
-        # Sort by date (most recent first) for cross detection
-        if 'Date' in data.columns:
-            data = data.sort_values('Date', ascending=False).reset_index(drop=True)
-        
         buy_signals = []
         sell_signals = []
         
-        # Group by symbol to detect crosses
-        for symbol in data['ice_connect_symbol'].unique():
-            symbol_data = data[data['ice_connect_symbol'] == symbol].copy()
-            symbol_data = symbol_data.sort_values('Date', ascending=False).reset_index(drop=True)
-            
-            if len(symbol_data) < 1:
-                continue  # Need at least 1 row
-            
-            # If target_date specified, only check if most recent row matches target_date
-            if target_date and 'Date' in symbol_data.columns:
-                most_recent_date = symbol_data.iloc[0]['Date']
-                if pd.notna(most_recent_date):
-                    if isinstance(most_recent_date, str):
-                        most_recent_date = pd.to_datetime(most_recent_date)
-                    if most_recent_date.date() != target_date.date():
-                        continue  # Skip symbols that don't have data for target_date
-            
-            # Check current row (most recent) against previous
+        candidates = np.arange(len(view.current_pos))
+        mask = view.entry_mask(self)
+        if mask is not None:
+            candidates = np.flatnonzero(np.asarray(mask, dtype=bool))
+            logger.info(f"  {len(candidates)} of {len(view.current_pos)} symbols pass the entry screen")
+        
+        fired = []
+        for i in candidates:
             # Use .copy() to avoid SettingWithCopyWarning when modifying metadata
-            current_row = symbol_data.iloc[0].copy()
-            prev_row = symbol_data.iloc[1].copy() if len(symbol_data) > 1 else None
+            current_row, prev_row = view.rows(i)
+            symbol = current_row['ice_connect_symbol']
             
             # Detect entry condition
             entry_result = self.detect_entry_condition(current_row, prev_row)
@@ -228,78 +531,13 @@ class BaseSignal(ABC):
             symbols_with_cross += 1
             logger.info(f"Signal detected for {symbol}: {signal_type} (strategy: {self.get_strategy_name()})")
             
-            # Get base points
-            base_points = self.get_base_points(current_row, signal_type)
-            
-            # Calculate confluence bonuses
-            is_spread = current_row.get('is_outright', True) == False
-            confluence = self.point_calculator.calculate_confluence_bonuses(
-                current_row,
-                self.get_strategy_name(),
-                signal_type,
-                is_spread
-            )
-            
-            # Calculate tenor/liquidity bonus
-            # Note: was_active_prior_week will be set later by prior_week_checker, but we pass it if it exists
-            was_active_prior_week = current_row.get('was_active_prior_week', False)
-            tenor_liquidity = self.point_calculator.calculate_tenor_liquidity_bonus(
-                {'symbol': symbol, 'row_data': current_row.to_dict(), 'was_active_prior_week': was_active_prior_week},
-                target_date
-            )
-            
-            # Calculate trend exhaustion penalty (applies to trend_following and enhanced_trend_following)
-            exhaustion_penalty = self.point_calculator.calculate_trend_exhaustion_penalty(
-                current_row,
-                self.get_strategy_name(),
-                signal_type
-            )
-            
-            total_points = base_points + confluence['total_bonus'] + tenor_liquidity['total_bonus'] - exhaustion_penalty['total_penalty']
-            
-            # Calculate stop/target
-            stop_target = self.calculate_stop_target(current_row, signal_type)
-            
-            # Calculate position size
-            pos_pct = self.calculate_position_size(current_row)
-            
-            # Calculate duration (days since entry)
-            entry_date = current_row.get('Date')
-            if pd.isna(entry_date):
-                duration = 0
-            else:
-                if isinstance(entry_date, str):
-                    entry_date = pd.to_datetime(entry_date)
-                duration = (datetime.now().date() - entry_date.date()).days if target_date is None else 0
-            
-            # Create signal dictionary
-            signal = {
-                'symbol': symbol,
-                'signal_type': signal_type,
-                'entry_date': entry_date,
-                'entry_price': current_row.get('close'),
-                'stop': stop_target['stop'],
-                'target': stop_target['target'],
-                'stop_pct': stop_target['stop_pct'],
-                'target_pct': stop_target['target_pct'],
-                'atr': stop_target['atr'],
-                'pos_pct': pos_pct,
-                'points': total_points,
-                'base_points': base_points,
-                'confluence_bonus': confluence['total_bonus'],
-                'confluence_breakdown': confluence['breakdown'],
-                'tenor_liquidity_bonus': tenor_liquidity['total_bonus'],
-                'tenor_liquidity_breakdown': tenor_liquidity['breakdown'],
-                'exhaustion_penalty': exhaustion_penalty['total_penalty'],
-                'exhaustion_penalty_breakdown': exhaustion_penalty['breakdown'],
-                'alignment_score': confluence['alignment_score'],
-                'duration': duration,
-                'is_fallback': False,  # Will be set to True for fallback signals
-                'was_active_prior_week': False,  # Will be set by prior_week_checker
-                'row_data': current_row.to_dict()  # Store full row for later use
-            }
-            # Add strategy name to row_data for easier lookup
-            signal['row_data']['strategy_name'] = self.get_strategy_name()
+            fired.append((i, symbol, current_row, signal_type))
+        
+        # Score all fired candidates in one batch, then build signal dicts
+        scores = self._score_fired(view, fired)
+        for (i, symbol, current_row, signal_type), score in zip(fired, scores):
+            row_data = SignalRow.from_series(view.data, view.current_pos[i], current_row)
+            signal = self._build_signal(symbol, current_row, signal_type, target_date, score, row_data)
             
             if signal_type == 'buy':
                 buy_signals.append(signal)
@@ -331,6 +569,157 @@ class BaseSignal(ABC):
             'all_sell_signals': all_sell_signals  # All signals before filtering
         }
     
+    def _build_signal(
+        self,
+        symbol: str,
+        current_row: pd.Series,
+        signal_type: str,
+        target_date: Optional[datetime] = None,
+        score: Optional[Dict] = None,
+        row_data: Optional[SignalRow] = None
+    ) -> Dict:
+        """
+        Score a fired entry and build its signal dictionary.
+        
+        Args:
+            symbol: ICE Connect symbol
+            current_row: Current row of data (with entry metadata attached)
+            signal_type: 'buy' or 'sell'
+            target_date: Target date for analysis (None = most recent)
+            score: Row of PointCalculator.score_candidates (None = score this row on its own)
+            row_data: SignalRow referencing current_row in the shared frame
+                      (None = store a full copy of current_row)
+        
+        Returns:
+            Signal dictionary
+        """
+        # Get base points
+        base_points = self.get_base_points(current_row, signal_type)
+        
+        if score is None:
+            score = self._score_row(symbol, current_row, signal_type, target_date)
+        
+        total_points = base_points + score['confluence_bonus'] + score['tenor_liquidity_bonus'] - score['exhaustion_penalty']
+        
+        # Calculate stop/target
+        stop_target = self.calculate_stop_target(current_row, signal_type)
+        
+        # Calculate position size
+        pos_pct = self.calculate_position_size(current_row)
+        
+        # Calculate duration (days since entry)
+        entry_date = current_row.get('Date')
+        if pd.isna(entry_date):
+            duration = 0
+        else:
+            if isinstance(entry_date, str):
+                entry_date = pd.to_datetime(entry_date)
+            duration = (datetime.now().date() - entry_date.date()).days if target_date is None else 0
+        
+        # Create signal dictionary
+        signal = {
+            'symbol': symbol,
+            'signal_type': signal_type,
+            'entry_date': entry_date,
+            'entry_price': current_row.get('close'),
+            'stop': stop_target['stop'],
+            'target': stop_target['target'],
+            'stop_pct': stop_target['stop_pct'],
+            'target_pct': stop_target['target_pct'],
+            'atr': stop_target['atr'],
+            'pos_pct': pos_pct,
+            'points': total_points,
+            'base_points': base_points,
+            'confluence_bonus': score['confluence_bonus'],
+            'confluence_breakdown': score['confluence_breakdown'],
+            'tenor_liquidity_bonus': score['tenor_liquidity_bonus'],
+            'tenor_liquidity_breakdown': score['tenor_liquidity_breakdown'],
+            'exhaustion_penalty': score['exhaustion_penalty'],
+            'exhaustion_penalty_breakdown': score['exhaustion_penalty_breakdown'],
+            'alignment_score': score['alignment_score'],
+            'duration': duration,
+            'is_fallback': False,  # Will be set to True for fallback signals
+            'was_active_prior_week': False,  # Will be set by prior_week_checker
+            'row_data': row_data if row_data is not None else current_row.to_dict()  # Row for later use (read lazily)
+        }
+        # Add strategy name to row_data for easier lookup
+        signal['row_data']['strategy_name'] = self.get_strategy_name()
+        
+        return signal
+    
+    def _score_fired(self, view: SignalView, fired: List[Tuple[int, str, pd.Series, str]]) -> List[Dict]:
+        """
+        Batch-score fired candidates with PointCalculator.score_candidates.
+        
+        Args:
+            view: SignalView the candidates came from
+            fired: List of (view position, symbol, current_row, signal_type)
+        
+        Returns:
+            One score dictionary per fired candidate
+        """
+        if not fired:
+            return []
+        
+        positions = view.current_pos[[i for i, _, _, _ in fired]]
+        frame = view.data.iloc[positions].reset_index(drop=True)
+        # Add metadata attached by detect_entry_condition (e.g. '_exhaustion_*' flags)
+        rows = [current_row for _, _, current_row, _ in fired]
+        extra_columns = list(dict.fromkeys(key for row in rows for key in row.index if key not in frame.columns))
+        if extra_columns:
+            metadata = pd.DataFrame({key: [row.get(key) for row in rows] for key in extra_columns})
+            frame = pd.concat([frame, metadata], axis=1)
+        signal_types = pd.Series([signal_type for _, _, _, signal_type in fired])
+        scores = self.point_calculator.score_candidates(frame, self.get_strategy_name(), signal_types, view.target_date)
+        return scores.to_dict('records')
+    
+    def _score_row(
+        self,
+        symbol: str,
+        current_row: pd.Series,
+        signal_type: str,
+        target_date: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Score a single candidate with the row-wise PointCalculator methods (reference path).
+        
+        Returns:
+            Score dictionary with the same keys as PointCalculator.score_candidates
+        """
+        # Calculate confluence bonuses
+        is_spread = current_row.get('is_outright', True) == False
+        confluence = self.point_calculator.calculate_confluence_bonuses(
+            current_row,
+            self.get_strategy_name(),
+            signal_type,
+            is_spread
+        )
+        
+        # Calculate tenor/liquidity bonus
+        # Note: was_active_prior_week will be set later by prior_week_checker, but we pass it if it exists
+        was_active_prior_week = current_row.get('was_active_prior_week', False)
+        tenor_liquidity = self.point_calculator.calculate_tenor_liquidity_bonus(
+            {'symbol': symbol, 'row_data': current_row.to_dict(), 'was_active_prior_week': was_active_prior_week},
+            target_date
+        )
+        
+        # Calculate trend exhaustion penalty (applies to trend_following and enhanced_trend_following)
+        exhaustion_penalty = self.point_calculator.calculate_trend_exhaustion_penalty(
+            current_row,
+            self.get_strategy_name(),
+            signal_type
+        )
+        
+        return {
+            'confluence_bonus': confluence['total_bonus'],
+            'confluence_breakdown': confluence['breakdown'],
+            'alignment_score': confluence['alignment_score'],
+            'tenor_liquidity_bonus': tenor_liquidity['total_bonus'],
+            'tenor_liquidity_breakdown': tenor_liquidity['breakdown'],
+            'exhaustion_penalty': exhaustion_penalty['total_penalty'],
+            'exhaustion_penalty_breakdown': exhaustion_penalty['breakdown']
+        }
+    
     def _filter_and_rank_with_fallback(self, signals: List[Dict]) -> List[Dict]:
         """
         Filter and rank signals by points, with fallback to show top 1 if no qualified signals.
@@ -347,8 +736,8 @@ class BaseSignal(ABC):
         
         logger.info(f"Generated {len(signals)} signals for {self.get_strategy_name()} before filtering")
         
-        # Sort by points (descending)
-        signals_sorted = sorted(signals, key=lambda x: x['points'], reverse=True)
+        # Sort by points (descending), ties by symbol so the ranking does not depend on row order
+        signals_sorted = sorted(signals, key=lambda x: (-x['points'], str(x['symbol'])))
         
         # Separate qualified (>= min_points) and fallback (< min_points)
         qualified = [s for s in signals_sorted if s['points'] >= self.min_points]
@@ -92,6 +92,153 @@ class EnhancedTrendFollowingSignals(BaseSignal):
         
         return (signal_type, trigger_type)
     
+    def detect_entry_mask(self, frame: pd.DataFrame) -> pd.Series:
+        """
+        Column-wise version of detect_entry_condition.
+        
+        Evaluates every enabled trigger per direction, keeps the highest-scoring
+        trigger per row (first in trigger order on ties, like max()), then applies
+        the confirmations for that trigger's direction.
+        
+        Args:
+            frame: Current bar per symbol with 'prev_' columns
+        
+        Returns:
+            Boolean Series, True where a confirmed trigger fired
+        """
+        strategy_config = self.config['strategies']['enhanced_trend_following']
+        triggers_config = strategy_config.get('entry_triggers', {})
+        enabled = triggers_config.get('enabled', {})
+        base_points_config = triggers_config.get('base_points', {})
+        has_previous = frame['_has_previous']
+        
+        triggers = []
+        
+        # 1. EMA Crossover
+        if enabled.get('ema_crossover', True):
+            ema_config = triggers_config.get('ema_crossover', {})
+            fast_ema_col = ema_config.get('fast_ema', 'ema_20')
+            slow_ema_col = ema_config.get('slow_ema', 'ema_50')
+            price = self._entry_column(frame, 'close')
+            fast_ema = self._entry_column(frame, fast_ema_col)
+            slow_ema = self._entry_column(frame, slow_ema_col)
+            prev_price = self._entry_column(frame, 'close', previous=True)
+            prev_fast_ema = self._entry_column(frame, fast_ema_col, previous=True)
+            prev_slow_ema = self._entry_column(frame, slow_ema_col, previous=True)
+            valid = slow_ema.notna() & prev_slow_ema.notna()
+            buy = valid & (prev_price <= prev_fast_ema) & (price > fast_ema) & (fast_ema > slow_ema)
+            sell = valid & (prev_price >= prev_fast_ema) & (price < fast_ema) & (fast_ema < slow_ema)
+            triggers.append(('ema_crossover', buy, sell & ~buy))
+        
+        # 2. Supertrend
+        if enabled.get('supertrend', True):
+            direction = self._supertrend_state(frame, 'supertrend_direction')
+            prev_direction = self._supertrend_state(frame, 'prev_supertrend_direction')
+            valid = direction['valid'] & prev_direction['valid'] & has_previous
+            buy = valid & ~prev_direction['up'] & direction['up']
+            sell = valid & ~prev_direction['down'] & direction['down']
+            triggers.append(('supertrend', buy, sell & ~buy))
+        
+        # 3. MACD Cross
+        if enabled.get('macd_cross', True):
+            macd_line = self._entry_column(frame, 'macd_line')
+            macd_signal = self._entry_column(frame, 'macd_signal')
+            prev_macd_line = self._entry_column(frame, 'macd_line', previous=True)
+            prev_macd_signal = self._entry_column(frame, 'macd_signal', previous=True)
+            buy = (prev_macd_line < prev_macd_signal) & (macd_line > macd_signal)
+            sell = (prev_macd_line > prev_macd_signal) & (macd_line < macd_signal)
+            triggers.append(('macd_cross', buy, sell & ~buy))
+        
+        # 4. Aroon Strong Trend
+        if enabled.get('aroon_strong', True):
+            threshold = triggers_config.get('aroon_strong', {}).get('oscillator_threshold', 50)
+            aroon_osc = self._entry_column(frame, 'aroon_oscillator')
+            buy = (aroon_osc > threshold) & self._truthy_column(frame, 'aroon_strong_uptrend')
+            sell = (aroon_osc < -threshold) & self._truthy_column(frame, 'aroon_strong_downtrend')
+            triggers.append(('aroon_strong', buy, sell & ~buy))
+        
+        # Highest base points wins; strict '>' keeps the first trigger on ties
+        fired = pd.Series(False, index=frame.index)
+        is_buy = pd.Series(False, index=frame.index)
+        best_points = pd.Series(-np.inf, index=frame.index)
+        for trigger_type, buy, sell in triggers:
+            points = base_points_config.get(trigger_type, 0)
+            better = (buy | sell) & (~fired | (points > best_points))
+            is_buy = is_buy.mask(better, buy)
+            best_points = best_points.mask(better, points)
+            fired = fired | better
+        
+        confirmed_buy = self._confirmations_mask(frame, 'buy', strategy_config.get('confirmations', {}))
+        confirmed_sell = self._confirmations_mask(frame, 'sell', strategy_config.get('confirmations', {}))
+        return fired & ((is_buy & confirmed_buy) | (~is_buy & confirmed_sell))
+    
+    @staticmethod
+    def _supertrend_state(frame: pd.DataFrame, column: str) -> Dict[str, pd.Series]:
+        """Column-wise supertrend direction parsing (same string matching as _check_supertrend)."""
+        if column not in frame.columns:
+            missing = pd.Series(False, index=frame.index)
+            return {'valid': missing, 'up': missing, 'down': missing}
+        values = frame[column]
+        text = values.astype(str).str.lower()
+        return {
+            'valid': values.notna(),
+            'up': text.isin(['up', '1', 'true', 'buy']),
+            'down': text.isin(['down', '0', 'false', 'sell'])
+        }
+    
+    @staticmethod
+    def _truthy_column(frame: pd.DataFrame, column: str) -> pd.Series:
+        """Column-wise truthiness of row.get(column, False)."""
+        if column not in frame.columns:
+            return pd.Series(False, index=frame.index)
+        values = frame[column]
+        if pd.api.types.is_numeric_dtype(values):
+            return values.ne(0)
+        return values.map(bool).astype(bool)
+    
+    def _confirmations_mask(self, frame: pd.DataFrame, signal_type: str, confirmations_config: Dict) -> pd.Series:
+        """
+        Column-wise version of _check_confirmations.
+        
+        Args:
+            frame: Current bar per symbol
+            signal_type: 'buy' or 'sell'
+            confirmations_config: Configuration dictionary for confirmations
+        
+        Returns:
+            Boolean Series, True where all required confirmations pass
+        """
+        required = confirmations_config.get('required', {})
+        passed = pd.Series(True, index=frame.index)
+        
+        if required.get('adx_strong', True):
+            min_adx = confirmations_config.get('adx_strong', {}).get('min_adx', 25)
+            passed &= self._entry_column(frame, 'adx') >= min_adx
+        
+        if required.get('di_alignment', True):
+            di_plus = self._entry_column(frame, 'di_plus')
+            di_minus = self._entry_column(frame, 'di_minus')
+            passed &= (di_plus > di_minus) if signal_type == 'buy' else (di_minus > di_plus)
+        
+        momentum_required = confirmations_config.get('momentum_required', 2)
+        momentum_config = confirmations_config.get('momentum_indicators', {})
+        momentum_aligned = pd.Series(0, index=frame.index)
+        
+        if momentum_config.get('rsi_aligned', True):
+            rsi = self._entry_column(frame, 'rsi')
+            momentum_aligned += ((rsi > 50) if signal_type == 'buy' else (rsi < 50)).astype(int)
+        
+        if momentum_config.get('macd_histogram_aligned', True):
+            macd_hist = self._entry_column(frame, 'macd_histogram')
+            momentum_aligned += ((macd_hist > 0) if signal_type == 'buy' else (macd_hist < 0)).astype(int)
+        
+        if momentum_config.get('stochastic_aligned', True):
+            stoch_k = self._entry_column(frame, 'stoch_k')
+            stoch_d = self._entry_column(frame, 'stoch_d')
+            momentum_aligned += ((stoch_k > stoch_d) if signal_type == 'buy' else (stoch_k < stoch_d)).astype(int)
+        
+        return passed & (momentum_aligned >= momentum_required)
+    
     def _check_ema_crossover(self, row: pd.Series, prev_row: Optional[pd.Series], ema_config: Dict) -> Optional[Tuple[str, str]]:
         """Check EMA crossover trigger."""
         if prev_row is None:
@@ -5,20 +5,27 @@ Formats signals into ICE Chat format with delta-sized quantities for spreads.
 import pandas as pd
 import numpy as np
 import re
+import threading
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 import logging
 from datetime import datetime
 
-# Import curve loader function at module level
+logger = logging.getLogger(__name__)
+
+# Import curve store at module level
 try:
-    from data_loaders.curve_loader import get_leg_price_from_curve
+    from data_loaders.curve_store import CurveStore
 except ImportError:
     # Fallback if import fails (e.g., during testing)
-    get_leg_price_from_curve = None
-    logger.warning("Could not import get_leg_price_from_curve from curve_loader. Delta sizing may use fallback prices.")
+    CurveStore = None
+    logger.warning("Could not import CurveStore from curve_store. Delta sizing may use fallback prices.")
 
-logger = logging.getLogger(__name__)
+# Shared symbol parser (root, month code, quarterly components)
+try:
+    from ..data_loaders.ice_symbol import IceSymbol
+except ImportError:
+    from data_loaders.ice_symbol import IceSymbol
 
 # Month code to name mapping (for display)
 MONTH_MAP = {
@@ -73,7 +80,8 @@ class ICEChatFormatter:
         Args:
             config: Configuration dictionary
             symbol_matrix_path: Path to symbol_matrix.csv (default: lists_and_matrix/symbol_matrix.csv)
-            curve_data: Curve price data from CurveBuilder (for delta sizing)
+            curve_data: Curve price data from CurveBuilder (for delta sizing): a CurveStore
+                        or the load_curve_prices dict
             prepared_df: Prepared DataFrame with close prices (fallback for price lookup)
         """
         self.config = config
@@ -94,8 +102,9 @@ class ICEChatFormatter:
         self.min_volumes = min_volumes.copy()
         self.min_volumes.pop('comment', None)  # Remove comment if present
         
-        # Store curve data and prepared_df for delta sizing
-        self.curve_data = curve_data or {}
+        # Store curve data (indexed, shared with the report) and prepared_df for delta sizing
+        self.curve_store = CurveStore.coerce(curve_data) if CurveStore is not None else None
+        self.curve_data = self.curve_store.as_dict() if self.curve_store is not None else (curve_data or {})
         self.prepared_df = prepared_df
         self.data_date = data_date  # Store data_date for year inference
         
@@ -106,7 +115,17 @@ class ICEChatFormatter:
         
         self.symbol_matrix_path = Path(symbol_matrix_path)
         self.symbol_matrix = None
+        self._symbol_rows = {}
         self._load_symbol_matrix()
+        
+        # prepared_df close prices in $/usg by exact symbol and by (root, month) for the leg price fallback
+        self._exact_leg_prices, self._contract_leg_prices = self._build_leg_price_index(prepared_df)
+        
+        # Formatted signals for this run, shared by the HTML report, ICE Connect file and AI payloads
+        self._formatted_signals = {}
+        self._format_cache_hits = 0
+        self._format_cache_misses = 0
+        self._format_cache_lock = threading.Lock()
     
     def _load_symbol_matrix(self):
         """Load symbol matrix CSV."""
@@ -114,6 +133,12 @@ class ICEChatFormatter:
             if self.symbol_matrix_path.exists():
                 self.symbol_matrix = pd.read_csv(self.symbol_matrix_path, low_memory=False)
                 logger.info(f"Loaded symbol matrix: {len(self.symbol_matrix)} rows")
+                # Row position of each ice_symbol (first occurrence) for _get_symbol_metadata
+                if 'ice_symbol' in self.symbol_matrix.columns:
+                    ice_symbols = self.symbol_matrix['ice_symbol']
+                    first = ice_symbols.notna() & ~ice_symbols.duplicated()
+                    positions = np.flatnonzero(first.to_numpy())
+                    self._symbol_rows = dict(zip(ice_symbols.to_numpy()[positions].tolist(), positions.tolist()))
             else:
                 logger.warning(f"Symbol matrix not found: {self.symbol_matrix_path}")
                 self.symbol_matrix = pd.DataFrame()
@@ -126,10 +151,10 @@ class ICEChatFormatter:
         if self.symbol_matrix is None or len(self.symbol_matrix) == 0:
             return {}
         
-        # Try exact match first
-        match = self.symbol_matrix[self.symbol_matrix['ice_symbol'] == symbol]
-        if len(match) > 0:
-            row = match.iloc[0]
+        # Exact match (indexed at load)
+        position = self._symbol_rows.get(symbol) if isinstance(symbol, str) else None
+        if position is not None:
+            row = self.symbol_matrix.iloc[position]
             return {
                 'product': row.get('product', ''),
                 'location': row.get('location', ''),
@@ -157,8 +182,7 @@ class ICEChatFormatter:
         if symbol.startswith('='):
             return None  # Formula, not a single month
         
-        match = re.search(r'%[A-Z]+ ([FGHJKMNQUVXZ])!', symbol)
-        return match.group(1) if match else None
+        return IceSymbol.parse(symbol).month
     
     def _format_date(self, symbol: str, metadata: Dict) -> str:
         """Format date string for symbol (month or quarter)."""
@@ -308,19 +332,60 @@ class ICEChatFormatter:
         Returns:
             Formatted ICE Chat message string
         """
+        return self.format_signal(signal)['message']
+    
+    def format_signal(self, signal: Dict) -> Dict:
+        """
+        ICE Chat message with its legs and quantities, formatted once per signal.
+        
+        Results are cached for the run by (symbol, signal_type, pos_pct, data_date),
+        so the HTML report, the ICE Connect file and the AI payload share one
+        metadata lookup, date format and delta sizing per signal.
+        
+        Args:
+            signal: Signal dictionary with symbol, signal_type, pos_pct
+        
+        Returns:
+            Dictionary with 'message', 'legs' (leg symbols, in message order) and
+            'quantities' (e.g. '13kb', '10kb per mo', one per leg); do not modify
+        """
         symbol = signal.get('symbol', '')
         signal_type = signal.get('signal_type', 'buy')
+        key = (symbol, signal_type, signal.get('pos_pct', 0), self.data_date)
+        formatted = self._formatted_signals.get(key)
+        if formatted is not None:
+            with self._format_cache_lock:
+                self._format_cache_hits += 1
+            return formatted
+        
         metadata = self._get_symbol_metadata(symbol)
         
         is_spread = metadata.get('is_spread', False)
         
         if is_spread:
-            return self._format_spread_message(signal, metadata)
+            formatted = self._format_spread_message(signal, metadata)
         else:
-            return self._format_outright_message(signal, metadata)
+            formatted = self._format_outright_message(signal, metadata)
+        with self._format_cache_lock:
+            self._format_cache_misses += 1
+            return self._formatted_signals.setdefault(key, formatted)
+    
+    def format_cache_stats(self) -> Dict:
+        """
+        Hit/miss counts of the formatted-signal cache (for run metrics).
+        
+        Returns:
+            Dictionary with 'hits', 'misses' and 'entries'
+        """
+        with self._format_cache_lock:
+            return {
+                'hits': self._format_cache_hits,
+                'misses': self._format_cache_misses,
+                'entries': len(self._formatted_signals)
+            }
     
-    def _format_outright_message(self, signal: Dict, metadata: Dict) -> str:
-        """Format ICE Chat message for outright."""
+    def _format_outright_message(self, signal: Dict, metadata: Dict) -> Dict:
+        """Format ICE Chat message for outright (format_signal record)."""
         symbol = signal.get('symbol', '')
         signal_type = signal.get('signal_type', 'buy')
         pos_pct = signal.get('pos_pct', 0)
@@ -356,7 +421,7 @@ class ICEChatFormatter:
         else:
             message = f"ICE Chat: What can I {action} {quantity} {product_name} in {date_str}?"
         
-        return message.strip()
+        return {'message': message.strip(), 'legs': (symbol,), 'quantities': (quantity,)}
     
     def _calculate_quantity(self, pos_pct: float, is_quarterly: bool = False, is_spread: bool = False, symbol_root: str = '') -> str:
         """
@@ -502,6 +567,76 @@ class ICEChatFormatter:
                 return 30  # Minimum 10kb per mo × 3 = 30kb total
             return round(total_quantity / 3) * 3
     
+    def _build_leg_price_index(self, prepared_df: Optional[pd.DataFrame]) -> Tuple[Dict, Dict]:
+        """
+        Index prepared_df close prices in $/usg for the leg price fallback.
+        
+        Pulled series are already in $/usg (the pull converts outrights and
+        the formulas carry their divisor); plain contract rows ('%AFE F!-IEU')
+        are native and divided by the symbol matrix's convert_to_$usg.
+        
+        Args:
+            prepared_df: Prepared DataFrame with a symbol column and 'close'
+        
+        Returns:
+            Tuple of ({symbol: price}, {(root, month_code): price}); the exact
+            index also has converted formulas under their unconverted form (the
+            spread symbol_1/symbol_2 form), the (root, month) index only
+            single-contract outright rows. First row with a valid close wins.
+        """
+        exact, by_contract = {}, {}
+        if prepared_df is None or len(prepared_df) == 0 or 'close' not in prepared_df.columns:
+            return exact, by_contract
+        symbol_col = next((col for col in ['ice_connect_symbol', 'Symbol', 'symbol', 'ice_symbol']
+                           if col in prepared_df.columns), None)
+        if symbol_col is None:
+            return exact, by_contract
+        
+        symbols = prepared_df[symbol_col]
+        closes = pd.to_numeric(prepared_df['close'], errors='coerce').to_numpy(dtype=float)
+        valid = np.isfinite(closes) & (closes > 0) & symbols.notna().to_numpy()
+        first = ~symbols.duplicated().to_numpy()
+        for symbol, close, is_first in zip(symbols.to_numpy()[valid].tolist(), closes[valid].tolist(), first[valid].tolist()):
+            parsed = IceSymbol.parse(symbol)
+            if parsed.root is None:
+                continue
+            if not parsed.is_formula:
+                close = close / (self._conversion_divisor(self._get_symbol_metadata(symbol).get('convert_to_$usg')) or 1.0)
+            if is_first:
+                exact.setdefault(symbol, close)
+                if parsed.is_formula and parsed.divisor != 1.0 and not parsed.is_spread:
+                    exact.setdefault(symbol[:symbol.rindex('/')], close)
+            if len(parsed.legs) == 1 and not parsed.is_spread:
+                by_contract.setdefault((parsed.root, parsed.month), close)
+        logger.debug(f"Leg price index: {len(exact)} symbols, {len(by_contract)} contracts from prepared_df")
+        return exact, by_contract
+    
+    @staticmethod
+    def _conversion_divisor(convert_factor) -> Optional[float]:
+        """Divisor of a convert_to_$usg value ('/521' or 521.0 -> 521.0; 'n/a', NaN or invalid -> None)."""
+        if isinstance(convert_factor, str):
+            if not convert_factor.startswith('/'):
+                return None
+            try:
+                return float(convert_factor[1:])
+            except ValueError:
+                return None
+        if isinstance(convert_factor, (int, float)) and convert_factor > 0:
+            return float(convert_factor)
+        return None
+    
+    def get_leg_prices(self, symbols) -> np.ndarray:
+        """
+        Leg prices in $/usg for many symbols (curve data, then the prepared_df index).
+        
+        Args:
+            symbols: ICE leg symbols (outrights or quarterly formulas)
+        
+        Returns:
+            float ndarray (NaN where no price is available)
+        """
+        return np.array([self._get_leg_price(symbol, self._get_symbol_metadata(symbol)) for symbol in symbols], dtype=float)
+    
     def _get_leg_price(self, symbol: str, metadata: Dict) -> Optional[float]:
         """
         Get price for a leg from curve data or prepared_df, converted to $/usg.
@@ -513,17 +648,16 @@ class ICEChatFormatter:
         Returns:
             Price in $/usg (dollars per US gallon), or None if unavailable
         """
-        # Use imported function (imported at module level)
-        if get_leg_price_from_curve is None:
-            logger.debug(f"_get_leg_price: get_leg_price_from_curve is None")
+        # Use imported store (imported at module level)
+        if self.curve_store is None:
+            logger.debug(f"_get_leg_price: CurveStore is not available")
             return None
         
         # Try curve data first
-        if self.curve_data:
+        if self.curve_store:
             # Extract root code
-            root_match = re.search(r'%([A-Z]+)', symbol)
-            if root_match:
-                root_code = root_match.group(1).upper()
+            root_code = IceSymbol.parse(symbol).root
+            if root_code:
                 
                 # For quarterlies, average component month prices
                 if metadata.get('quarter_numb') == 'Y':
@@ -532,10 +666,12 @@ class ICEChatFormatter:
                         # Parse component symbols (e.g., '%PRN J!-IEU,%PRN K!-IEU,%PRN M!-IEU')
                         comp_symbols = [s.strip() for s in str(component_symbols).split(',') if s.strip().startswith('%')]
                         prices = []
-                        for comp_sym in comp_symbols[:3]:  # Take first 3 months
-                            # Get price and apply conversion for each component
-                            price = get_leg_price_from_curve(comp_sym, self.curve_data)
-                            if price is not None:
+                        comp_symbols = comp_symbols[:3]  # Take first 3 months
+                        comp_prices = self.curve_store.leg_prices(comp_symbols)
+                        for comp_sym, price in zip(comp_symbols, comp_prices):
+                            # Apply conversion for each component
+                            if not np.isnan(price):
+                                price = float(price)
                                 # Get metadata for component symbol to apply conversion
                                 comp_meta = self._get_symbol_metadata(comp_sym)
                                 convert_factor = comp_meta.get('convert_to_$usg', metadata.get('convert_to_$usg', 'n/a'))
@@ -572,7 +708,7 @@ class ICEChatFormatter:
                     except:
                         pass
                 
-                price = get_leg_price_from_curve(symbol, self.curve_data, year=year)
+                price = self.curve_store.leg_price(symbol, year=year)
                 if price is not None:
                     # Apply conversion to $/usg if needed
                     convert_factor = metadata.get('convert_to_$usg', 'n/a')
@@ -599,80 +735,16 @@ class ICEChatFormatter:
                     logger.debug(f"_get_leg_price: {symbol} not found in curve_data (root={root_code})")
         
         # Fallback to prepared_df if available - this is critical for delta sizing
-        if self.prepared_df is not None and len(self.prepared_df) > 0:
-            # Try different possible column names for symbol
-            symbol_col = None
-            for col in ['ice_connect_symbol', 'Symbol', 'symbol', 'ice_symbol']:
-                if col in self.prepared_df.columns:
-                    symbol_col = col
-                    break
-            
-            if symbol_col:
-                # Try exact match first
-                symbol_data = self.prepared_df[self.prepared_df[symbol_col] == symbol]
-                if len(symbol_data) > 0:
-                    close_price = symbol_data.iloc[0].get('close')
-                    if pd.notna(close_price) and close_price > 0:
-                        # Apply conversion to $/usg if needed (prepared_df prices are already in native units)
-                        convert_factor = metadata.get('convert_to_$usg', 'n/a')
-                        if convert_factor and convert_factor != 'n/a' and convert_factor != '' and not pd.isna(convert_factor):
-                            try:
-                                # Parse conversion factor (e.g., "/521" or "/42" or already a float like 521.0)
-                                if isinstance(convert_factor, str) and convert_factor.startswith('/'):
-                                    divisor = float(convert_factor[1:])
-                                    close_price = close_price / divisor
-                                    logger.debug(f"_get_leg_price: {symbol} = {close_price:.4f} $/usg from prepared_df (converted using {convert_factor})")
-                                elif isinstance(convert_factor, (int, float)) and not pd.isna(convert_factor) and convert_factor > 0:
-                                    # Already a numeric divisor
-                                    close_price = close_price / float(convert_factor)
-                                    logger.debug(f"_get_leg_price: {symbol} = {close_price:.4f} $/usg from prepared_df (converted using divisor {convert_factor})")
-                                else:
-                                    # Only warn if it's not NaN (NaN is expected for symbols that don't need conversion)
-                                    if not pd.isna(convert_factor):
-                                        logger.warning(f"_get_leg_price: Unexpected conversion format: {convert_factor} (type: {type(convert_factor)})")
-                            except (ValueError, TypeError) as e:
-                                logger.warning(f"_get_leg_price: Error parsing conversion factor {convert_factor}: {e}")
-                        else:
-                            logger.debug(f"_get_leg_price: {symbol} = {close_price} $/usg from prepared_df (exact match, no conversion)")
-                        return float(close_price)
-                
-                # If no exact match, try to find by root code and month
-                # Extract root and month from symbol
-                root_match = re.search(r'%([A-Z]+)', symbol)
-                month_match = re.search(r'%[A-Z]+\s+([FGHJKMNQUVXZ])!', symbol)
-                if root_match and month_match:
-                    root_code = root_match.group(1).upper()
-                    month_code = month_match.group(1)
-                    # Look for symbols that match this root and month
-                    # Pattern: %ROOT MONTH! or %ROOT MONTH!-EXCHANGE
-                    pattern = rf'%{root_code}\s+{month_code}!'
-                    for idx, row in self.prepared_df.iterrows():
-                        row_symbol = str(row.get(symbol_col, ''))
-                        if re.search(pattern, row_symbol):
-                            close_price = row.get('close')
-                            if pd.notna(close_price) and close_price > 0:
-                                # Apply conversion to $/usg if needed (prepared_df prices are already in native units)
-                                convert_factor = metadata.get('convert_to_$usg', 'n/a')
-                                if convert_factor and convert_factor != 'n/a' and convert_factor != '' and not pd.isna(convert_factor):
-                                    try:
-                                        # Parse conversion factor (e.g., "/521" or "/42" or already a float like 521.0)
-                                        if isinstance(convert_factor, str) and convert_factor.startswith('/'):
-                                            divisor = float(convert_factor[1:])
-                                            close_price = close_price / divisor
-                                            logger.debug(f"_get_leg_price: {symbol} ≈ {row_symbol} = {close_price:.4f} $/usg from prepared_df (pattern match, converted using {convert_factor})")
-                                        elif isinstance(convert_factor, (int, float)) and not pd.isna(convert_factor) and convert_factor > 0:
-                                            # Already a numeric divisor
-                                            close_price = close_price / float(convert_factor)
-                                            logger.debug(f"_get_leg_price: {symbol} ≈ {row_symbol} = {close_price:.4f} $/usg from prepared_df (pattern match, converted using divisor {convert_factor})")
-                                        else:
-                                            # Only warn if it's not NaN (NaN is expected for symbols that don't need conversion)
-                                            if not pd.isna(convert_factor):
-                                                logger.warning(f"_get_leg_price: Unexpected conversion format: {convert_factor} (type: {type(convert_factor)})")
-                                    except (ValueError, TypeError) as e:
-                                        logger.warning(f"_get_leg_price: Error parsing conversion factor {convert_factor}: {e}")
-                                else:
-                                    logger.debug(f"_get_leg_price: {symbol} ≈ {row_symbol} = {close_price} $/usg from prepared_df (pattern match, no conversion)")
-                                return float(close_price)
+        # (index built at construction: exact symbol, then (root, month) of an outright row)
+        price = self._exact_leg_prices.get(symbol)
+        if price is not None:
+            logger.debug(f"_get_leg_price: {symbol} = {price:.4f} $/usg from prepared_df (exact match)")
+            return price
+        parsed = IceSymbol.parse(symbol)
+        price = self._contract_leg_prices.get((parsed.root, parsed.month))
+        if price is not None:
+            logger.debug(f"_get_leg_price: {symbol} ≈ %{parsed.root} {parsed.month}! = {price:.4f} $/usg from prepared_df (root/month match)")
+            return price
         
         # Log why price wasn't found
         if not self.curve_data:
@@ -720,16 +792,16 @@ class ICEChatFormatter:
                 logger.debug(f"Enriched meta_2 from spread: quarterly={meta_2['quarter_numb']}")
         
         # Extract root codes - handle quarterly formulas (may contain ((('%ROOT... pattern)
-        # Try regex pattern first (works for both =((('%ROOT... and ((('%ROOT... patterns)
+        # Parsed root of the first contract (works for both =((('%ROOT... and ((('%ROOT... patterns)
+        parsed_1 = IceSymbol.parse(symbol_1)
+        parsed_2 = IceSymbol.parse(symbol_2)
         if symbol_1:
-            root_match = re.search(r"%([A-Z]+)\s+[FGHJKMNQUVXZ]!", symbol_1)
-            root_1 = root_match.group(1) if root_match else symbol_1.lstrip('%').split()[0]
+            root_1 = parsed_1.root if parsed_1.legs else symbol_1.lstrip('%').split()[0]
         else:
             root_1 = ''
         
         if symbol_2:
-            root_match = re.search(r"%([A-Z]+)\s+[FGHJKMNQUVXZ]!", symbol_2)
-            root_2 = root_match.group(1) if root_match else symbol_2.lstrip('%').split()[0]
+            root_2 = parsed_2.root if parsed_2.legs else symbol_2.lstrip('%').split()[0]
         else:
             root_2 = ''
         
@@ -896,10 +968,10 @@ class ICEChatFormatter:
                 other_root = other_root_initial
                 logger.debug(f"Using initial other_root='{other_root}' from base leg selection")
             elif other_symbol:
-                # Try regex pattern (works for both =((('%ROOT... and ((('%ROOT... patterns)
-                root_match = re.search(r"%([A-Z]+)\s+[FGHJKMNQUVXZ]!", other_symbol)
-                if root_match:
-                    other_root = root_match.group(1)
+                # Parsed root of the first contract (works for both =((('%ROOT... and ((('%ROOT... patterns)
+                parsed_other = IceSymbol.parse(other_symbol)
+                if parsed_other.legs:
+                    other_root = parsed_other.root
                     logger.debug(f"Extracted other_root='{other_root}' from quarterly formula: {other_symbol[:50]}...")
                 else:
                     # Fallback: simple extraction for regular symbols
@@ -1040,8 +1112,8 @@ class ICEChatFormatter:
         
         return (qty_1, qty_2)
     
-    def _format_spread_message(self, signal: Dict, metadata: Dict) -> str:
-        """Format ICE Chat message for spread."""
+    def _format_spread_message(self, signal: Dict, metadata: Dict) -> Dict:
+        """Format ICE Chat message for spread (format_signal record)."""
         signal_type = signal.get('signal_type', 'buy')
         pos_pct = signal.get('pos_pct', 0)
         
@@ -1097,15 +1169,15 @@ class ICEChatFormatter:
         if symbol_1 and symbol_1.startswith('='):
             # Quarterly formula - extract root from first component symbol
             # Pattern: =((('%ROOT MONTH!-EXCHANGE')+...
-            root_match = re.search(r"%([A-Z]+)\s+[FGHJKMNQUVXZ]!", symbol_1)
-            root_1 = root_match.group(1) if root_match else ''
+            parsed = IceSymbol.parse(symbol_1)
+            root_1 = parsed.root if parsed.legs else ''
         else:
             root_1 = symbol_1.lstrip('%').split()[0] if symbol_1 else ''
         
         if symbol_2 and symbol_2.startswith('='):
             # Quarterly formula - extract root from first component symbol
-            root_match = re.search(r"%([A-Z]+)\s+[FGHJKMNQUVXZ]!", symbol_2)
-            root_2 = root_match.group(1) if root_match else ''
+            parsed = IceSymbol.parse(symbol_2)
+            root_2 = parsed.root if parsed.legs else ''
         else:
             root_2 = symbol_2.lstrip('%').split()[0] if symbol_2 else ''
         
@@ -1150,7 +1222,7 @@ class ICEChatFormatter:
         
         message = f"ICE Chat: What can I {part_1} and {part_2}?"
         
-        return message.strip()
+        return {'message': message.strip(), 'legs': (symbol_1, symbol_2), 'quantities': (quantity_1, quantity_2)}
     
     def format_score_breakdown(self, signal: Dict) -> str:
         """
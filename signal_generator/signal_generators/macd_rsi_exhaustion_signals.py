@@ -5,10 +5,9 @@ Mean reversion system: Buy when MACD or RSI exhausted to downside, Sell when exh
 import pandas as pd
 import numpy as np
 from typing import Optional, Dict, List
-from datetime import datetime
 import logging
 
-from .base_signal import BaseSignal
+from .base_signal import BaseSignal, SignalView
 
 logger = logging.getLogger(__name__)
 
@@ -128,7 +127,7 @@ class MacdRsiExhaustionSignals(BaseSignal):
             if (percentile_ok or absolute_ok) and momentum_ok:
                 rsi_buy = True
                 logger.debug(f"RSI exhaustion BUY for {row.get('ice_connect_symbol', 'unknown')}: "
-                           f"percentile={rsi_percentile:.1f if not pd.isna(rsi_percentile) else 'N/A'}, "
+                           f"percentile={'N/A' if pd.isna(rsi_percentile) else f'{rsi_percentile:.1f}'}, "
                            f"absolute={rsi:.1f}, momentum_up={momentum_ok}")
             
             # RSI Sell: (percentile > threshold OR absolute > threshold) AND momentum reversal down
@@ -139,7 +138,7 @@ class MacdRsiExhaustionSignals(BaseSignal):
             if (percentile_ok or absolute_ok) and momentum_ok:
                 rsi_sell = True
                 logger.debug(f"RSI exhaustion SELL for {row.get('ice_connect_symbol', 'unknown')}: "
-                           f"percentile={rsi_percentile:.1f if not pd.isna(rsi_percentile) else 'N/A'}, "
+                           f"percentile={'N/A' if pd.isna(rsi_percentile) else f'{rsi_percentile:.1f}'}, "
                            f"absolute={rsi:.1f}, momentum_down={momentum_ok}")
         
         # Store which indicators triggered in row metadata (for later use in signal dict)
@@ -156,6 +155,50 @@ class MacdRsiExhaustionSignals(BaseSignal):
         
         return None
     
+    def detect_entry_mask(self, frame: pd.DataFrame) -> pd.Series:
+        """
+        Column-wise MACD/RSI exhaustion screen (same rules as detect_entry_condition).
+        
+        Args:
+            frame: Current bar per symbol with 'prev_' columns
+        
+        Returns:
+            Boolean Series, True where MACD or RSI exhaustion fired in either direction
+        """
+        strategy_config = self.config['strategies']['macd_rsi_exhaustion']
+        entry_conditions = strategy_config.get('entry_conditions', {})
+        macd_config = entry_conditions.get('macd_exhaustion', {})
+        rsi_config = entry_conditions.get('rsi_exhaustion', {})
+        
+        # MACD exhaustion: percentile extreme AND (zero line OR crossover)
+        macd_percentile = self._entry_column(frame, 'macd_line_percentile')
+        macd_line = self._entry_column(frame, 'macd_line')
+        macd_signal = self._entry_column(frame, 'macd_signal')
+        prev_macd_line = self._entry_column(frame, 'macd_line', previous=True)
+        prev_macd_signal = self._entry_column(frame, 'macd_signal', previous=True)
+        macd_valid = macd_percentile.notna() & macd_line.notna() & macd_signal.notna()
+        
+        macd_buy = macd_valid & (macd_percentile < macd_config.get('buy', {}).get('percentile_threshold', 20)) & (
+            (macd_line < 0) | ((prev_macd_line < prev_macd_signal) & (macd_line > macd_signal))
+        )
+        macd_sell = macd_valid & (macd_percentile > macd_config.get('sell', {}).get('percentile_threshold', 80)) & (
+            (macd_line > 0) | ((prev_macd_line > prev_macd_signal) & (macd_line < macd_signal))
+        )
+        
+        # RSI exhaustion: (percentile OR absolute extreme) AND momentum reversal
+        rsi_percentile = self._entry_column(frame, 'rsi_percentile')
+        rsi = self._entry_column(frame, 'rsi')
+        prev_rsi = self._entry_column(frame, 'rsi', previous=True)
+        buy_config = rsi_config.get('buy', {})
+        sell_config = rsi_config.get('sell', {})
+        
+        rsi_buy = ((rsi_percentile < buy_config.get('percentile_threshold', 20)) |
+                   (rsi < buy_config.get('absolute_threshold', 30))) & (rsi > prev_rsi)
+        rsi_sell = ((rsi_percentile > sell_config.get('percentile_threshold', 80)) |
+                    (rsi > sell_config.get('absolute_threshold', 70))) & (rsi < prev_rsi)
+        
+        return macd_buy | macd_sell | rsi_buy | rsi_sell
+    
     def get_base_points(self, row: pd.Series, signal_type: str) -> int:
         """
         Get base points for exhaustion signal.
@@ -175,18 +218,14 @@ class MacdRsiExhaustionSignals(BaseSignal):
         """Get strategy name for configuration lookup."""
         return 'macd_rsi_exhaustion'
     
-    def generate_signals(
-        self,
-        data: pd.DataFrame,
-        target_date: Optional[datetime] = None
-    ) -> Dict[str, List[Dict]]:
+    def generate_signals_from_view(self, view: SignalView) -> Dict[str, List[Dict]]:
         """
         Generate signals and add exhaustion metadata (which indicator triggered).
         
         Overrides base class to add exhaustion indicator metadata to signals.
         """
         # Call parent to generate signals
-        signals = super().generate_signals(data, target_date)
+        signals = super().generate_signals_from_view(view)
         
         # Add exhaustion metadata to each signal
         for signal_list in [signals.get('buy_signals', []), signals.get('sell_signals', [])]:
@@ -43,6 +43,19 @@ class MeanReversionSignals(BaseSignal):
         
         return None
     
+    def detect_entry_mask(self, frame: pd.DataFrame) -> pd.Series:
+        """
+        Column-wise price percentile screen (same rule as detect_entry_condition).
+        
+        Args:
+            frame: Current bar per symbol with 'prev_' columns
+        
+        Returns:
+            Boolean Series, True where the percentile is < 25 or > 75
+        """
+        price_percentile = self._entry_column(frame, 'percentile_close')
+        return (price_percentile < 25) | (price_percentile > 75)
+    
     def get_base_points(self, row: pd.Series, signal_type: str) -> int:
         """
         Get base points for price percentile extreme.
@@ -68,6 +68,20 @@ class MovingAverageSignals(BaseSignal):
         # If price equals EMA exactly (rare), return None
         return None
     
+    def detect_entry_mask(self, frame: pd.DataFrame) -> pd.Series:
+        """
+        Column-wise price vs EMA 20 screen (same rule as detect_entry_condition).
+        
+        Args:
+            frame: Current bar per symbol with 'prev_' columns
+        
+        Returns:
+            Boolean Series, True where price is above or below the EMA
+        """
+        close = self._entry_column(frame, 'close')
+        ema = self._entry_column(frame, 'ema_20')
+        return (close > ema) | (close < ema)
+    
     def get_base_points(self, row: pd.Series, signal_type: str) -> int:
         """
         Get base points for price vs EMA cross.
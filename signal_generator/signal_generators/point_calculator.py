@@ -4,11 +4,15 @@ Calculates bonus points based on indicator alignment.
 """
 import pandas as pd
 import numpy as np
-import re
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import logging
 
+try:
+    from ..data_loaders.ice_symbol import IceSymbol
+except ImportError:
+    from data_loaders.ice_symbol import IceSymbol
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +31,8 @@ class PointCalculator:
         """
         self.config = config
         self.alignment_weights = config.get('alignment_weights', {})
+        # Contract months for batch tenor scoring (per symbol and quarterly metadata)
+        self._contract_month_cache = {}
     
     def calculate_confluence_bonuses(
         self,
@@ -393,7 +399,6 @@ class PointCalculator:
                 - total_bonus: Total bonus points (capped at max_bonus)
         """
         from datetime import datetime, timedelta
-        import re
         
         if not data_date:
             data_date = datetime.now()
@@ -516,7 +521,6 @@ class PointCalculator:
     def _is_contract_in_tenor(self, symbol: str, metadata: Dict, data_date: datetime, tenor_months: List[int]) -> bool:
         """Check if contract month is within tenor (2-6 months ahead)."""
         from datetime import datetime
-        import re
         
         if not symbol:
             return False
@@ -567,35 +571,26 @@ class PointCalculator:
                     return False
             return False
         else:
-            # Monthly: extract month code from symbol
-            month_code_map = {
-                'F': 1, 'G': 2, 'H': 3, 'J': 4, 'K': 5, 'M': 6,
-                'N': 7, 'Q': 8, 'U': 9, 'V': 10, 'X': 11, 'Z': 12
-            }
-            
-            # Extract month code (e.g., '%AFE F!-IEU' -> 'F')
-            month_match = re.search(r'%[A-Z]+\s+([FGHJKMNQUVXZ])!', symbol)
-            if month_match:
-                month_code = month_match.group(1)
-                contract_month = month_code_map.get(month_code)
-                if contract_month:
-                    # Check both same year and next year possibilities
-                    # For 2-6 months ahead from data_date, contract could be in same year or next year
-                    
-                    # Option 1: Same year contract
-                    if contract_month > data_month:
-                        months_ahead_same = contract_month - data_month
-                        if months_ahead_same in tenor_months:
-                            return True
-                    
-                    # Option 2: Next year contract (for months that wrap around)
-                    # Example: data_date = Nov 2024 (month 11), contract = Jan (month 1)
-                    # months_ahead = (12 - 11) + 1 = 2 months (Jan 2025 is 2 months from Nov 2024)
-                    months_ahead_next = (12 - data_month) + contract_month
-                    if months_ahead_next in tenor_months:
+            # Monthly: month code from symbol (e.g., '%AFE F!-IEU' -> 'F' -> 1)
+            contract_month = IceSymbol.parse(symbol).month_number
+            if contract_month:
+                # Check both same year and next year possibilities
+                # For 2-6 months ahead from data_date, contract could be in same year or next year
+                
+                # Option 1: Same year contract
+                if contract_month > data_month:
+                    months_ahead_same = contract_month - data_month
+                    if months_ahead_same in tenor_months:
                         return True
-                    
-                    return False
+                
+                # Option 2: Next year contract (for months that wrap around)
+                # Example: data_date = Nov 2024 (month 11), contract = Jan (month 1)
+                # months_ahead = (12 - 11) + 1 = 2 months (Jan 2025 is 2 months from Nov 2024)
+                months_ahead_next = (12 - data_month) + contract_month
+                if months_ahead_next in tenor_months:
+                    return True
+                
+                return False
         
         return False
     
@@ -604,13 +599,9 @@ class PointCalculator:
         if not symbol:
             return False
         
-        # Extract root code (e.g., '%AFE F!-IEU' -> 'AFE')
-        root_match = re.search(r'%([A-Z]+)', symbol)
-        if root_match:
-            root = root_match.group(1)
-            return root in tier_1
-        
-        return False
+        # Root code (e.g., '%AFE F!-IEU' -> 'AFE')
+        root = IceSymbol.parse(symbol).root
+        return root is not None and root in tier_1
     
     def calculate_trend_exhaustion_penalty(
         self,
@@ -750,3 +741,436 @@ class PointCalculator:
         return 0
 
 
+    
+    @staticmethod
+    def _batch_column(frame: pd.DataFrame, column: str) -> pd.Series:
+        """Numeric column of a candidate frame, NaN where missing (mirrors row.get(column, np.nan))."""
+        if column not in frame.columns:
+            return pd.Series(np.nan, index=frame.index)
+        return pd.to_numeric(frame[column], errors='coerce').astype('float64')
+    
+    @staticmethod
+    def _batch_truthy(frame: pd.DataFrame, column: str, default: bool) -> pd.Series:
+        """Column-wise truthiness of row.get(column, default)."""
+        if column not in frame.columns:
+            return pd.Series(default, index=frame.index)
+        values = frame[column]
+        if pd.api.types.is_numeric_dtype(values):
+            return values.ne(0)
+        return values.map(bool).astype(bool)
+    
+    def _confluence_points_batch(
+        self,
+        frame: pd.DataFrame,
+        indicator_name: str,
+        is_buy: pd.Series,
+        is_spread: pd.Series
+    ) -> Optional[pd.Series]:
+        """
+        Column-wise version of the _check_* helpers for one confluence indicator.
+        
+        Returns:
+            Boolean Series (indicator aligned), or None for unknown indicators (0 points)
+        """
+        col = lambda name: self._batch_column(frame, name)
+        is_sell = ~is_buy
+        
+        if indicator_name == 'rsi_aligned':
+            rsi = col('rsi')
+            return (is_buy & (rsi < 30)) | (is_sell & (rsi > 70))
+        if indicator_name == 'stochastic_aligned':
+            stoch_k = col('stoch_k')
+            return (is_buy & (stoch_k < 20)) | (is_sell & (stoch_k > 80))
+        if indicator_name == 'cci_aligned':
+            cci = col('cci')
+            return (is_buy & (cci < -100)) | (is_sell & (cci > 100))
+        if indicator_name == 'adx_strong':
+            return col('adx') > 25
+        if indicator_name in ('bollinger_aligned', 'bollinger_extreme'):
+            close, bb_upper, bb_lower = col('close'), col('bb_upper'), col('bb_lower')
+            valid = bb_upper.notna() & bb_lower.notna()
+            return valid & ((is_buy & (close <= bb_lower * 1.02)) | (is_sell & (close >= bb_upper * 0.98)))
+        if indicator_name == 'correlation_high':
+            return is_spread & (col('correlation') > 0.7)
+        if indicator_name == 'cointegration':
+            significance_level = self.config.get('spread_analysis', {}).get('cointegration', {}).get('significance_level', 0.05)
+            return is_spread & (col('cointegration_pvalue') < significance_level)
+        if indicator_name == 'rsi_percentile_aligned':
+            rsi_percentile = col('rsi_percentile')
+            return (is_buy & (rsi_percentile < 25)) | (is_sell & (rsi_percentile > 75))
+        if indicator_name in ('macd_reversal', 'macd_histogram_aligned'):
+            macd_hist = col('macd_histogram')
+            return (is_buy & (macd_hist > 0)) | (is_sell & (macd_hist < 0))
+        if indicator_name == 'adx_very_strong':
+            return col('adx') >= 30
+        if indicator_name == 'di_alignment':
+            di_plus, di_minus = col('di_plus'), col('di_minus')
+            return (is_buy & (di_plus > di_minus)) | (is_sell & (di_minus > di_plus))
+        if indicator_name in ('ema_50_aligned', 'ema_100_aligned', 'ema_200_aligned'):
+            price, ema = col('close'), col(indicator_name[:-len('_aligned')])
+            return (is_buy & (price > ema)) | (is_sell & (price < ema))
+        if indicator_name == 'both_indicators_exhausted':
+            macd_exhausted = self._batch_truthy(frame, '_exhaustion_macd_buy', False) | self._batch_truthy(frame, '_exhaustion_macd_sell', False)
+            rsi_exhausted = self._batch_truthy(frame, '_exhaustion_rsi_buy', False) | self._batch_truthy(frame, '_exhaustion_rsi_sell', False)
+            return macd_exhausted & rsi_exhausted
+        return None
+    
+    def calculate_confluence_bonuses_batch(
+        self,
+        frame: pd.DataFrame,
+        strategy_name: str,
+        signal_types: pd.Series,
+        is_spread: pd.Series
+    ) -> pd.DataFrame:
+        """
+        Column-wise calculate_confluence_bonuses over a frame of candidates.
+        
+        Args:
+            frame: Candidate rows (one per signal) with indicator columns
+            strategy_name: Name of strategy
+            signal_types: 'buy'/'sell' per candidate (aligned with frame)
+            is_spread: Boolean per candidate (for correlation/cointegration)
+        
+        Returns:
+            DataFrame with one points column per confluence indicator (config order),
+            plus 'total_bonus' and 'alignment_score'
+        """
+        strategy_config = self.config['strategies'].get(strategy_name, {})
+        confluence_config = strategy_config.get('confluence_bonuses', {})
+        is_buy = pd.Series((signal_types == 'buy').to_numpy(), index=frame.index)
+        is_spread = pd.Series(np.asarray(is_spread, dtype=bool), index=frame.index)
+        
+        result = pd.DataFrame(index=frame.index)
+        total_bonus = np.zeros(len(frame), dtype=np.int64)
+        aligned_weight_sum = np.zeros(len(frame))
+        
+        for indicator_name, indicator_config in confluence_config.items():
+            # Skip non-dictionary items (like "comment" keys)
+            if not isinstance(indicator_config, dict):
+                continue
+            points = indicator_config.get('points', 0)
+            aligned = self._confluence_points_batch(frame, indicator_name, is_buy, is_spread)
+            if aligned is None:
+                awarded = np.zeros(len(frame), dtype=np.asarray(points).dtype)
+            else:
+                awarded = np.where(aligned.to_numpy(dtype=bool), points, 0)
+            result[indicator_name] = awarded
+            total_bonus = total_bonus + awarded
+            if points > 0:
+                aligned_weight_sum = aligned_weight_sum + np.where(awarded > 0, self._get_indicator_weight(indicator_name), 0.0)
+        
+        result['total_bonus'] = total_bonus
+        result['alignment_score'] = self._alignment_score_batch(aligned_weight_sum, result, confluence_config)
+        return result
+    
+    def _alignment_score_batch(self, aligned_weight_sum: np.ndarray, breakdown: pd.DataFrame, confluence_config: Dict) -> List[float]:
+        """Column-wise _calculate_alignment_score (same rounding as the row-wise version)."""
+        total_indicators = len(confluence_config)
+        if total_indicators == 0:
+            return [0.0] * len(breakdown)
+        
+        numeric_weights = {k: v for k, v in self.alignment_weights.items()
+                          if isinstance(v, (int, float)) and k != 'comment'}
+        total_possible_weight = sum(numeric_weights.values()) if numeric_weights else total_indicators
+        
+        if total_possible_weight > 0:
+            scores = aligned_weight_sum / total_possible_weight * 100
+        else:
+            indicator_columns = [c for c in breakdown.columns if c not in ('total_bonus', 'alignment_score')]
+            aligned_count = (breakdown[indicator_columns].to_numpy() > 0).sum(axis=1) if indicator_columns else np.zeros(len(breakdown))
+            scores = aligned_count / total_indicators * 100
+        return [round(score, 1) for score in scores.tolist()]
+    
+    def calculate_trend_exhaustion_penalty_batch(
+        self,
+        frame: pd.DataFrame,
+        strategy_name: str,
+        signal_types: pd.Series
+    ) -> pd.DataFrame:
+        """
+        Column-wise calculate_trend_exhaustion_penalty over a frame of candidates.
+        
+        Args:
+            frame: Candidate rows (one per signal) with indicator columns
+            strategy_name: Name of strategy
+            signal_types: 'buy'/'sell' per candidate (aligned with frame)
+        
+        Returns:
+            DataFrame with one column per penalty (NaN = not in breakdown, after
+            capping) plus 'total_penalty'
+        """
+        result = pd.DataFrame(index=frame.index)
+        result['total_penalty'] = 0
+        
+        if strategy_name not in ['trend_following', 'enhanced_trend_following']:
+            return result
+        
+        strategy_config = self.config['strategies'].get(strategy_name, {})
+        penalty_config = strategy_config.get('trend_exhaustion_penalty', {})
+        if not penalty_config.get('enabled', True):
+            return result
+        
+        penalties = penalty_config.get('penalties', {})
+        max_penalty = penalty_config.get('max_penalty', 15)
+        is_buy = pd.Series((signal_types == 'buy').to_numpy(), index=frame.index)
+        is_sell = ~is_buy
+        price = self._batch_column(frame, 'close')
+        
+        awarded = {}
+        if 'rsi_extreme' in penalties:
+            config = penalties['rsi_extreme']
+            rsi = self._batch_column(frame, 'rsi')
+            hit = (is_buy & (rsi > config.get('buy_threshold', 75))) | (is_sell & (rsi < config.get('sell_threshold', 25)))
+            awarded['rsi_extreme'] = np.where(hit, config.get('points', 10), 0)
+        
+        if 'price_distance_from_ema' in penalties:
+            config = penalties['price_distance_from_ema']
+            ema = self._batch_column(frame, config.get('ema_column', 'ema_50'))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                distance_pct = ((price - ema) / ema).abs() * 100
+            far = (ema != 0) & (distance_pct > config.get('distance_percent', 5.0))
+            hit = far & ((is_buy & (price > ema)) | (is_sell & (price < ema)))
+            awarded['price_distance_from_ema'] = np.where(hit, config.get('points', 5), 0)
+        
+        if 'bollinger_extreme' in penalties:
+            config = penalties['bollinger_extreme']
+            bb_upper = self._batch_column(frame, 'bb_upper')
+            bb_lower = self._batch_column(frame, 'bb_lower')
+            tolerance = 0.01
+            valid = bb_upper.notna() & bb_lower.notna()
+            hit = valid & ((is_buy & (price >= bb_upper * (1 - tolerance))) | (is_sell & (price <= bb_lower * (1 + tolerance))))
+            awarded['bollinger_extreme'] = np.where(hit, config.get('points', 5), 0)
+        
+        total_penalty = sum(awarded.values()) if awarded else np.zeros(len(frame), dtype=np.int64)
+        capped = total_penalty > max_penalty
+        for name, values in awarded.items():
+            column = np.where(values > 0, values, np.nan).astype('float64')
+            if capped.any():
+                # Scale down breakdown proportionally (Python round, as in the row-wise version)
+                scaled = [round(v * (max_penalty / t)) for v, t in zip(values[capped].tolist(), total_penalty[capped].tolist())]
+                column[capped] = np.where(values[capped] > 0, scaled, np.nan)
+            result[name] = column
+        result['total_penalty'] = np.where(capped, max_penalty, total_penalty)
+        return result
+    
+    def _contract_month(self, symbol, quarter_numb='N', component_months='') -> Optional[int]:
+        """
+        Contract month (1-12) used for the tenor check, cached per symbol/metadata.
+        
+        Quarterlies use the first component month; monthlies the month code in the symbol.
+        
+        Returns:
+            Month number, or None if it cannot be determined
+        """
+        key = (symbol, quarter_numb, component_months)
+        if key in self._contract_month_cache:
+            return self._contract_month_cache[key]
+        
+        contract_month = None
+        if isinstance(symbol, str) and symbol:
+            if quarter_numb == 'Y':
+                if component_months and component_months != 'n/a' and isinstance(component_months, str):
+                    month_map = {
+                        'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+                        'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
+                    }
+                    contract_month = month_map.get(component_months.split(',')[0].strip().upper())
+            else:
+                contract_month = IceSymbol.parse(symbol).month_number
+        
+        self._contract_month_cache[key] = contract_month
+        return contract_month
+    
+    def _leg_attributes(self, symbols: pd.Series, metadata: List[Dict], data_month: int, tenor_months: List[int], tier_1: set) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        In-tenor and tier-1 flags for one leg per candidate, from cached symbol attributes.
+        
+        Returns:
+            Tuple of (in_tenor, is_tier1) boolean arrays
+        """
+        symbols = symbols.tolist()
+        contract_months = np.array([
+            self._contract_month(symbol, meta.get('quarter_numb', 'N'), meta.get('component_months_names', '')) or 0
+            for symbol, meta in zip(symbols, metadata)
+        ])
+        months_ahead_same = np.where(contract_months > data_month, contract_months - data_month, -1)
+        months_ahead_next = (12 - data_month) + contract_months
+        in_tenor = (contract_months > 0) & (np.isin(months_ahead_same, tenor_months) | np.isin(months_ahead_next, tenor_months))
+        is_tier1 = np.array([parsed.root in tier_1 for parsed in IceSymbol.parse_many(symbols)], dtype=bool)
+        return in_tenor, is_tier1
+    
+    def calculate_tenor_liquidity_bonus_batch(
+        self,
+        frame: pd.DataFrame,
+        data_date: datetime = None,
+        was_active_prior_week: Optional[pd.Series] = None
+    ) -> pd.DataFrame:
+        """
+        Column-wise calculate_tenor_liquidity_bonus over a frame of candidates.
+        
+        Contract months and root codes are parsed once per symbol and cached, so
+        repeated calls (e.g. one per historical week) only do array arithmetic.
+        
+        Args:
+            frame: Candidate rows with 'ice_connect_symbol' (and symbol_1/symbol_2 for spreads)
+            data_date: Data date for tenor calculation (if None, uses current date)
+            was_active_prior_week: Boolean per candidate (None = all False)
+        
+        Returns:
+            DataFrame with 'TNR', 'LIQ', 'PRWK' (NaN = not in breakdown) and 'total_bonus'
+        """
+        result = pd.DataFrame(index=frame.index)
+        tenor_config = self.config.get('tenor_liquidity_bonus', {})
+        if not tenor_config:
+            result['total_bonus'] = 0
+            return result
+        
+        if not data_date:
+            data_date = datetime.now()
+        if isinstance(data_date, str):
+            data_date = datetime.strptime(data_date.split()[0], '%Y-%m-%d')
+        elif hasattr(data_date, 'to_pydatetime'):
+            data_date = data_date.to_pydatetime()
+        
+        bonus_config = tenor_config.get('bonus_points', {})
+        tier_1 = set(tenor_config.get('liquidity_tiers', {}).get('tier_1', []))
+        tenor_months = tenor_config.get('tenor_months', [2, 3, 4, 5, 6])
+        data_month = data_date.month
+        n = len(frame)
+        
+        def text_column(name):
+            return frame[name] if name in frame.columns else pd.Series('', index=frame.index)
+        
+        def metadata_column(name):
+            if name not in frame.columns:
+                return [{}] * n
+            return [value if isinstance(value, dict) and value else {} for value in frame[name].tolist()]
+        
+        def row_metadata():
+            quarter = frame['quarter_numb'].tolist() if 'quarter_numb' in frame.columns else ['N'] * n
+            months = frame['component_months_names'].tolist() if 'component_months_names' in frame.columns else [''] * n
+            return [{'quarter_numb': q, 'component_months_names': m} for q, m in zip(quarter, months)]
+        
+        is_spread = ~self._batch_truthy(frame, 'is_outright', True).to_numpy()
+        
+        in_tenor, is_tier1 = self._leg_attributes(text_column('ice_connect_symbol'), row_metadata(), data_month, tenor_months, tier_1)
+        leg1_in_tenor, leg1_tier1 = self._leg_attributes(text_column('symbol_1'), metadata_column('meta_1'), data_month, tenor_months, tier_1)
+        leg2_in_tenor, leg2_tier1 = self._leg_attributes(text_column('symbol_2'), metadata_column('meta_2'), data_month, tenor_months, tier_1)
+        
+        one_leg_in_tenor = bonus_config.get('one_leg_in_tenor', 3)
+        one_leg_tier1 = bonus_config.get('one_leg_tier1', 3)
+        tier1_in_tenor_one_leg = bonus_config.get('tier1_in_tenor_one_leg', 2)
+        
+        # Spreads: both legs
+        spread_tnr = np.where(leg1_in_tenor & leg2_in_tenor, bonus_config.get('both_legs_in_tenor', 5),
+                              np.where(leg1_in_tenor | leg2_in_tenor, one_leg_in_tenor, 0))
+        spread_has_tnr = leg1_in_tenor | leg2_in_tenor
+        leg1_combo = leg1_tier1 & leg1_in_tenor
+        leg2_combo = leg2_tier1 & leg2_in_tenor
+        both_tier1 = leg1_tier1 & leg2_tier1
+        spread_liq = np.where(
+            both_tier1,
+            bonus_config.get('both_legs_tier1', 5) + np.where(
+                leg1_combo & leg2_combo, bonus_config.get('tier1_in_tenor_both_legs', 3),
+                np.where(leg1_combo | leg2_combo, tier1_in_tenor_one_leg, 0)),
+            one_leg_tier1 + np.where(leg1_combo | leg2_combo, tier1_in_tenor_one_leg, 0)
+        )
+        spread_has_liq = leg1_tier1 | leg2_tier1
+        
+        # Outrights: single symbol
+        outright_tnr = np.full(n, one_leg_in_tenor)
+        outright_liq = one_leg_tier1 + np.where(in_tenor, tier1_in_tenor_one_leg, 0)
+        
+        has_tnr = np.where(is_spread, spread_has_tnr, in_tenor)
+        has_liq = np.where(is_spread, spread_has_liq, is_tier1)
+        tnr = np.where(has_tnr, np.where(is_spread, spread_tnr, outright_tnr), 0)
+        liq = np.where(has_liq, np.where(is_spread, spread_liq, outright_liq), 0)
+        
+        # PRWK bonus (separate from tenor/liquidity, stacks on top)
+        if was_active_prior_week is None:
+            has_prwk = np.zeros(n, dtype=bool)
+        else:
+            has_prwk = np.array([bool(value) for value in was_active_prior_week.tolist()], dtype=bool)
+        prwk = np.where(has_prwk, bonus_config.get('prior_week_active', 5), 0)
+        
+        # Cap tenor/liquidity at max (PRWK is separate); scaled values use Python round like the row-wise version
+        max_bonus = bonus_config.get('max_bonus', 10)
+        tenor_liq_total = tnr + liq
+        capped = tenor_liq_total > max_bonus
+        tnr_out = np.where(has_tnr, tnr, np.nan).astype('float64')
+        liq_out = np.where(has_liq, liq, np.nan).astype('float64')
+        for idx in np.flatnonzero(capped):
+            scale_factor = max_bonus / tenor_liq_total[idx]
+            if has_tnr[idx]:
+                tnr_out[idx] = round(tnr[idx].item() * scale_factor)
+            if has_liq[idx]:
+                liq_out[idx] = round(liq[idx].item() * scale_factor)
+        
+        result['TNR'] = tnr_out
+        result['LIQ'] = liq_out
+        # When capped, the row-wise version only re-adds PRWK if it is non-zero
+        result['PRWK'] = np.where(has_prwk & ((prwk > 0) | ~capped), prwk, np.nan).astype('float64')
+        result['total_bonus'] = np.where(capped, max_bonus, tenor_liq_total) + prwk
+        return result
+    
+    @staticmethod
+    def _breakdown_dicts(frame: pd.DataFrame, columns: List[str], keep_all: bool = False) -> List[Dict]:
+        """Per-row breakdown dictionaries from points columns (NaN = key absent unless keep_all)."""
+        if not columns:
+            return [{} for _ in range(len(frame))]
+        records = []
+        for values in zip(*(frame[c].tolist() for c in columns)):
+            if keep_all:
+                records.append(dict(zip(columns, values)))
+            else:
+                records.append({c: int(v) for c, v in zip(columns, values) if v == v})
+        return records
+    
+    def score_candidates(
+        self,
+        frame: pd.DataFrame,
+        strategy_name: str,
+        signal_types: pd.Series,
+        data_date: datetime = None
+    ) -> pd.DataFrame:
+        """
+        Batch scoring of signal candidates (confluence, tenor/liquidity, exhaustion penalty).
+        
+        Same results as calling calculate_confluence_bonuses, calculate_tenor_liquidity_bonus
+        and calculate_trend_exhaustion_penalty once per candidate.
+        
+        Args:
+            frame: Candidate rows (one per signal) with indicator columns
+            strategy_name: Name of strategy
+            signal_types: 'buy'/'sell' per candidate (aligned with frame)
+            data_date: Data date for tenor calculation (if None, uses current date)
+        
+        Returns:
+            DataFrame aligned with frame with 'confluence_bonus', 'confluence_breakdown',
+            'alignment_score', 'tenor_liquidity_bonus', 'tenor_liquidity_breakdown',
+            'exhaustion_penalty' and 'exhaustion_penalty_breakdown'
+        """
+        signal_types = pd.Series(np.asarray(signal_types), index=frame.index)
+        if 'is_outright' in frame.columns:
+            is_spread = (frame['is_outright'] == False).to_numpy(dtype=bool)
+        else:
+            is_spread = np.zeros(len(frame), dtype=bool)
+        was_active = frame['was_active_prior_week'] if 'was_active_prior_week' in frame.columns else None
+        
+        confluence = self.calculate_confluence_bonuses_batch(frame, strategy_name, signal_types, is_spread)
+        tenor_liquidity = self.calculate_tenor_liquidity_bonus_batch(frame, data_date, was_active)
+        exhaustion = self.calculate_trend_exhaustion_penalty_batch(frame, strategy_name, signal_types)
+        
+        confluence_columns = [c for c in confluence.columns if c not in ('total_bonus', 'alignment_score')]
+        tenor_columns = [c for c in ('TNR', 'LIQ', 'PRWK') if c in tenor_liquidity.columns]
+        penalty_columns = [c for c in exhaustion.columns if c != 'total_penalty']
+        
+        result = pd.DataFrame(index=frame.index)
+        result['confluence_bonus'] = confluence['total_bonus'].tolist()
+        result['confluence_breakdown'] = self._breakdown_dicts(confluence, confluence_columns, keep_all=True)
+        result['alignment_score'] = confluence['alignment_score'].tolist()
+        result['tenor_liquidity_bonus'] = tenor_liquidity['total_bonus'].tolist()
+        result['tenor_liquidity_breakdown'] = self._breakdown_dicts(tenor_liquidity, tenor_columns)
+        result['exhaustion_penalty'] = exhaustion['total_penalty'].tolist()
+        result['exhaustion_penalty_breakdown'] = self._breakdown_dicts(exhaustion, penalty_columns)
+        return result
@@ -0,0 +1,496 @@
+"""
+Single-pass signal engine: prepares the current/previous-bar view once and
+evaluates every enabled strategy over it.
+New entry rules can be added declaratively (SignalRule) instead of subclassing BaseSignal.
+"""
+import time
+import pickle
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from .base_signal import BaseSignal, SignalView, SignalRangeView
+from .signal_row import bind_signal_rows
+from .point_calculator import PointCalculator
+from .trend_signals import TrendFollowingSignals
+from .enhanced_trend_signals import EnhancedTrendFollowingSignals
+from .mean_reversion_signals import MeanReversionSignals
+from .macd_rsi_exhaustion_signals import MacdRsiExhaustionSignals
+
+logger = logging.getLogger(__name__)
+
+# Strategies run by default, in report order
+DEFAULT_STRATEGIES = (
+    TrendFollowingSignals,
+    EnhancedTrendFollowingSignals,
+    MeanReversionSignals,
+    MacdRsiExhaustionSignals,
+)
+
+
+# Per-process state of strategy worker processes (see SignalEngine.run with workers > 1)
+_WORKER_STATE = {}
+
+
+class _RecordBuffer(logging.Handler):
+    """Collects log records in a worker process so the parent can replay them in order."""
+    
+    def __init__(self):
+        super().__init__()
+        self.records = []
+    
+    def emit(self, record: logging.LogRecord):
+        # Make the record picklable (as QueueHandler.prepare does)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+
+def _init_strategy_worker(data: pd.DataFrame, target_date: Optional[datetime], log_level: int):
+    """
+    Worker process initializer: keep the shared frame and route logging to a buffer.
+    
+    Args:
+        data: Indicator data (inherited on fork, pickled once per worker otherwise)
+        target_date: Target date for analysis
+        log_level: Root log level of the parent process
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    buffer = _RecordBuffer()
+    root.addHandler(buffer)
+    root.setLevel(log_level)
+    
+    _WORKER_STATE['data'] = data
+    _WORKER_STATE['target_date'] = target_date
+    _WORKER_STATE['view'] = None
+    _WORKER_STATE['logs'] = buffer
+
+
+def _run_strategy_in_worker(strategy: BaseSignal) -> Tuple[Dict, float, List[logging.LogRecord]]:
+    """
+    Evaluate one strategy over the worker's SignalView (built once per worker).
+    
+    Args:
+        strategy: BaseSignal instance
+    
+    Returns:
+        Tuple of (generate_signals result, seconds, log records)
+    """
+    buffer = _WORKER_STATE['logs']
+    buffer.records = []
+    if _WORKER_STATE['view'] is None:
+        _WORKER_STATE['view'] = SignalView(_WORKER_STATE['data'], _WORKER_STATE['target_date'])
+    start = time.perf_counter()
+    result = strategy.generate_signals_from_view(_WORKER_STATE['view'])
+    return result, time.perf_counter() - start, buffer.records
+
+
+class SignalRule:
+    """
+    Declarative entry rule evaluated column-wise over a SignalView frame.
+    
+    buy and sell are callables receiving a column accessor col(name, previous=False)
+    (float Series, NaN where the column or previous bar is missing) and returning a
+    boolean Series. When both fire on a row, buy wins.
+    
+    Example:
+        SignalRule(
+            'ema_position',
+            buy=lambda col: col('close') > col('ema_20'),
+            sell=lambda col: col('close') < col('ema_20'),
+            base_points=50
+        )
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        buy: Optional[Callable] = None,
+        sell: Optional[Callable] = None,
+        base_points: int = 50,
+        base_points_key: Optional[str] = None
+    ):
+        """
+        Initialize a declarative rule.
+        
+        Args:
+            name: Strategy name (also used for config lookup and as trigger type)
+            buy: Buy condition callable (None = never buy)
+            sell: Sell condition callable (None = never sell)
+            base_points: Base points when no config entry overrides them
+            base_points_key: Key in config['strategies'][name]['base_points'] (optional)
+        """
+        self.name = name
+        self.buy = buy
+        self.sell = sell
+        self.base_points = base_points
+        self.base_points_key = base_points_key
+    
+    def evaluate(self, frame: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        """
+        Evaluate the rule over an entry frame.
+        
+        Args:
+            frame: Current bar per symbol with 'prev_' columns (SignalView.frame)
+        
+        Returns:
+            Tuple of (buy mask, sell mask), mutually exclusive
+        """
+        def col(name: str, previous: bool = False) -> pd.Series:
+            return BaseSignal._entry_column(frame, name, previous=previous)
+        
+        no_signal = pd.Series(False, index=frame.index)
+        buy = self.buy(col).fillna(False).astype(bool) if self.buy else no_signal
+        sell = self.sell(col).fillna(False).astype(bool) if self.sell else no_signal
+        return buy, sell & ~buy
+
+
+class RuleSignals(BaseSignal):
+    """
+    Strategy driven by a SignalRule (no subclass needed per strategy).
+    """
+    
+    def __init__(self, config: dict, point_calculator: PointCalculator, rule: SignalRule):
+        """
+        Initialize rule-driven strategy.
+        
+        Args:
+            config: Configuration dictionary
+            point_calculator: PointCalculator instance
+            rule: SignalRule defining the entry condition
+        """
+        super().__init__(config, point_calculator)
+        self.rule = rule
+    
+    def detect_entry_mask(self, frame: pd.DataFrame) -> pd.Series:
+        """Column-wise rule evaluation."""
+        buy, sell = self.rule.evaluate(frame)
+        return buy | sell
+    
+    def detect_entry_condition(self, row: pd.Series, prev_row: Optional[pd.Series] = None) -> Optional[Tuple[str, str]]:
+        """
+        Evaluate the rule on a single symbol (one-row entry frame).
+        
+        Args:
+            row: Current row of data
+            prev_row: Previous row (for cross detection)
+        
+        Returns:
+            Tuple of (signal_type, rule name) or None
+        """
+        frame = pd.DataFrame([row.to_dict()])
+        if prev_row is not None:
+            previous = pd.DataFrame([prev_row.to_dict()]).add_prefix('prev_')
+            frame = pd.concat([frame, previous], axis=1)
+        frame['_has_previous'] = prev_row is not None
+        
+        buy, sell = self.rule.evaluate(frame)
+        if buy.iloc[0]:
+            signal_type = 'buy'
+        elif sell.iloc[0]:
+            signal_type = 'sell'
+        else:
+            return None
+        
+        row['_trigger_type'] = self.rule.name
+        return (signal_type, self.rule.name)
+    
+    def get_base_points(self, row: pd.Series, signal_type: str) -> int:
+        """
+        Get base points from config (if base_points_key is set) or the rule default.
+        
+        Args:
+            row: Current row of data
+            signal_type: 'buy' or 'sell'
+        
+        Returns:
+            Base points
+        """
+        if self.rule.base_points_key:
+            strategy_config = self.config['strategies'].get(self.rule.name, {})
+            return strategy_config.get('base_points', {}).get(self.rule.base_points_key, self.rule.base_points)
+        return self.rule.base_points
+    
+    def get_strategy_name(self) -> str:
+        """Get strategy name (the rule name)."""
+        return self.rule.name
+
+
+class SignalEngine:
+    """
+    Evaluates all enabled strategies over one shared SignalView.
+    
+    Returns the same per-strategy dictionaries as calling generate_signals on
+    each strategy, but sorts and groups the data only once. Per-strategy
+    timings (seconds) are kept in self.timings after each run.
+    """
+    
+    def __init__(
+        self,
+        config: dict,
+        point_calculator: Optional[PointCalculator] = None,
+        strategies: Optional[List[BaseSignal]] = None,
+        rules: Optional[List[SignalRule]] = None,
+        metrics=None
+    ):
+        """
+        Initialize signal engine.
+        
+        Args:
+            config: Configuration dictionary
+            point_calculator: PointCalculator instance (None = create one)
+            strategies: Strategy instances (None = DEFAULT_STRATEGIES)
+            rules: Additional declarative rules
+            metrics: Optional run-metrics collector with a stage(name, **fields) context
+                     manager and record(name, seconds, **fields) (e.g. utils.run_metrics.RunMetrics)
+        """
+        self.config = config
+        self.point_calculator = point_calculator or PointCalculator(config)
+        self.strategies: List[BaseSignal] = []
+        self.timings: Dict[str, float] = {}
+        self.metrics = metrics
+        
+        if strategies is None:
+            strategies = [cls(config, self.point_calculator) for cls in DEFAULT_STRATEGIES]
+        for strategy in strategies:
+            self.add_strategy(strategy)
+        for rule in rules or []:
+            self.add_rule(rule)
+    
+    def add_strategy(self, strategy: BaseSignal) -> BaseSignal:
+        """
+        Register a strategy instance.
+        
+        Args:
+            strategy: BaseSignal instance
+        
+        Returns:
+            The registered strategy
+        """
+        name = strategy.get_strategy_name()
+        if name in self.strategy_names:
+            raise ValueError(f"Strategy '{name}' is already registered")
+        self.strategies.append(strategy)
+        return strategy
+    
+    def add_rule(self, rule: SignalRule) -> RuleSignals:
+        """
+        Register a declarative rule as a strategy.
+        
+        Args:
+            rule: SignalRule instance
+        
+        Returns:
+            RuleSignals strategy wrapping the rule
+        """
+        return self.add_strategy(RuleSignals(self.config, self.point_calculator, rule))
+    
+    @property
+    def strategy_names(self) -> List[str]:
+        """Names of registered strategies, in evaluation order."""
+        return [strategy.get_strategy_name() for strategy in self.strategies]
+    
+    def _stage(self, name: str, **fields):
+        """Metrics stage context (no-op without a metrics collector)."""
+        return self.metrics.stage(name, **fields) if self.metrics is not None else nullcontext({})
+    
+    @staticmethod
+    def _signal_count(result: Dict) -> int:
+        """Number of candidates before filtering in a generate_signals result."""
+        return len(result.get('all_buy_signals', result.get('buy_signals', []))) + \
+            len(result.get('all_sell_signals', result.get('sell_signals', [])))
+    
+    def is_enabled(self, strategy_name: str) -> bool:
+        """
+        Check config['strategies'][name]['enabled'] (default: enabled).
+        
+        Args:
+            strategy_name: Strategy name
+        
+        Returns:
+            True if the strategy should run
+        """
+        return self.config['strategies'].get(strategy_name, {}).get('enabled', True)
+    
+    def run(
+        self,
+        data: pd.DataFrame,
+        target_date: Optional[datetime] = None,
+        workers: int = 1
+    ) -> Dict[str, Dict]:
+        """
+        Generate signals for every registered strategy.
+        
+        Args:
+            data: DataFrame with indicator data
+            target_date: Target date for analysis (None = use most recent date)
+            workers: Worker processes for strategy evaluation (1 = in-process, sequential)
+        
+        Returns:
+            Dictionary {strategy_name: generate_signals result}; disabled strategies
+            get empty 'buy_signals'/'sell_signals'
+        """
+        self.timings = {}
+        empty = {'buy_signals': [], 'sell_signals': []}
+        
+        if data is None or len(data) == 0:
+            logger.warning("No data available for signal generation")
+            return {name: dict(empty) for name in self.strategy_names}
+        
+        enabled = [strategy for strategy in self.strategies if self.is_enabled(strategy.get_strategy_name())]
+        if workers > 1 and len(enabled) > 1:
+            return self._run_in_workers(data, target_date, workers)
+        
+        start = time.perf_counter()
+        with self._stage('prepare_view', rows=len(data)) as stage:
+            view = SignalView(data, target_date)
+            stage['symbols'] = len(view.current_pos)
+        self.timings['prepare_view'] = time.perf_counter() - start
+        logger.info(f"Signal view prepared: {len(view.current_pos)} symbols ({self.timings['prepare_view']:.3f}s)")
+        
+        results = {}
+        for strategy in self.strategies:
+            name = strategy.get_strategy_name()
+            if not self.is_enabled(name):
+                logger.info(f"Skipping disabled strategy: {name}")
+                results[name] = dict(empty)
+                continue
+            start = time.perf_counter()
+            with self._stage(name) as stage:
+                results[name] = strategy.generate_signals_from_view(view)
+                stage['signals'] = self._signal_count(results[name])
+            self.timings[name] = time.perf_counter() - start
+        
+        self.log_timings()
+        return results
+    
+    def _run_in_workers(self, data: pd.DataFrame, target_date: Optional[datetime], workers: int) -> Dict[str, Dict]:
+        """
+        Evaluate strategies concurrently in a process pool over one shared frame.
+        
+        Each worker builds the SignalView once; results come back without the frame
+        (SignalRow pickling) and are re-bound to data here. Worker log records are
+        replayed in strategy order, so the log reads as in a sequential run.
+        Strategies that cannot be pickled (e.g. rules built from lambdas) run in-process.
+        
+        Args:
+            data: DataFrame with indicator data
+            target_date: Target date for analysis
+            workers: Maximum worker processes
+        
+        Returns:
+            Dictionary {strategy_name: generate_signals result}
+        """
+        empty = {'buy_signals': [], 'sell_signals': []}
+        remote = []
+        for strategy in self.strategies:
+            if not self.is_enabled(strategy.get_strategy_name()):
+                continue
+            try:
+                pickle.dumps(strategy)
+                remote.append(strategy)
+            except Exception as e:
+                logger.warning(f"Strategy {strategy.get_strategy_name()} cannot run in a worker process ({e}) - running in-process")
+        
+        logger.info(f"Evaluating {len(remote)} strategies in {min(workers, len(remote))} worker processes")
+        start = time.perf_counter()
+        futures = {}
+        executor = ProcessPoolExecutor(
+            max_workers=min(workers, len(remote)) or 1,
+            initializer=_init_strategy_worker,
+            initargs=(data, target_date, logging.getLogger().getEffectiveLevel())
+        )
+        try:
+            for strategy in remote:
+                futures[strategy.get_strategy_name()] = executor.submit(_run_strategy_in_worker, strategy)
+            
+            view = None
+            results = {}
+            for strategy in self.strategies:
+                name = strategy.get_strategy_name()
+                if not self.is_enabled(name):
+                    logger.info(f"Skipping disabled strategy: {name}")
+                    results[name] = dict(empty)
+                    continue
+                if name in futures:
+                    result, seconds, records = futures[name].result()
+                    for record in records:
+                        logging.getLogger(record.name).handle(record)
+                    results[name] = bind_signal_rows(result, data)
+                    self.timings[name] = seconds
+                    if self.metrics is not None:
+                        self.metrics.record(name, seconds, signals=self._signal_count(result), process='worker')
+                else:
+                    if view is None:
+                        view = SignalView(data, target_date)
+                    local_start = time.perf_counter()
+                    with self._stage(name) as stage:
+                        results[name] = strategy.generate_signals_from_view(view)
+                        stage['signals'] = self._signal_count(results[name])
+                    self.timings[name] = time.perf_counter() - local_start
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        logger.info(f"Strategies evaluated in {time.perf_counter() - start:.3f}s wall time")
+        self.log_timings()
+        return results
+    
+    def run_range(self, data: pd.DataFrame, dates: List) -> Dict[pd.Timestamp, Dict[str, Dict]]:
+        """
+        Generate signals for every registered strategy as of each of several dates.
+        
+        Sorts the data once and screens each strategy once over all dates
+        (see BaseSignal.generate_signals_range).
+        
+        Args:
+            data: DataFrame with indicator data spanning the dates
+            dates: Target dates (datetime, Timestamp or 'YYYY-MM-DD')
+        
+        Returns:
+            Dictionary {date (normalized Timestamp): {strategy_name: generate_signals result}}
+        """
+        self.timings = {}
+        empty = {'buy_signals': [], 'sell_signals': []}
+        
+        if data is None or len(data) == 0:
+            logger.warning("No data available for signal generation")
+            return {pd.Timestamp(d).normalize(): {name: dict(empty) for name in self.strategy_names} for d in dates}
+        
+        start = time.perf_counter()
+        range_view = SignalRangeView(data, dates)
+        self.timings['prepare_view'] = time.perf_counter() - start
+        logger.info(f"Signal range view prepared: {len(range_view.dates)} dates, "
+                    f"{len(range_view.current_pos)} symbol-dates ({self.timings['prepare_view']:.3f}s)")
+        
+        results = {date: {} for date in range_view.dates}
+        for strategy in self.strategies:
+            name = strategy.get_strategy_name()
+            if not self.is_enabled(name):
+                logger.info(f"Skipping disabled strategy: {name}")
+                for date in range_view.dates:
+                    results[date][name] = dict(empty)
+                continue
+            start = time.perf_counter()
+            for date, result in strategy.generate_signals_from_range(range_view).items():
+                results[date][name] = result
+            self.timings[name] = time.perf_counter() - start
+        
+        self.log_timings()
+        return results
+    
+    def log_timings(self):
+        """Log per-strategy timings from the last run."""
+        if not self.timings:
+            return
+        total = sum(self.timings.values())
+        logger.info(f"Signal engine timings (total {total:.3f}s):")
+        for name, seconds in self.timings.items():
+            logger.info(f"  {name}: {seconds:.3f}s")
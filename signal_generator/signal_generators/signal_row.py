@@ -0,0 +1,147 @@
+"""
+Compact row reference stored as signal['row_data'].
+Holds a row position into the shared indicator frame instead of a full copy
+of the row; indicator values are fetched (and converted) only when accessed.
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+
+
+def _native(value: Any) -> Any:
+    """Convert numpy scalars to Python scalars (as Series.to_dict does)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class SignalRow(Mapping):
+    """
+    Read-through mapping over one row of a shared DataFrame.
+    
+    Behaves like the row_data dict it replaces (get, [], in, iteration, len),
+    but only stores the frame reference, the row position and the keys that
+    are not frame columns (entry metadata such as '_trigger_type' and
+    'strategy_name'). Assignments go to that overlay, never to the frame.
+    
+    Usage:
+        row_data = SignalRow.from_series(view.data, position, current_row)
+        row_data.get('rsi')              # read lazily from view.data
+        row_data['strategy_name'] = ...  # stored on the record only
+    """
+    
+    __slots__ = ('_data', '_pos', '_extra')
+    
+    def __init__(self, data: pd.DataFrame, pos: int, extra: Optional[Dict] = None):
+        """
+        Initialize row reference.
+        
+        Args:
+            data: Shared DataFrame (must not be modified while signals refer to it)
+            pos: Row position (iloc) in data
+            extra: Values for keys that are not columns of data
+        """
+        self._data = data
+        self._pos = int(pos)
+        self._extra = extra if extra is not None else {}
+    
+    @classmethod
+    def from_series(cls, data: pd.DataFrame, pos: int, row: pd.Series) -> 'SignalRow':
+        """
+        Reference a row of data, keeping the keys added to its Series copy.
+        
+        Args:
+            data: Shared DataFrame the row was taken from
+            pos: Row position (iloc) in data
+            row: Copy of data.iloc[pos] with entry metadata appended
+        
+        Returns:
+            SignalRow
+        """
+        # Keys appended by detect_entry_condition follow the frame columns
+        extra = {key: _native(row[key]) for key in row.index[len(data.columns):]}
+        return cls(data, pos, extra)
+    
+    def __getstate__(self):
+        # The shared frame is not pickled (see bind / bind_signal_rows)
+        return (self._pos, self._extra)
+    
+    def __setstate__(self, state):
+        self._pos, self._extra = state
+        self._data = None
+    
+    def bind(self, data: pd.DataFrame) -> 'SignalRow':
+        """
+        Attach the shared frame after unpickling (e.g. results from a worker process).
+        
+        Args:
+            data: The same DataFrame the row position refers to
+        
+        Returns:
+            self
+        """
+        self._data = data
+        return self
+    
+    @property
+    def position(self) -> int:
+        """Row position (iloc) in the shared frame."""
+        return self._pos
+    
+    def __getitem__(self, key):
+        if key in self._extra:
+            return self._extra[key]
+        try:
+            loc = self._data.columns.get_loc(key)
+        except (KeyError, TypeError):
+            raise KeyError(key)
+        return _native(self._data.iat[self._pos, loc])
+    
+    def __setitem__(self, key, value):
+        self._extra[key] = value
+    
+    def __contains__(self, key) -> bool:
+        return key in self._extra or key in self._data.columns
+    
+    def __iter__(self):
+        yield from self._data.columns
+        for key in self._extra:
+            if key not in self._data.columns:
+                yield key
+    
+    def __len__(self) -> int:
+        return len(self._data.columns) + sum(1 for key in self._extra if key not in self._data.columns)
+    
+    def to_dict(self) -> Dict:
+        """
+        Materialize the full row as a plain dictionary.
+        
+        Returns:
+            Dictionary equal to the row_data dict this record replaces
+        """
+        row = {key: _native(value) for key, value in zip(self._data.columns, self._data.iloc[self._pos].tolist())}
+        row.update(self._extra)
+        return row
+    
+    def __repr__(self) -> str:
+        return f"SignalRow(pos={self._pos}, extra={self._extra})"
+
+
+def bind_signal_rows(result: Dict, data: pd.DataFrame) -> Dict:
+    """
+    Re-attach the shared frame to every SignalRow in a generate_signals result.
+    
+    Args:
+        result: Dictionary of signal lists ('buy_signals', 'all_buy_signals', ...)
+        data: DataFrame the signals were generated from
+    
+    Returns:
+        The same result
+    """
+    for signals in result.values():
+        if not isinstance(signals, list):
+            continue
+        for signal in signals:
+            row_data = signal.get('row_data') if isinstance(signal, dict) else None
+            if isinstance(row_data, SignalRow):
+                row_data.bind(data)
+    return result
@@ -65,6 +65,25 @@ class TrendFollowingSignals(BaseSignal):
         logger.debug(f"No cross for {row.get('ice_connect_symbol', 'unknown')}: prev({prev_macd_line:.4f} vs {prev_macd_signal:.4f}), curr({macd_line:.4f} vs {macd_signal:.4f})")
         return None
     
+    def detect_entry_mask(self, frame: pd.DataFrame) -> pd.Series:
+        """
+        Column-wise MACD cross screen (same rule as detect_entry_condition).
+        
+        Args:
+            frame: Current bar per symbol with 'prev_' columns
+        
+        Returns:
+            Boolean Series, True where a buy or sell cross fired
+        """
+        macd_line = self._entry_column(frame, 'macd_line')
+        macd_signal = self._entry_column(frame, 'macd_signal')
+        prev_macd_line = self._entry_column(frame, 'macd_line', previous=True)
+        prev_macd_signal = self._entry_column(frame, 'macd_signal', previous=True)
+        
+        buy = (prev_macd_line < prev_macd_signal) & (macd_line > macd_signal)
+        sell = (prev_macd_line > prev_macd_signal) & (macd_line < macd_signal)
+        return buy | sell
+    
     def get_base_points(self, row: pd.Series, signal_type: str) -> int:
         """
         Get base points for MACD cross.
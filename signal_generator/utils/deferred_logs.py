@@ -0,0 +1,88 @@
+"""
+Hold back log output of a background thread and replay it later.
+Lets run_signal_generator overlap steps in threads while the log still reads
+in step order (as in a sequential run).
+"""
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Tuple
+import logging
+import threading
+
+
+class DeferredLogs(logging.Filter):
+    """
+    Root-handler filter that captures the records emitted by one task's thread.
+    
+    Usage:
+        future, logs = submit_deferred(executor, build_report, signals)
+        ...                        # main thread keeps logging normally
+        report = logs.result(future)  # replays the task's records, then returns
+    """
+    
+    def __init__(self):
+        """Initialize and attach to the root logger's handlers."""
+        super().__init__()
+        self.thread_id = None
+        self.records = []
+        self._handlers = list(logging.getLogger().handlers)
+        for handler in self._handlers:
+            handler.addFilter(self)
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, 'replayed', False):
+            return True
+        if self.thread_id is not None and record.thread == self.thread_id:
+            # Every root handler sees the record; keep it once
+            if not self.records or self.records[-1] is not record:
+                self.records.append(record)
+            return False
+        return True
+    
+    def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn in the current (worker) thread with its records deferred."""
+        self.thread_id = threading.get_ident()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.thread_id = None
+    
+    def replay(self):
+        """Detach from the handlers and emit the captured records in order."""
+        for handler in self._handlers:
+            handler.removeFilter(self)
+        self._handlers = []
+        records, self.records = self.records, []
+        for record in records:
+            record.replayed = True
+            logging.getLogger(record.name).handle(record)
+    
+    def result(self, future: Future) -> Any:
+        """
+        Wait for the task, replay its records and return its result.
+        
+        Args:
+            future: Future returned by submit_deferred
+        
+        Returns:
+            The task's result (its exception is re-raised after the replay)
+        """
+        try:
+            return future.result()
+        finally:
+            self.replay()
+
+
+def submit_deferred(executor: Executor, fn: Callable, *args, **kwargs) -> Tuple[Future, DeferredLogs]:
+    """
+    Submit fn to a thread pool with its log records deferred.
+    
+    Args:
+        executor: ThreadPoolExecutor
+        fn: Callable to run
+        *args, **kwargs: Arguments for fn
+    
+    Returns:
+        Tuple of (future, DeferredLogs); call DeferredLogs.result(future) to collect
+    """
+    deferred = DeferredLogs()
+    return executor.submit(deferred.run, fn, *args, **kwargs), deferred
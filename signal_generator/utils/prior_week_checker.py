@@ -4,16 +4,25 @@ Files are named with Fridays, so we find the prior Friday (7 days before).
 """
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Set, Tuple
+from typing import Dict, Optional, Set, Tuple
 import logging
 import pandas as pd
 
 from ..data_loaders import load_data, prepare_data
-from ..signal_generators import TrendFollowingSignals, MeanReversionSignals, MacdRsiExhaustionSignals, PointCalculator
+from ..signal_generators import SignalEngine, PointCalculator
 from ..config import load_config
+from .signal_ledger import SignalLedger
 
 logger = logging.getLogger(__name__)
 
+# Strategy keys -> names used in the PRWK lookup keys
+STRATEGY_DISPLAY_NAMES = {
+    'trend_following': 'Trend Following',
+    'enhanced_trend_following': 'Enhanced Trend Following',
+    'mean_reversion': 'Mean Reversion',
+    'macd_rsi_exhaustion': 'MACD/RSI Exhaustion',
+}
+
 
 def find_prior_friday(current_date: datetime) -> datetime:
     """
@@ -34,39 +43,47 @@ def find_prior_friday(current_date: datetime) -> datetime:
     return prior_friday
 
 
-def check_prior_week_signals(
-    current_signals: Dict,
-    data_date: datetime,
+def load_prior_week_lookup(
+    prior_friday: datetime,
     data_dir: str,
-    config: dict
-) -> Dict[str, bool]:
+    config: dict,
+    point_calculator: PointCalculator,
+    ledger: Optional[SignalLedger] = None
+) -> Optional[Set[Tuple[str, str, str]]]:
     """
-    Check which current signals were active in the prior week.
+    Get the (symbol, strategy_display, signal_type) signals active on the prior Friday.
+    
+    Uses the signal ledger when the prior week was recorded; otherwise recomputes
+    the prior week's signals from its data file (and records them in the ledger).
     
     Args:
-        current_signals: Dict with 'buy_signals' and 'sell_signals' for all strategies
-        data_date: Current data date
+        prior_friday: Prior week data date
         data_dir: Directory containing CSV files
         config: Configuration dictionary
+        point_calculator: PointCalculator instance
+        ledger: SignalLedger (None = always recompute)
         
     Returns:
-        Dictionary mapping (symbol, strategy_type, signal_type) -> True/False
-        Format: {('symbol', 'strategy', 'buy'): True, ...}
+        Lookup set, or None if the prior week is unavailable
     """
-    logger.info("\n[Prior Week Check] Checking prior week signals...")
-    
-    # Find prior Friday
-    prior_friday = find_prior_friday(data_date)
     prior_date_str = prior_friday.strftime('%Y-%m-%d')
     
-    logger.info(f"Looking for prior week data: {prior_date_str}")
+    if ledger is not None and ledger.has_date(prior_friday):
+        prior_lookup = {
+            (symbol, STRATEGY_DISPLAY_NAMES.get(strategy_key, strategy_key), signal_type)
+            for symbol, strategy_key, signal_type in ledger.lookup(prior_friday)
+        }
+        logger.info(f"✓ Prior week signals read from ledger ({prior_date_str}): {len(prior_lookup)} signals")
+        return prior_lookup
+    
+    logger.info(f"Prior week not in signal ledger - recomputing from data: {prior_date_str}")
     
     # Try to load prior week data
     try:
         prior_df = load_data(target_date=prior_friday, data_dir=data_dir)
         if prior_df is None:
             logger.warning(f"Could not load prior week data for {prior_date_str}")
-            return {}
+            return None
         
         # Prepare prior week data
         prior_prepared = prepare_data(prior_df, target_date=prior_friday)
@@ -74,48 +91,102 @@ def check_prior_week_signals(
         
     except Exception as e:
         logger.warning(f"Error loading prior week data: {e}")
-        return {}
+        return None
     
     # Generate signals for prior week
     try:
-        point_calculator = PointCalculator(config)
-        trend_gen = TrendFollowingSignals(config, point_calculator)
-        from ..signal_generators.enhanced_trend_signals import EnhancedTrendFollowingSignals
-        enhanced_trend_gen = EnhancedTrendFollowingSignals(config, point_calculator)
-        mean_rev_gen = MeanReversionSignals(config, point_calculator)
-        macd_rsi_exhaustion_gen = MacdRsiExhaustionSignals(config, point_calculator)
-        
-        prior_trend = trend_gen.generate_signals(prior_prepared, target_date=prior_friday)
-        prior_enhanced_trend = enhanced_trend_gen.generate_signals(prior_prepared, target_date=prior_friday)
-        prior_mean_rev = mean_rev_gen.generate_signals(prior_prepared, target_date=prior_friday)
-        prior_macd_rsi_exhaustion = macd_rsi_exhaustion_gen.generate_signals(prior_prepared, target_date=prior_friday)
+        signal_engine = SignalEngine(config, point_calculator)
+        prior_signals_by_strategy = signal_engine.run(prior_prepared, target_date=prior_friday)
         
-        logger.info(f"✓ Prior week signals generated: "
-                   f"Trend={len(prior_trend.get('buy_signals', [])) + len(prior_trend.get('sell_signals', []))}, "
-                   f"EnhancedTrend={len(prior_enhanced_trend.get('buy_signals', [])) + len(prior_enhanced_trend.get('sell_signals', []))}, "
-                   f"MeanRev={len(prior_mean_rev.get('buy_signals', [])) + len(prior_mean_rev.get('sell_signals', []))}, "
-                   f"MACD/RSIExhaustion={len(prior_macd_rsi_exhaustion.get('buy_signals', [])) + len(prior_macd_rsi_exhaustion.get('sell_signals', []))}")
+        counts = ', '.join(
+            f"{STRATEGY_DISPLAY_NAMES.get(key, key)}="
+            f"{len(signals.get('buy_signals', [])) + len(signals.get('sell_signals', []))}"
+            for key, signals in prior_signals_by_strategy.items()
+        )
+        logger.info(f"✓ Prior week signals generated: {counts}")
         
     except Exception as e:
         logger.warning(f"Error generating prior week signals: {e}")
-        return {}
+        return None
+    
+    if ledger is not None:
+        ledger.record(prior_friday, prior_signals_by_strategy)
     
     # Create lookup set: (symbol, strategy_type, signal_type) -> True
     prior_lookup: Set[Tuple[str, str, str]] = set()
-    
-    # Process prior week signals
-    for strategy_key, prior_signals, strategy_name in [
-        ('trend_following', prior_trend, 'Trend Following'),
-        ('enhanced_trend_following', prior_enhanced_trend, 'Enhanced Trend Following'),
-        ('mean_reversion', prior_mean_rev, 'Mean Reversion'),
-        ('macd_rsi_exhaustion', prior_macd_rsi_exhaustion, 'MACD/RSI Exhaustion')
-    ]:
+    for strategy_key, prior_signals in prior_signals_by_strategy.items():
+        strategy_name = STRATEGY_DISPLAY_NAMES.get(strategy_key, strategy_key)
         for signal_type in ['buy', 'sell']:
             for signal in prior_signals.get(f'{signal_type}_signals', []):
                 symbol = signal.get('symbol', '')
                 if symbol:
                     prior_lookup.add((symbol, strategy_name, signal_type))
     
+    return prior_lookup
+
+
+def prepare_prior_week_lookup(
+    data_date: datetime,
+    data_dir: str,
+    config: dict,
+    ledger: Optional[SignalLedger] = None
+) -> Optional[Set[Tuple[str, str, str]]]:
+    """
+    Find the prior Friday and load its signal lookup (ledger or recompute).
+    
+    Independent of the current week's signals, so it can run while they are
+    being generated (see run_signal_generator --workers).
+    
+    Args:
+        data_date: Current data date
+        data_dir: Directory containing CSV files
+        config: Configuration dictionary
+        ledger: SignalLedger with recorded prior runs (None = recompute prior week)
+        
+    Returns:
+        Lookup set of (symbol, strategy_display, signal_type), or None if unavailable
+    """
+    logger.info("\n[Prior Week Check] Checking prior week signals...")
+    
+    # Find prior Friday
+    prior_friday = find_prior_friday(data_date)
+    
+    logger.info(f"Looking for prior week data: {prior_friday.strftime('%Y-%m-%d')}")
+    
+    return load_prior_week_lookup(prior_friday, data_dir, config, PointCalculator(config), ledger=ledger)
+
+
+def check_prior_week_signals(
+    current_signals: Dict,
+    data_date: datetime,
+    data_dir: str,
+    config: dict,
+    ledger: Optional[SignalLedger] = None,
+    prior_lookup: Optional[Set[Tuple[str, str, str]]] = None
+) -> Dict[str, bool]:
+    """
+    Check which current signals were active in the prior week.
+    
+    Args:
+        current_signals: Dict with 'buy_signals' and 'sell_signals' for all strategies
+        data_date: Current data date
+        data_dir: Directory containing CSV files
+        config: Configuration dictionary
+        ledger: SignalLedger with recorded prior runs (None = recompute prior week)
+        prior_lookup: Result of prepare_prior_week_lookup (None = prepare it here)
+        
+    Returns:
+        Dictionary mapping (symbol, strategy_type, signal_type) -> True/False
+        Format: {('symbol', 'strategy', 'buy'): True, ...}
+    """
+    if prior_lookup is None:
+        prior_lookup = prepare_prior_week_lookup(data_date, data_dir, config, ledger=ledger)
+        if prior_lookup is None:
+            return {}
+    
+    # Used below to recalculate tenor/liquidity bonuses with PRWK
+    point_calculator = PointCalculator(config)
+    
     logger.info(f"✓ Prior week lookup created: {len(prior_lookup)} unique signals")
     
     # Check current signals against prior week
@@ -124,10 +195,8 @@ def check_prior_week_signals(
     # Process current signals and add was_active_prior_week flag
     # We'll process signals from each strategy separately to get correct strategy type
     strategy_signal_lists = [
-        ('trend_following', 'Trend Following', current_signals.get('trend_following', {})),
-        ('enhanced_trend_following', 'Enhanced Trend Following', current_signals.get('enhanced_trend_following', {})),
-        ('mean_reversion', 'Mean Reversion', current_signals.get('mean_reversion', {})),
-        ('macd_rsi_exhaustion', 'MACD/RSI Exhaustion', current_signals.get('macd_rsi_exhaustion', {}))
+        (strategy_key, strategy_display, current_signals.get(strategy_key, {}))
+        for strategy_key, strategy_display in STRATEGY_DISPLAY_NAMES.items()
     ]
     
     for strategy_key, strategy_display, strategy_signals in strategy_signal_lists:
@@ -148,7 +217,7 @@ def check_prior_week_signals(
                 # Note: We need to recalculate because the bonus was calculated with was_active=False initially
                 if was_active:
                     # Recalculate tenor/liquidity bonus with updated was_active_prior_week
-                    # point_calculator was already created above (line 81)
+                    # point_calculator was created at the start of the check
                     # Build signal dict for bonus calculation (point_calculator expects row_data)
                     bonus_signal_dict = {
                         'symbol': signal.get('symbol', ''),
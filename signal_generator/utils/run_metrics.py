@@ -0,0 +1,225 @@
+"""
+Lightweight per-stage instrumentation for signal generator runs.
+Records wall time, RSS and (optionally) tracemalloc allocations per stage and
+writes them as a JSON run-metrics file next to the HTML report, so runs can be
+compared week over week.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Resident set size of this process in MB.
+    
+    Returns:
+        RSS in MB, or None if it cannot be measured on this platform
+    """
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / 1e6
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of this process in MB (since process start).
+    
+    Returns:
+        Peak RSS in MB, or None if unavailable
+    """
+    if PSUTIL_AVAILABLE and hasattr(psutil.Process().memory_info(), 'peak_wset'):
+        return psutil.Process().memory_info().peak_wset / 1e6  # Windows
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        return peak / 1e6 if sys.platform == 'darwin' else peak * 1024 / 1e6
+    return None
+
+
+class RunMetrics:
+    """
+    Collects timings and memory per stage of a run.
+    
+    Stages nest (per thread); a nested stage is recorded as 'outer/inner'.
+    tracemalloc is opt-in because tracing slows allocation-heavy code; its peaks
+    are process-wide, so stages overlapping in threads share them.
+    
+    Usage:
+        metrics = RunMetrics(trace_memory=False)
+        with metrics.stage('step_2_load_data') as stage:
+            df = load_data(...)
+            stage['rows'] = len(df)
+        metrics.save(report_path.with_suffix('.metrics.json'))
+    """
+    
+    def __init__(self, trace_memory: bool = False):
+        """
+        Initialize metrics collection.
+        
+        Args:
+            trace_memory: Track Python allocations per stage with tracemalloc
+        """
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now()
+        self.info: Dict = {}
+        self.stages: List[Dict] = []
+        self._start = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+    
+    def _stack(self) -> list:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+    
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """
+        Time a stage and sample memory around it.
+        
+        Args:
+            name: Stage name (nested stages are prefixed with the outer name)
+            **fields: Extra values to record (e.g. rows=...)
+        
+        Yields:
+            Dictionary of extra fields; values set on it are recorded with the stage
+        """
+        stack = self._stack()
+        path = '/'.join([frame['name'] for frame in stack] + [name])
+        frame = {'name': name, 'child_peak': 0}
+        stack.append(frame)
+        
+        extra = dict(fields)
+        rss_start = current_rss_mb()
+        traced_start = 0
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            traced_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield extra
+        finally:
+            entry = {
+                'stage': path,
+                'seconds': round(time.perf_counter() - start, 4),
+                'thread': threading.current_thread().name,
+            }
+            rss_end = current_rss_mb()
+            if rss_end is not None:
+                entry['rss_mb'] = round(rss_end, 1)
+                entry['rss_delta_mb'] = round(rss_end - rss_start, 1)
+            if tracing:
+                traced_end, traced_peak = tracemalloc.get_traced_memory()
+                # reset_peak in nested stages would hide their peaks from this one
+                traced_peak = max(traced_peak, frame['child_peak'])
+                entry['traced_delta_mb'] = round((traced_end - traced_start) / 1e6, 2)
+                entry['traced_peak_mb'] = round(traced_peak / 1e6, 2)
+            entry.update(extra)
+            
+            stack.pop()
+            if tracing and stack:
+                stack[-1]['child_peak'] = max(stack[-1]['child_peak'], traced_peak)
+            with self._lock:
+                self.stages.append(entry)
+    
+    def record(self, name: str, seconds: float, **fields):
+        """
+        Record a stage timed elsewhere (e.g. a strategy run in a worker process).
+        
+        Args:
+            name: Stage name (prefixed with the current stage, if any)
+            seconds: Duration in seconds
+            **fields: Extra values to record
+        """
+        path = '/'.join([frame['name'] for frame in self._stack()] + [name])
+        entry = {'stage': path, 'seconds': round(seconds, 4), 'thread': threading.current_thread().name}
+        entry.update(fields)
+        with self._lock:
+            self.stages.append(entry)
+    
+    def to_dict(self) -> Dict:
+        """
+        Metrics as a JSON-serializable dictionary.
+        
+        Returns:
+            Dictionary with run info, totals and one entry per stage (in completion order)
+        """
+        totals = {'seconds': round(time.perf_counter() - self._start, 4)}
+        rss = current_rss_mb()
+        if rss is not None:
+            totals['rss_mb'] = round(rss, 1)
+        peak = peak_rss_mb()
+        if peak is not None:
+            totals['peak_rss_mb'] = round(peak, 1)
+        if self.trace_memory and tracemalloc.is_tracing():
+            totals['traced_mb'] = round(tracemalloc.get_traced_memory()[0] / 1e6, 2)
+        
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'trace_memory': self.trace_memory,
+            **self.info,
+            'totals': totals,
+            'stages': list(self.stages),
+        }
+    
+    def top_level_stages(self) -> List[Dict]:
+        """Stages without a parent, in completion order (for report summaries)."""
+        return [entry for entry in self.stages if '/' not in entry['stage']]
+    
+    def save(self, path: Path) -> Path:
+        """
+        Write the metrics JSON.
+        
+        Args:
+            path: Output file
+        
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        logger.info(f"✓ Run metrics saved to: {path}")
+        return path
+    
+    def stop(self):
+        """Stop tracemalloc if this instance started it."""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
@@ -0,0 +1,172 @@
+"""
+Persistent ledger of the final signals of every run.
+Keyed by (data_date, strategy, symbol, side) so prior-week membership (PRWK)
+is a lookup instead of a second full signal run.
+"""
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+import json
+import logging
+import os
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default ledger file (signal_generator/output/signal_ledger.json)
+DEFAULT_LEDGER_PATH = Path(__file__).parent.parent / 'output' / 'signal_ledger.json'
+
+SIDES = ('buy', 'sell')
+
+
+def _date_key(data_date) -> str:
+    """Normalize a date/datetime/Timestamp/string to 'YYYY-MM-DD'."""
+    return pd.Timestamp(data_date).strftime('%Y-%m-%d')
+
+
+class SignalLedger:
+    """
+    Compact JSON ledger: {data_date: {strategy: {'buy': [symbols], 'sell': [symbols]}}}.
+    
+    A recorded date with no signals is stored as an empty entry, so has_date()
+    distinguishes "no signals that week" from "week never recorded".
+    
+    Usage:
+        ledger = SignalLedger.from_config(config)
+        if ledger.has_date(prior_friday):
+            active = ledger.lookup(prior_friday)
+        ledger.record(data_date, signals_by_strategy)
+    """
+    
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize ledger (loads the file if it exists).
+        
+        Args:
+            path: Ledger JSON file (default: signal_generator/output/signal_ledger.json)
+        """
+        self.path = Path(path) if path else DEFAULT_LEDGER_PATH
+        self._entries = self._load()
+        self._index = {}
+    
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['SignalLedger']:
+        """
+        Create a ledger from config['signal_ledger'].
+        
+        Args:
+            config: Signal configuration dictionary
+        
+        Returns:
+            SignalLedger, or None if the ledger is disabled
+        """
+        ledger_config = config.get('signal_ledger', {})
+        if not ledger_config.get('enabled', True):
+            return None
+        path = ledger_config.get('path')
+        if path:
+            path = Path(path)
+            if not path.is_absolute():
+                path = Path(__file__).parent.parent / path
+        return cls(path)
+    
+    def _load(self) -> Dict:
+        """Read the ledger file (empty ledger if missing or unreadable)."""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read signal ledger {self.path}: {e} - starting empty")
+            return {}
+    
+    def _save(self):
+        """Write the ledger atomically (temp file + replace)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.path)
+    
+    def dates(self) -> list:
+        """Recorded data dates ('YYYY-MM-DD'), oldest first."""
+        return sorted(self._entries)
+    
+    def has_date(self, data_date) -> bool:
+        """
+        Check whether a run was recorded for data_date.
+        
+        Args:
+            data_date: Data date (datetime, Timestamp or 'YYYY-MM-DD')
+        
+        Returns:
+            True if the ledger has an entry for that date
+        """
+        return _date_key(data_date) in self._entries
+    
+    def record(self, data_date, signals_by_strategy: Dict[str, Dict]) -> int:
+        """
+        Record the final signals of a run (replaces any earlier entry for the date).
+        
+        Args:
+            data_date: Data date of the run
+            signals_by_strategy: {strategy_name: {'buy_signals': [...], 'sell_signals': [...]}}
+        
+        Returns:
+            Number of signals recorded
+        """
+        key = _date_key(data_date)
+        entry = {}
+        count = 0
+        for strategy, signals in signals_by_strategy.items():
+            sides = {}
+            for side in SIDES:
+                symbols = [s.get('symbol') for s in (signals or {}).get(f'{side}_signals', []) if s.get('symbol')]
+                sides[side] = symbols
+                count += len(symbols)
+            entry[strategy] = sides
+        
+        self._entries[key] = entry
+        self._index.pop(key, None)
+        try:
+            self._save()
+            logger.info(f"✓ Signal ledger: recorded {count} signals for {key} ({self.path})")
+        except OSError as e:
+            logger.warning(f"Could not write signal ledger {self.path}: {e}")
+        return count
+    
+    def lookup(self, data_date) -> Set[Tuple[str, str, str]]:
+        """
+        Indexed set of (symbol, strategy, side) active on data_date.
+        
+        Args:
+            data_date: Data date
+        
+        Returns:
+            Set of (symbol, strategy_name, side); empty if the date is not recorded
+        """
+        key = _date_key(data_date)
+        if key not in self._index:
+            active = set()
+            for strategy, sides in self._entries.get(key, {}).items():
+                for side in SIDES:
+                    for symbol in sides.get(side, []):
+                        active.add((symbol, strategy, side))
+            self._index[key] = active
+        return self._index[key]
+    
+    def is_active(self, data_date, strategy: str, symbol: str, side: str) -> bool:
+        """
+        Check whether a signal was in the final list on data_date.
+        
+        Args:
+            data_date: Data date
+            strategy: Strategy name (e.g. 'trend_following')
+            symbol: ICE Connect symbol
+            side: 'buy' or 'sell'
+        
+        Returns:
+            True if recorded
+        """
+        return (symbol, strategy, side) in self.lookup(data_date)
@@ -0,0 +1,151 @@
+"""
+Sidecar files stored next to each weekly snapshot (unfiltered_YYYY-MM-DD.csv)
+
+- raw_ohlc/raw_ohlc_YYYY-MM-DD.npz: the full OHLC history every series' indicators
+  were calculated from (symbols + offsets + dates + OHLC matrix, compressed)
+- lineage/lineage_YYYY-MM-DD.json: which indicator_config.json sub-tree (and hash)
+  produced which output columns, plus the indicator code version
+
+Together they let recompute_indicators.py rewrite selected indicator columns
+across existing snapshots without re-pulling from ICE.
+"""
+from pathlib import Path
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+RAW_OHLC_DIR = 'raw_ohlc'
+LINEAGE_DIR = 'lineage'
+OHLC_COLUMNS = ['open', 'high', 'low', 'close']
+
+
+def raw_ohlc_path(output_dir, date_str):
+    """Path of the raw OHLC store for a snapshot date (YYYY-MM-DD)."""
+    return Path(output_dir) / RAW_OHLC_DIR / f"raw_ohlc_{date_str}.npz"
+
+
+def lineage_path(output_dir, date_str):
+    """Path of the column lineage file for a snapshot date (YYYY-MM-DD)."""
+    return Path(output_dir) / LINEAGE_DIR / f"lineage_{date_str}.json"
+
+
+def save_raw_ohlc(series_frames, path):
+    """
+    Save the OHLC input of every series into one compressed file
+    
+    Args:
+        series_frames: Dictionary {ice_connect_symbol: DataFrame with Date index/column and open/high/low/close}
+        path: Destination .npz path
+    
+    Returns:
+        Number of series written
+    """
+    symbols = []
+    lengths = []
+    dates = []
+    values = []
+    for symbol, df in series_frames.items():
+        if df is None or len(df) == 0:
+            continue
+        frame = df.set_index('Date') if 'Date' in df.columns else df
+        if not all(col in frame.columns for col in OHLC_COLUMNS):
+            continue
+        frame = frame.sort_index()
+        symbols.append(str(symbol))
+        lengths.append(len(frame))
+        dates.append(pd.to_datetime(frame.index).values.astype('datetime64[ns]'))
+        values.append(frame[OHLC_COLUMNS].to_numpy(dtype='float64'))
+    
+    if not symbols:
+        return 0
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.stem + '.tmp.npz')
+    np.savez_compressed(
+        tmp_path,
+        symbols=np.array(symbols),
+        offsets=np.concatenate([[0], np.cumsum(lengths)]).astype('int64'),
+        dates=np.concatenate(dates),
+        ohlc=np.vstack(values)
+    )
+    os.replace(tmp_path, path)
+    return len(symbols)
+
+
+def load_raw_ohlc(path, symbols=None):
+    """
+    Load raw OHLC series saved by save_raw_ohlc
+    
+    Args:
+        path: .npz path
+        symbols: Optional iterable of ice_connect_symbols to load (default: all)
+    
+    Returns:
+        Dictionary {ice_connect_symbol: DataFrame with Date index and open/high/low/close}
+    """
+    wanted = set(symbols) if symbols is not None else None
+    result = {}
+    with np.load(path, allow_pickle=False) as data:
+        all_symbols = data['symbols']
+        offsets = data['offsets']
+        dates = data['dates']
+        ohlc = data['ohlc']
+    for i, symbol in enumerate(all_symbols):
+        symbol = str(symbol)
+        if wanted is not None and symbol not in wanted:
+            continue
+        start, end = offsets[i], offsets[i + 1]
+        result[symbol] = pd.DataFrame(
+            ohlc[start:end], columns=OHLC_COLUMNS,
+            index=pd.DatetimeIndex(dates[start:end], name='Date')
+        )
+    return result
+
+
+def save_lineage(lineage, path):
+    """Write a column lineage dictionary to JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(lineage, f, indent=2, default=str)
+
+
+def load_lineage(path):
+    """Read a column lineage JSON file (None if missing or unreadable)."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not read lineage file {path}: {e}")
+        return None
+
+
+def delete_snapshot_sidecars(output_dir, date_str):
+    """
+    Remove the raw OHLC and lineage files for a snapshot date
+    
+    Args:
+        output_dir: Snapshot directory (e.g. full_unfiltered_historicals)
+        date_str: Snapshot date (YYYY-MM-DD)
+    
+    Returns:
+        Number of files deleted
+    """
+    deleted = 0
+    for path in (raw_ohlc_path(output_dir, date_str), lineage_path(output_dir, date_str)):
+        try:
+            if path.exists():
+                path.unlink()
+                deleted += 1
+        except OSError as e:
+            logger.warning(f"Could not delete {path}: {e}")
+    return deleted
@@ -0,0 +1,17 @@
+"""
+Shared test setup
+
+Puts the repo root, signal_generator/ and benchmarks/ on sys.path, the way
+run_signal_generator.py and the benchmarks import these modules.
+
+Run from the repo root:
+    python -m pytest -q
+"""
+from pathlib import Path
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+for path in (REPO_ROOT / 'benchmarks', REPO_ROOT / 'signal_generator', REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
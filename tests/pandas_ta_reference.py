@@ -0,0 +1,230 @@
+"""
+Reference values for the indicator kernel tests
+
+Writes tests/data/kernel_reference.json: fixed OHLC inputs (three series of
+different lengths, one with a zero-range bar) and the expected ewm_mean, rma,
+ema, atr, adx, rsi and macd outputs for each, so test_indicator_kernels.py
+runs without pandas_ta.
+
+The expected values come from pandas_ta itself when it is installed (talib=False,
+the native code paths indicator_kernels mirrors). Without it they come from the
+pandas transcription of the pandas_ta 0.3.14b functions below, which is built
+on pandas' ewm/rolling rather than on the kernels' own recurrences. The file
+records which source was used, and test_indicator_kernels.py re-checks the
+stored values against pandas_ta whenever it is installed.
+
+Examples:
+    python tests/pandas_ta_reference.py
+    python tests/pandas_ta_reference.py --transcription
+"""
+from pathlib import Path
+import argparse
+import json
+import logging
+import sys
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_FILE = Path(__file__).resolve().parent / 'data' / 'kernel_reference.json'
+
+# Indicator parameters of the reference values
+PARAMS = {
+    'ewm_alpha': 0.3,
+    'ewm_min_periods': 3,
+    'rma_length': 10,
+    'ema_length': 10,
+    'atr_length': 14,
+    'adx_length': 14,
+    'rsi_length': 14,
+    'macd': {'fast': 12, 'slow': 26, 'signal': 9},
+}
+
+
+def make_inputs(seed=29):
+    """
+    Fixed OHLC inputs
+    
+    Returns:
+        Dictionary {name: {'high', 'low', 'close'} lists}, values rounded to 4 decimals
+    """
+    rng = np.random.default_rng(seed)
+    inputs = {}
+    for name, n in (('long', 80), ('zero_range', 45), ('short', 20)):
+        close = np.round(50 + rng.standard_normal(n).cumsum(), 4)
+        high = np.round(close + rng.random(n), 4)
+        low = np.round(close - rng.random(n), 4)
+        if name == 'zero_range':
+            high[20] = low[20] = close[20]
+        inputs[name] = {'high': high.tolist(), 'low': low.tolist(), 'close': close.tolist()}
+    return inputs
+
+
+# pandas transcription of pandas_ta 0.3.14b (native paths, mamode='rma', sma-seeded ema)
+
+def _rma(close, length):
+    if len(close) < length:
+        return None
+    return close.ewm(alpha=1.0 / length, min_periods=length).mean()
+
+
+def _ema(close, length):
+    if len(close) < length:
+        return None
+    close = close.copy()
+    sma_nth = close[0:length].mean()
+    close[:length - 1] = np.nan
+    close.iloc[length - 1] = sma_nth
+    return close.ewm(span=length, adjust=False).mean()
+
+
+def _true_range(high, low, close):
+    high_low_range = high - low
+    if high_low_range.eq(0).any():
+        high_low_range = high_low_range + sys.float_info.epsilon
+    prev_close = close.shift(1)
+    ranges = pd.concat([high_low_range, high - prev_close, prev_close - low], axis=1)
+    true_range = ranges.abs().max(axis=1)
+    true_range.iloc[:1] = np.nan
+    return true_range
+
+
+def _atr(high, low, close, length):
+    if len(close) < length:
+        return None
+    return _rma(_true_range(high, low, close), length)
+
+
+def _adx(high, low, close, length):
+    if len(close) < length:
+        return None
+    atr_ = _atr(high, low, close, length)
+    up = high - high.shift(1)
+    dn = low.shift(1) - low
+    pos = ((up > dn) & (up > 0)) * up
+    neg = ((dn > up) & (dn > 0)) * dn
+    pos = pos.apply(lambda x: 0 if abs(x) < sys.float_info.epsilon else x)
+    neg = neg.apply(lambda x: 0 if abs(x) < sys.float_info.epsilon else x)
+    k = 100.0 / atr_
+    dmp = k * _rma(pos, length)
+    dmn = k * _rma(neg, length)
+    dx = 100.0 * (dmp - dmn).abs() / (dmp + dmn)
+    return pd.DataFrame({'adx': _rma(dx, length), 'dmp': dmp, 'dmn': dmn})
+
+
+def _rsi(close, length):
+    if len(close) < length:
+        return None
+    negative = close.diff(1)
+    positive = negative.copy()
+    positive[positive < 0] = 0
+    negative[negative > 0] = 0
+    positive_avg = _rma(positive, length)
+    negative_avg = _rma(negative, length)
+    return 100.0 * positive_avg / (positive_avg + negative_avg.abs())
+
+
+def _macd(close, fast, slow, signal):
+    if len(close) < max(fast, slow, signal):
+        return None
+    macd = _ema(close, fast) - _ema(close, slow)
+    signalma = _ema(macd.loc[macd.first_valid_index():], signal)
+    return pd.DataFrame({'macd': macd, 'signal': signalma, 'histogram': macd - signalma})
+
+
+def expected_values(series, ta=None):
+    """
+    Expected kernel outputs for one input series
+    
+    Args:
+        series: {'high', 'low', 'close'} lists (from make_inputs)
+        ta: pandas_ta module, or None for the transcription
+    
+    Returns:
+        Dictionary {output name: pd.Series or None (pandas_ta returns None for short input)}
+    """
+    high, low, close = (pd.Series(series[col], dtype='float64') for col in ('high', 'low', 'close'))
+    macd_params = PARAMS['macd']
+    values = {
+        'ewm_mean_adjusted': close.ewm(alpha=PARAMS['ewm_alpha'], adjust=True, min_periods=PARAMS['ewm_min_periods']).mean(),
+        'ewm_mean_unadjusted': close.ewm(alpha=PARAMS['ewm_alpha'], adjust=False, min_periods=PARAMS['ewm_min_periods']).mean(),
+    }
+    if ta is None:
+        adx_frame = _adx(high, low, close, PARAMS['adx_length'])
+        macd_frame = _macd(close, macd_params['fast'], macd_params['slow'], macd_params['signal'])
+        values.update({
+            'rma': _rma(close, PARAMS['rma_length']),
+            'ema': _ema(close, PARAMS['ema_length']),
+            'atr': _atr(high, low, close, PARAMS['atr_length']),
+            'rsi': _rsi(close, PARAMS['rsi_length']),
+        })
+    else:
+        adx_frame = ta.adx(high, low, close, length=PARAMS['adx_length'])
+        macd_frame = ta.macd(close, fast=macd_params['fast'], slow=macd_params['slow'], signal=macd_params['signal'], talib=False)
+        if adx_frame is not None:
+            adx_frame = adx_frame.iloc[:, :3].set_axis(['adx', 'dmp', 'dmn'], axis=1)
+        if macd_frame is not None:
+            # pandas_ta column order: MACD, MACDh, MACDs
+            macd_frame = macd_frame.iloc[:, :3].set_axis(['macd', 'histogram', 'signal'], axis=1)
+        values.update({
+            'rma': ta.rma(close, length=PARAMS['rma_length']),
+            'ema': ta.ema(close, length=PARAMS['ema_length'], talib=False),
+            'atr': ta.atr(high, low, close, length=PARAMS['atr_length'], talib=False),
+            'rsi': ta.rsi(close, length=PARAMS['rsi_length'], talib=False),
+        })
+    for name in ('adx', 'dmp', 'dmn'):
+        values[name] = None if adx_frame is None else adx_frame[name]
+    for name in ('macd', 'signal', 'histogram'):
+        values[f'macd_{name}'] = None if macd_frame is None else macd_frame[name]
+    return values
+
+
+def _to_list(values, n):
+    """JSON-friendly values: None for NaN, all None for a missing (None) result."""
+    if values is None:
+        return [None] * n
+    return [None if np.isnan(v) else float(v) for v in values.to_numpy(dtype='float64')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write the indicator kernel reference values')
+    parser.add_argument('--transcription', action='store_true',
+                        help='Use the pandas transcription even if pandas_ta is installed')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    
+    ta = None
+    source = 'pandas transcription of pandas_ta 0.3.14b'
+    if not args.transcription:
+        try:
+            import pandas_ta as ta
+            source = f"pandas_ta {getattr(ta, 'version', '')}".strip()
+        except ImportError:
+            ta = None
+    
+    inputs = make_inputs()
+    reference = {
+        'source': source,
+        'pandas': pd.__version__,
+        'params': PARAMS,
+        'series': {
+            name: {
+                'input': series,
+                'expected': {
+                    output: _to_list(values, len(series['close']))
+                    for output, values in expected_values(series, ta).items()
+                }
+            }
+            for name, series in inputs.items()
+        }
+    }
+    REFERENCE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(REFERENCE_FILE, 'w') as f:
+        json.dump(reference, f, indent=1)
+    logger.info(f"Wrote {REFERENCE_FILE} ({source})")
+
+
+if __name__ == '__main__':
+    main()
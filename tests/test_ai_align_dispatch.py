@@ -0,0 +1,145 @@
+"""
+AIAlignDispatcher against the fake chat-completions server
+
+benchmarks/fake_chat_server.py answers like the OpenAI API (deterministic
+alignment JSON, optional 429s beyond a requests-per-minute limit), so these
+run without an API key or network access. Skipped when openai is not installed.
+
+- the sync single-pass client and the dispatcher build and parse the same request
+- repeated cache keys share one in-flight request
+- the dispatcher's rate limiter keeps requests under the server's limit
+- failed passes, failed trades and rejected requests do not lose the other responses
+"""
+from datetime import date
+import time
+
+import pytest
+
+pytest.importorskip('openai')
+
+import fake_chat_server
+import signal_generator.ai.ai_align_dispatch as ai_align_dispatch
+from signal_generator.ai import AIAlignCache, AIAlignDispatcher, get_ai_trade_alignment, prefetch_ai_alignments
+from signal_generator.ai.ai_align_cache import build_cache_key
+
+CACHE_DATE = date(2025, 12, 5)
+REQUIRED_FIELDS = ["alignment_label", "technical_view", "fundamental_view", "overall_comment", "confidence"]
+
+
+def _payload(i):
+    return {'spread_expression': f'SPREAD {i}', 'signal_direction': 'Buy', 'legs': []}
+
+
+def _requests(n):
+    return [(f'key-{i}', _payload(i)) for i in range(n)]
+
+
+@pytest.fixture
+def server():
+    server = fake_chat_server.start()
+    yield server
+    server.stop()
+
+
+def test_single_pass_client_matches_dispatcher(server, monkeypatch):
+    monkeypatch.setenv('OPENAI_BASE_URL', server.base_url)
+    sync_response = get_ai_trade_alignment(_payload(0), api_key='test', model='gpt-4o', multi_pass=False)
+    
+    dispatcher = AIAlignDispatcher(api_key='test', model='gpt-4o', num_passes=1, base_url=server.base_url)
+    responses = dispatcher.fetch_many(_requests(1))
+    
+    assert 'error' not in sync_response
+    assert set(REQUIRED_FIELDS) <= set(sync_response)
+    assert responses['key-0'] == sync_response
+    assert server.requests == 2
+
+
+def test_repeated_keys_are_coalesced(server):
+    requests = _requests(3) + _requests(3) + [('key-0', _payload(0))]
+    dispatcher = AIAlignDispatcher(api_key='test', num_passes=2, base_url=server.base_url)
+    responses = dispatcher.fetch_many(requests)
+    
+    assert sorted(responses) == ['key-0', 'key-1', 'key-2']
+    assert all('error' not in response for response in responses.values())
+    assert server.requests == 3 * 2
+    assert dispatcher.stats()['coalesced'] == 4
+    assert dispatcher.stats()['trades'] == 3
+
+
+def test_rate_limit_keeps_server_limit():
+    server = fake_chat_server.start(requests_per_minute=4)
+    try:
+        dispatcher = AIAlignDispatcher(api_key='test', num_passes=1, requests_per_minute=4,
+                                       base_url=server.base_url, max_retries=0)
+        responses = dispatcher.fetch_many(_requests(4))
+    finally:
+        server.stop()
+    assert server.rejected == 0
+    assert all('error' not in response for response in responses.values())
+
+
+def test_rate_limit_waits_for_the_window(server, monkeypatch):
+    # A half-second window stands in for the minute
+    monkeypatch.setattr(ai_align_dispatch, 'WINDOW_SECONDS', 0.5)
+    dispatcher = AIAlignDispatcher(api_key='test', num_passes=1, requests_per_minute=2, base_url=server.base_url)
+    start = time.perf_counter()
+    responses = dispatcher.fetch_many(_requests(6))
+    elapsed = time.perf_counter() - start
+    
+    assert len(responses) == 6
+    assert all('error' not in response for response in responses.values())
+    # Six requests at two per window: the last two go out two windows after the first
+    assert elapsed >= 1.0
+    assert dispatcher.stats()['rate_limit_wait'] >= 0.9
+
+
+def test_rejected_requests_do_not_abort_the_run():
+    # No dispatcher limit and no retries: requests beyond the server limit fail with 429
+    server = fake_chat_server.start(requests_per_minute=3)
+    try:
+        dispatcher = AIAlignDispatcher(api_key='test', num_passes=1, base_url=server.base_url, max_retries=0)
+        responses = dispatcher.fetch_many(_requests(5))
+    finally:
+        server.stop()
+    errors = [key for key, response in responses.items() if 'error' in response]
+    assert len(responses) == 5
+    assert len(errors) == server.rejected == 2
+    assert all(responses[key]['alignment_label'] == 'AI Error' for key in errors)
+
+
+def test_failed_later_pass_falls_back_to_previous(server, monkeypatch):
+    parse = ai_align_dispatch._parse_pass_response
+    
+    def fail_pass_two(content, pass_number=1):
+        if pass_number == 2:
+            return ai_align_dispatch._error_response("JSON parse error: test", "AI Parse Error")
+        return parse(content, pass_number)
+    
+    monkeypatch.setattr(ai_align_dispatch, '_parse_pass_response', fail_pass_two)
+    responses = AIAlignDispatcher(api_key='test', num_passes=3, base_url=server.base_url).fetch_many(_requests(2))
+    
+    assert all('error' not in response for response in responses.values())
+    # Pass 3 never runs once pass 2 failed
+    assert server.requests == 2 * 2
+
+
+def test_failed_trade_does_not_lose_the_others(server, tmp_path):
+    dispatcher = AIAlignDispatcher(api_key='test', num_passes=1, base_url=server.base_url)
+    align = dispatcher._align
+    
+    async def fail_one(client, limiter, semaphore, trade_payload):
+        if trade_payload['spread_expression'] == 'SPREAD 2':
+            raise RuntimeError('trade failed')
+        return await align(client, limiter, semaphore, trade_payload)
+    
+    dispatcher._align = fail_one
+    requests = [({'symbol': f'S{i}', 'week_date': '2025-12-05'}, _payload(i)) for i in range(4)]
+    cache = AIAlignCache(cache_dir=tmp_path, flush_every=100)
+    
+    stored = prefetch_ai_alignments(requests, CACHE_DATE, cache, dispatcher)
+    
+    assert stored == 4
+    responses = {signature['symbol']: cache.get(CACHE_DATE, build_cache_key(signature)) for signature, _ in requests}
+    assert responses['S2']['alignment_label'] == 'AI Error'
+    assert all('error' not in responses[symbol] for symbol in ('S0', 'S1', 'S3'))
+    cache.close()
@@ -0,0 +1,52 @@
+"""Cache keys of IndicatorCache (indicator_cache.py)"""
+from pathlib import Path
+import copy
+import json
+
+import pandas as pd
+import pytest
+
+from indicator_cache import IndicatorCache
+from indicator_plan import IndicatorPlan
+
+CONFIG_FILE = Path(__file__).resolve().parent.parent / 'study_settings' / 'indicator_config.json'
+
+
+@pytest.fixture
+def config():
+    with open(CONFIG_FILE) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def ohlc():
+    return pd.DataFrame({
+        'Date': pd.date_range('2025-01-03', periods=8, freq='W-FRI'),
+        'open': [1.0, 1.1, 1.2, 1.1, 1.3, 1.4, 1.2, 1.5],
+        'high': [1.2, 1.3, 1.4, 1.3, 1.5, 1.6, 1.4, 1.7],
+        'low': [0.9, 1.0, 1.1, 1.0, 1.2, 1.3, 1.1, 1.4],
+        'close': [1.1, 1.2, 1.1, 1.3, 1.4, 1.2, 1.5, 1.6],
+    })
+
+
+def test_engine_switches_change_the_key(tmp_path, config, ohlc):
+    cache = IndicatorCache(tmp_path, code_version='test')
+    reference = cache.make_key(ohlc, config)
+    
+    panel = copy.deepcopy(config)
+    panel['indicator_engine']['mode'] = 'panel'
+    kernels = copy.deepcopy(config)
+    kernels['batch_kernels']['enabled'] = True
+    
+    keys = {reference, cache.make_key(ohlc, panel), cache.make_key(ohlc, kernels)}
+    assert len(keys) == 3
+    assert cache.make_key(ohlc, config) == reference
+
+
+def test_equal_plans_share_a_key(tmp_path, config, ohlc):
+    cache = IndicatorCache(tmp_path, code_version='test')
+    first = cache.make_key(ohlc, config, IndicatorPlan({'rsi'}, {'rsi_14'}))
+    second = cache.make_key(ohlc, config, IndicatorPlan({'rsi'}, {'rsi_14'}))
+    other = cache.make_key(ohlc, config, IndicatorPlan({'rsi', 'atr'}, {'rsi_14', 'atr'}))
+    assert first == second
+    assert other != first
@@ -0,0 +1,85 @@
+"""
+indicator_kernels against fixed pandas_ta reference values
+
+tests/data/kernel_reference.json holds the inputs and the expected outputs
+(written by tests/pandas_ta_reference.py; its "source" field says whether they
+came from pandas_ta or from the pandas transcription of it). The three input
+series are packed together, so the ragged (trailing NaN) handling is exercised
+as well. With pandas_ta installed, the stored values are also checked against
+pandas_ta itself.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicator_kernels
+from pandas_ta_reference import REFERENCE_FILE, expected_values
+
+OUTPUTS = [
+    'ewm_mean_adjusted', 'ewm_mean_unadjusted', 'rma', 'ema', 'atr',
+    'adx', 'dmp', 'dmn', 'rsi', 'macd_macd', 'macd_signal', 'macd_histogram'
+]
+
+
+def _as_array(values):
+    return np.array([np.nan if v is None else v for v in values], dtype='float64')
+
+
+@pytest.fixture(scope='module')
+def reference():
+    with open(REFERENCE_FILE) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='module')
+def kernel_outputs(reference):
+    """Kernel outputs per series, computed on all reference series packed at once."""
+    params = reference['params']
+    frames = {name: pd.DataFrame(series['input']) for name, series in reference['series'].items()}
+    keys, lengths, arrays = indicator_kernels.pack_series(frames)
+    high, low, close = arrays['high'], arrays['low'], arrays['close']
+    
+    adx = indicator_kernels.adx(high, low, close, length=params['adx_length'], lengths=lengths)
+    macd = indicator_kernels.macd(close, **params['macd'])
+    packed = {
+        'ewm_mean_adjusted': indicator_kernels.ewm_mean(close, params['ewm_alpha'], adjust=True,
+                                                        min_periods=params['ewm_min_periods']),
+        'ewm_mean_unadjusted': indicator_kernels.ewm_mean(close, params['ewm_alpha'], adjust=False,
+                                                          min_periods=params['ewm_min_periods']),
+        'rma': indicator_kernels.rma(close, params['rma_length']),
+        'ema': indicator_kernels.ema(close, params['ema_length']),
+        'atr': indicator_kernels.atr(high, low, close, params['atr_length'], lengths=lengths),
+        'adx': adx['adx'],
+        'dmp': adx['dmp'],
+        'dmn': adx['dmn'],
+        'rsi': indicator_kernels.rsi(close, params['rsi_length']),
+        'macd_macd': macd['macd'],
+        'macd_signal': macd['signal'],
+        'macd_histogram': macd['histogram'],
+    }
+    return {
+        output: dict(zip(keys, indicator_kernels.unpack_series(values, lengths)))
+        for output, values in packed.items()
+    }
+
+
+@pytest.mark.parametrize('output', OUTPUTS)
+def test_kernel_matches_reference(reference, kernel_outputs, output):
+    for name, series in reference['series'].items():
+        np.testing.assert_allclose(
+            kernel_outputs[output][name], _as_array(series['expected'][output]),
+            rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=f"{output} of series {name}"
+        )
+
+
+def test_reference_matches_pandas_ta(reference):
+    ta = pytest.importorskip('pandas_ta')
+    for name, series in reference['series'].items():
+        for output, values in expected_values(series['input'], ta).items():
+            actual = np.full(len(series['input']['close']), np.nan) if values is None else values.to_numpy(dtype='float64')
+            np.testing.assert_allclose(
+                actual, _as_array(series['expected'][output]),
+                rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=f"pandas_ta {output} of series {name}"
+            )
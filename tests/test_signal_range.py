@@ -0,0 +1,58 @@
+"""
+SignalEngine.run_range against per-date SignalEngine.run
+
+run_range screens several snapshot dates in one pass (SignalRangeView); each
+date's result must equal run() on the data up to that date, including the
+order of the ranked top-N lists. The snapshot is synthetic
+(benchmarks/synthetic_snapshot.py): three weekly dates stacked into one frame,
+with enough spreads that points ties occur within a strategy.
+"""
+import json
+import logging
+
+import pandas as pd
+import pytest
+
+from config import load_config
+from data_loaders import prepare_data
+from signal_generators import SignalEngine, PointCalculator
+from synthetic_snapshot import DEFAULT_INDICATOR_CONFIG, build_snapshot_frames, load_matrix
+
+SIGNAL_KEYS = ('symbol', 'signal_type', 'points', 'entry_price')
+
+
+@pytest.fixture(scope='module')
+def snapshot():
+    with open(DEFAULT_INDICATOR_CONFIG) as f:
+        indicator_config = json.load(f)
+    frames = build_snapshot_frames(load_matrix(spreads=2000), indicator_config, snapshots=3)
+    data = prepare_data(pd.concat(list(frames.values()), ignore_index=True))
+    return data, sorted(frames)
+
+
+@pytest.fixture(scope='module')
+def engine():
+    config = load_config()
+    return SignalEngine(config, PointCalculator(config))
+
+
+def _signals(signals):
+    return [tuple(s.get(key) for key in SIGNAL_KEYS) for s in signals]
+
+
+def test_run_range_matches_per_date_runs(snapshot, engine, caplog):
+    caplog.set_level(logging.WARNING)
+    data, dates = snapshot
+    range_results = engine.run_range(data, dates)
+    assert len(range_results) == len(dates)
+    
+    for date in dates:
+        expected = engine.run(data[data['Date'] <= date], target_date=date.to_pydatetime())
+        actual = range_results[pd.Timestamp(date).normalize()]
+        assert set(actual) == set(expected)
+        for strategy, result in expected.items():
+            for side in ('buy_signals', 'sell_signals'):
+                assert _signals(actual[strategy][side]) == _signals(result[side]), f"{strategy} {side} on {date.date()}"
+            for side in ('all_buy_signals', 'all_sell_signals'):
+                assert sorted(_signals(actual[strategy].get(side, []))) == sorted(_signals(result.get(side, []))), \
+                    f"{strategy} {side} on {date.date()}"
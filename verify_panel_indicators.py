@@ -0,0 +1,162 @@
+"""
+Check PanelIndicatorEngine against calculate_technical_indicators
+
+The per-series function in pull_ohlc_data.py (pandas_ta) is the reference
+implementation; the panel engine must reproduce every output column. This
+script runs both on the same series and reports, per column, how many series
+differ beyond tolerance (NaN positions must match exactly, as must integer
+flag columns after casting).
+
+Inputs:
+- the raw OHLC stored next to a snapshot (full_unfiltered_historicals/raw_ohlc/raw_ohlc_YYYY-MM-DD.npz)
+- or synthetic random walks (--synthetic N), including flat and very short series
+
+Examples:
+    python verify_panel_indicators.py --date 2025-12-05
+    python verify_panel_indicators.py --synthetic 500 --mode plan
+"""
+import logging
+import sys
+
+import numpy as np
+import pandas as pd
+
+from pull_ohlc_data import calculate_technical_indicators, load_indicator_config, PANDAS_TA_AVAILABLE
+from indicator_plan import build_indicator_plan
+from panel_indicators import PanelIndicatorEngine
+from snapshot_store import load_raw_ohlc, raw_ohlc_path
+
+logger = logging.getLogger(__name__)
+
+
+def make_synthetic_series(count, seed=0, max_weeks=300):
+    """
+    Random-walk OHLC series of mixed lengths for equivalence checks
+    
+    Includes series shorter than every indicator period, flat stretches (ties in
+    percentiles, zero ranges) and zero-range bars.
+    
+    Args:
+        count: Number of series
+        seed: Random seed
+        max_weeks: Longest series length
+    
+    Returns:
+        Dictionary {key: DataFrame with Date column and open/high/low/close}
+    """
+    rng = np.random.default_rng(seed)
+    lengths = [1, 2, 5, 13, 14, 20, 34, 60, 120, max_weeks]
+    frames = {}
+    for i in range(count):
+        n = int(lengths[i % len(lengths)] if i < len(lengths) else rng.integers(34, max_weeks + 1))
+        close = 50 + rng.standard_normal(n).cumsum()
+        if i % 7 == 3:
+            close[: n // 2] = close[0]
+        high = close + rng.random(n)
+        low = close - rng.random(n)
+        if i % 11 == 5:
+            high, low = close.copy(), close.copy()
+        start = pd.Timestamp('2019-01-04') + pd.Timedelta(weeks=int(rng.integers(0, 60)))
+        frames[f'SYNTH_{i}'] = pd.DataFrame({
+            'Date': pd.date_range(start, periods=n, freq='W-FRI'),
+            'open': close, 'high': high, 'low': low, 'close': close
+        })
+    return frames
+
+
+def compare_panel_to_reference(series_frames, config, plan=None, rtol=1e-9, atol=1e-9):
+    """
+    Compare panel engine output with calculate_technical_indicators series by series
+    
+    Args:
+        series_frames: Dictionary {key: OHLC DataFrame}
+        config: Indicator configuration dictionary
+        plan: Optional IndicatorPlan (None = full mode)
+        rtol, atol: Tolerances passed to np.isclose
+    
+    Returns:
+        Dictionary {column: {'series': mismatching series count, 'max_abs_diff': float, 'example': key}}
+        ('__columns__' reports series whose column layout differs)
+    """
+    panel = PanelIndicatorEngine(config, plan=plan).compute(series_frames)
+    if panel.skipped:
+        logger.info(f"{len(panel.skipped)} series with NaN OHLC are not handled by the panel engine (skipped)")
+    
+    mismatches = {}
+    
+    def record(column, key, diff):
+        entry = mismatches.setdefault(column, {'series': 0, 'max_abs_diff': 0.0, 'example': key})
+        entry['series'] += 1
+        entry['max_abs_diff'] = max(entry['max_abs_diff'], diff)
+    
+    for key in panel.keys:
+        reference = calculate_technical_indicators(series_frames[key], {}, config, plan=plan)
+        candidate = panel.series_frame(key)
+        if list(reference.columns) != list(candidate.columns):
+            record('__columns__', key, 0.0)
+            continue
+        for col in reference.columns:
+            expected = pd.to_numeric(reference[col], errors='coerce').to_numpy(dtype='float64')
+            actual = pd.to_numeric(candidate[col], errors='coerce').to_numpy(dtype='float64')
+            with np.errstate(invalid='ignore'):
+                close = np.isclose(expected, actual, rtol=rtol, atol=atol, equal_nan=True)
+                close |= np.isinf(expected) & (expected == actual)
+            if not close.all():
+                deltas = np.abs(expected[~close] - actual[~close])
+                finite = deltas[np.isfinite(deltas)]
+                record(col, key, float(finite.max()) if len(finite) else float('inf'))
+    return mismatches
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Compare the panel indicator engine with the per-series reference (calculate_technical_indicators)'
+    )
+    parser.add_argument('--date', type=str, default=None,
+                        help='Snapshot date (YYYY-MM-DD) whose stored raw OHLC to use')
+    parser.add_argument('--output-dir', type=str, default='full_unfiltered_historicals',
+                        help='Snapshot directory (default: full_unfiltered_historicals)')
+    parser.add_argument('--synthetic', type=int, default=None,
+                        help='Use N synthetic random-walk series instead of stored raw OHLC')
+    parser.add_argument('--limit', type=int, default=None,
+                        help='Only compare the first N series')
+    parser.add_argument('--mode', type=str, choices=['full', 'plan'], default='full',
+                        help='Indicator mode to compare (default: full)')
+    parser.add_argument('--config', type=str, default='study_settings/indicator_config.json',
+                        help='Indicator configuration file')
+    parser.add_argument('--rtol', type=float, default=1e-9, help='Relative tolerance (default: 1e-9)')
+    parser.add_argument('--atol', type=float, default=1e-9, help='Absolute tolerance (default: 1e-9)')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    
+    if not PANDAS_TA_AVAILABLE:
+        logger.error("pandas_ta is required for the reference implementation")
+        sys.exit(2)
+    if args.synthetic is None and args.date is None:
+        parser.error('Specify --date or --synthetic')
+    
+    config = load_indicator_config(args.config)
+    plan = build_indicator_plan(config, mode=args.mode)
+    
+    if args.synthetic is not None:
+        frames = make_synthetic_series(args.synthetic)
+    else:
+        path = raw_ohlc_path(args.output_dir, args.date)
+        if not path.exists():
+            logger.error(f"No raw OHLC stored for {args.date} ({path})")
+            sys.exit(2)
+        frames = load_raw_ohlc(path)
+    if args.limit:
+        frames = dict(list(frames.items())[:args.limit])
+    
+    logger.info(f"Comparing {len(frames):,} series ({args.mode} mode, rtol={args.rtol}, atol={args.atol})")
+    mismatches = compare_panel_to_reference(frames, config, plan=plan, rtol=args.rtol, atol=args.atol)
+    if not mismatches:
+        logger.info("✓ Panel engine matches the reference for every column")
+        sys.exit(0)
+    for col, entry in sorted(mismatches.items()):
+        logger.warning(f"  {col}: {entry['series']} series differ (max |diff| {entry['max_abs_diff']:.3g}, e.g. {entry['example']})")
+    sys.exit(1)